@@ -15,7 +15,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 # Cambiar al directorio del script para rutas relativas
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-from main import consolidar_bancos, categorizar_movimientos, generar_reportes
+from main import consolidar_bancos, categorizar_movimientos, generar_reportes, ejecutar_pipeline, vigilar_input
 from config import get_config
 from glob import glob
 
@@ -29,6 +29,13 @@ from rich.prompt import Prompt, Confirm
 
 console = Console()
 
+# Título de cada paso del proceso completo
+TITULOS_PASOS = {
+    'Consolidar': "CONSOLIDANDO EXTRACTOS BANCARIOS",
+    'Categorizar': "CATEGORIZANDO MOVIMIENTOS",
+    'Reportes': "GENERANDO REPORTES Y DASHBOARD",
+}
+
 
 def seleccionar_archivo_input():
     """
@@ -158,6 +165,8 @@ def mostrar_menu_principal():
     menu.add_row("5", "⚙️  Configuración de rutas")
     menu.add_row("6", "ℹ️  Información del sistema")
     menu.add_row("", "")
+    menu.add_row("7", "👀 Modo VIGILANCIA (procesa cada extracto que llegue a input/)")
+    menu.add_row("", "")
     menu.add_row("0", "🚪 SALIR", style="dim")
 
     panel = Panel(
@@ -192,76 +201,65 @@ def proceso_completo():
         Prompt.ask("\n[dim]Presiona ENTER para continuar[/dim]")
         return
 
-    # PASO 1: Consolidar
-    console.print()
-    console.print(Panel(
-        "[bold cyan]PASO 1/3: CONSOLIDANDO EXTRACTOS BANCARIOS[/bold cyan]",
-        border_style="cyan",
-        box=box.HEAVY
-    ))
+    # Los 3 pasos con cache: un paso cuyas entradas no cambiaron se reutiliza
+    def al_iniciar_etapa(numero, nombre):
+        console.print()
+        console.print(Panel(
+            f"[bold cyan]PASO {numero}/3: {TITULOS_PASOS[nombre]}[/bold cyan]",
+            border_style="cyan",
+            box=box.HEAVY
+        ))
+
+    def al_terminar_etapa(numero, nombre, registro):
+        if registro['hit']:
+            console.print(f"\n[bold green]✅ {nombre}: sin cambios, reutilizado de la corrida anterior.[/bold green]")
+        else:
+            console.print(f"\n[bold green]✅ {nombre}: completado.[/bold green]")
+        if numero < 3:
+            Prompt.ask("[dim]Presiona ENTER para continuar[/dim]")
+
+    resultado = ejecutar_pipeline(
+        archivo_especifico=archivo_input,
+        revisar_manual=True,
+        abrir_dashboard=True,
+        al_iniciar_etapa=al_iniciar_etapa,
+        al_terminar_etapa=al_terminar_etapa
+    )
 
-    resultado = consolidar_bancos(archivo_especifico=archivo_input)
-    if resultado is None:
-        console.print("\n[bold red]❌ Error en consolidación. Proceso detenido.[/bold red]")
+    if resultado['categorizado'] is None:
+        console.print(f"\n[bold red]❌ Error en {resultado['error'].lower()}. Proceso detenido.[/bold red]")
         Prompt.ask("\n[dim]Presiona ENTER para continuar[/dim]")
         return
 
-    df_consolidado, archivo_consolidado = resultado
-
-    console.print("\n[bold green]✅ Consolidación completada.[/bold green]")
-    Prompt.ask("[dim]Presiona ENTER para continuar[/dim]")
-
-    # PASO 2: Categorizar
-    console.print()
-    console.print(Panel(
-        "[bold cyan]PASO 2/3: CATEGORIZANDO MOVIMIENTOS[/bold cyan]",
-        border_style="cyan",
-        box=box.HEAVY
-    ))
-
-    resultado = categorizar_movimientos(
-        ruta_archivo_consolidado=archivo_consolidado,
-        revisar_manual=True
-    )
-
-    if resultado is None:
-        console.print("\n[bold red]❌ Error en categorización. Proceso detenido.[/bold red]")
+    if resultado['dashboard'] is None and resultado['reporte'] is None:
+        console.print("\n[bold red]❌ Error en generación de reportes.[/bold red]")
         Prompt.ask("\n[dim]Presiona ENTER para continuar[/dim]")
         return
 
-    df_categorizado, archivo_categorizado = resultado
+    # Proceso completo (una salida de reportes puede haber fallado sin perder la otra)
+    completo = resultado['error'] is None
 
-    console.print("\n[bold green]✅ Categorización completada.[/bold green]")
-    Prompt.ask("[dim]Presiona ENTER para continuar[/dim]")
-
-    # PASO 3: Reportes
-    console.print()
-    console.print(Panel(
-        "[bold cyan]PASO 3/3: GENERANDO REPORTES Y DASHBOARD[/bold cyan]",
-        border_style="cyan",
-        box=box.HEAVY
-    ))
+    def marca(ruta):
+        return "[green]✓[/green]" if ruta else "[red]✗[/red]"
 
-    resultado = generar_reportes(
-        ruta_archivo_categorizado=archivo_categorizado,
-        abrir_dashboard=True
+    etapas = "\n".join(
+        f"  [cyan]{registro['etapa']}:[/cyan] "
+        + ("[green]reutilizada (cache)[/green]" if registro['hit'] else "ejecutada")
+        + f" [dim]({registro['segundos']:.1f} s)[/dim]"
+        for registro in resultado['etapas']
     )
 
-    if resultado is None:
-        console.print("\n[bold red]❌ Error en generación de reportes.[/bold red]")
-        Prompt.ask("\n[dim]Presiona ENTER para continuar[/dim]")
-        return
-
-    # Proceso completo exitoso
     console.print()
     console.print(Panel(
         f"[bold white]Archivos generados en la carpeta 'output/':[/bold white]\n\n"
-        f"  [green]✓[/green] {os.path.basename(archivo_consolidado)}\n"
-        f"  [green]✓[/green] {os.path.basename(archivo_categorizado)}\n"
-        f"  [green]✓[/green] reporte_ejecutivo_*.xlsx\n"
-        f"  [green]✓[/green] dashboard_*.html",
-        title="[bold green]✅ PROCESO COMPLETO FINALIZADO EXITOSAMENTE[/bold green]",
-        border_style="green",
+        f"  [green]✓[/green] {os.path.basename(resultado['consolidado'])}\n"
+        f"  [green]✓[/green] {os.path.basename(resultado['categorizado'])}\n"
+        f"  {marca(resultado['reporte'])} reporte_ejecutivo_*.xlsx\n"
+        f"  {marca(resultado['dashboard'])} dashboard_*.html\n\n"
+        f"[bold white]Etapas:[/bold white]\n{etapas}",
+        title=("[bold green]✅ PROCESO COMPLETO FINALIZADO EXITOSAMENTE[/bold green]" if completo
+               else "[bold yellow]⚠️ PROCESO FINALIZADO CON ERRORES EN REPORTES[/bold yellow]"),
+        border_style="green" if completo else "yellow",
         box=box.DOUBLE
     ))
 
@@ -316,6 +314,26 @@ def solo_reportes():
     Prompt.ask("\n[dim]Presiona ENTER para volver al menú principal[/dim]")
 
 
+def modo_vigilancia():
+    """Vigila input/ y procesa automáticamente cada extracto nuevo hasta Ctrl+C."""
+    console.print()
+    console.print(Panel(
+        "[bold white]Cada extracto que se copie a la carpeta 'input/' se procesa solo:[/bold white]\n\n"
+        "  [cyan]1.[/cyan] Lectura y normalización\n"
+        "  [cyan]2.[/cyan] Categorización (sin revisión manual)\n"
+        "  [cyan]3.[/cyan] Se agrega al archivo categorizado del mes\n"
+        "  [cyan]4.[/cyan] Reportes y dashboard actualizados\n\n"
+        "[dim]Presiona Ctrl+C para detener y volver al menú.[/dim]",
+        title="[bold cyan]👀 MODO VIGILANCIA[/bold cyan]",
+        border_style="cyan",
+        box=box.ROUNDED
+    ))
+
+    vigilar_input()
+
+    Prompt.ask("\n[dim]Presiona ENTER para volver al menú principal[/dim]")
+
+
 def configuracion():
     """Muestra y permite cambiar la configuración."""
     console.print()
@@ -396,7 +414,7 @@ def main():
         try:
             opcion = Prompt.ask(
                 "[bold cyan]Selecciona una opción[/bold cyan]",
-                choices=['0', '1', '2', '3', '4', '5', '6'],
+                choices=['0', '1', '2', '3', '4', '5', '6', '7'],
                 default='1'
             ).strip()
 
@@ -430,6 +448,9 @@ def main():
             elif opcion == '6':
                 informacion_sistema()
 
+            elif opcion == '7':
+                modo_vigilancia()
+
             else:
                 console.print("\n[bold red]❌ ERROR:[/bold red] Opción inválida. Por favor selecciona una opción del menú.")
                 Prompt.ask("\n[dim]Presiona ENTER para continuar[/dim]")
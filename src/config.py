@@ -47,10 +47,12 @@ class ClasificadorConfig:
     Attributes:
         reglas_concepto_file: Archivo JSON con reglas de nivel 1 (concepto)
         reglas_refinamiento_file: Archivo JSON con reglas de nivel 2 (detalle)
+        registro_prestadores_file: Archivo JSON con el padrón de prestadores conocidos
         usar_reglas_externas: Si True, cargar reglas desde JSON (futuro)
     """
     reglas_concepto_file: str = "reglas_concepto.json"
     reglas_refinamiento_file: str = "reglas_refinamiento.json"
+    registro_prestadores_file: str = "registro_prestadores.json"
     usar_reglas_externas: bool = False  # Futuro: migración a JSON
 
     def get_reglas_concepto_path(self, data_dir: str = "./data") -> Path:
@@ -61,6 +63,10 @@ class ClasificadorConfig:
         """Retorna Path completo al archivo de reglas de refinamiento."""
         return Path(data_dir) / self.reglas_refinamiento_file
 
+    def get_registro_prestadores_path(self, data_dir: str = "./data") -> Path:
+        """Retorna Path completo al archivo del registro de prestadores."""
+        return Path(data_dir) / self.registro_prestadores_file
+
 
 @dataclass
 class SystemConfig:
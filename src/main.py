@@ -10,20 +10,15 @@ import sys
 import argparse
 from glob import glob
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 # Importar configuración centralizada
 from config import get_config
 
-# Importar módulos propios
-from readers.supervielle_reader import SupervielleReader
-from readers.galicia_reader import GaliciaReader
-from processors.normalizer import Normalizer
-from processors.consolidator import Consolidator
-from processors.categorizer import Categorizer
-from utils.cli_corrector import CLICorrector
-from reports.analyzer import Analyzer
-from reports.dashboard_generator import DashboardGenerator
-from reports.excel_exporter import ExcelExporter
+# Los módulos propios (y con ellos pandas y openpyxl) se importan dentro de
+# cada comando: --help y el menú arrancan sin cargarlos
+if TYPE_CHECKING:
+    from reports.cubo import CuboMovimientos
 
 
 def detectar_banco(ruta_archivo: str):
@@ -37,6 +32,8 @@ def detectar_banco(ruta_archivo: str):
         Tupla (nombre_banco, reader_instance) o (None, None) si no se detecta
     """
     import pandas as pd
+    from readers.supervielle_reader import SupervielleReader
+    from readers.galicia_reader import GaliciaReader
 
     try:
         df = pd.read_excel(ruta_archivo)
@@ -67,6 +64,9 @@ def consolidar_bancos(ruta_input: str = None, ruta_output: str = None, archivo_e
         ruta_output: Carpeta donde se guardarán los resultados (default: config.paths.output_dir)
         archivo_especifico: Nombre de archivo específico a procesar (opcional)
     """
+    from processors.normalizer import Normalizer
+    from processors.consolidator import Consolidator
+
     # Obtener configuración
     config = get_config()
     ruta_input = ruta_input or config.paths.input_dir
@@ -190,7 +190,7 @@ def categorizar_movimientos_df(df, categorizer=None):
         >>> df_cat, df_sin_cat = categorizar_movimientos_df(df)
         >>> len(df_cat)  # Retorna DataFrame categorizado
     """
-    import pandas as pd
+    from processors.categorizer import Categorizer
 
     # Crear categorizador si no se provee uno
     if categorizer is None:
@@ -203,6 +203,61 @@ def categorizar_movimientos_df(df, categorizer=None):
     return df_categorizado, df_sin_clasificar
 
 
+def cargar_historial_categorizado(ruta_output: str, excluir: str = None,
+                                  max_archivos: int = 12, columnas: list = None):
+    """
+    Lee los archivos categorizados previos para usarlos como historial.
+
+    Solo se leen las columnas necesarias (las que falten en archivos
+    anteriores simplemente se omiten).
+
+    Args:
+        ruta_output: Carpeta donde están los movimientos_categorizados_*.xlsx
+        excluir: Ruta de archivo a ignorar (ej: el que se va a sobrescribir)
+        max_archivos: Cantidad máxima de archivos (los más recientes; None = todos)
+        columnas: Columnas a leer (default: Concepto, Detalle, Categoria_Principal,
+            Categoria_Final)
+
+    Returns:
+        DataFrame con las columnas pedidas (vacío si no hay historial)
+    """
+    import pandas as pd
+
+    columnas = columnas or ['Concepto', 'Detalle', 'Categoria_Principal', 'Categoria_Final']
+    archivos = glob(os.path.join(ruta_output, "movimientos_categorizados_*.xlsx"))
+    if excluir:
+        archivos = [a for a in archivos if os.path.abspath(a) != os.path.abspath(excluir)]
+    archivos = sorted(archivos, key=os.path.getmtime, reverse=True)[:max_archivos]
+
+    historial = []
+    for archivo in archivos:
+        try:
+            historial.append(pd.read_excel(archivo, sheet_name='Movimientos Categorizados',
+                                           usecols=lambda col: col in columnas))
+        except Exception as e:
+            print(f"  Advertencia: no se pudo leer historial {os.path.basename(archivo)}: {e}")
+
+    if not historial:
+        return pd.DataFrame(columns=columnas)
+
+    return pd.concat(historial, ignore_index=True)
+
+
+def obtener_cubo(ruta_output: str) -> 'CuboMovimientos':
+    """
+    Cubo histórico de movimientos agregados de la carpeta de salida.
+
+    Args:
+        ruta_output: Carpeta de salida
+
+    Returns:
+        CuboMovimientos sobre ruta_output/cubo_movimientos.sqlite
+    """
+    from reports.cubo import CuboMovimientos
+
+    return CuboMovimientos(os.path.join(ruta_output, "cubo_movimientos.sqlite"))
+
+
 def categorizar_movimientos(ruta_archivo_consolidado: str = None,
                             ruta_output: str = None,
                             revisar_manual: bool = True):
@@ -215,6 +270,9 @@ def categorizar_movimientos(ruta_archivo_consolidado: str = None,
         revisar_manual: Si True, abre CLI para corrección de movimientos sin clasificar
     """
     import pandas as pd
+    from processors.categorizer import Categorizer
+    from processors.sugeridor import SugeridorCategorias
+    from utils.cli_corrector import CLICorrector
 
     # Obtener configuración
     config = get_config()
@@ -253,6 +311,24 @@ def categorizar_movimientos(ruta_archivo_consolidado: str = None,
     # Llamar a la función pura de categorización (lógica de negocio separada)
     df_categorizado, df_sin_clasificar = categorizar_movimientos_df(df, categorizer)
 
+    # Generar nombre de archivo de salida
+    fecha_actual = datetime.now()
+    nombre_salida = f"movimientos_categorizados_{fecha_actual.year}_{fecha_actual.month:02d}.xlsx"
+    ruta_salida = os.path.join(ruta_output, nombre_salida)
+
+    # Sugerencias por similitud para los sin clasificar (historial + movimientos actuales)
+    if len(df_sin_clasificar) > 0:
+        df_historial = pd.concat([
+            cargar_historial_categorizado(ruta_output, excluir=ruta_salida),
+            df_categorizado
+        ], ignore_index=True)
+        sugeridor = SugeridorCategorias().entrenar(df_historial)
+        df_categorizado = sugeridor.anotar(df_categorizado)
+        df_sin_clasificar = categorizer.obtener_sin_clasificar(df_categorizado)
+
+        con_sugerencia = df_sin_clasificar['Sugerencias'].notna().sum()
+        print(f"\nSugerencias de categoría: {con_sugerencia}/{len(df_sin_clasificar)} movimientos sin clasificar")
+
     # Revisión manual si hay movimientos sin clasificar y se solicita
     if len(df_sin_clasificar) > 0 and revisar_manual:
         print(f"\n{'='*80}")
@@ -275,18 +351,25 @@ def categorizar_movimientos(ruta_archivo_consolidado: str = None,
                 categorizer=categorizer
             )
 
-    # Generar nombre de archivo de salida
-    fecha_actual = datetime.now()
-    nombre_salida = f"movimientos_categorizados_{fecha_actual.year}_{fecha_actual.month:02d}.xlsx"
-    ruta_salida = os.path.join(ruta_output, nombre_salida)
-
     # Exportar
     categorizer.exportar_categorizados(df_categorizado, ruta_salida)
 
+    # Actualizar el cubo histórico (reemplaza los días/bancos de este archivo)
+    celdas = obtener_cubo(ruta_output).actualizar(df_categorizado)
+
+    # Uso de reglas en esta corrida (hits por regla, defaults, reglas sin uso, tiempos)
+    ruta_estadisticas = os.path.join(
+        ruta_output, f"estadisticas_reglas_{fecha_actual.year}_{fecha_actual.month:02d}.json")
+    uso = categorizer.clasificador.exportar_estadisticas(ruta_estadisticas)
+
     print(f"\n{'='*80}")
     print("PROCESO COMPLETADO")
     print(f"{'='*80}")
     print(f"\nArchivo generado: {ruta_salida}")
+    print(f"Cubo histórico actualizado: {celdas} celda(s)")
+    print(f"Estadísticas de reglas: {ruta_estadisticas}")
+    print(f"  Tiempo Nivel 1: {uso['tiempo_nivel1_s']:.3f}s | Nivel 2: {uso['tiempo_nivel2_s']:.3f}s")
+    print(f"  Reglas sin uso en esta corrida: {len(uso['reglas_sin_uso'])}")
 
     # Estadísticas finales
     total_clasificados = len(df_categorizado[df_categorizado['Categoria_Principal'] != 'Sin Clasificar'])
@@ -300,9 +383,260 @@ def categorizar_movimientos(ruta_archivo_consolidado: str = None,
     return df_categorizado, ruta_salida
 
 
+def leer_correcciones(ruta_correcciones: str):
+    """
+    Lee un archivo de correcciones masivas (CSV o JSON).
+
+    El CSV puede usar ',' o ';' como separador (Excel en español exporta con ';').
+    El JSON debe ser una lista de objetos (un objeto por corrección).
+
+    Args:
+        ruta_correcciones: Ruta al archivo .csv o .json
+
+    Returns:
+        DataFrame con las correcciones
+
+    Raises:
+        ValueError: Si la extensión no es soportada
+    """
+    import pandas as pd
+
+    extension = os.path.splitext(ruta_correcciones)[1].lower()
+
+    if extension == '.csv':
+        return pd.read_csv(ruta_correcciones, sep=None, engine='python',
+                           encoding='utf-8-sig', dtype={'ID_Movimiento': str})
+    if extension == '.json':
+        return pd.read_json(ruta_correcciones, orient='records', dtype={'ID_Movimiento': str})
+
+    raise ValueError(f"Formato de correcciones no soportado: {extension} (usar .csv o .json)")
+
+
+def aplicar_correcciones(ruta_correcciones: str,
+                         ruta_archivo_categorizado: str = None,
+                         ruta_output: str = None):
+    """
+    Aplica un archivo de correcciones masivas al archivo categorizado (sin CLI interactivo).
+
+    Las correcciones se aplican con un único merge (ver Categorizer.aplicar_correcciones)
+    y el archivo categorizado se reescribe con las categorías corregidas.
+
+    Args:
+        ruta_correcciones: Ruta al archivo de correcciones (.csv o .json)
+        ruta_archivo_categorizado: Ruta al archivo categorizado (si None, busca el más reciente)
+        ruta_output: Carpeta de salida (default: config.paths.output_dir)
+    """
+    import pandas as pd
+    from processors.categorizer import Categorizer
+
+    # Obtener configuración
+    config = get_config()
+    ruta_output = ruta_output or config.paths.output_dir
+
+    print("="*80)
+    print("TORO · Resumen de Cuentas - Sistema de Control Financiero")
+    print("Bloque 2: Correcciones Masivas")
+    print("="*80)
+
+    # Si no se especifica archivo, buscar el más reciente
+    if ruta_archivo_categorizado is None:
+        archivos_categorizados = glob(os.path.join(ruta_output, "movimientos_categorizados_*.xlsx"))
+
+        if not archivos_categorizados:
+            print("\nError: No se encontraron archivos categorizados.")
+            print("Por favor ejecuta primero: python main.py --categorizar")
+            return
+
+        ruta_archivo_categorizado = max(archivos_categorizados, key=os.path.getmtime)
+
+    print(f"\nArchivo a corregir: {os.path.basename(ruta_archivo_categorizado)}")
+    print(f"Correcciones:       {os.path.basename(ruta_correcciones)}")
+
+    try:
+        df = pd.read_excel(ruta_archivo_categorizado, sheet_name='Movimientos Categorizados',
+                           dtype={'ID_Movimiento': str})
+        df_correcciones = leer_correcciones(ruta_correcciones)
+        print(f"OK Leidos {len(df)} movimientos y {len(df_correcciones)} correcciones")
+    except Exception as e:
+        print(f"Error al leer archivos: {e}")
+        return
+
+    categorizer = Categorizer()
+
+    try:
+        df_corregido = categorizer.aplicar_correcciones(df, df_correcciones)
+    except ValueError as e:
+        print(f"Error en archivo de correcciones: {e}")
+        return
+
+    categorizer.exportar_categorizados(df_corregido, ruta_archivo_categorizado)
+
+    sin_clasificar = int((df_corregido['Categoria_Principal'] == 'Sin Clasificar').sum())
+    print(f"\n{'='*80}")
+    print("PROCESO COMPLETADO")
+    print(f"{'='*80}")
+    print(f"\nArchivo actualizado: {ruta_archivo_categorizado}")
+    print(f"Movimientos sin clasificar restantes: {sin_clasificar}")
+
+    return df_corregido, ruta_archivo_categorizado
+
+
+def reclasificar_movimientos(ruta_archivo_categorizado: str = None,
+                             ruta_output: str = None):
+    """
+    Reclasifica el archivo categorizado tras un cambio de reglas.
+
+    Solo se reevalúan los movimientos afectados por reglas agregadas,
+    eliminadas o modificadas respecto de la foto guardada en la hoja "Reglas"
+    (ver ReclasificadorSelectivo). Si el archivo no tiene esa hoja, se
+    reevalúan todos. Las correcciones manuales se conservan.
+
+    Args:
+        ruta_archivo_categorizado: Ruta al archivo categorizado (si None, busca el más reciente)
+        ruta_output: Carpeta de salida (default: config.paths.output_dir)
+
+    Returns:
+        Tupla (df_reclasificado, df_cambios) o None si hubo error
+    """
+    import pandas as pd
+    from processors.categorizer import Categorizer
+    from processors.reclasificador import ReclasificadorSelectivo
+
+    # Obtener configuración
+    config = get_config()
+    ruta_output = ruta_output or config.paths.output_dir
+
+    print("="*80)
+    print("TORO · Resumen de Cuentas - Sistema de Control Financiero")
+    print("Bloque 2: Reclasificación por Cambio de Reglas")
+    print("="*80)
+
+    # Si no se especifica archivo, buscar el más reciente
+    if ruta_archivo_categorizado is None:
+        archivos_categorizados = glob(os.path.join(ruta_output, "movimientos_categorizados_*.xlsx"))
+
+        if not archivos_categorizados:
+            print("\nError: No se encontraron archivos categorizados.")
+            print("Por favor ejecuta primero: python main.py --categorizar")
+            return
+
+        ruta_archivo_categorizado = max(archivos_categorizados, key=os.path.getmtime)
+
+    print(f"\nArchivo a reclasificar: {os.path.basename(ruta_archivo_categorizado)}")
+
+    try:
+        hojas = pd.read_excel(ruta_archivo_categorizado, sheet_name=None,
+                              dtype={'ID_Movimiento': str})
+    except Exception as e:
+        print(f"Error al leer archivo: {e}")
+        return
+
+    df = hojas['Movimientos Categorizados']
+    df_reglas = hojas.get('Reglas')
+    if df_reglas is None:
+        print("  Advertencia: el archivo no tiene hoja 'Reglas'; se reevalúan todos los movimientos")
+
+    categorizer = Categorizer()
+    reclasificador = ReclasificadorSelectivo(categorizer.clasificador, df_reglas)
+
+    cambios_reglas = reclasificador.comparar_reglas()
+    if df_reglas is not None:
+        print(f"Reglas agregadas: {len(cambios_reglas['agregadas'])} | "
+              f"eliminadas: {len(cambios_reglas['eliminadas'])} | "
+              f"modificadas: {len(cambios_reglas['modificadas'])}")
+
+    df_nuevo, df_cambios = reclasificador.reclasificar(df)
+
+    categorizer.exportar_categorizados(df_nuevo, ruta_archivo_categorizado)
+
+    print(f"\n{'='*80}")
+    print("PROCESO COMPLETADO")
+    print(f"{'='*80}")
+
+    if len(df_cambios) > 0:
+        print("\nCambios de categoría (anterior -> nueva):")
+        resumen = df_cambios.groupby(['Categoria_Anterior', 'Categoria_Nueva']).size()
+        for (anterior, nueva), cantidad in resumen.sort_values(ascending=False).items():
+            print(f"  {cantidad:5d}  {anterior} -> {nueva}")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        ruta_cambios = os.path.join(ruta_output, f"cambios_reclasificacion_{timestamp}.xlsx")
+        df_cambios.to_excel(ruta_cambios, index=False)
+        print(f"\nDetalle de cambios: {ruta_cambios}")
+    else:
+        print("\nNingún movimiento cambió de categoría")
+
+    return df_nuevo, df_cambios
+
+
+def regresion_reglas(ruta_reglas_candidatas: str,
+                     ruta_corpus: str = None,
+                     ruta_output: str = None):
+    """
+    Compara reglas candidatas contra el corpus histórico antes de publicarlas.
+
+    Reproduce todos los movimientos categorizados (o un archivo puntual) con las
+    reglas JSON candidatas y reporta qué movimientos cambiarían de categoría
+    (ver RegresionReglas). No modifica ningún archivo categorizado.
+
+    Args:
+        ruta_reglas_candidatas: Carpeta con reglas_concepto.json y reglas_refinamiento.json candidatos
+        ruta_corpus: Archivo categorizado a usar como corpus (si None, usa todo el historial)
+        ruta_output: Carpeta de salida (default: config.paths.output_dir)
+
+    Returns:
+        Dict con el resultado de RegresionReglas.ejecutar() o None si hubo error
+    """
+    import pandas as pd
+    from processors.clasificador_cascada import ClasificadorCascada
+    from processors.regresion_reglas import RegresionReglas
+
+    # Obtener configuración
+    config = get_config()
+    ruta_output = ruta_output or config.paths.output_dir
+
+    print("="*80)
+    print("TORO · Resumen de Cuentas - Sistema de Control Financiero")
+    print("Bloque 2: Regresión de Reglas sobre Historial")
+    print("="*80)
+
+    columnas = ['Concepto', 'Detalle', 'Categoria_Final', 'Regla_Concepto']
+    if ruta_corpus:
+        print(f"\nCorpus: {os.path.basename(ruta_corpus)}")
+        df_corpus = pd.read_excel(ruta_corpus, sheet_name='Movimientos Categorizados',
+                                  usecols=lambda col: col in columnas)
+    else:
+        print(f"\nCorpus: historial completo en {ruta_output}")
+        df_corpus = cargar_historial_categorizado(ruta_output, max_archivos=None, columnas=columnas)
+
+    if len(df_corpus) == 0:
+        print("\nError: No se encontraron movimientos categorizados para comparar.")
+        print("Por favor ejecuta primero: python main.py --categorizar")
+        return
+
+    print(f"Reglas candidatas: {ruta_reglas_candidatas}")
+    try:
+        clasificador = ClasificadorCascada.desde_json(ruta_reglas_candidatas)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error al cargar reglas candidatas: {e}")
+        return
+
+    regresion = RegresionReglas(clasificador)
+    resultado = regresion.ejecutar(df_corpus)
+    regresion.imprimir_resumen(resultado)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    regresion.exportar(resultado, os.path.join(ruta_output, f"regresion_reglas_{timestamp}.xlsx"))
+
+    return resultado
+
+
 def generar_reportes(ruta_archivo_categorizado: str = None,
                      ruta_output: str = None,
-                     abrir_dashboard: bool = True):
+                     abrir_dashboard: bool = True,
+                     desde: str = None,
+                     hasta: str = None,
+                     offline: bool = False):
     """
     Genera reportes y dashboard desde movimientos categorizados.
 
@@ -310,9 +644,21 @@ def generar_reportes(ruta_archivo_categorizado: str = None,
         ruta_archivo_categorizado: Ruta al archivo categorizado (si None, busca el más reciente)
         ruta_output: Carpeta de salida (default: config.paths.output_dir)
         abrir_dashboard: Si True, intenta abrir el dashboard en el navegador
+        desde: Primer día del período a reportar (AAAA-MM-DD, None = sin límite)
+        hasta: Último día del período a reportar (AAAA-MM-DD, None = sin límite)
+        offline: Si True, el dashboard es un HTML autocontenido (Chart.js embebido
+            y datos comprimidos), sin acceso a internet
+
+    Returns:
+        Tupla (ruta del dashboard, ruta del Excel), con None en la salida que
+        falló; None si no se generó ninguna
     """
     import pandas as pd
     import webbrowser
+    from reports.analyzer import Analyzer
+    from reports.dashboard_generator import DashboardGenerator
+    from reports.excel_exporter import ExcelExporter
+    from reports.paralelo import generar_en_paralelo
 
     # Obtener configuración
     config = get_config()
@@ -345,8 +691,24 @@ def generar_reportes(ruta_archivo_categorizado: str = None,
         print(f"Error al leer archivo: {e}")
         return
 
-    # Crear analizador
-    analyzer = Analyzer(df)
+    # Crear analizador (ordena por fecha una sola vez)
+    analizador_completo = Analyzer(df)
+    analyzer = analizador_completo
+
+    # Período solicitado: corte por búsqueda binaria sobre las fechas ordenadas
+    sufijo_periodo = ""
+    if desde is not None or hasta is not None:
+        try:
+            analyzer = analizador_completo.periodo(desde, hasta)
+        except ValueError as e:
+            print(f"Error en el período (--desde/--hasta deben ser AAAA-MM-DD): {e}")
+            return
+        if len(analyzer.df) == 0:
+            print(f"\nError: No hay movimientos entre {desde or 'el inicio'} y {hasta or 'el final'}.")
+            return
+        primero, ultimo = analyzer.rango_fechas()
+        sufijo_periodo = f"_{primero:%Y%m%d}_{ultimo:%Y%m%d}"
+        print(f"OK Período {primero:%d/%m/%Y} - {ultimo:%d/%m/%Y}: {len(analyzer.df)} movimientos")
 
     # Calcular métricas
     metricas = analyzer.calcular_metricas()
@@ -356,28 +718,46 @@ def generar_reportes(ruta_archivo_categorizado: str = None,
 
     # Generar dashboard HTML
     fecha_actual = datetime.now()
-    nombre_dashboard = f"dashboard_{fecha_actual.year}_{fecha_actual.month:02d}.html"
+    nombre_dashboard = f"dashboard_{fecha_actual.year}_{fecha_actual.month:02d}{sufijo_periodo}.html"
     ruta_dashboard = os.path.join(ruta_output, nombre_dashboard)
 
-    dashboard_gen = DashboardGenerator(df, metricas)
-    dashboard_gen.generar_html(ruta_dashboard)
+    # Mantener el cubo al día con el archivo analizado (mes a mes y acumulado del año)
+    cubo = obtener_cubo(ruta_output)
+    cubo.actualizar(analizador_completo.df)
 
-    # Generar reporte ejecutivo Excel
-    nombre_reporte = f"reporte_ejecutivo_{fecha_actual.year}_{fecha_actual.month:02d}.xlsx"
+    # Comparativo por categoría: mes actual vs anterior y vs mismo mes del año anterior
+    comparativo = analyzer.comparativo('M', periodos=36, cubo=cubo)
+
+    nombre_reporte = f"reporte_ejecutivo_{fecha_actual.year}_{fecha_actual.month:02d}{sufijo_periodo}.xlsx"
     ruta_reporte = os.path.join(ruta_output, nombre_reporte)
 
-    excel_exp = ExcelExporter(df, metricas)
-    excel_exp.exportar(ruta_reporte)
+    # Dashboard y Excel a la vez: reutilizan los agregados ya calculados por el
+    # Analyzer, y si una salida falla la otra se genera igual
+    dashboard_gen = DashboardGenerator(analyzer.df, metricas, analyzer.agregados, cubo, comparativo,
+                                       offline=offline, comprimir_datos=offline)
+    excel_exp = ExcelExporter(analyzer.df, metricas, analyzer.agregados, comparativo)
+    salidas = generar_en_paralelo({
+        'Dashboard HTML': lambda: dashboard_gen.generar_html(ruta_dashboard),
+        'Reporte Excel': lambda: excel_exp.exportar(ruta_reporte),
+    })
+    if salidas['Dashboard HTML']['error'] is not None:
+        ruta_dashboard = None
+    if salidas['Reporte Excel']['error'] is not None:
+        ruta_reporte = None
+    if ruta_dashboard is None and ruta_reporte is None:
+        print("\nError: no se pudo generar ningún reporte.")
+        return
 
     print(f"\n{'='*80}")
-    print("PROCESO COMPLETADO")
+    print("PROCESO COMPLETADO" if ruta_dashboard and ruta_reporte else "PROCESO COMPLETADO CON ERRORES")
     print(f"{'='*80}")
     print(f"\nArchivos generados:")
-    print(f"  - Dashboard HTML: {ruta_dashboard}")
-    print(f"  - Reporte Excel:  {ruta_reporte}")
+    for nombre, ruta in (('Dashboard HTML', ruta_dashboard), ('Reporte Excel', ruta_reporte)):
+        estado = ruta if ruta else f"ERROR ({salidas[nombre]['error']})"
+        print(f"  - {nombre + ':':<16}{estado}  [{salidas[nombre]['segundos']:.1f} s]")
 
     # Abrir dashboard en navegador si se solicita
-    if abrir_dashboard:
+    if abrir_dashboard and ruta_dashboard:
         print(f"\nAbriendo dashboard en el navegador...")
         try:
             webbrowser.open('file://' + os.path.abspath(ruta_dashboard))
@@ -388,6 +768,321 @@ def generar_reportes(ruta_archivo_categorizado: str = None,
     return ruta_dashboard, ruta_reporte
 
 
+def ejecutar_pipeline(archivo_especifico: str,
+                      ruta_input: str = None,
+                      ruta_output: str = None,
+                      revisar_manual: bool = True,
+                      abrir_dashboard: bool = True,
+                      usar_cache: bool = True,
+                      al_iniciar_etapa=None,
+                      al_terminar_etapa=None):
+    """
+    Proceso completo (consolidar -> categorizar -> reportes) con cache de etapas.
+
+    Cada etapa se vuelve a ejecutar solo si cambió algo de lo que la
+    determina (ver utils/cache_etapas.py):
+        - Consolidar: el extracto
+        - Categorizar: el consolidado, las reglas, el historial categorizado
+          (sugerencias) y si hay revisión manual
+        - Reportes: el categorizado y el cubo histórico (con el mes ya volcado)
+    y, en todas, la versión del código y el mes (que da nombre a los archivos).
+    Si una etapa no cambió se restauran sus archivos de la corrida anterior.
+
+    Args:
+        archivo_especifico: Extracto a procesar (en ruta_input)
+        ruta_input: Carpeta de extractos (default: config.paths.input_dir)
+        ruta_output: Carpeta de salida (default: config.paths.output_dir)
+        revisar_manual: Si True, ofrece la revisión manual de los sin clasificar
+        abrir_dashboard: Si True, abre el dashboard en el navegador
+        usar_cache: Si False, ejecuta todas las etapas (y actualiza la cache)
+        al_iniciar_etapa: Función opcional (numero, nombre) antes de cada etapa
+        al_terminar_etapa: Función opcional (numero, nombre, registro) después
+            de cada etapa que terminó bien (registro: {'etapa', 'hit', 'segundos'})
+
+    Returns:
+        Dict con 'consolidado', 'categorizado', 'dashboard', 'reporte' (None
+        lo que no se generó), 'etapas' (resumen de la cache) y 'error'
+        (nombre de la etapa que falló o None)
+    """
+    import pandas as pd
+    import webbrowser
+    from reports.analyzer import Analyzer
+    from utils.cache_etapas import CacheEtapas, huella_archivo, huella_contenido, version_codigo
+
+    config = get_config()
+    ruta_input = ruta_input or config.paths.input_dir
+    ruta_output = ruta_output or config.paths.output_dir
+
+    cache = CacheEtapas(os.path.join(ruta_output, '.cache_etapas'), reutilizar=usar_cache)
+    fecha_actual = datetime.now()
+    comunes = {'codigo': version_codigo(config.system.version),
+               'mes': f"{fecha_actual.year}_{fecha_actual.month:02d}"}
+    reglas = {
+        nombre: huella_archivo(str(ruta)) for nombre, ruta in (
+            ('reglas_concepto', config.clasificador.get_reglas_concepto_path(config.paths.data_dir)),
+            ('reglas_refinamiento', config.clasificador.get_reglas_refinamiento_path(config.paths.data_dir)),
+            ('registro_prestadores', config.clasificador.get_registro_prestadores_path(config.paths.data_dir)),
+        )
+    }
+    resultado = {'consolidado': None, 'categorizado': None, 'dashboard': None, 'reporte': None,
+                 'etapas': cache.resumen, 'error': None}
+
+    def etapa(numero, nombre, entradas, calcular):
+        if al_iniciar_etapa:
+            al_iniciar_etapa(numero, nombre)
+        archivos = cache.ejecutar(nombre, {**comunes, **entradas}, calcular)
+        if not archivos:
+            resultado['error'] = nombre
+            return None
+        if cache.resumen[-1]['hit']:
+            print(f"\n✓ {nombre}: sin cambios, se reutiliza la corrida anterior")
+            for ruta in archivos:
+                print(f"  - {ruta}")
+        if al_terminar_etapa:
+            al_terminar_etapa(numero, nombre, cache.resumen[-1])
+        return archivos
+
+    def ejecutar_etapas():
+        # 1. Extracto -> consolidado
+        def consolidar():
+            salida = consolidar_bancos(ruta_input, ruta_output, archivo_especifico)
+            return [salida[1]] if salida else None
+
+        archivos = etapa(1, 'Consolidar', {
+            'extracto': huella_archivo(os.path.join(ruta_input, archivo_especifico or '')),
+        }, consolidar)
+        if archivos is None:
+            return
+        resultado['consolidado'] = archivos[0]
+
+        # 2. Consolidado + reglas -> categorizado (+ estadísticas de reglas)
+        nombre_categorizado = f"movimientos_categorizados_{comunes['mes']}.xlsx"
+        historial = sorted(
+            ruta for ruta in glob(os.path.join(ruta_output, "movimientos_categorizados_*.xlsx"))
+            if os.path.basename(ruta) != nombre_categorizado
+        )
+
+        def categorizar():
+            salida = categorizar_movimientos(resultado['consolidado'], ruta_output, revisar_manual)
+            if not salida:
+                return None
+            ruta_estadisticas = os.path.join(ruta_output, f"estadisticas_reglas_{comunes['mes']}.json")
+            return [salida[1]] + ([ruta_estadisticas] if os.path.exists(ruta_estadisticas) else [])
+
+        archivos = etapa(2, 'Categorizar', {
+            'consolidado': huella_contenido(resultado['consolidado']),
+            'historial': {os.path.basename(ruta): huella_contenido(ruta) for ruta in historial},
+            'revisar_manual': revisar_manual,
+            **reglas,
+        }, categorizar)
+        if archivos is None:
+            return
+        resultado['categorizado'] = archivos[0]
+
+        # 3. Categorizado -> dashboard + reporte ejecutivo (el comparativo sale del cubo)
+        def reportes():
+            salida = generar_reportes(resultado['categorizado'], ruta_output, abrir_dashboard=abrir_dashboard)
+            return list(salida) if salida else None
+
+        # generar_reportes vuelca el mes en el cubo: se aplica antes (es
+        # idempotente) para que la huella sea la del cubo que verán los reportes
+        cubo = obtener_cubo(ruta_output)
+        cubo.actualizar(Analyzer(pd.read_excel(resultado['categorizado'],
+                                               sheet_name='Movimientos Categorizados')).df)
+        archivos = etapa(3, 'Reportes', {
+            'categorizado': huella_contenido(resultado['categorizado']),
+            'cubo': cubo.huella(),
+        }, reportes)
+        if archivos is None:
+            return
+        resultado['dashboard'], resultado['reporte'] = archivos
+        if resultado['dashboard'] is None or resultado['reporte'] is None:
+            resultado['error'] = 'Reportes'
+
+        if cache.resumen[-1]['hit'] and abrir_dashboard:
+            try:
+                webbrowser.open('file://' + os.path.abspath(resultado['dashboard']))
+            except Exception:
+                print(f"Abre manualmente: {resultado['dashboard']}")
+
+    ejecutar_etapas()
+
+    print(f"\n{'='*80}")
+    print("RESUMEN DE ETAPAS")
+    print(f"{'='*80}")
+    for registro in cache.resumen:
+        estado = "reutilizada (cache)" if registro['hit'] else "ejecutada"
+        print(f"  - {registro['etapa'] + ':':<13}{estado:<21}[{registro['segundos']:.1f} s]")
+
+    return resultado
+
+
+def vigilar_input(ruta_input: str = None,
+                  ruta_output: str = None,
+                  intervalo: float = 2.0):
+    """
+    Modo vigilancia: procesa automáticamente cada extracto que llega a la
+    carpeta de entrada, hasta Ctrl+C.
+
+    Cada extracto se lee, normaliza y categoriza (sin revisión manual), se
+    agrega al archivo categorizado del mes y se regeneran los reportes, que
+    vuelcan el mes completo en el cubo. El categorizador se crea una sola vez y queda listo entre
+    extractos; se vuelve a crear solo si cambian las reglas.
+
+    Args:
+        ruta_input: Carpeta a vigilar (default: config.paths.input_dir)
+        ruta_output: Carpeta de salida (default: config.paths.output_dir)
+        intervalo: Segundos entre revisiones de la carpeta
+    """
+    import pandas as pd
+    from processors.categorizer import Categorizer
+    from processors.consolidator import Consolidator
+    from processors.normalizer import Normalizer
+    from utils.cache_etapas import huella_archivo
+    from utils.vigilante import VigilanteCarpeta
+
+    config = get_config()
+    ruta_input = ruta_input or config.paths.input_dir
+    ruta_output = ruta_output or config.paths.output_dir
+    os.makedirs(ruta_output, exist_ok=True)
+
+    print("="*80)
+    print("TORO · Resumen de Cuentas - Sistema de Control Financiero")
+    print("Modo vigilancia de extractos")
+    print("="*80)
+
+    if not os.path.exists(ruta_input):
+        print(f"\nError: No existe la carpeta '{ruta_input}'")
+        return
+
+    rutas_reglas = [
+        str(config.clasificador.get_reglas_concepto_path(config.paths.data_dir)),
+        str(config.clasificador.get_reglas_refinamiento_path(config.paths.data_dir)),
+        str(config.clasificador.get_registro_prestadores_path(config.paths.data_dir)),
+    ]
+
+    def huella_reglas():
+        return [huella_archivo(ruta) for ruta in rutas_reglas]
+
+    # Estado que se mantiene entre extractos
+    estado = {'categorizer': Categorizer(), 'reglas': huella_reglas(), 'nombre': None, 'movimientos': None}
+
+    def procesar(ruta_archivo: str):
+        banco, reader = detectar_banco(ruta_archivo)
+        if banco is None:
+            print(f"  Advertencia: {os.path.basename(ruta_archivo)} no tiene un formato de banco conocido. Se omite.")
+            return
+        print(f"  Banco detectado: {banco}")
+        df = Normalizer().normalizar(reader.leer(ruta_archivo))
+
+        # Reglas editadas mientras se vigilaba: recrear el categorizador
+        reglas = huella_reglas()
+        if reglas != estado['reglas']:
+            print("  Reglas modificadas: recargando clasificador...")
+            estado['categorizer'], estado['reglas'] = Categorizer(), reglas
+        categorizer = estado['categorizer']
+
+        df_categorizado, df_sin_clasificar = categorizar_movimientos_df(df, categorizer)
+
+        # Archivo categorizado del mes: se lee una vez y se mantiene en memoria
+        fecha_actual = datetime.now()
+        nombre = f"movimientos_categorizados_{fecha_actual.year}_{fecha_actual.month:02d}.xlsx"
+        ruta_salida = os.path.join(ruta_output, nombre)
+        if estado['nombre'] != nombre:
+            estado['nombre'] = nombre
+            estado['movimientos'] = None
+            if os.path.exists(ruta_salida):
+                estado['movimientos'] = pd.read_excel(ruta_salida, sheet_name='Movimientos Categorizados',
+                                                      dtype={'ID_Movimiento': str})
+
+        estado['movimientos'] = Consolidator.anexar(estado['movimientos'], df_categorizado)
+        categorizer.exportar_categorizados(estado['movimientos'], ruta_salida)
+
+        print(f"OK {os.path.basename(ruta_archivo)}: {len(df_categorizado)} movimientos "
+              f"({len(df_sin_clasificar)} sin clasificar); {len(estado['movimientos'])} en {nombre}")
+
+        generar_reportes(ruta_salida, ruta_output, abrir_dashboard=False)
+
+    VigilanteCarpeta(ruta_input, procesar, intervalo=intervalo).ejecutar()
+
+
+def servir_dashboard(ruta_archivo_categorizado: str = None,
+                     ruta_output: str = None,
+                     puerto: int = 8765,
+                     abrir_dashboard: bool = True):
+    """
+    Sirve el dashboard en http://127.0.0.1:<puerto> con consultas en vivo
+    (período, categoría, banco) sobre el archivo categorizado, sin regenerar
+    el HTML. Corre hasta Ctrl+C.
+
+    Args:
+        ruta_archivo_categorizado: Ruta al archivo categorizado (si None, busca el más reciente)
+        ruta_output: Carpeta de salida (default: config.paths.output_dir)
+        puerto: Puerto local
+        abrir_dashboard: Si True, intenta abrir el dashboard en el navegador
+    """
+    import pandas as pd
+    import webbrowser
+    from reports.servidor import ServidorDashboard
+
+    config = get_config()
+    ruta_output = ruta_output or config.paths.output_dir
+
+    print("="*80)
+    print("TORO · Resumen de Cuentas - Sistema de Control Financiero")
+    print("Dashboard en vivo (servidor local)")
+    print("="*80)
+
+    if ruta_archivo_categorizado is None:
+        archivos_categorizados = glob(os.path.join(ruta_output, "movimientos_categorizados_*.xlsx"))
+
+        if not archivos_categorizados:
+            print("\nError: No se encontraron archivos categorizados.")
+            print("Por favor ejecuta primero: python main.py --categorizar")
+            return
+
+        ruta_archivo_categorizado = max(archivos_categorizados, key=os.path.getmtime)
+
+    print(f"\nArchivo a servir: {os.path.basename(ruta_archivo_categorizado)}")
+
+    try:
+        df = pd.read_excel(ruta_archivo_categorizado, sheet_name='Movimientos Categorizados')
+        print(f"OK Leidos {len(df)} movimientos")
+    except Exception as e:
+        print(f"Error al leer archivo: {e}")
+        return
+
+    # Cubo al día para la sección mes a mes (igual que en --reportes)
+    cubo = obtener_cubo(ruta_output)
+    dashboard = ServidorDashboard(df, cubo)
+    cubo.actualizar(dashboard.analyzer.df)
+
+    try:
+        servidor = dashboard.servir(puerto=puerto)
+    except OSError as e:
+        print(f"Error: no se pudo usar el puerto {puerto} ({e}). Usa otro con --puerto")
+        return
+
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/"
+    print(f"\nDashboard en {url}")
+    print("API: /api/resumen · /api/datos · /api/agregados?por=categoria|principal|banco|D|W|M")
+    print("Filtros: ?desde=AAAA-MM-DD&hasta=AAAA-MM-DD&categoria=...&banco=...")
+    print("Ctrl+C para detener")
+
+    if abrir_dashboard:
+        try:
+            webbrowser.open(url)
+        except:
+            print(f"Abre manualmente: {url}")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor detenido")
+    finally:
+        servidor.server_close()
+
+
 def main():
     """
     Punto de entrada principal del sistema.
@@ -402,15 +1097,39 @@ Ejemplos de uso:
     python main.py --consolidar --archivo Movimientos_Supervielle_2025_11_18_.xlsx
 
   Flujo completo (consolidar, categorizar y generar reportes):
+    python main.py --completo --archivo Movimientos_Supervielle_2025_11_18_.xlsx
+
+  Flujo completo paso a paso:
     python main.py --consolidar --archivo Movimientos_Supervielle_2025_11_18_.xlsx
     python main.py --categorizar --sin-revision
     python main.py --reportes --sin-abrir
 
+  Reportes de un período (semana, trimestre, año fiscal):
+    python main.py --reportes --desde 2025-07-01 --hasta 2025-09-30
+
+  Dashboard autocontenido para equipos sin internet:
+    python main.py --reportes --offline
+
+  Procesar automáticamente cada extracto que llegue a input/ (hasta Ctrl+C):
+    python main.py --vigilar
+
+  Dashboard en vivo (filtros por período, categoría y banco sin regenerar):
+    python main.py --servir --puerto 8765
+
+  Aplicar correcciones revisadas en una planilla (CSV/JSON):
+    python main.py --aplicar-correcciones correcciones.csv
+
+  Reclasificar tras editar las reglas (solo reevalúa lo afectado):
+    python main.py --reclasificar
+
+  Probar reglas JSON candidatas contra todo el historial (no modifica nada):
+    python main.py --regresion-reglas ./reglas_candidatas
+
   Especificar carpetas personalizadas:
     python main.py --consolidar --archivo MI_ARCHIVO.xlsx --input ./mis_extractos --output ./resultados
 
 IMPORTANTE:
-  - El argumento --archivo es OBLIGATORIO para --consolidar
+  - El argumento --archivo es OBLIGATORIO para --consolidar y --completo
   - NO mezcles archivos de diferentes períodos/cuentas (rompe los saldos)
   - Procesa UN archivo a la vez
 
@@ -424,6 +1143,18 @@ Para más información, consulta el README.md
         help='Consolidar extractos bancarios de la carpeta input/'
     )
 
+    parser.add_argument(
+        '--completo',
+        action='store_true',
+        help='Proceso completo (consolidar, categorizar y reportes) reutilizando las etapas sin cambios'
+    )
+
+    parser.add_argument(
+        '--sin-cache',
+        action='store_true',
+        help='Ejecutar todas las etapas aunque no hayan cambiado (solo para --completo)'
+    )
+
     parser.add_argument(
         '--categorizar',
         action='store_true',
@@ -436,6 +1167,55 @@ Para más información, consulta el README.md
         help='Generar reportes y dashboard desde movimientos categorizados'
     )
 
+    parser.add_argument(
+        '--servir',
+        action='store_true',
+        help='Servir el dashboard en un servidor local con consultas en vivo (Ctrl+C para detener)'
+    )
+
+    parser.add_argument(
+        '--vigilar',
+        action='store_true',
+        help='Vigilar la carpeta input/ y procesar cada extracto nuevo (categorizar, agregar al mes y regenerar reportes) hasta Ctrl+C'
+    )
+
+    parser.add_argument(
+        '--intervalo',
+        type=float,
+        default=2.0,
+        metavar='SEGUNDOS',
+        help='Segundos entre revisiones de la carpeta (solo para --vigilar, default: 2)'
+    )
+
+    parser.add_argument(
+        '--puerto',
+        type=int,
+        default=8765,
+        help='Puerto local del dashboard en vivo (solo para --servir, default: 8765)'
+    )
+
+    parser.add_argument(
+        '--aplicar-correcciones',
+        type=str,
+        default=None,
+        metavar='CORRECCIONES',
+        help='Aplicar correcciones masivas (CSV/JSON con ID_Movimiento o Fecha/Concepto/Detalle/Importe y Categoria_Final) al archivo categorizado'
+    )
+
+    parser.add_argument(
+        '--reclasificar',
+        action='store_true',
+        help='Reclasificar el archivo categorizado reevaluando solo los movimientos afectados por cambios de reglas'
+    )
+
+    parser.add_argument(
+        '--regresion-reglas',
+        type=str,
+        default=None,
+        metavar='CARPETA_REGLAS',
+        help='Comparar reglas JSON candidatas (reglas_concepto.json / reglas_refinamiento.json) contra el historial categorizado'
+    )
+
     parser.add_argument(
         '--archivo',
         type=str,
@@ -446,13 +1226,35 @@ Para más información, consulta el README.md
     parser.add_argument(
         '--sin-revision',
         action='store_true',
-        help='No abrir CLI de revisión manual (solo para --categorizar)'
+        help='No abrir CLI de revisión manual (para --categorizar y --completo)'
+    )
+
+    parser.add_argument(
+        '--desde',
+        type=str,
+        default=None,
+        metavar='AAAA-MM-DD',
+        help='Primer día del período a reportar (solo para --reportes)'
+    )
+
+    parser.add_argument(
+        '--hasta',
+        type=str,
+        default=None,
+        metavar='AAAA-MM-DD',
+        help='Último día del período a reportar, inclusive (solo para --reportes)'
     )
 
     parser.add_argument(
         '--sin-abrir',
         action='store_true',
-        help='No abrir dashboard en navegador (solo para --reportes)'
+        help='No abrir dashboard en navegador (para --reportes, --completo y --servir)'
+    )
+
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Dashboard autocontenido, sin acceso a internet (solo para --reportes)'
     )
 
     # Obtener configuración para defaults
@@ -483,6 +1285,17 @@ Para más información, consulta el README.md
     if args.consolidar:
         consolidar_bancos(ruta_input=args.input, ruta_output=args.output, archivo_especifico=args.archivo)
 
+    # Proceso completo con cache de etapas
+    if args.completo:
+        ejecutar_pipeline(
+            archivo_especifico=args.archivo,
+            ruta_input=args.input,
+            ruta_output=args.output,
+            revisar_manual=not args.sin_revision,
+            abrir_dashboard=not args.sin_abrir,
+            usar_cache=not args.sin_cache
+        )
+
     # Ejecutar categorización
     if args.categorizar:
         categorizar_movimientos(
@@ -491,11 +1304,50 @@ Para más información, consulta el README.md
             revisar_manual=not args.sin_revision
         )
 
+    # Aplicar correcciones masivas (antes de reportes para que se reflejen)
+    if args.aplicar_correcciones:
+        aplicar_correcciones(
+            ruta_correcciones=args.aplicar_correcciones,
+            ruta_archivo_categorizado=args.archivo,
+            ruta_output=args.output
+        )
+
+    # Reclasificar por cambio de reglas (antes de reportes para que se reflejen)
+    if args.reclasificar:
+        reclasificar_movimientos(
+            ruta_archivo_categorizado=args.archivo,
+            ruta_output=args.output
+        )
+
+    # Regresión de reglas candidatas (solo reporta, no modifica archivos)
+    if args.regresion_reglas:
+        regresion_reglas(
+            ruta_reglas_candidatas=args.regresion_reglas,
+            ruta_corpus=args.archivo,
+            ruta_output=args.output
+        )
+
     # Generar reportes
     if args.reportes:
         generar_reportes(
             ruta_archivo_categorizado=args.archivo,
             ruta_output=args.output,
+            abrir_dashboard=not args.sin_abrir,
+            desde=args.desde,
+            hasta=args.hasta,
+            offline=args.offline
+        )
+
+    # Vigilar la carpeta de entrada (corre hasta Ctrl+C)
+    if args.vigilar:
+        vigilar_input(ruta_input=args.input, ruta_output=args.output, intervalo=args.intervalo)
+
+    # Servir dashboard en vivo (al final: corre hasta Ctrl+C)
+    if args.servir:
+        servir_dashboard(
+            ruta_archivo_categorizado=args.archivo,
+            ruta_output=args.output,
+            puerto=args.puerto,
             abrir_dashboard=not args.sin_abrir
         )
 
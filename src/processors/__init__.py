@@ -3,5 +3,11 @@ from .consolidator import Consolidator
 from .categorizer import Categorizer
 from .clasificador import Clasificador
 from .metadata_extractor import MetadataExtractor
+from .sugeridor import SugeridorCategorias
+from .reclasificador import ReclasificadorSelectivo
+from .regresion_reglas import RegresionReglas
+from .entidades import IndicePrestadores, RegistroPrestadores
 
-__all__ = ['Normalizer', 'Consolidator', 'Categorizer', 'Clasificador', 'MetadataExtractor']
+__all__ = ['Normalizer', 'Consolidator', 'Categorizer', 'Clasificador', 'MetadataExtractor',
+           'SugeridorCategorias', 'ReclasificadorSelectivo', 'RegresionReglas', 'IndicePrestadores',
+           'RegistroPrestadores']
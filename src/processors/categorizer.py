@@ -52,6 +52,8 @@ class Categorizer:
     - Documento: CUIT/DNI detectado
     - Es_DEBIN: Boolean indicando si es DEBIN
     - DEBIN_ID: ID del DEBIN si aplica
+    - ID_Movimiento: Identificador estable del movimiento (hash de sus datos)
+    - Regla_Concepto / Regla_Detalle: IDs de las reglas que asignaron la categoría
 
     Objetivo: 99%+ de clasificación automática
     """
@@ -67,7 +69,7 @@ class Categorizer:
         print(f"  - Reglas de Concepto (Nivel 1): {stats['reglas_concepto']}")
         print(f"  - Categorías Refinables (Nivel 2): {stats['categorias_refinables']}")
         print(f"  - Patrones de Refinamiento: {stats['patrones_refinamiento']}")
-        print(f"  - Cobertura Estimada: {stats['cobertura_estimada']}")
+        print(f"  - Prestadores Registrados: {stats['prestadores_registrados']}")
 
     def categorizar_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -84,6 +86,11 @@ class Categorizer:
         - Es_DEBIN
         - DEBIN_ID
 
+        Y las columnas de trazabilidad:
+        - Regla_Concepto: ID de la regla de Nivel 1 aplicada
+        - Regla_Detalle: ID del patrón (o default) de Nivel 2 aplicado
+        - ID_Movimiento: identificador estable (ver calcular_id_movimiento)
+
         Args:
             df: DataFrame con movimientos consolidados
 
@@ -100,12 +107,19 @@ class Categorizer:
         df['Categoria_Principal'] = None
         df['Categoria_Final'] = None
 
+        # Trazabilidad: IDs de las reglas de Nivel 1 y Nivel 2 que decidieron
+        df['Regla_Concepto'] = ''
+        df['Regla_Detalle'] = ''
+
         # Inicializar columnas de metadata
         df['Persona_Nombre'] = None
         df['Documento'] = None
         df['Es_DEBIN'] = False
         df['DEBIN_ID'] = None
 
+        # Identificador estable para correcciones externas
+        df['ID_Movimiento'] = self.calcular_id_movimiento(df)
+
         total = len(df)
         clasificados_nivel1 = 0
         clasificados_nivel2 = 0
@@ -113,13 +127,10 @@ class Categorizer:
 
         # Procesar cada movimiento
         for idx, row in df.iterrows():
-            # Clasificar usando cascada
-            tipo_mov, cat_principal, cat_final, confianza = self.clasificador.clasificar_movimiento(
-                concepto=row['Concepto'],
-                detalle=row['Detalle'],
-                debito=row['Débito'],
-                credito=row['Crédito']
-            )
+            # Clasificar usando cascada (registrando qué reglas decidieron)
+            tipo_mov = self.clasificador.determinar_tipo(row['Débito'], row['Crédito'])
+            cat_principal, cat_final, confianza, regla_concepto, regla_detalle = \
+                self.clasificador.clasificar_texto(row['Concepto'], row['Detalle'])
 
             # Extraer metadata
             metadata = self.extractor.extraer_metadata(
@@ -131,6 +142,8 @@ class Categorizer:
             df.at[idx, 'Tipo_Movimiento'] = tipo_mov
             df.at[idx, 'Categoria_Principal'] = cat_principal
             df.at[idx, 'Categoria_Final'] = cat_final
+            df.at[idx, 'Regla_Concepto'] = regla_concepto
+            df.at[idx, 'Regla_Detalle'] = regla_detalle
 
             # Asignar metadata
             df.at[idx, 'Persona_Nombre'] = metadata['persona_nombre']
@@ -188,9 +201,21 @@ class Categorizer:
             'Débito', 'Crédito', 'Saldo',
             'Banco',
             'Tipo_Movimiento', 'Categoria_Principal', 'Categoria_Final',
-            'Persona_Nombre', 'Documento', 'Es_DEBIN', 'DEBIN_ID'
+            'Persona_Nombre', 'Documento', 'Es_DEBIN', 'DEBIN_ID',
+            'ID_Movimiento', 'Regla_Concepto', 'Regla_Detalle'
         ]
 
+        df = df.copy()
+        if 'ID_Movimiento' not in df.columns:
+            df['ID_Movimiento'] = self.calcular_id_movimiento(df)
+        for col in ['Regla_Concepto', 'Regla_Detalle']:
+            if col not in df.columns:
+                df[col] = ''
+
+        # Sugerencias para sin clasificar (opcional, ver SugeridorCategorias)
+        if 'Sugerencias' in df.columns:
+            columnas_ordenadas.append('Sugerencias')
+
         df_export = df[columnas_ordenadas].copy()
 
         # Exportar a Excel
@@ -216,6 +241,10 @@ class Categorizer:
                 'L': 15,  # Documento
                 'M': 10,  # Es_DEBIN
                 'N': 15,  # DEBIN_ID
+                'O': 18,  # ID_Movimiento
+                'P': 30,  # Regla_Concepto
+                'Q': 30,  # Regla_Detalle
+                'R': 60,  # Sugerencias
             }
 
             for col, ancho in anchos.items():
@@ -227,6 +256,9 @@ class Categorizer:
                     cell = worksheet[f'{col}{row}']
                     cell.number_format = '#,##0.00'
 
+            # Foto de las reglas usadas (base para reclasificación selectiva)
+            self.clasificador.indice_reglas().to_excel(writer, sheet_name='Reglas', index=False)
+
         print(f"OK Archivo exportado: {ruta_salida}")
         print(f"Columnas generadas:")
         print(f"  - Tipo_Movimiento")
@@ -279,6 +311,9 @@ class Categorizer:
         df.at[idx, 'Tipo_Movimiento'] = tipo_movimiento
         df.at[idx, 'Categoria_Principal'] = categoria_principal
         df.at[idx, 'Categoria_Final'] = categoria_final
+        # Marca de corrección manual: la reclasificación por reglas no la pisa
+        df.at[idx, 'Regla_Concepto'] = 'MANUAL'
+        df.at[idx, 'Regla_Detalle'] = ''
 
         # Nota: El sistema de aprendizaje automático requeriría reimplementación
         # en el nuevo ClasificadorCascada para agregar reglas dinámicamente.
@@ -289,6 +324,185 @@ class Categorizer:
 
         return df
 
+    @staticmethod
+    def calcular_id_movimiento(df: pd.DataFrame) -> pd.Series:
+        """
+        Calcula un identificador estable para cada movimiento.
+
+        El ID es un hash de (Fecha, Concepto, Detalle, Débito, Crédito, Banco)
+        más el número de ocurrencia, para distinguir movimientos idénticos
+        dentro del mismo extracto. Se calcula vectorialmente y no depende
+        del orden de las columnas ni del índice del DataFrame.
+
+        Args:
+            df: DataFrame con movimientos
+
+        Returns:
+            Serie de strings hexadecimales de 16 caracteres (mismo índice que df)
+        """
+        if len(df) == 0:
+            return pd.Series([], index=df.index, dtype=object)
+
+        def _texto(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series('', index=df.index)
+            return df[col].fillna('').astype(str).str.strip()
+
+        def _monto(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series(0.0, index=df.index)
+            return pd.to_numeric(df[col], errors='coerce').fillna(0.0).round(2)
+
+        claves = pd.DataFrame({
+            # Unidad fija: pandas puede leer fechas en [us] o [ns] según la fuente
+            'Fecha': pd.to_datetime(df['Fecha'], errors='coerce').astype('datetime64[ns]'),
+            'Concepto': _texto('Concepto'),
+            'Detalle': _texto('Detalle'),
+            'Débito': _monto('Débito'),
+            'Crédito': _monto('Crédito'),
+            'Banco': _texto('Banco'),
+        }, index=df.index)
+
+        hashes = pd.util.hash_pandas_object(claves, index=False)
+        ocurrencia = hashes.groupby(hashes).cumcount()
+        hashes = pd.util.hash_pandas_object(
+            pd.DataFrame({'hash': hashes, 'ocurrencia': ocurrencia}), index=False
+        )
+
+        return hashes.map('{:016x}'.format)
+
+    def aplicar_correcciones(self, df: pd.DataFrame,
+                             df_correcciones: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica correcciones masivas (ej: revisadas en una planilla) con un único merge.
+
+        Cada corrección identifica el movimiento por:
+        - 'ID_Movimiento' (preferido, ver calcular_id_movimiento), o
+        - ('Fecha', 'Concepto', 'Detalle', 'Importe'), donde Importe es el monto
+          absoluto del movimiento (Débito o Crédito).
+
+        Columnas de la corrección:
+        - 'Categoria_Final' (obligatoria): nueva categoría completa
+        - 'Tipo_Movimiento' (opcional): se infiere de Crédito si falta
+
+        Args:
+            df: DataFrame categorizado
+            df_correcciones: DataFrame con las correcciones
+
+        Returns:
+            DataFrame con las correcciones aplicadas
+
+        Raises:
+            ValueError: Si las correcciones no tienen columnas suficientes
+        """
+        if 'Categoria_Final' not in df_correcciones.columns:
+            raise ValueError("Las correcciones deben tener la columna 'Categoria_Final'")
+
+        df = df.copy()
+
+        if 'ID_Movimiento' in df_correcciones.columns:
+            if 'ID_Movimiento' not in df.columns:
+                df['ID_Movimiento'] = self.calcular_id_movimiento(df)
+            claves = ['ID_Movimiento']
+            claves_df = df[claves].astype(str)
+            claves_corr = df_correcciones[claves].astype(str)
+        else:
+            claves = ['Fecha', 'Concepto', 'Detalle', 'Importe']
+            faltantes = [c for c in claves if c not in df_correcciones.columns]
+            if faltantes:
+                raise ValueError(
+                    f"Las correcciones deben tener 'ID_Movimiento' o las columnas {claves} "
+                    f"(faltan: {faltantes})"
+                )
+            claves_df = self._claves_correccion(df['Fecha'], df['Concepto'], df['Detalle'],
+                                                df['Débito'].fillna(0) + df['Crédito'].fillna(0))
+            claves_corr = self._claves_correccion(
+                df_correcciones['Fecha'], df_correcciones['Concepto'],
+                df_correcciones['Detalle'], pd.to_numeric(df_correcciones['Importe'], errors='coerce')
+            )
+
+        correcciones = claves_corr.copy()
+        correcciones['_categoria_nueva'] = df_correcciones['Categoria_Final'].astype(str).str.strip()
+        correcciones['_tipo_nuevo'] = (
+            df_correcciones['Tipo_Movimiento'] if 'Tipo_Movimiento' in df_correcciones.columns else None
+        )
+        correcciones = correcciones[correcciones['_categoria_nueva'].ne('') &
+                                    df_correcciones['Categoria_Final'].notna()]
+        # Si una fila aparece repetida en la planilla, gana la última corrección
+        correcciones = correcciones.drop_duplicates(subset=claves, keep='last')
+
+        # Un único left-join posicional: la fila i del resultado es la fila i de df
+        unido = claves_df.reset_index(drop=True).merge(correcciones, on=claves, how='left')
+        mascara = unido['_categoria_nueva'].notna().to_numpy()
+
+        if mascara.any():
+            nuevas = unido.loc[mascara, '_categoria_nueva']
+            tipos = unido.loc[mascara, '_tipo_nuevo']
+            tipos_inferidos = pd.Series(
+                (df['Crédito'].to_numpy()[mascara] > 0), index=tipos.index
+            ).map({True: 'Ingreso', False: 'Egreso'})
+            tipos = tipos.where(tipos.notna(), tipos_inferidos)
+
+            filas = df.index[mascara]
+            df.loc[filas, 'Categoria_Final'] = nuevas.to_numpy()
+            df.loc[filas, 'Categoria_Principal'] = nuevas.str.split(' - ').str[0].to_numpy()
+            df.loc[filas, 'Tipo_Movimiento'] = tipos.to_numpy()
+            # Marca de corrección manual: la reclasificación por reglas no la pisa
+            df.loc[filas, 'Regla_Concepto'] = 'MANUAL'
+            df.loc[filas, 'Regla_Detalle'] = ''
+
+        aplicadas = int(mascara.sum())
+        sin_coincidencia = len(correcciones) - unido.loc[mascara, claves].drop_duplicates().shape[0]
+        print(f"OK Correcciones aplicadas a {aplicadas} movimiento(s)")
+        if sin_coincidencia > 0:
+            print(f"  Advertencia: {sin_coincidencia} correccion(es) no coinciden con ningún movimiento")
+
+        return df
+
+    @staticmethod
+    def _claves_correccion(fecha: pd.Series, concepto: pd.Series,
+                           detalle: pd.Series, importe: pd.Series) -> pd.DataFrame:
+        """
+        Normaliza las columnas clave (Fecha, Concepto, Detalle, Importe) para el merge.
+
+        Returns:
+            DataFrame con claves comparables entre el archivo y las correcciones
+        """
+        return pd.DataFrame({
+            'Fecha': Categorizer._fechas_correccion(fecha),
+            'Concepto': concepto.fillna('').astype(str).str.strip(),
+            'Detalle': detalle.fillna('').astype(str).str.strip(),
+            'Importe': importe.astype(float).abs().round(2),
+        })
+
+    # Fechas de planillas en español (día primero), probadas después de ISO (AAAA-MM-DD)
+    FORMATOS_FECHA_CORRECCION = ['%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y',
+                                 '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M', '%d-%m-%Y']
+
+    @staticmethod
+    def _fechas_correccion(fecha: pd.Series) -> pd.Series:
+        """
+        Convierte las fechas de las correcciones sin confundir día y mes.
+
+        pd.to_datetime sin formato lee '05/03/2025' como 3 de mayo. Los textos
+        se prueban como ISO y luego con los formatos de FORMATOS_FECHA_CORRECCION
+        (día/mes/año); las fechas que ya son datetime se usan tal cual.
+
+        Returns:
+            Serie datetime64[ns] (NaT si no se pudo leer)
+        """
+        if pd.api.types.is_datetime64_any_dtype(fecha):
+            return fecha.astype('datetime64[ns]')
+
+        texto = fecha.astype('string').str.strip()
+        resultado = pd.to_datetime(texto, format='ISO8601', errors='coerce')
+        for formato in Categorizer.FORMATOS_FECHA_CORRECCION:
+            faltan = resultado.isna() & texto.notna()
+            if not faltan.any():
+                break
+            resultado[faltan] = pd.to_datetime(texto[faltan], format=formato, errors='coerce')
+        return resultado.astype('datetime64[ns]')
+
     def guardar_reglas_aprendidas(self):
         """
         Guarda las reglas aprendidas.
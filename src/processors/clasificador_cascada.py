@@ -20,8 +20,16 @@ Objetivo: Alcanzar 99%+ de clasificación automática
 Autor: Sistema TORO
 Última actualización: 2025-11-27
 """
+import json
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Optional
+
+from .entidades import RegistroPrestadores
 
 
 class ClasificadorCascada:
@@ -38,6 +46,7 @@ class ClasificadorCascada:
     ---------------
     - Nivel 1: 78 reglas hardcoded en _cargar_reglas_concepto()
     - Nivel 2: 4 categorías refinables en _cargar_reglas_refinamiento()
+      (los prestadores conocidos salen de data/registro_prestadores.json)
 
     Migración Futura:
     ----------------
@@ -48,10 +57,61 @@ class ClasificadorCascada:
     Objetivo: 99%+ de clasificación automática
     """
 
-    def __init__(self):
-        """Inicializa el clasificador con todas las reglas."""
-        self.reglas_concepto = self._cargar_reglas_concepto()
-        self.reglas_refinamiento = self._cargar_reglas_refinamiento()
+    def __init__(self, reglas_concepto: Dict[str, str] = None,
+                 reglas_refinamiento: Dict[str, Dict] = None,
+                 ids_concepto: Dict[str, str] = None):
+        """
+        Inicializa el clasificador con todas las reglas.
+
+        Sin argumentos usa las reglas hardcoded, o las de data/*.json si
+        config.clasificador.usar_reglas_externas está activo.
+
+        Args:
+            reglas_concepto: Reglas de Nivel 1 {patron: categoria} (opcional)
+            reglas_refinamiento: Reglas de Nivel 2 con la estructura de
+                _cargar_reglas_refinamiento() (opcional)
+            ids_concepto: IDs de las reglas de Nivel 1 {patron: id} (opcional)
+        """
+        if reglas_concepto is None and reglas_refinamiento is None:
+            from config import get_config
+            if get_config().clasificador.usar_reglas_externas:
+                from .reglas_loader import ReglasLoader
+                loader = ReglasLoader()
+                reglas_concepto = loader.cargar_reglas_concepto()
+                reglas_refinamiento = loader.cargar_reglas_refinamiento()
+                ids_concepto = loader.ids_concepto
+
+        self.reglas_concepto = (reglas_concepto if reglas_concepto is not None
+                                else self._cargar_reglas_concepto())
+        self.reglas_refinamiento = (reglas_refinamiento if reglas_refinamiento is not None
+                                    else self._cargar_reglas_refinamiento())
+        self.ids_concepto = ids_concepto or {}
+
+        # IDs de Nivel 2 por categoría base, armados una sola vez (se leen por fila)
+        self._ids_refinamiento = {
+            categoria_base: self._calcular_ids_refinamiento(categoria_base, reglas)
+            for categoria_base, reglas in self.reglas_refinamiento.items()
+        }
+
+        # Instrumentación en ejecución: contadores agregados (ver estadisticas_uso)
+        self.reiniciar_estadisticas()
+
+    @classmethod
+    def desde_json(cls, ruta_base: str = None) -> 'ClasificadorCascada':
+        """
+        Crea un clasificador con las reglas de data/reglas_*.json (con sus IDs).
+
+        Args:
+            ruta_base: Carpeta con los JSON (default: config.paths.data_dir)
+
+        Returns:
+            ClasificadorCascada con reglas externas
+        """
+        from .reglas_loader import ReglasLoader
+        loader = ReglasLoader(ruta_base)
+        reglas_concepto = loader.cargar_reglas_concepto()
+        reglas_refinamiento = loader.cargar_reglas_refinamiento()
+        return cls(reglas_concepto, reglas_refinamiento, loader.ids_concepto)
 
     def _cargar_reglas_concepto(self) -> Dict[str, str]:
         """
@@ -115,7 +175,10 @@ class ClasificadorCascada:
 
         Estructura: {
             'categoria_base_a_refinar': {
-                'patrones': [(patron, categoria_refinada), ...]
+                'patrones': [(patron, categoria_refinada), ...],
+                # o (RegistroPrestadores, categoria_si_el_prestador_no_tiene)
+                'ids': [id_patron, ...],  # mismos IDs que reglas_refinamiento.json
+                'default': categoria_si_no_coincide
             }
         }
 
@@ -145,6 +208,9 @@ class ClasificadorCascada:
                     # Mercado Libre/Pago
                     (["merpago", "mercadopago", "mercadolibre"], "Gastos Operativos - Compras ML"),
                 ],
+                'ids': ["REF-GAS-001", "REF-GAS-002", "REF-GAS-003", "REF-GAS-004",
+                        "REF-GAS-005", "REF-GAS-006", "REF-GAS-007", "REF-GAS-008",
+                        "REF-GAS-009", "REF-GAS-010", "REF-GAS-011"],
                 'default': "Gastos Operativos - Compras Varias"
             },
 
@@ -157,17 +223,16 @@ class ClasificadorCascada:
                     (["clinica", "sanatorio", "aclinor"], "Prestadores - Clínicas"),
                     (["dr.", "dra."], "Prestadores - Profesionales"),
 
-                    # Prestadores Conocidos (por nombre)
-                    (["tosin", "plizzo", "tosca", "bernardi", "lopez", "tura", "decade",
-                      "frandino", "picatto", "diaz gustavo", "cabrera", "ghiglione",
-                      "figueroa", "caballi", "gorosito", "lezcano", "marengo", "pizzichini",
-                      "gentile", "sosa", "bonaldi", "cuevas", "roda"], "Prestadores - Profesionales"),
+                    # Prestadores Conocidos (registro: documento o nombre)
+                    (self._cargar_registro_prestadores(), "Prestadores - Profesionales"),
 
                     # Pagos Municipales/AFIP
                     (["municipalidad", "municipio"], "Impuestos - Municipal"),
                     (["afip"], "Impuestos - AFIP"),
                     (["arba"], "Impuestos - ARBA"),
                 ],
+                'ids': ["REF-EGR-001", "REF-EGR-002", "REF-EGR-003", "REF-EGR-004",
+                        "REF-EGR-005", "REF-EGR-006", "REF-EGR-007", "REF-EGR-008"],
                 'default': "Egresos - Transferencias Varias"
             },
 
@@ -179,6 +244,7 @@ class ClasificadorCascada:
                     (["gas"], "Servicios - Gas"),
                     (["afip"], "Impuestos - AFIP"),
                 ],
+                'ids': ["REF-SRV-001", "REF-SRV-002", "REF-SRV-003", "REF-SRV-004"],
                 'default': "Servicios - Varios"
             },
 
@@ -187,10 +253,24 @@ class ClasificadorCascada:
                 'patrones': [
                     (["obra soc", "obra social"], "Ingresos - Obras Sociales"),
                 ],
+                'ids': ["REF-ING-001"],
                 'default': "Ingresos - Transferencias"
             },
         }
 
+    @staticmethod
+    def _cargar_registro_prestadores() -> RegistroPrestadores:
+        """
+        Registro de prestadores conocidos (data/registro_prestadores.json).
+
+        Returns:
+            RegistroPrestadores (vacío si el archivo no existe)
+        """
+        from config import get_config
+        config = get_config()
+        ruta = config.clasificador.get_registro_prestadores_path(config.paths.data_dir)
+        return RegistroPrestadores.desde_json(str(ruta))
+
     def clasificar_movimiento(self, concepto: str, detalle: str,
                             debito: float, credito: float) -> Tuple[str, str, str, int]:
         """
@@ -209,47 +289,193 @@ class ClasificadorCascada:
             - categoria_final: Categoría completa refinada (ej: "Servicios - Agua")
             - confianza: 0-100, donde 100 = clasificado, 0 = sin clasificar
         """
-        # 1. Determinar tipo de movimiento
+        tipo_movimiento = self.determinar_tipo(debito, credito)
+        categoria_principal, categoria_final, confianza, _, _ = self.clasificar_texto(concepto, detalle)
+
+        return (tipo_movimiento, categoria_principal, categoria_final, confianza)
+
+    def determinar_tipo(self, debito: float, credito: float) -> str:
+        """
+        Determina el tipo de movimiento según los montos.
+
+        Args:
+            debito: Monto debitado
+            credito: Monto acreditado
+
+        Returns:
+            "Ingreso", "Egreso" o "Neutro" (ambos montos insignificantes)
+        """
         # Usar umbral de 0.01 para evitar valores microscópicos (ej: 5e-324 del Excel)
         UMBRAL_MINIMO = 0.01  # 1 centavo
 
         if credito >= UMBRAL_MINIMO:
-            tipo_movimiento = "Ingreso"
+            return "Ingreso"
         elif debito >= UMBRAL_MINIMO:
-            tipo_movimiento = "Egreso"
-        else:
-            # Ambos son 0 o valores insignificantes
-            tipo_movimiento = "Neutro"
+            return "Egreso"
+        # Ambos son 0 o valores insignificantes
+        return "Neutro"
+
+    def clasificar_texto(self, concepto: str, detalle: str) -> Tuple[str, str, int, str, str]:
+        """
+        Aplica la cascada Concepto → Detalle e informa qué reglas la resolvieron.
 
-        # 2. Normalizar campos
+        La categoría solo depende de (Concepto, Detalle), por lo que el resultado
+        puede reutilizarse para todos los movimientos con el mismo par de textos.
+
+        Args:
+            concepto: Campo "Concepto" del movimiento
+            detalle: Campo "Detalle" del movimiento (puede estar vacío)
+
+        Returns:
+            Tupla (categoria_principal, categoria_final, confianza, regla_concepto, regla_detalle)
+            - regla_concepto: ID de la regla de Nivel 1 aplicada ('' si sin clasificar)
+            - regla_detalle: ID del patrón de Nivel 2 aplicado, ID del default
+              de la categoría (ver id_default_refinamiento) o '' si no se refinó
+        """
+        # 1. Normalizar campos
         concepto_str = str(concepto) if pd.notna(concepto) else ''
         detalle_str = str(detalle) if pd.notna(detalle) else ''
         concepto_lower = concepto_str.lower().strip()
         detalle_upper = detalle_str.upper().strip()  # DETALLE en mayúsculas para búsqueda
 
-        # 3. NIVEL 1: Clasificación BASE por "Concepto"
-        categoria_base = self._clasificar_por_concepto(concepto_lower)
+        # 2. NIVEL 1: Clasificación BASE por "Concepto"
+        inicio = time.perf_counter()
+        patron = self._buscar_patron_concepto(concepto_lower)
+        self.tiempo_nivel1 += time.perf_counter() - inicio
+        self.movimientos_evaluados += 1
 
-        if not categoria_base:
+        if patron is None:
             # No se pudo clasificar
-            return (tipo_movimiento, "Sin Clasificar", "Sin Clasificar - Requiere Revisión", 0)
+            self.movimientos_sin_clasificar += 1
+            return ("Sin Clasificar", "Sin Clasificar - Requiere Revisión", 0, '', '')
+
+        categoria_base = self.reglas_concepto[patron]
+        regla_concepto = self.id_regla_concepto(patron)
+        self.hits_reglas[regla_concepto] += 1
 
-        # 4. NIVEL 2: Refinamiento por "Detalle" (si existe)
+        # 3. NIVEL 2: Refinamiento por "Detalle" (si existe)
         if detalle_upper and categoria_base in self.reglas_refinamiento:
-            categoria_refinada = self._refinar_por_detalle(categoria_base, detalle_upper)
+            inicio = time.perf_counter()
+            categoria_refinada, regla_detalle = self._buscar_refinamiento(categoria_base, detalle_upper)
+            self.tiempo_nivel2 += time.perf_counter() - inicio
+            self.hits_reglas[regla_detalle] += 1
         else:
-            categoria_refinada = categoria_base
+            categoria_refinada, regla_detalle = categoria_base, ''
 
-        # 5. Extraer categoría principal (texto antes del " - ")
+        # 4. Extraer categoría principal (texto antes del " - ")
         if " - " in categoria_refinada:
             categoria_principal = categoria_refinada.split(" - ")[0]
         else:
             categoria_principal = categoria_refinada
 
-        # 6. Confianza = 100 si se clasificó, 0 si no
-        confianza = 100
+        # 5. Confianza = 100 si se clasificó
+        return (categoria_principal, categoria_refinada, 100, regla_concepto, regla_detalle)
+
+    def clasificar_lote(self, conceptos: pd.Series, detalles: pd.Series) -> pd.DataFrame:
+        """
+        Aplica la cascada a muchos movimientos (mismo resultado que clasificar_texto).
+
+        El Nivel 1 se evalúa una vez por Concepto distinto y el Nivel 2 una vez
+        por par (categoría base, Detalle) distinto, en lugar de una vez por fila.
+
+        Args:
+            conceptos: Serie con el campo "Concepto"
+            detalles: Serie con el campo "Detalle" (alineada con conceptos)
+
+        Returns:
+            DataFrame alineado con conceptos, columnas: Categoria_Principal,
+            Categoria_Final, Confianza, Regla_Concepto, Regla_Detalle
+        """
+        # Trabajar con códigos enteros: los textos se normalizan una vez por valor distinto
+        codigos, unicos = pd.factorize(conceptos.fillna('').astype(str))
+        codigos_det, unicos_det = pd.factorize(detalles.fillna('').astype(str))
+        concepto_lower = pd.Index(unicos).str.lower().str.strip()
+        detalle_upper = pd.Index(unicos_det).str.upper().str.strip().to_numpy(dtype=object)
+
+        # NIVEL 1: una búsqueda por concepto distinto
+        inicio = time.perf_counter()
+        por_concepto = []
+        for concepto in concepto_lower:
+            patron = self._buscar_patron_concepto(concepto)
+            if patron is None:
+                por_concepto.append((None, "Sin Clasificar - Requiere Revisión", ''))
+            else:
+                por_concepto.append((self.reglas_concepto[patron], self.reglas_concepto[patron],
+                                     self.id_regla_concepto(patron)))
+
+        base_unicos = pd.Series([r[0] for r in por_concepto], dtype=object)
+        final = np.array([r[1] for r in por_concepto], dtype=object)[codigos]
+        regla_concepto = np.array([r[2] for r in por_concepto], dtype=object)[codigos]
+        regla_detalle = np.full(len(codigos), '', dtype=object)
+
+        self.tiempo_nivel1 += time.perf_counter() - inicio
+        self.movimientos_evaluados += len(codigos)
+        hits = np.bincount(codigos, minlength=len(por_concepto))
+        for (_, _, regla_id), cantidad in zip(por_concepto, hits):
+            if regla_id:
+                self.hits_reglas[regla_id] += int(cantidad)
+            else:
+                self.movimientos_sin_clasificar += int(cantidad)
+
+        # NIVEL 2: una búsqueda por (categoría base refinable, detalle) distinto
+        codigos_base_unicos, bases = pd.factorize(base_unicos.where(
+            base_unicos.isin(list(self.reglas_refinamiento))))
+        codigos_base = codigos_base_unicos[codigos]
+        refinar = (codigos_base >= 0) & (detalle_upper != '')[codigos_det]
+
+        if refinar.any():
+            inicio = time.perf_counter()
+            claves = codigos_base[refinar].astype(np.int64) * len(unicos_det) + codigos_det[refinar]
+            codigos_par, claves_unicas = pd.factorize(claves)
+            refinados = [self._buscar_refinamiento(bases[clave // len(unicos_det)],
+                                                   detalle_upper[clave % len(unicos_det)])
+                         for clave in claves_unicas]
+            final[refinar] = np.array([r[0] for r in refinados], dtype=object)[codigos_par]
+            regla_detalle[refinar] = np.array([r[1] for r in refinados], dtype=object)[codigos_par]
+
+            self.tiempo_nivel2 += time.perf_counter() - inicio
+            hits = np.bincount(codigos_par, minlength=len(refinados))
+            for (_, regla_id), cantidad in zip(refinados, hits):
+                self.hits_reglas[regla_id] += int(cantidad)
+
+        # Categoría principal = texto antes del " - " (una vez por categoría distinta)
+        codigos_final, finales = pd.factorize(final)
+        principal = pd.Index(finales).str.split(' - ').str[0].to_numpy(dtype=object)[codigos_final]
+
+        return pd.DataFrame({
+            'Categoria_Principal': principal,
+            'Categoria_Final': final,
+            'Confianza': np.where(regla_concepto != '', 100, 0),
+            'Regla_Concepto': regla_concepto,
+            'Regla_Detalle': regla_detalle,
+        }, index=conceptos.index)
+
+    def id_regla_concepto(self, patron: str) -> str:
+        """
+        ID de una regla de Nivel 1.
+
+        Usa el "id" del JSON si existe; las reglas hardcoded se identifican
+        por su patrón (ej: "N1:compra visa débito").
+        """
+        return self.ids_concepto.get(patron, f"N1:{patron}")
+
+    def ids_refinamiento(self, categoria_base: str) -> List[str]:
+        """
+        IDs de los patrones de Nivel 2 de una categoría (en orden de evaluación).
+        """
+        return self._ids_refinamiento[categoria_base]
+
+    @staticmethod
+    def _calcular_ids_refinamiento(categoria_base: str, reglas: Dict) -> List[str]:
+        """IDs de los patrones de Nivel 2: los del JSON o "categoria#n"."""
+        ids = reglas.get('ids') or []
+        return [ids[i] if i < len(ids) else f"{categoria_base}#{i + 1}"
+                for i in range(len(reglas['patrones']))]
 
-        return (tipo_movimiento, categoria_principal, categoria_refinada, confianza)
+    @staticmethod
+    def id_default_refinamiento(categoria_base: str) -> str:
+        """ID de la regla 'default' de Nivel 2 de una categoría refinable."""
+        return f"DEFAULT:{categoria_base}"
 
     def _clasificar_por_concepto(self, concepto_lower: str) -> str:
         """
@@ -261,15 +487,27 @@ class ClasificadorCascada:
         Returns:
             Categoría base o None si no se encuentra
         """
+        patron = self._buscar_patron_concepto(concepto_lower)
+        return self.reglas_concepto[patron] if patron is not None else None
+
+    def _buscar_patron_concepto(self, concepto_lower: str) -> Optional[str]:
+        """
+        Busca la regla de Nivel 1 que aplica a un concepto.
+
+        Args:
+            concepto_lower: Concepto en minúsculas
+
+        Returns:
+            Patrón de la regla aplicada o None si no hay coincidencia
+        """
         # Buscar coincidencia exacta primero
-        for patron, categoria in self.reglas_concepto.items():
-            if patron == concepto_lower:
-                return categoria
+        if concepto_lower in self.reglas_concepto:
+            return concepto_lower
 
         # Si no hay coincidencia exacta, buscar por contención
-        for patron, categoria in self.reglas_concepto.items():
+        for patron in self.reglas_concepto:
             if patron in concepto_lower:
-                return categoria
+                return patron
 
         return None
 
@@ -284,16 +522,111 @@ class ClasificadorCascada:
         Returns:
             Categoría refinada o categoria_base si no se puede refinar
         """
+        return self._buscar_refinamiento(categoria_base, detalle_upper)[0]
+
+    def _buscar_refinamiento(self, categoria_base: str, detalle_upper: str) -> Tuple[str, str]:
+        """
+        Busca el patrón de Nivel 2 que aplica a un detalle.
+
+        Args:
+            categoria_base: Categoría obtenida del Nivel 1
+            detalle_upper: Detalle en mayúsculas
+
+        Returns:
+            Tupla (categoria_refinada, id_regla)
+        """
         reglas = self.reglas_refinamiento[categoria_base]
 
         # Buscar coincidencia en patrones
-        for patrones_lista, categoria_refinada in reglas['patrones']:
+        for (patrones_lista, categoria_refinada), regla_id in zip(reglas['patrones'],
+                                                               self._ids_refinamiento[categoria_base]):
+            if isinstance(patrones_lista, RegistroPrestadores):
+                # Búsqueda indexada (documento, luego nombre): el ID es el del prestador
+                prestador = patrones_lista.buscar(detalle_upper)
+                if prestador is not None:
+                    return prestador['categoria'] or categoria_refinada, prestador['id']
+                continue
             for patron in patrones_lista:
                 if patron.upper() in detalle_upper:
-                    return categoria_refinada
+                    return categoria_refinada, regla_id
 
         # Si no hay coincidencia, retornar default
-        return reglas.get('default', categoria_base)
+        return reglas.get('default', categoria_base), self.id_default_refinamiento(categoria_base)
+
+    def indice_reglas(self) -> pd.DataFrame:
+        """
+        Describe todas las reglas cargadas, una fila por regla.
+
+        Sirve para guardar qué reglas se usaron al categorizar y comparar
+        versiones de reglas (ver ReclasificadorSelectivo).
+
+        Returns:
+            DataFrame con columnas: Regla_ID, Nivel, Categoria_Base, Patrones, Categoria
+            (Patrones = palabras clave separadas por " | "; un registro de
+            prestadores aporta una fila por prestador)
+        """
+        filas = []
+
+        for patron, categoria in self.reglas_concepto.items():
+            filas.append({
+                'Regla_ID': self.id_regla_concepto(patron),
+                'Nivel': 1,
+                'Categoria_Base': '',
+                'Patrones': patron,
+                'Categoria': categoria,
+            })
+
+        for categoria_base, reglas in self.reglas_refinamiento.items():
+            for (palabras, categoria), regla_id in zip(reglas['patrones'],
+                                                     self.ids_refinamiento(categoria_base)):
+                if isinstance(palabras, RegistroPrestadores):
+                    filas.extend({
+                        'Regla_ID': prestador['id'],
+                        'Nivel': 2,
+                        'Categoria_Base': categoria_base,
+                        'Patrones': palabras.patrones(prestador),
+                        'Categoria': prestador['categoria'] or categoria,
+                    } for prestador in palabras)
+                    continue
+                filas.append({
+                    'Regla_ID': regla_id,
+                    'Nivel': 2,
+                    'Categoria_Base': categoria_base,
+                    'Patrones': ' | '.join(palabras),
+                    'Categoria': categoria,
+                })
+            filas.append({
+                'Regla_ID': self.id_default_refinamiento(categoria_base),
+                'Nivel': 2,
+                'Categoria_Base': categoria_base,
+                'Patrones': '',
+                'Categoria': reglas.get('default', categoria_base),
+            })
+
+        return pd.DataFrame(filas, columns=['Regla_ID', 'Nivel', 'Categoria_Base', 'Patrones', 'Categoria'])
+
+    def obtener_categorias(self) -> Dict[str, List[str]]:
+        """
+        Retorna las categorías que puede asignar el clasificador.
+
+        Returns:
+            Dict {categoria_principal: [categorias_finales]} (ordenado alfabéticamente)
+        """
+        finales = set(self.reglas_concepto.values())
+        for categoria_base, reglas in self.reglas_refinamiento.items():
+            finales.add(categoria_base)
+            finales.add(reglas.get('default', categoria_base))
+            finales.update(categoria for _, categoria in reglas['patrones'])
+            for patrones, _ in reglas['patrones']:
+                if isinstance(patrones, RegistroPrestadores):
+                    finales.update(patrones.categorias())
+
+        categorias = {}
+        for categoria_final in sorted(finales):
+            principal = categoria_final.split(" - ")[0]
+            categorias.setdefault(principal, []).append(categoria_final)
+
+        return categorias
 
     def obtener_estadisticas(self) -> Dict:
         """
@@ -301,6 +634,8 @@ class ClasificadorCascada:
 
         Returns:
             Dict con información sobre el clasificador
+            - cobertura_medida: % clasificado de los movimientos evaluados
+              desde el último reinicio (None si todavía no se evaluó ninguno)
         """
         total_reglas_concepto = len(self.reglas_concepto)
         total_categorias_refinables = len(self.reglas_refinamiento)
@@ -309,10 +644,92 @@ class ClasificadorCascada:
             len(reglas['patrones'])
             for reglas in self.reglas_refinamiento.values()
         )
+        prestadores_registrados = sum(
+            len(patrones)
+            for reglas in self.reglas_refinamiento.values()
+            for patrones, _ in reglas['patrones']
+            if isinstance(patrones, RegistroPrestadores)
+        )
 
         return {
             'reglas_concepto': total_reglas_concepto,
             'categorias_refinables': total_categorias_refinables,
             'patrones_refinamiento': total_patrones_refinamiento,
-            'cobertura_estimada': '99%+'
+            'prestadores_registrados': prestadores_registrados,
+            'cobertura_medida': self._cobertura()
         }
+
+    def reiniciar_estadisticas(self):
+        """Pone en cero los contadores de uso de reglas y los tiempos por nivel."""
+        self.hits_reglas: Counter = Counter()
+        self.tiempo_nivel1 = 0.0
+        self.tiempo_nivel2 = 0.0
+        self.movimientos_evaluados = 0
+        self.movimientos_sin_clasificar = 0
+
+    def _cobertura(self) -> Optional[float]:
+        """Porcentaje de movimientos evaluados que quedaron clasificados."""
+        if self.movimientos_evaluados == 0:
+            return None
+        clasificados = self.movimientos_evaluados - self.movimientos_sin_clasificar
+        return round(clasificados / self.movimientos_evaluados * 100, 2)
+
+    def estadisticas_uso(self) -> Dict:
+        """
+        Uso de cada regla desde el último reinicio de contadores.
+
+        Los contadores son agregados (un entero por regla y un acumulador de
+        tiempo por nivel), por lo que pueden quedar activos en producción.
+
+        Returns:
+            Dict con:
+            - movimientos / sin_clasificar / cobertura_medida
+            - tiempo_nivel1_s / tiempo_nivel2_s: tiempo acumulado por nivel
+            - hits_nivel1 / hits_nivel2: {regla_id: aplicaciones} (mayor a menor)
+            - defaults_nivel2: {categoria_base: movimientos que cayeron en el default}
+            - reglas_sin_uso: IDs de reglas (sin defaults) que no se aplicaron nunca
+        """
+        indice = self.indice_reglas()
+        es_default = indice['Regla_ID'].str.startswith(self.id_default_refinamiento(''))
+
+        def _hits(ids) -> Dict[str, int]:
+            conteos = {regla_id: self.hits_reglas.get(regla_id, 0) for regla_id in ids}
+            return dict(sorted(conteos.items(), key=lambda x: x[1], reverse=True))
+
+        hits_nivel1 = _hits(indice.loc[indice['Nivel'] == 1, 'Regla_ID'])
+        hits_nivel2 = _hits(indice.loc[(indice['Nivel'] == 2) & ~es_default, 'Regla_ID'])
+        defaults = {
+            base: self.hits_reglas.get(self.id_default_refinamiento(base), 0)
+            for base in self.reglas_refinamiento
+        }
+
+        return {
+            'movimientos': self.movimientos_evaluados,
+            'sin_clasificar': self.movimientos_sin_clasificar,
+            'cobertura_medida': self._cobertura(),
+            'tiempo_nivel1_s': round(self.tiempo_nivel1, 6),
+            'tiempo_nivel2_s': round(self.tiempo_nivel2, 6),
+            'hits_nivel1': hits_nivel1,
+            'hits_nivel2': hits_nivel2,
+            'defaults_nivel2': defaults,
+            'reglas_sin_uso': [regla_id for regla_id, hits in {**hits_nivel1, **hits_nivel2}.items()
+                               if hits == 0],
+        }
+
+    def exportar_estadisticas(self, ruta_salida: str) -> Dict:
+        """
+        Guarda estadisticas_uso() en un archivo JSON.
+
+        Args:
+            ruta_salida: Ruta del archivo JSON
+
+        Returns:
+            Dict exportado
+        """
+        estadisticas = {'generado': datetime.now().isoformat(timespec='seconds'),
+                        **self.estadisticas_uso()}
+
+        with open(ruta_salida, 'w', encoding='utf-8') as f:
+            json.dump(estadisticas, f, indent=2, ensure_ascii=False)
+
+        return estadisticas
@@ -63,6 +63,33 @@ class Consolidator:
 
         return df_consolidado
 
+    @staticmethod
+    def anexar(df_existente: pd.DataFrame, df_nuevo: pd.DataFrame) -> pd.DataFrame:
+        """
+        Agrega movimientos nuevos a los ya consolidados.
+
+        Igual que en el cubo, los pares (día, banco) presentes en df_nuevo
+        reemplazan a los existentes: volver a cargar un extracto (o uno que se
+        superpone con el anterior) no duplica movimientos.
+
+        Args:
+            df_existente: Movimientos ya consolidados (puede estar vacío o ser None)
+            df_nuevo: Movimientos del extracto nuevo
+
+        Returns:
+            DataFrame con ambos, ordenado cronológicamente (más reciente primero)
+        """
+        if df_existente is None or len(df_existente) == 0:
+            return df_nuevo.sort_values('Fecha', ascending=False, kind='stable').reset_index(drop=True)
+
+        def pares(df: pd.DataFrame) -> pd.MultiIndex:
+            dia = pd.to_datetime(df['Fecha'], errors='coerce').dt.normalize()
+            return pd.MultiIndex.from_arrays([dia, df['Banco'].astype(str)])
+
+        reemplazados = pares(df_existente).isin(pares(df_nuevo))
+        df_anexado = pd.concat([df_existente[~reemplazados], df_nuevo], ignore_index=True)
+        return df_anexado.sort_values('Fecha', ascending=False, kind='stable').reset_index(drop=True)
+
     def exportar(self, df: pd.DataFrame, nombre_archivo: str = None) -> str:
         """
         Exporta el DataFrame consolidado a Excel.
@@ -0,0 +1,402 @@
+"""
+Resolución de entidades (prestadores) - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+El mismo prestador aparece con distintas grafías en el Detalle del banco
+("DECADE S.A.", "DECADE SA", "DECADE S"). IndicePrestadores asigna a cada
+movimiento un id de entidad:
+
+1. Por documento: el CUIT/CUIL de una persona (prefijo 20/23/24/27) se
+   reduce a su DNI, así CUIT y DNI de la misma persona coinciden.
+2. Sin documento, por nombre normalizado (mayúsculas, sin acentos, signos,
+   sufijos societarios ni letras sueltas, palabras ordenadas) igual al de
+   una entidad con documento.
+3. Si no hay coincidencia exacta, comparación aproximada solo dentro de
+   bloques (nombres que comparten el prefijo de dos de sus palabras),
+   nunca todos contra todos.
+
+RegistroPrestadores es el padrón de prestadores conocidos
+(data/registro_prestadores.json) que usa el Nivel 2 del clasificador: busca
+por el documento del Detalle y, si no, por las palabras del nombre, siempre
+con diccionarios (costo constante por movimiento aunque el padrón crezca).
+"""
+import difflib
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Prefijos de CUIT/CUIL de personas humanas (contienen el DNI en los dígitos 3 a 10)
+PREFIJOS_PERSONA = ('20', '23', '24', '27')
+
+# Palabras que no identifican a la entidad (formas societarias)
+PALABRAS_SOCIETARIAS = {'SA', 'SRL', 'SAS', 'SAU', 'SCS', 'SH', 'SOCIEDAD', 'ANONIMA', 'RESPONSABILIDAD',
+                        'LIMITADA', 'DE', 'Y', 'CIA'}
+
+# Documento dentro del Detalle (mismo patrón que MetadataExtractor)
+PATRON_DOCUMENTO = re.compile(r'(?:DOCUMENTO|CUIT|CUIL):\s*(\d{8,11})', re.IGNORECASE)
+
+
+def clave_documento(documento: str) -> Optional[str]:
+    """
+    Clave de un solo documento, igual a la de normalizar_documentos().
+
+    Args:
+        documento: CUIT/CUIL/DNI como texto (con o sin guiones)
+
+    Returns:
+        Clave o None si no es un documento válido
+    """
+    digitos = re.sub(r'\D', '', str(documento or ''))
+    if not 7 <= len(digitos) <= 11:
+        return None
+    if len(digitos) == 11 and digitos[:2] in PREFIJOS_PERSONA:
+        digitos = digitos[2:10]
+    return digitos.zfill(8)
+
+
+def palabras_nombre(nombre: str) -> List[str]:
+    """
+    Palabras significativas de un nombre: mayúsculas, sin acentos ni signos,
+    sin formas societarias ni letras sueltas.
+
+    Args:
+        nombre: Nombre (o Detalle completo)
+
+    Returns:
+        Lista de palabras en el orden original
+    """
+    nombre = unicodedata.normalize('NFKD', nombre).encode('ascii', 'ignore').decode('ascii')
+    return [p for p in ''.join(c if c.isalpha() else ' ' for c in nombre.upper()).split()
+            if len(p) > 1 and p not in PALABRAS_SOCIETARIAS]
+
+
+def normalizar_documentos(documentos: pd.Series) -> pd.Series:
+    """
+    Clave de documento comparable: DNI para personas, CUIT completo para empresas.
+
+    Acepta documentos como texto o como número (al leer el Excel el Documento
+    llega como float).
+
+    Args:
+        documentos: Serie con Documento (CUIT/CUIL/DNI)
+
+    Returns:
+        Serie de texto con la clave (NaN si no hay documento válido)
+    """
+    if pd.api.types.is_numeric_dtype(documentos):
+        texto = documentos.round().astype('Int64').astype('string')
+    else:
+        texto = documentos.astype('string').str.replace(r'\.0$', '', regex=True)
+    digitos = texto.str.replace(r'\D', '', regex=True)
+    digitos = digitos.where(digitos.str.len().between(7, 11))
+
+    es_cuit_persona = (digitos.str.len() == 11) & digitos.str[:2].isin(PREFIJOS_PERSONA)
+    clave = digitos.where(~es_cuit_persona.fillna(False), digitos.str[2:10])
+    # DNI de 7 dígitos: completar a 8 como dentro del CUIT
+    return clave.str.zfill(8).astype(object).where(clave.notna(), np.nan)
+
+
+def normalizar_nombres(nombres: pd.Series) -> pd.Series:
+    """
+    Nombre comparable: mayúsculas, sin acentos ni signos, sin formas
+    societarias ni letras sueltas y con las palabras ordenadas.
+
+    Args:
+        nombres: Serie con Persona_Nombre
+
+    Returns:
+        Serie de texto normalizado (NaN si no queda nada)
+    """
+    def normalizar(nombre: str) -> str:
+        return ' '.join(sorted(palabras_nombre(nombre)))
+
+    validos = nombres.notna() & (nombres.astype(str) != 'None')
+    unicos = pd.unique(nombres[validos].astype(str))
+    mapa = {nombre: normalizar(nombre) for nombre in unicos}
+    normalizados = nombres[validos].astype(str).map(mapa)
+    return normalizados.where(normalizados != '').reindex(nombres.index)
+
+
+class IndicePrestadores:
+    """
+    Índice de entidades: documento primero, nombre normalizado después y
+    comparación aproximada por bloques para lo que queda.
+
+    Uso:
+        indice = IndicePrestadores()
+        entidad = indice.resolver(df_prestadores)       # id por movimiento
+        montos = df_prestadores['Débito'].groupby(entidad).sum().nlargest(10)
+    """
+
+    def __init__(self, similitud_minima: float = 0.9, largo_prefijo: int = 4,
+                 max_bloque: int = 200):
+        """
+        Args:
+            similitud_minima: Similitud (0-1, difflib) para unir dos nombres
+            largo_prefijo: Letras del prefijo de palabra que definen un bloque
+            max_bloque: Bloques más grandes (palabras muy comunes) no se comparan
+        """
+        self.similitud_minima = similitud_minima
+        self.largo_prefijo = largo_prefijo
+        self.max_bloque = max_bloque
+
+    def resolver(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Id de entidad de cada movimiento ('DOC:<clave>' o 'NOM:<nombre normalizado>').
+
+        Args:
+            df: Movimientos con Persona_Nombre y opcionalmente Documento
+
+        Returns:
+            Serie alineada con df (NaN si el movimiento no tiene nombre ni documento)
+        """
+        vacia = pd.Series(np.nan, index=df.index, dtype=object)
+        documento = normalizar_documentos(df['Documento']) if 'Documento' in df.columns else vacia
+        nombre = normalizar_nombres(df['Persona_Nombre']) if 'Persona_Nombre' in df.columns else vacia
+
+        entidad = ('DOC:' + documento).astype(object)
+
+        # Nombre -> documento, solo si el nombre corresponde a un único documento
+        con_documento = pd.DataFrame({'nombre': nombre, 'documento': documento}).dropna().drop_duplicates()
+        documentos_por_nombre = con_documento.groupby('nombre')['documento'].agg(['first', 'size'])
+        unico = documentos_por_nombre[documentos_por_nombre['size'] == 1]['first']
+        ambiguos = set(documentos_por_nombre.index[documentos_por_nombre['size'] > 1])
+
+        sin_documento = entidad.isna() & nombre.notna()
+        nombres_libres = [n for n in pd.unique(nombre[sin_documento])
+                          if n not in unico.index and n not in ambiguos]
+        mapa = self._agrupar_aproximado(nombres_libres, list(unico.index))
+
+        destino = nombre[sin_documento].map(lambda n: self._destino(n, unico, mapa))
+        entidad[sin_documento] = destino
+        return entidad
+
+    @staticmethod
+    def _destino(nombre: str, unico: pd.Series, mapa: Dict[str, str]) -> str:
+        if nombre in unico.index:
+            return 'DOC:' + unico[nombre]
+        representante = mapa.get(nombre, nombre)
+        if representante in unico.index:
+            return 'DOC:' + unico[representante]
+        return 'NOM:' + representante
+
+    def _bloques(self, nombre: str) -> List[str]:
+        return list({palabra[:self.largo_prefijo] for palabra in nombre.split()
+                     if len(palabra) >= self.largo_prefijo})
+
+    def _agrupar_aproximado(self, libres: List[str], conocidos: List[str]) -> Dict[str, str]:
+        """
+        Une cada nombre libre (sin documento ni coincidencia exacta) con el
+        nombre más parecido de su bloque: primero entre los conocidos (con
+        documento) y si no, con otros libres (unión por representante).
+
+        Args:
+            libres: Nombres normalizados a resolver
+            conocidos: Nombres normalizados con documento único
+
+        Returns:
+            Dict nombre libre -> nombre representante
+        """
+        if not libres:
+            return {}
+
+        bloques: Dict[str, List[str]] = {}
+        for nombre in conocidos + libres:
+            for bloque in self._bloques(nombre):
+                bloques.setdefault(bloque, []).append(nombre)
+
+        es_conocido = set(conocidos)
+        padre = {nombre: nombre for nombre in libres}
+
+        def raiz(nombre: str) -> str:
+            while padre.get(nombre, nombre) != nombre:
+                nombre = padre[nombre]
+            return nombre
+
+        for nombre in libres:
+            # Candidatos: comparten al menos dos bloques (o el único que tiene el nombre)
+            propios = self._bloques(nombre)
+            compartidos = Counter(c for bloque in propios
+                                  if len(bloques[bloque]) <= self.max_bloque
+                                  for c in bloques[bloque] if c != nombre)
+            minimo = min(2, len(propios))
+            candidatos = [c for c, n in compartidos.items() if n >= minimo]
+            if not candidatos:
+                continue
+
+            matcher = difflib.SequenceMatcher(None, b=nombre, autojunk=False)
+            mejor, mejor_similitud = None, self.similitud_minima
+            # Conocidos primero: a igual similitud gana el que tiene documento
+            for candidato in sorted(candidatos, key=lambda c: (c not in es_conocido, c)):
+                matcher.set_seq1(candidato)
+                if matcher.real_quick_ratio() < mejor_similitud or matcher.quick_ratio() < mejor_similitud:
+                    continue
+                similitud = matcher.ratio()
+                if similitud > mejor_similitud or (mejor is None and similitud >= mejor_similitud):
+                    mejor, mejor_similitud = candidato, similitud
+
+            if mejor is None:
+                continue
+            a, b = raiz(nombre), raiz(mejor)
+            if a == b or (a in es_conocido and b in es_conocido):
+                continue  # ya unidos, o uniría dos documentos distintos
+            # Representante: el conocido (con documento) o el menor alfabéticamente
+            if b in es_conocido or (a not in es_conocido and b < a):
+                padre[a] = b
+            else:
+                padre[b] = a
+
+        return {nombre: raiz(nombre) for nombre in libres}
+
+
+class RegistroPrestadores:
+    """
+    Padrón de prestadores conocidos con índices hash.
+
+    Cada prestador tiene CUIT y/o nombre y una categoría. La búsqueda sobre
+    un Detalle prueba primero el documento (un acceso al diccionario) y
+    después las palabras del nombre: cada palabra del Detalle es un acceso al
+    índice, y un prestador coincide si todas las palabras de su nombre están
+    en el Detalle (palabras completas: "TURA" no coincide con "FACTURA").
+
+    Uso:
+        registro = RegistroPrestadores.desde_json('data/registro_prestadores.json')
+        prestador = registro.buscar(detalle_upper)   # dict o None
+    """
+
+    def __init__(self, prestadores: Iterable[Dict] = ()):
+        """
+        Args:
+            prestadores: Dicts con 'cuit' y/o 'nombre', 'categoria' (opcional) e 'id' (opcional)
+        """
+        self.prestadores: List[Dict] = []
+        self._por_documento: Dict[str, Dict] = {}
+        self._por_palabra: Dict[str, List[Dict]] = {}
+        for prestador in prestadores:
+            self.agregar(prestador)
+
+    @classmethod
+    def desde_json(cls, ruta: str) -> 'RegistroPrestadores':
+        """
+        Carga el padrón desde JSON (ver data/registro_prestadores.json).
+
+        Args:
+            ruta: Ruta del archivo
+
+        Returns:
+            RegistroPrestadores (vacío si el archivo no existe)
+        """
+        if not os.path.exists(ruta):
+            print(f"⚠️  No se encontró el registro de prestadores: {ruta}")
+            return cls()
+
+        with open(ruta, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        return cls(p for p in data.get('prestadores', []) if p.get('activo', True))
+
+    def agregar(self, prestador: Dict) -> Dict:
+        """
+        Agrega un prestador al padrón y a los índices.
+
+        Args:
+            prestador: Dict con 'cuit' y/o 'nombre', 'categoria' e 'id' (opcionales)
+
+        Returns:
+            Entrada registrada
+
+        Raises:
+            ValueError: Si el prestador no tiene CUIT ni nombre válidos
+        """
+        cuit = str(prestador.get('cuit') or '').strip()
+        nombre = str(prestador.get('nombre') or '').strip()
+        clave = clave_documento(cuit) if cuit else None
+        palabras = frozenset(palabras_nombre(nombre))
+        if clave is None and not palabras:
+            raise ValueError(f"Prestador sin CUIT ni nombre válido: {prestador}")
+
+        entrada = {
+            'id': prestador.get('id') or f"PRE:{cuit or nombre}",
+            'cuit': cuit,
+            'nombre': nombre,
+            'categoria': prestador.get('categoria'),
+            'palabras': palabras,
+            'orden': len(self.prestadores),
+        }
+        self.prestadores.append(entrada)
+
+        if clave is not None:
+            self._por_documento.setdefault(clave, entrada)
+        if palabras:
+            # Se indexa por la palabra más larga (la más distintiva del nombre)
+            ancla = max(sorted(palabras), key=len)
+            self._por_palabra.setdefault(ancla, []).append(entrada)
+
+        return entrada
+
+    def buscar(self, detalle: str) -> Optional[Dict]:
+        """
+        Prestador registrado que aparece en un Detalle.
+
+        Args:
+            detalle: Detalle del movimiento
+
+        Returns:
+            Entrada del padrón o None. Por documento gana siempre; por nombre
+            gana el nombre más completo (y a igualdad, el registrado primero).
+        """
+        if not detalle:
+            return None
+
+        for match in PATRON_DOCUMENTO.finditer(detalle):
+            entrada = self._por_documento.get(clave_documento(match.group(1)))
+            if entrada is not None:
+                return entrada
+
+        palabras = set(palabras_nombre(detalle))
+        mejor = None
+        for palabra in palabras:
+            for entrada in self._por_palabra.get(palabra, ()):
+                if not entrada['palabras'] <= palabras:
+                    continue
+                if (mejor is None or len(entrada['palabras']) > len(mejor['palabras'])
+                        or (len(entrada['palabras']) == len(mejor['palabras'])
+                            and entrada['orden'] < mejor['orden'])):
+                    mejor = entrada
+        return mejor
+
+    @staticmethod
+    def patrones(entrada: Dict) -> str:
+        """
+        Patrones de una entrada en el formato de indice_reglas() (" | ").
+
+        Args:
+            entrada: Entrada del padrón
+
+        Returns:
+            CUIT y nombre separados por " | "
+        """
+        return ' | '.join(valor for valor in (entrada['cuit'], entrada['nombre']) if valor)
+
+    def categorias(self) -> set:
+        """
+        Returns:
+            Categorías asignadas explícitamente por el padrón
+        """
+        return {entrada['categoria'] for entrada in self.prestadores if entrada['categoria']}
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.prestadores)
+
+    def __len__(self) -> int:
+        return len(self.prestadores)
+
+    def __repr__(self) -> str:
+        return f"RegistroPrestadores({len(self)} prestadores)"
@@ -0,0 +1,212 @@
+"""
+Reclasificación selectiva por cambios de reglas - TORO · Resumen de Cuentas
+==========================================================================
+
+Sistema: TORO (anteriormente SANARTE)
+Módulo: ReclasificadorSelectivo
+
+Descripción:
+-----------
+Cada movimiento categorizado guarda qué reglas decidieron su categoría
+(columnas Regla_Concepto y Regla_Detalle) y el archivo categorizado guarda
+una foto de las reglas usadas (hoja "Reglas").
+
+Al editar las reglas, solo se reevalúan los movimientos que pueden cambiar:
+- Movimientos resueltos por reglas eliminadas o modificadas
+- Movimientos cuyo texto coincide con reglas agregadas o modificadas
+  (Nivel 1 sobre Concepto, Nivel 2 sobre Detalle dentro de su categoría base)
+- Movimientos que cayeron en el 'default' de una categoría cuyo default cambió
+- Movimientos "Sin Clasificar"
+
+Las correcciones manuales (Regla_Concepto = "MANUAL") nunca se reevalúan.
+
+Limitación: el orden de evaluación no forma parte de la firma de una regla;
+reordenar reglas sin cambiar su contenido no dispara reevaluación.
+"""
+import re
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from .clasificador_cascada import ClasificadorCascada
+
+
+class ReclasificadorSelectivo:
+    """
+    Reevalúa solo los movimientos afectados por un cambio de reglas.
+
+    Uso:
+        reclasificador = ReclasificadorSelectivo(ClasificadorCascada(), df_reglas_anteriores)
+        df_nuevo, df_cambios = reclasificador.reclasificar(df_categorizado)
+    """
+
+    REGLA_MANUAL = 'MANUAL'
+    COLUMNAS_FIRMA = ['Nivel', 'Categoria_Base', 'Patrones', 'Categoria']
+
+    def __init__(self, clasificador: ClasificadorCascada, reglas_anteriores: pd.DataFrame = None):
+        """
+        Args:
+            clasificador: Clasificador con las reglas NUEVAS
+            reglas_anteriores: Foto de las reglas con que se categorizó
+                (ClasificadorCascada.indice_reglas() / hoja "Reglas").
+                Si es None, se reevalúan todos los movimientos.
+        """
+        self.clasificador = clasificador
+        self.reglas_nuevas = self._normalizar_indice(clasificador.indice_reglas())
+        self.reglas_anteriores = (self._normalizar_indice(reglas_anteriores)
+                                  if reglas_anteriores is not None else None)
+
+    @classmethod
+    def _normalizar_indice(cls, indice: pd.DataFrame) -> pd.DataFrame:
+        """Unifica tipos del índice (al leerlo de Excel los vacíos llegan como NaN)."""
+        indice = indice.copy()
+        indice['Nivel'] = pd.to_numeric(indice['Nivel'], errors='coerce').fillna(0).astype(int)
+        for col in ['Regla_ID', 'Categoria_Base', 'Patrones', 'Categoria']:
+            indice[col] = indice[col].fillna('').astype(str)
+        return indice.drop_duplicates(subset='Regla_ID', keep='first').set_index('Regla_ID')
+
+    def comparar_reglas(self) -> Dict[str, List[str]]:
+        """
+        Compara las reglas anteriores con las nuevas por ID.
+
+        Returns:
+            Dict con listas de IDs: 'agregadas', 'eliminadas', 'modificadas'
+        """
+        if self.reglas_anteriores is None:
+            return {'agregadas': list(self.reglas_nuevas.index), 'eliminadas': [], 'modificadas': []}
+
+        anteriores, nuevas = self.reglas_anteriores, self.reglas_nuevas
+        comunes = anteriores.index.intersection(nuevas.index)
+
+        distintas = (anteriores.loc[comunes, self.COLUMNAS_FIRMA] !=
+                     nuevas.loc[comunes, self.COLUMNAS_FIRMA]).any(axis=1)
+
+        return {
+            'agregadas': list(nuevas.index.difference(anteriores.index)),
+            'eliminadas': list(anteriores.index.difference(nuevas.index)),
+            'modificadas': list(comunes[distintas.to_numpy()]),
+        }
+
+    @staticmethod
+    def _contiene_alguno(textos: pd.Series, patrones: List[str]) -> pd.Series:
+        """Máscara vectorizada: el texto contiene alguno de los patrones (literal)."""
+        patrones = [p for p in patrones if p]
+        if not patrones:
+            return pd.Series(False, index=textos.index)
+        regex = '|'.join(re.escape(p) for p in patrones)
+        return textos.str.contains(regex, regex=True)
+
+    def filas_afectadas(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Calcula qué movimientos deben reevaluarse con las reglas nuevas.
+
+        Args:
+            df: DataFrame categorizado (con Regla_Concepto / Regla_Detalle)
+
+        Returns:
+            Máscara booleana alineada con df
+        """
+        if (self.reglas_anteriores is None or 'Regla_Concepto' not in df.columns
+                or 'Regla_Detalle' not in df.columns):
+            return pd.Series(True, index=df.index)
+
+        regla_concepto = df['Regla_Concepto'].fillna('').astype(str)
+        regla_detalle = df['Regla_Detalle'].fillna('').astype(str)
+        concepto = df['Concepto'].fillna('').astype(str).str.lower().str.strip()
+        detalle = df['Detalle'].fillna('').astype(str).str.upper().str.strip()
+
+        cambios = self.comparar_reglas()
+        invalidas = set(cambios['eliminadas']) | set(cambios['modificadas'])
+        vigentes = self.reglas_nuevas.loc[cambios['agregadas'] + cambios['modificadas']]
+
+        # 1. Sin clasificar y movimientos resueltos por reglas eliminadas/modificadas
+        mascara = (df['Categoria_Principal'] == 'Sin Clasificar')
+        mascara |= regla_concepto.isin(invalidas) | regla_detalle.isin(invalidas)
+
+        # 2. Reglas de Nivel 1 nuevas/modificadas: coincidencia sobre Concepto
+        nivel1 = vigentes[vigentes['Nivel'] == 1]
+        mascara |= self._contiene_alguno(concepto, nivel1['Patrones'].tolist())
+
+        # 3. Reglas de Nivel 2 nuevas/modificadas: coincidencia sobre Detalle,
+        #    solo dentro de la categoría base (según la regla de Nivel 1 vigente)
+        nivel2 = vigentes[vigentes['Nivel'] == 2]
+        if len(nivel2) > 0:
+            categoria_n1 = self.reglas_nuevas.loc[self.reglas_nuevas['Nivel'] == 1, 'Categoria']
+            categoria_base = regla_concepto.map(categoria_n1)
+
+            for base, reglas in nivel2.groupby('Categoria_Base'):
+                en_base = (categoria_base == base) & (detalle != '')
+                es_default = reglas.index == ClasificadorCascada.id_default_refinamiento(base)
+
+                palabras = [p.upper() for patrones in reglas.loc[~es_default, 'Patrones']
+                            for p in patrones.split(' | ')]
+                mascara |= en_base & self._contiene_alguno(detalle, palabras)
+
+                if es_default.any():
+                    # Los que cayeron en el default, o que antes no se refinaban
+                    mascara |= en_base & regla_detalle.isin(
+                        [ClasificadorCascada.id_default_refinamiento(base), ''])
+
+        # Las correcciones manuales se respetan siempre
+        mascara &= regla_concepto != self.REGLA_MANUAL
+
+        return mascara
+
+    def reclasificar(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Reevalúa los movimientos afectados y devuelve el diff de categorías.
+
+        Los textos repetidos se clasifican una sola vez (ver clasificar_lote).
+
+        Args:
+            df: DataFrame categorizado
+
+        Returns:
+            Tupla (df_reclasificado, df_cambios)
+            - df_cambios: solo movimientos cuya Categoria_Final cambió, con
+              Categoria_Anterior, Categoria_Nueva, Regla_Anterior y Regla_Nueva
+        """
+        df = df.copy()
+        for col in ['Regla_Concepto', 'Regla_Detalle']:
+            if col not in df.columns:
+                df[col] = ''
+
+        mascara = self.filas_afectadas(df)
+        afectadas = df[mascara]
+
+        print(f"\nReevaluando {len(afectadas)} de {len(df)} movimientos afectados por cambios de reglas")
+
+        columnas_diff = ['Fecha', 'Concepto', 'Detalle', 'Categoria_Anterior', 'Categoria_Nueva',
+                         'Regla_Anterior', 'Regla_Nueva']
+        if len(afectadas) == 0:
+            return df, pd.DataFrame(columns=columnas_diff)
+
+        # Nivel 1 por Concepto distinto, Nivel 2 por (base, Detalle) distinto
+        resultados = self.clasificador.clasificar_lote(afectadas['Concepto'], afectadas['Detalle'])
+
+        anterior = afectadas['Categoria_Final'].astype(str).to_numpy()
+        regla_anterior = (afectadas['Regla_Detalle'].fillna('').astype(str)
+                          .where(afectadas['Regla_Detalle'].fillna('') != '',
+                                 afectadas['Regla_Concepto'].fillna('').astype(str))).to_numpy()
+
+        for col in ['Categoria_Principal', 'Categoria_Final', 'Regla_Concepto', 'Regla_Detalle']:
+            df.loc[afectadas.index, col] = resultados[col].to_numpy()
+
+        regla_nueva = resultados['Regla_Detalle'].where(resultados['Regla_Detalle'] != '',
+                                                        resultados['Regla_Concepto']).to_numpy()
+        diff = pd.DataFrame({
+            'Fecha': afectadas['Fecha'].to_numpy(),
+            'Concepto': afectadas['Concepto'].to_numpy(),
+            'Detalle': afectadas['Detalle'].to_numpy(),
+            'Categoria_Anterior': anterior,
+            'Categoria_Nueva': resultados['Categoria_Final'].to_numpy(),
+            'Regla_Anterior': regla_anterior,
+            'Regla_Nueva': regla_nueva,
+        }, index=afectadas.index)
+        if 'ID_Movimiento' in afectadas.columns:
+            diff.insert(0, 'ID_Movimiento', afectadas['ID_Movimiento'].to_numpy())
+
+        df_cambios = diff[diff['Categoria_Anterior'] != diff['Categoria_Nueva']]
+        print(f"OK {len(df_cambios)} movimiento(s) cambiaron de categoría")
+
+        return df, df_cambios
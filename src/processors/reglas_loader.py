@@ -10,6 +10,8 @@ import json
 import os
 from typing import Dict, List, Tuple
 
+from .entidades import RegistroPrestadores
+
 
 class ReglasLoader:
     """
@@ -37,6 +39,9 @@ class ReglasLoader:
         self.ruta_concepto = os.path.join(ruta_base, "reglas_concepto.json")
         self.ruta_refinamiento = os.path.join(ruta_base, "reglas_refinamiento.json")
 
+        # IDs de las reglas cargadas (campo "id" del JSON), completados al cargar
+        self.ids_concepto: Dict[str, str] = {}
+
     def cargar_reglas_concepto(self) -> Dict[str, str]:
         """
         Carga reglas de Nivel 1 (Concepto) desde JSON.
@@ -70,6 +75,8 @@ class ReglasLoader:
 
             # Guardar en diccionario
             reglas_dict[patron] = categoria
+            if regla.get('id'):
+                self.ids_concepto[patron] = regla['id']
             reglas_activas += 1
 
         print(f"✓ Cargadas {reglas_activas} reglas de concepto (Nivel 1) desde JSON")
@@ -87,6 +94,9 @@ class ReglasLoader:
             {
                 'categoria_base': {
                     'patrones': [(lista_palabras, categoria_refinada), ...],
+                    # (un patrón con "registro" trae un RegistroPrestadores
+                    #  en lugar de la lista de palabras)
+                    'ids': [id_patron, ...],  # paralelo a 'patrones'
                     'default': 'Categoria Default'
                 }
             }
@@ -110,21 +120,29 @@ class ReglasLoader:
 
         for categoria_base, config in data.get('reglas_refinamiento', {}).items():
             patrones_lista = []
+            ids_lista = []
 
-            for patron in config.get('patrones', []):
+            for posicion, patron in enumerate(config.get('patrones', []), 1):
                 if not patron.get('activo', True):
                     continue  # Saltar patrones desactivados
 
-                palabras_clave = patron['palabras_clave']
                 categoria_refinada = patron['categoria_refinada']
-
-                # Convertir a tupla (lista_palabras, categoria)
-                patrones_lista.append((palabras_clave, categoria_refinada))
+                if patron.get('registro'):
+                    # Padrón de prestadores en lugar de palabras clave
+                    registro = RegistroPrestadores.desde_json(
+                        os.path.join(self.ruta_base, patron['registro']))
+                    print(f"✓ Cargados {len(registro)} prestadores desde {patron['registro']}")
+                    patrones_lista.append((registro, categoria_refinada))
+                else:
+                    # Convertir a tupla (lista_palabras, categoria)
+                    patrones_lista.append((patron['palabras_clave'], categoria_refinada))
+                ids_lista.append(patron.get('id') or f"{categoria_base}#{posicion}")
                 total_patrones += 1
 
             # Guardar configuración de esta categoría
             reglas_dict[categoria_base] = {
                 'patrones': patrones_lista,
+                'ids': ids_lista,
                 'default': config.get('categoria_default', categoria_base)
             }
             total_categorias += 1
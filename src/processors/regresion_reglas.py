@@ -0,0 +1,161 @@
+"""
+Regresión de reglas sobre corpus histórico - TORO · Resumen de Cuentas
+=====================================================================
+
+Sistema: TORO (anteriormente SANARTE)
+Módulo: RegresionReglas
+
+Descripción:
+-----------
+Antes de publicar un nuevo juego de reglas (data/reglas_*.json) permite saber
+exactamente qué movimientos históricos cambiarían de categoría.
+
+El corpus (movimientos ya categorizados) se clasifica con
+ClasificadorCascada.clasificar_lote: el Nivel 1 se evalúa una vez por
+Concepto distinto y el Nivel 2 una vez por (categoría base, Detalle)
+distinto, por lo que el costo de las reglas depende de la cantidad de
+textos distintos y no de la cantidad de movimientos. Solo los movimientos
+que cambian de categoría se agrupan para el reporte.
+
+Reporte:
+- Cantidad de movimientos por cambio Categoria_Anterior -> Categoria_Nueva
+- Ejemplos de textos para cada cambio
+- Movimientos que pasan a "Sin Clasificar"
+
+Las correcciones manuales (Regla_Concepto = "MANUAL") no se comparan.
+"""
+from typing import Dict
+
+import pandas as pd
+
+from .clasificador_cascada import ClasificadorCascada
+
+
+class RegresionReglas:
+    """
+    Reproduce un corpus categorizado contra reglas candidatas.
+
+    Uso:
+        regresion = RegresionReglas(ClasificadorCascada.desde_json('reglas_nuevas/'))
+        resultado = regresion.ejecutar(df_corpus)
+        regresion.exportar(resultado, 'regresion.xlsx')
+    """
+
+    REGLA_MANUAL = 'MANUAL'
+    CATEGORIA_SIN_CLASIFICAR = 'Sin Clasificar'
+
+    def __init__(self, clasificador: ClasificadorCascada, muestras_por_cambio: int = 5):
+        """
+        Args:
+            clasificador: Clasificador con las reglas candidatas
+            muestras_por_cambio: Ejemplos de texto a mostrar por cada cambio
+        """
+        self.clasificador = clasificador
+        self.muestras_por_cambio = muestras_por_cambio
+
+    def ejecutar(self, df_corpus: pd.DataFrame) -> Dict:
+        """
+        Clasifica el corpus con las reglas candidatas y arma el reporte de cambios.
+
+        Args:
+            df_corpus: Movimientos categorizados con Concepto, Detalle,
+                Categoria_Final (y opcionalmente Regla_Concepto)
+
+        Returns:
+            Dict con:
+            - movimientos: total de movimientos comparados
+            - manuales_excluidos: correcciones manuales no comparadas
+            - movimientos_cambiados: movimientos que cambian de categoría
+            - cambios: DataFrame Categoria_Anterior, Categoria_Nueva, Cantidad
+            - muestras: DataFrame con ejemplos de texto por cambio
+            - nuevos_sin_clasificar: DataFrame de textos que pasan a Sin Clasificar
+        """
+        corpus = df_corpus
+        if 'Regla_Concepto' in corpus.columns:
+            corpus = corpus[(corpus['Regla_Concepto'] != self.REGLA_MANUAL).to_numpy()]
+
+        # Nivel 1 por Concepto distinto, Nivel 2 por (base, Detalle) distinto
+        clasificados = self.clasificador.clasificar_lote(corpus['Concepto'], corpus['Detalle'])
+
+        anterior = corpus['Categoria_Final'].fillna('').astype(str).to_numpy()
+        cambio = anterior != clasificados['Categoria_Final'].to_numpy()
+
+        # Solo los movimientos que cambian se agrupan por texto
+        clasificados = clasificados[cambio]
+        regla_nueva = clasificados['Regla_Detalle'].where(clasificados['Regla_Detalle'] != '',
+                                                          clasificados['Regla_Concepto'])
+        cambiados = pd.DataFrame({
+            'Concepto': corpus['Concepto'][cambio].fillna('').astype(str).to_numpy(),
+            'Detalle': corpus['Detalle'][cambio].fillna('').astype(str).to_numpy(),
+            'Categoria_Anterior': anterior[cambio],
+            'Categoria_Nueva': clasificados['Categoria_Final'].to_numpy(),
+            'Regla_Nueva': regla_nueva.to_numpy(),
+            'Principal_Nueva': clasificados['Categoria_Principal'].to_numpy(),
+        })
+        cambiados = (cambiados.groupby(list(cambiados.columns), sort=False).size()
+                     .rename('Cantidad').reset_index()
+                     .sort_values('Cantidad', ascending=False, kind='stable'))
+
+        cambios = (cambiados.groupby(['Categoria_Anterior', 'Categoria_Nueva'], sort=False)['Cantidad']
+                   .sum().sort_values(ascending=False, kind='stable').reset_index())
+
+        muestras = cambiados.groupby(['Categoria_Anterior', 'Categoria_Nueva'], sort=False).head(
+            self.muestras_por_cambio)
+
+        nuevos_sin_clasificar = cambiados[cambiados['Principal_Nueva'] == self.CATEGORIA_SIN_CLASIFICAR]
+
+        columnas = ['Concepto', 'Detalle', 'Categoria_Anterior', 'Categoria_Nueva', 'Regla_Nueva', 'Cantidad']
+        return {
+            'movimientos': len(corpus),
+            'manuales_excluidos': len(df_corpus) - len(corpus),
+            'movimientos_cambiados': int(cambio.sum()),
+            'cambios': cambios,
+            'muestras': muestras[columnas].reset_index(drop=True),
+            'nuevos_sin_clasificar': nuevos_sin_clasificar[columnas].reset_index(drop=True),
+        }
+
+    def imprimir_resumen(self, resultado: Dict, max_cambios: int = 20):
+        """
+        Muestra el reporte compacto en consola.
+
+        Args:
+            resultado: Salida de ejecutar()
+            max_cambios: Cantidad máxima de cambios a listar
+        """
+        print(f"\nMovimientos comparados: {resultado['movimientos']}")
+        if resultado['manuales_excluidos']:
+            print(f"Correcciones manuales excluidas: {resultado['manuales_excluidos']}")
+        print(f"Movimientos que cambian de categoría: {resultado['movimientos_cambiados']}")
+        print(f"Nuevos sin clasificar: {int(resultado['nuevos_sin_clasificar']['Cantidad'].sum())}")
+
+        cambios = resultado['cambios']
+        if len(cambios) > 0:
+            print("\nCambios (anterior -> nueva):")
+            for _, fila in cambios.head(max_cambios).iterrows():
+                print(f"  {fila['Cantidad']:7d}  {fila['Categoria_Anterior']} -> {fila['Categoria_Nueva']}")
+            if len(cambios) > max_cambios:
+                print(f"  ... y {len(cambios) - max_cambios} cambio(s) más (ver Excel)")
+
+    def exportar(self, resultado: Dict, ruta_salida: str):
+        """
+        Exporta el reporte a Excel (hojas Resumen, Cambios, Muestras, Nuevos Sin Clasificar).
+
+        Args:
+            resultado: Salida de ejecutar()
+            ruta_salida: Ruta del archivo Excel
+        """
+        resumen = pd.DataFrame({
+            'Métrica': ['Movimientos comparados', 'Correcciones manuales excluidas',
+                        'Movimientos que cambian', 'Nuevos sin clasificar'],
+            'Valor': [resultado['movimientos'], resultado['manuales_excluidos'],
+                      resultado['movimientos_cambiados'],
+                      int(resultado['nuevos_sin_clasificar']['Cantidad'].sum())],
+        })
+
+        with pd.ExcelWriter(ruta_salida, engine='openpyxl') as writer:
+            resumen.to_excel(writer, sheet_name='Resumen', index=False)
+            resultado['cambios'].to_excel(writer, sheet_name='Cambios', index=False)
+            resultado['muestras'].to_excel(writer, sheet_name='Muestras', index=False)
+            resultado['nuevos_sin_clasificar'].to_excel(writer, sheet_name='Nuevos Sin Clasificar', index=False)
+
+        print(f"OK Reporte de regresión exportado: {ruta_salida}")
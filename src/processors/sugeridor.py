@@ -0,0 +1,233 @@
+"""
+Sugeridor de categorías para movimientos sin clasificar - TORO · Resumen de Cuentas
+==================================================================================
+
+Sistema: TORO (anteriormente SANARTE)
+Módulo: SugeridorCategorias
+
+Descripción:
+-----------
+Cuando el Nivel 1 no reconoce el "Concepto", el movimiento queda como
+"Sin Clasificar - Requiere Revisión". Este módulo sugiere las categorías
+más parecidas usando el historial de movimientos ya categorizados.
+
+Método:
+------
+- Texto = Concepto + Detalle normalizados (minúsculas, sin acentos ni dígitos)
+- Representación: trigramas de caracteres ponderados con TF-IDF
+- Cada Categoria_Final se resume en un centroide (suma normalizada de sus textos)
+- Consulta: similitud coseno de TODOS los movimientos sin clasificar contra
+  todos los centroides en una sola operación (merge + groupby sobre la
+  representación dispersa en formato largo), sin comparar fila por fila
+
+Funciona 100% offline: solo usa pandas/numpy sobre datos locales.
+"""
+import unicodedata
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SugeridorCategorias:
+    """
+    Índice de trigramas TF-IDF sobre el historial categorizado.
+
+    Uso:
+        sugeridor = SugeridorCategorias()
+        sugeridor.entrenar(df_historial)
+        df = sugeridor.anotar(df_categorizado)   # agrega columna 'Sugerencias'
+    """
+
+    CATEGORIA_SIN_CLASIFICAR = 'Sin Clasificar'
+
+    def __init__(self, k: int = 3, score_minimo: float = 0.1):
+        """
+        Args:
+            k: Cantidad máxima de categorías sugeridas por movimiento
+            score_minimo: Similitud mínima (0-1) para incluir una sugerencia
+        """
+        self.k = k
+        self.score_minimo = score_minimo
+
+        self.vocabulario = pd.Index([])
+        self.idf = np.array([])
+        self.categorias = pd.Index([])
+        # Centroides en formato disperso largo: columnas termino, categoria, peso
+        self.centroides = pd.DataFrame(columns=['termino', 'categoria', 'peso'])
+
+    @staticmethod
+    def normalizar_textos(concepto: pd.Series, detalle: pd.Series) -> pd.Series:
+        """
+        Normaliza Concepto + Detalle para comparar textos.
+
+        Args:
+            concepto: Serie con el campo Concepto
+            detalle: Serie con el campo Detalle
+
+        Returns:
+            Serie de textos en minúsculas, sin acentos, dígitos ni signos
+        """
+        texto = (concepto.fillna('').astype(str) + ' ' +
+                 detalle.fillna('').astype(str).replace('None', ''))
+        texto = texto.str.lower().map(
+            lambda t: unicodedata.normalize('NFKD', t).encode('ascii', 'ignore').decode('ascii')
+        )
+        texto = texto.str.replace(r'[^a-z]+', ' ', regex=True).str.strip()
+        return texto
+
+    @staticmethod
+    def _trigramas(textos: pd.Series) -> pd.DataFrame:
+        """
+        Descompone cada texto en trigramas de caracteres (con bordes de palabra).
+
+        Args:
+            textos: Serie de textos normalizados (índice = id de documento)
+
+        Returns:
+            DataFrame largo con columnas doc, trigrama, tf
+        """
+        def _extraer(texto: str) -> List[str]:
+            relleno = f" {texto} "
+            return [relleno[i:i + 3] for i in range(len(relleno) - 2)]
+
+        largo = textos.map(_extraer).explode().dropna()
+        if len(largo) == 0:
+            return pd.DataFrame(columns=['doc', 'trigrama', 'tf'])
+
+        largo = largo.rename('trigrama').rename_axis('doc').reset_index()
+        return largo.groupby(['doc', 'trigrama'], sort=False).size().rename('tf').reset_index()
+
+    @staticmethod
+    def _normalizar_l2(df: pd.DataFrame, clave: str) -> pd.DataFrame:
+        """Divide cada peso por la norma L2 de su documento/categoría."""
+        norma = np.sqrt((df['peso'] ** 2).groupby(df[clave]).transform('sum'))
+        df = df.copy()
+        df['peso'] = df['peso'] / norma.where(norma > 0, 1.0)
+        return df
+
+    def entrenar(self, df_historial: pd.DataFrame) -> 'SugeridorCategorias':
+        """
+        Construye el índice a partir de movimientos ya categorizados.
+
+        Solo se usan filas clasificadas (Categoria_Principal != 'Sin Clasificar').
+        Los textos repetidos se indexan una sola vez por categoría.
+
+        Args:
+            df_historial: DataFrame con Concepto, Detalle, Categoria_Principal, Categoria_Final
+
+        Returns:
+            self (para encadenar llamadas)
+        """
+        clasificados = df_historial[
+            df_historial['Categoria_Principal'].notna() &
+            (df_historial['Categoria_Principal'] != self.CATEGORIA_SIN_CLASIFICAR)
+        ]
+
+        docs = pd.DataFrame({
+            'texto': self.normalizar_textos(clasificados['Concepto'], clasificados['Detalle']),
+            'categoria': clasificados['Categoria_Final'].astype(str),
+        })
+        docs = docs[docs['texto'] != ''].drop_duplicates().reset_index(drop=True)
+
+        if len(docs) == 0:
+            return self
+
+        tf = self._trigramas(docs['texto'])
+
+        # IDF suavizado sobre documentos únicos
+        n_docs = len(docs)
+        df_termino = tf.groupby('trigrama')['doc'].nunique()
+        self.vocabulario = pd.Index(df_termino.index)
+        self.idf = (np.log((1 + n_docs) / (1 + df_termino.to_numpy())) + 1.0)
+
+        tf['termino'] = self.vocabulario.get_indexer(tf['trigrama'])
+        tf['peso'] = (1.0 + np.log(tf['tf'].to_numpy())) * self.idf[tf['termino'].to_numpy()]
+        tf = self._normalizar_l2(tf, 'doc')
+
+        # Centroide por categoría = suma de vectores de sus documentos, normalizada
+        self.categorias = pd.Index(docs['categoria'].unique())
+        codigos = self.categorias.get_indexer(docs['categoria'])
+        tf['categoria'] = codigos[tf['doc'].to_numpy()]
+
+        centroides = tf.groupby(['termino', 'categoria'], sort=False)['peso'].sum().reset_index()
+        self.centroides = self._normalizar_l2(centroides, 'categoria')
+
+        return self
+
+    def sugerir(self, df: pd.DataFrame) -> List[List[Tuple[str, float]]]:
+        """
+        Calcula las top-k categorías más parecidas para cada fila (consulta en lote).
+
+        Args:
+            df: DataFrame con columnas Concepto y Detalle
+
+        Returns:
+            Lista alineada con las filas de df; cada elemento es una lista de
+            (categoria_final, score) ordenada de mayor a menor score
+        """
+        resultado = [[] for _ in range(len(df))]
+
+        if len(df) == 0 or len(self.centroides) == 0:
+            return resultado
+
+        # Cada texto distinto se consulta una sola vez
+        codigos, textos_unicos = pd.factorize(self.normalizar_textos(df['Concepto'], df['Detalle']))
+        consulta = self._trigramas(pd.Series(textos_unicos))
+        if len(consulta) == 0:
+            return resultado
+
+        consulta['termino'] = self.vocabulario.get_indexer(consulta['trigrama'])
+        consulta = consulta[consulta['termino'] >= 0]
+        if len(consulta) == 0:
+            return resultado
+
+        consulta['peso'] = (1.0 + np.log(consulta['tf'].to_numpy())) * self.idf[consulta['termino'].to_numpy()]
+        consulta = self._normalizar_l2(consulta, 'doc')
+
+        # Producto disperso consulta x centroidesᵀ: join por término y suma por (doc, categoría)
+        producto = consulta[['doc', 'termino', 'peso']].merge(
+            self.centroides, on='termino', suffixes=('_q', '_c')
+        )
+        producto['score'] = producto['peso_q'] * producto['peso_c']
+        scores = producto.groupby(['doc', 'categoria'], sort=False)['score'].sum().reset_index()
+
+        scores = scores[scores['score'] >= self.score_minimo]
+        scores = scores.sort_values(['doc', 'score'], ascending=[True, False])
+        scores = scores.groupby('doc', sort=False).head(self.k)
+
+        por_texto = [[] for _ in range(len(textos_unicos))]
+        nombres = self.categorias.to_numpy()[scores['categoria'].to_numpy()]
+        for doc, categoria, score in zip(scores['doc'].to_numpy(), nombres, scores['score'].to_numpy()):
+            por_texto[doc].append((categoria, round(float(score), 3)))
+
+        return [list(por_texto[codigo]) for codigo in codigos]
+
+    @staticmethod
+    def formatear(sugerencias: List[Tuple[str, float]]) -> str:
+        """
+        Formatea una lista de sugerencias para Excel/consola.
+
+        Ejemplo: "Servicios - Agua (82%) | Servicios - Gas (41%)"
+        """
+        return ' | '.join(f"{categoria} ({score:.0%})" for categoria, score in sugerencias)
+
+    def anotar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Agrega la columna 'Sugerencias' a los movimientos sin clasificar.
+
+        Args:
+            df: DataFrame categorizado
+
+        Returns:
+            Copia de df con la columna 'Sugerencias' (vacía en filas clasificadas)
+        """
+        df = df.copy()
+        df['Sugerencias'] = None
+
+        mascara = df['Categoria_Principal'] == self.CATEGORIA_SIN_CLASIFICAR
+        if mascara.any():
+            sugerencias = self.sugerir(df[mascara])
+            df.loc[mascara, 'Sugerencias'] = [self.formatear(s) or None for s in sugerencias]
+
+        return df
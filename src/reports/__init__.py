@@ -1,5 +1,12 @@
+from .agregados import AgregadosReporte
 from .analyzer import Analyzer
+from .conciliacion import ConciliadorSaldos
+from .cubo import CuboMovimientos
 from .dashboard_generator import DashboardGenerator
 from .excel_exporter import ExcelExporter
+from .excel_streaming import EscritorExcelStreaming
+from .metricas import MetricasFinancieras
+from .servidor import ServidorDashboard
 
-__all__ = ['Analyzer', 'DashboardGenerator', 'ExcelExporter']
+__all__ = ['AgregadosReporte', 'Analyzer', 'ConciliadorSaldos', 'CuboMovimientos', 'DashboardGenerator',
+           'EscritorExcelStreaming', 'ExcelExporter', 'MetricasFinancieras', 'ServidorDashboard']
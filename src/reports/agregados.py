@@ -0,0 +1,353 @@
+"""
+Agregados compartidos entre reportes - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+Analyzer, DashboardGenerator y ExcelExporter necesitan los mismos totales,
+desgloses y subconjuntos (ingresos, egresos, prestadores, sin clasificar).
+AgregadosReporte los calcula una sola vez por DataFrame y los memoriza, de
+modo que cada agregado se calcula exactamente una vez por corrida, aunque
+el dashboard y el Excel los pidan a la vez desde hilos distintos.
+"""
+import threading
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from processors.entidades import IndicePrestadores
+
+
+class AgregadosReporte:
+    """
+    Capa de agregados memorizados sobre un DataFrame categorizado.
+
+    El DataFrame se trata como inmutable: si cambia, crear un nuevo
+    AgregadosReporte o llamar a invalidar().
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df: DataFrame con movimientos categorizados
+        """
+        self.df = df
+        self._cache: Dict[str, object] = {}
+        # Reentrante: un agregado puede calcularse a partir de otro
+        self._lock = threading.RLock()
+
+    @classmethod
+    def desde_tabla(cls, por_categoria: pd.DataFrame) -> 'AgregadosReporte':
+        """
+        Crea agregados a partir de una tabla por categoría ya calculada
+        (por ejemplo, leída del cubo). Los subconjuntos de movimientos no
+        están disponibles.
+
+        Args:
+            por_categoria: Tabla con el formato de por_categoria()
+
+        Returns:
+            AgregadosReporte con la tabla precargada
+        """
+        agregados = cls(None)
+        agregados._cache['por_categoria'] = por_categoria
+        return agregados
+
+    def invalidar(self):
+        """Descarta todos los agregados memorizados."""
+        self._cache.clear()
+
+    def _memo(self, clave: str, calcular: Callable):
+        """Devuelve el valor memorizado de 'clave' o lo calcula la primera vez."""
+        with self._lock:
+            if clave not in self._cache:
+                self._cache[clave] = calcular()
+            return self._cache[clave]
+
+    # ------------------------------------------------------------------
+    # Agregación base
+    # ------------------------------------------------------------------
+
+    def por_categoria(self) -> pd.DataFrame:
+        """
+        Agregación única por (Tipo_Movimiento, Categoria_Principal, Categoria_Final, Clasificado).
+
+        Un solo groupby sobre el DataFrame; el resto de los totales y desgloses
+        por categoría se derivan de esta tabla (una fila por combinación).
+
+        Returns:
+            DataFrame con columnas Tipo_Movimiento, Categoria_Principal,
+            Categoria_Final, Clasificado, Crédito, Débito, Movimientos
+        """
+        def calcular():
+            claves = pd.DataFrame({
+                'Tipo_Movimiento': self.df['Tipo_Movimiento'],
+                'Categoria_Principal': self.df['Categoria_Principal'],
+                'Categoria_Final': self.df['Categoria_Final'],
+                'Clasificado': self.df['Categoria_Principal'] != 'Sin Clasificar',
+            })
+            return (
+                pd.concat([claves, self.df[['Crédito', 'Débito']]], axis=1)
+                .groupby(list(claves.columns), dropna=False, sort=False)
+                .agg(**{'Crédito': ('Crédito', 'sum'), 'Débito': ('Débito', 'sum'),
+                        'Movimientos': ('Crédito', 'size')})
+                .reset_index()
+            )
+
+        return self._memo('por_categoria', calcular)
+
+    def ingresos_por_categoria(self) -> pd.Series:
+        """
+        Ingresos (Crédito de movimientos tipo Ingreso) por Categoria_Final.
+
+        Returns:
+            Serie ordenada de mayor a menor
+        """
+        def calcular():
+            agregado = self.por_categoria()
+            ingresos = agregado[agregado['Tipo_Movimiento'] == 'Ingreso']
+            return ingresos.groupby('Categoria_Final')['Crédito'].sum().sort_values(ascending=False)
+
+        return self._memo('ingresos_por_categoria', calcular)
+
+    def egresos_por_categoria(self) -> pd.Series:
+        """
+        Egresos (Débito de movimientos tipo Egreso) por Categoria_Final.
+
+        Returns:
+            Serie ordenada de mayor a menor
+        """
+        def calcular():
+            agregado = self.por_categoria()
+            egresos = agregado[agregado['Tipo_Movimiento'] == 'Egreso']
+            return egresos.groupby('Categoria_Final')['Débito'].sum().sort_values(ascending=False)
+
+        return self._memo('egresos_por_categoria', calcular)
+
+    def resumen_principal(self) -> pd.DataFrame:
+        """
+        Resumen por Categoria_Principal (sin "Sin Clasificar").
+
+        Returns:
+            DataFrame con columnas categoria, transacciones, ingresos, egresos, neto
+            ordenado por egresos descendente
+        """
+        def calcular():
+            agregado = self.por_categoria()
+            agregado = agregado[agregado['Categoria_Principal'] != 'Sin Clasificar']
+            es_ingreso = agregado['Tipo_Movimiento'] == 'Ingreso'
+            es_egreso = agregado['Tipo_Movimiento'] == 'Egreso'
+
+            resumen = pd.DataFrame({
+                'categoria': agregado['Categoria_Principal'],
+                'transacciones': agregado['Movimientos'],
+                'ingresos': agregado['Crédito'].where(es_ingreso, 0.0),
+                'egresos': agregado['Débito'].where(es_egreso, 0.0),
+            }).groupby('categoria', sort=False).sum().reset_index()
+
+            resumen['neto'] = resumen['ingresos'] - resumen['egresos']
+            return resumen.sort_values('egresos', ascending=False, kind='stable').reset_index(drop=True)
+
+        return self._memo('resumen_principal', calcular)
+
+    def total_categoria_final(self, texto: str) -> Dict:
+        """
+        Movimientos y Débito de las categorías finales que contienen un texto.
+
+        Args:
+            texto: Texto a buscar en Categoria_Final (sin distinguir mayúsculas)
+
+        Returns:
+            Dict con 'movimientos' y 'debito'
+        """
+        def calcular():
+            agregado = self.por_categoria()
+            mascara = agregado['Categoria_Final'].str.contains(texto, case=False, na=False)
+            return {
+                'movimientos': int(agregado.loc[mascara, 'Movimientos'].sum()),
+                'debito': agregado.loc[mascara, 'Débito'].sum(),
+            }
+
+        return self._memo(f'total_categoria_final:{texto.lower()}', calcular)
+
+    # ------------------------------------------------------------------
+    # Series temporales
+    # ------------------------------------------------------------------
+
+    # Granularidad -> (frecuencia de período, frecuencia de calendario)
+    GRANULARIDADES = {
+        'D': ('D', 'D'),
+        'W': ('W-SUN', 'W-MON'),   # semanas de lunes a domingo, etiquetadas por el lunes
+        'M': ('M', 'MS'),          # meses etiquetados por el día 1
+    }
+
+    @classmethod
+    def inicio_periodo(cls, fecha: pd.Series, granularidad: str) -> pd.Series:
+        """
+        Inicio del período (día, lunes de la semana o día 1 del mes) de cada fecha.
+
+        Args:
+            fecha: Serie datetime64
+            granularidad: 'D', 'W' o 'M'
+
+        Returns:
+            Serie datetime64 con el inicio del período
+        """
+        if granularidad not in cls.GRANULARIDADES:
+            raise ValueError(f"Granularidad no soportada: {granularidad} (usar 'D', 'W' o 'M')")
+        if granularidad == 'D':
+            return fecha.dt.normalize()
+        return fecha.dt.to_period(cls.GRANULARIDADES[granularidad][0]).dt.start_time
+
+    def flujo_caja(self, granularidad: str = 'D', rellenar_calendario: bool = False) -> pd.DataFrame:
+        """
+        Flujo de caja (ingresos y egresos clasificados) por día, semana o mes.
+
+        Las fechas se truncan como datetime64 (sin objetos date de Python) y
+        ingresos/egresos salen de un único groupby por (período, es ingreso)
+        y un unstack.
+        No modifica el DataFrame.
+
+        Args:
+            granularidad: 'D' (diario), 'W' (semanal, desde el lunes) o 'M' (mensual)
+            rellenar_calendario: Si True, incluye los períodos sin movimientos con 0
+
+        Returns:
+            DataFrame con columnas: fecha (inicio del período), ingresos, egresos
+        """
+        if granularidad not in self.GRANULARIDADES:
+            raise ValueError(f"Granularidad no soportada: {granularidad} (usar 'D', 'W' o 'M')")
+
+        def calcular():
+            frecuencia_calendario = self.GRANULARIDADES[granularidad][1]
+
+            es_ingreso = (self.df['Tipo_Movimiento'] == 'Ingreso').to_numpy()
+            es_egreso = (self.df['Tipo_Movimiento'] == 'Egreso').to_numpy()
+            mascara = (self.df['Categoria_Principal'] != 'Sin Clasificar').to_numpy() & (es_ingreso | es_egreso)
+
+            periodo = self.inicio_periodo(pd.to_datetime(self.df['Fecha'])[mascara], granularidad)
+
+            monto = np.where(es_ingreso, self.df['Crédito'].to_numpy(dtype=float),
+                             self.df['Débito'].to_numpy(dtype=float))[mascara]
+            ingreso = pd.Series(es_ingreso[mascara], index=periodo.index, name='ingreso')
+
+            flujo = (
+                pd.Series(monto, index=periodo.index)
+                .groupby([periodo.rename('fecha'), ingreso])
+                .sum()
+                .unstack(fill_value=0.0)
+                .reindex(columns=[True, False], fill_value=0.0)
+                .sort_index()
+            )
+
+            if rellenar_calendario and len(flujo) > 0:
+                calendario = pd.date_range(flujo.index.min(), flujo.index.max(),
+                                           freq=frecuencia_calendario, name='fecha')
+                flujo = flujo.reindex(calendario, fill_value=0.0)
+
+            flujo.columns = ['ingresos', 'egresos']
+            return flujo.rename_axis('fecha').reset_index()
+
+        return self._memo(f'flujo_caja:{granularidad}:{rellenar_calendario}', calcular)
+
+    def por_periodo_categoria(self, granularidad: str = 'M') -> pd.DataFrame:
+        """
+        Importe por (período, Tipo_Movimiento, Categoria_Final), en un solo groupby.
+
+        El importe es el Crédito de los ingresos y el Débito de los egresos.
+        Es la tabla larga que Analyzer.comparar_periodos pivotea.
+
+        Args:
+            granularidad: 'D', 'W' o 'M'
+
+        Returns:
+            DataFrame con columnas periodo, Tipo_Movimiento, Categoria_Final,
+            importe, movimientos
+        """
+        def calcular():
+            es_ingreso = (self.df['Tipo_Movimiento'] == 'Ingreso').to_numpy()
+            mascara = es_ingreso | (self.df['Tipo_Movimiento'] == 'Egreso').to_numpy()
+            importe = np.where(es_ingreso, self.df['Crédito'].fillna(0.0).to_numpy(dtype=float),
+                               self.df['Débito'].fillna(0.0).to_numpy(dtype=float))
+
+            tabla = pd.DataFrame({
+                'periodo': self.inicio_periodo(pd.to_datetime(self.df['Fecha'])[mascara], granularidad),
+                'Tipo_Movimiento': self.df['Tipo_Movimiento'][mascara],
+                'Categoria_Final': self.df['Categoria_Final'][mascara].fillna('Sin Clasificar'),
+                'importe': importe[mascara],
+            })
+            return (tabla.groupby(['periodo', 'Tipo_Movimiento', 'Categoria_Final'])
+                    .agg(importe=('importe', 'sum'), movimientos=('importe', 'size'))
+                    .reset_index())
+
+        return self._memo(f'por_periodo_categoria:{granularidad}', calcular)
+
+    # ------------------------------------------------------------------
+    # Subconjuntos de movimientos (una sola máscara por subconjunto)
+    # ------------------------------------------------------------------
+
+    def ingresos(self) -> pd.DataFrame:
+        """Movimientos con Tipo_Movimiento == 'Ingreso'."""
+        return self._memo('ingresos', lambda: self.df[self.df['Tipo_Movimiento'] == 'Ingreso'])
+
+    def egresos(self) -> pd.DataFrame:
+        """Movimientos con Tipo_Movimiento == 'Egreso'."""
+        return self._memo('egresos', lambda: self.df[self.df['Tipo_Movimiento'] == 'Egreso'])
+
+    def sin_clasificar(self) -> pd.DataFrame:
+        """Movimientos con Categoria_Principal == 'Sin Clasificar'."""
+        return self._memo('sin_clasificar',
+                          lambda: self.df[self.df['Categoria_Principal'] == 'Sin Clasificar'])
+
+    def prestadores(self) -> pd.DataFrame:
+        """Movimientos con Categoria_Principal == 'Prestadores'."""
+        return self._memo('prestadores',
+                          lambda: self.df[self.df['Categoria_Principal'] == 'Prestadores'])
+
+    def entidades_prestadores(self) -> pd.Series:
+        """
+        Id de entidad de cada movimiento de prestadores (ver IndicePrestadores):
+        agrupa las distintas grafías de un mismo prestador por documento o nombre.
+
+        Returns:
+            Serie alineada con prestadores() (NaN si no hay nombre ni documento)
+        """
+        return self._memo('entidades_prestadores', lambda: IndicePrestadores().resolver(self.prestadores()))
+
+    def resumen_prestadores(self) -> Dict:
+        """
+        Prestadores activos (entidades distintas) y monto total pagado.
+
+        Returns:
+            Dict con 'movimientos', 'activos' y 'total'
+        """
+        def calcular():
+            prestadores = self.prestadores()
+            activos = self.entidades_prestadores().nunique()
+            return {
+                'movimientos': len(prestadores),
+                'activos': activos,
+                'total': prestadores['Débito'].sum(),
+            }
+
+        return self._memo('resumen_prestadores', calcular)
+
+    def resumen_debin(self) -> Dict:
+        """
+        Ingresos por DEBIN (Tipo_Movimiento == 'Ingreso' y Es_DEBIN).
+
+        Returns:
+            Dict con 'cantidad', 'total' y 'promedio' (0 si no hay columna Es_DEBIN)
+        """
+        def calcular():
+            ingresos = self.ingresos()
+            if 'Es_DEBIN' not in ingresos.columns:
+                return {'cantidad': 0, 'total': 0.0, 'promedio': 0.0}
+
+            creditos = ingresos.loc[ingresos['Es_DEBIN'] == True, 'Crédito']
+            return {
+                'cantidad': len(creditos),
+                'total': creditos.sum(),
+                'promedio': creditos.mean() if len(creditos) > 0 else 0.0,
+            }
+
+        return self._memo('resumen_debin', calcular)
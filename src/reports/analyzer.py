@@ -2,121 +2,257 @@
 Analizador financiero de movimientos categorizados - TORO · Resumen de Cuentas
 Autor: Sistema TORO
 """
+import threading
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
+from .agregados import AgregadosReporte
+from .conciliacion import ConciliadorSaldos
+from .metricas import MetricasFinancieras
+
+
 class Analyzer:
     """
     Analiza movimientos categorizados y genera métricas financieras.
     """
 
+    # Métricas que se calculan juntas (grupo -> métricas del grupo), en el
+    # orden en que se muestran. Cada grupo se resuelve en _metricas_<grupo>().
+    GRUPOS_METRICAS = {
+        'saldos': ('saldo_inicial', 'saldo_final'),
+        'categorias': (
+            'total_ingresos', 'total_egresos', 'variacion', 'balance',
+            'ingresos_clasificados', 'egresos_clasificados',
+            'ingresos_sin_clasificar', 'egresos_sin_clasificar',
+            'total_movimientos', 'movimientos_clasificados', 'movimientos_sin_clasificar',
+            'porcentaje_clasificado', 'ingresos_por_subcategoria', 'egresos_por_subcategoria',
+            'alerta_egresos_mayores',
+        ),
+        'top_prestadores': ('top_prestadores',),
+        'flujo_diario': ('flujo_diario',),
+        'validacion': ('validacion_saldos_ok', 'diferencia_validacion'),
+        'conciliacion': ('saldos_por_cuenta', 'quiebres_saldo'),
+    }
+    _GRUPO_DE_METRICA = {clave: grupo for grupo, claves in GRUPOS_METRICAS.items() for clave in claves}
+
     def __init__(self, df: pd.DataFrame):
         """
         Args:
             df: DataFrame con movimientos categorizados
         """
+        if not pd.api.types.is_datetime64_any_dtype(df['Fecha']):
+            df = df.assign(Fecha=pd.to_datetime(df['Fecha'], errors='coerce'))
+
         # Filtrar movimientos inválidos (sin fecha o con fecha NaT)
-        df_limpio = df[df['Fecha'].notna()].copy()
+        validos = df['Fecha'].notna()
+        df_limpio = df if validos.all() else df[validos]
 
         # Advertir si se filtraron movimientos
         if len(df_limpio) < len(df):
             filas_filtradas = len(df) - len(df_limpio)
             print(f"  Advertencia: Se filtraron {filas_filtradas} movimiento(s) sin fecha válida")
 
+        # Orden cronológico estable, base de los cortes por período (ver rebanada).
+        # Los extractos vienen del más reciente al más antiguo: se invierten antes
+        # de ordenar para que los movimientos del mismo segundo queden en el orden
+        # en que el banco los aplicó. Un DataFrame ya ordenado no se copia.
+        if not df_limpio['Fecha'].is_monotonic_increasing:
+            if df_limpio['Fecha'].iloc[0] > df_limpio['Fecha'].iloc[-1]:
+                df_limpio = df_limpio.iloc[::-1]
+            df_limpio = df_limpio.sort_values('Fecha', kind='stable')
+
         self.df = df_limpio
-        self.metricas = {}
 
-    def calcular_metricas(self) -> Dict:
+        # Agregados compartidos con DashboardGenerator y ExcelExporter
+        self.agregados = AgregadosReporte(self.df)
+        self._conciliacion = None
+
+        # Métricas perezosas: se calculan al leerlas (ver calcular_metricas)
+        self._valores: Dict = {}
+        self._lock = threading.RLock()
+        self.metricas = MetricasFinancieras(self, self._GRUPO_DE_METRICA)
+
+    def rango_fechas(self) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
         """
-        Calcula todas las métricas financieras.
+        Returns:
+            Tupla (primer movimiento, último movimiento), o (None, None) sin movimientos
+        """
+        if len(self.df) == 0:
+            return None, None
+        return self.df['Fecha'].iloc[0], self.df['Fecha'].iloc[-1]
+
+    def rebanada(self, desde: str = None, hasta: str = None) -> pd.DataFrame:
+        """
+        Movimientos de un período, por búsqueda binaria sobre las fechas ordenadas.
+
+        El resultado es un corte (iloc) de self.df, sin máscaras ni copias:
+        O(log n) por período.
+
+        Args:
+            desde: Primer día (o instante) incluido (None = sin límite)
+            hasta: Último día incluido (None = sin límite). Si trae hora, es
+                el último instante incluido.
 
         Returns:
-            Diccionario con todas las métricas
+            DataFrame con los movimientos del período, en orden cronológico
         """
-        print("\nCalculando métricas financieras...")
+        inicio, fin = self.limites(desde, hasta)
+        return self.df.iloc[inicio:fin]
 
-        # Filtrar movimientos clasificados vs sin clasificar
-        df_clasificados = self.df[self.df['Categoria_Principal'] != 'Sin Clasificar']
-        df_sin_clasificar = self.df[self.df['Categoria_Principal'] == 'Sin Clasificar']
+    def limites(self, desde: str = None, hasta: str = None) -> Tuple[int, int]:
+        """
+        Posiciones [inicio, fin) del período en self.df (ver rebanada).
 
-        # Calcular saldos inicial y final
-        saldo_inicial, saldo_final = self._calcular_saldos()
+        Args:
+            desde: Primer día (o instante) incluido (None = sin límite)
+            hasta: Último día incluido (None = sin límite)
 
-        # Calcular totales (TODOS los movimientos)
-        total_ingresos = self._calcular_ingresos()
-        total_egresos = self._calcular_egresos()
-        variacion = total_ingresos - total_egresos
-        balance = total_ingresos - total_egresos  # Mantener por compatibilidad
+        Returns:
+            Tupla (inicio, fin) con inicio <= fin
+        """
+        fechas = self.df['Fecha']
+        inicio = 0 if desde is None else int(fechas.searchsorted(pd.Timestamp(desde), side='left'))
+        if hasta is None:
+            fin = len(self.df)
+        else:
+            hasta = pd.Timestamp(hasta)
+            if hasta == hasta.normalize():
+                # Solo fecha: incluir el día completo
+                fin = int(fechas.searchsorted(hasta + pd.Timedelta(days=1), side='left'))
+            else:
+                fin = int(fechas.searchsorted(hasta, side='right'))
+        return inicio, max(inicio, fin)
+
+    def periodo(self, desde: str = None, hasta: str = None) -> 'Analyzer':
+        """
+        Analyzer sobre los movimientos de un período (ver rebanada).
 
-        # Calcular montos de movimientos sin clasificar
-        ingresos_sin_clasificar = df_sin_clasificar['Crédito'].sum()
-        egresos_sin_clasificar = df_sin_clasificar['Débito'].sum()
+        Args:
+            desde: Primer día incluido (None = sin límite)
+            hasta: Último día incluido (None = sin límite)
 
-        # Calcular montos solo de clasificados
-        ingresos_clasificados = df_clasificados[df_clasificados['Tipo_Movimiento'] == 'Ingreso']['Crédito'].sum()
-        egresos_clasificados = df_clasificados[df_clasificados['Tipo_Movimiento'] == 'Egreso']['Débito'].sum()
+        Returns:
+            Analyzer nuevo, con sus propias métricas y agregados
+        """
+        return Analyzer(self.rebanada(desde, hasta))
 
-        # Validación de coherencia
-        validacion_ok, diferencia = self._validar_coherencia_saldos(
-            saldo_inicial, saldo_final, total_ingresos, total_egresos
-        )
+    def calcular_metricas(self, metricas: Iterable[str] = None,
+                          mostrar_resumen: bool = None) -> MetricasFinancieras:
+        """
+        Métricas financieras, calculadas a demanda.
 
-        # Porcentaje clasificado
-        total_movimientos = len(self.df)
-        movimientos_clasificados = len(df_clasificados)
-        porcentaje_clasificado = (movimientos_clasificados / total_movimientos * 100) if total_movimientos > 0 else 0
+        Cada métrica se calcula la primera vez que se la lee y queda
+        memoizada (ver MetricasFinancieras). El resultado se usa igual que
+        un diccionario.
 
-        # Desglose por subcategoría
-        ingresos_por_sub = self._desglose_ingresos()
-        egresos_por_sub = self._desglose_egresos()
+        Args:
+            metricas: Métricas a incluir (None = todas, ver GRUPOS_METRICAS)
+            mostrar_resumen: Si True, imprime el resumen financiero (lo que
+                calcula todas las métricas). None = solo al pedir todas
 
-        # Top prestadores
-        top_prestadores = self._top_prestadores(10)
+        Returns:
+            MetricasFinancieras con las métricas solicitadas
 
-        # Flujo diario
-        flujo_diario = self._flujo_diario()
+        Raises:
+            ValueError: Si se pide una métrica desconocida
+        """
+        if mostrar_resumen is None:
+            mostrar_resumen = metricas is None
 
-        # Detectar alerta
-        alerta = total_egresos > total_ingresos
+        if metricas is None:
+            vista = self.metricas
+        else:
+            metricas = list(metricas)
+            desconocidas = [m for m in metricas if m not in self._GRUPO_DE_METRICA]
+            if desconocidas:
+                raise ValueError(f"Métrica(s) desconocida(s): {', '.join(desconocidas)}")
+            vista = MetricasFinancieras(self, metricas)
 
-        # Guardar métricas
-        self.metricas = {
-            'saldo_inicial': saldo_inicial,
-            'saldo_final': saldo_final,
-            'total_ingresos': total_ingresos,
-            'total_egresos': total_egresos,
-            'variacion': variacion,
-            'balance': balance,  # Mantener por compatibilidad
-            'ingresos_clasificados': ingresos_clasificados,
-            'egresos_clasificados': egresos_clasificados,
-            'ingresos_sin_clasificar': ingresos_sin_clasificar,
-            'egresos_sin_clasificar': egresos_sin_clasificar,
-            'total_movimientos': total_movimientos,
-            'movimientos_clasificados': movimientos_clasificados,
-            'movimientos_sin_clasificar': len(df_sin_clasificar),
-            'porcentaje_clasificado': porcentaje_clasificado,
-            'ingresos_por_subcategoria': ingresos_por_sub,
-            'egresos_por_subcategoria': egresos_por_sub,
-            'top_prestadores': top_prestadores,
-            'flujo_diario': flujo_diario,
-            'alerta_egresos_mayores': alerta,
-            'validacion_saldos_ok': validacion_ok,
-            'diferencia_validacion': diferencia
+        if mostrar_resumen:
+            print("\nCalculando métricas financieras...")
+            self._mostrar_resumen()
+
+        return vista
+
+    def metrica(self, clave: str):
+        """
+        Valor de una métrica, calculando su grupo la primera vez.
+
+        Args:
+            clave: Nombre de la métrica (ej: 'total_ingresos')
+
+        Returns:
+            Valor de la métrica
+        """
+        # Con lock: el dashboard y el Excel pueden leer métricas a la vez (ver reports.paralelo)
+        with self._lock:
+            if clave not in self._valores:
+                if clave not in self._GRUPO_DE_METRICA:
+                    raise KeyError(clave)
+                grupo = self._GRUPO_DE_METRICA[clave]
+                self._valores.update(getattr(self, f'_metricas_{grupo}')())
+            return self._valores[clave]
+
+    def metrica_calculada(self, clave: str) -> bool:
+        """True si la métrica ya fue calculada."""
+        return clave in self._valores
+
+    def _metricas_saldos(self) -> Dict:
+        saldo_inicial, saldo_final = self._calcular_saldos()
+        return {'saldo_inicial': saldo_inicial, 'saldo_final': saldo_final}
+
+    def _metricas_categorias(self) -> Dict:
+        # Totales, conteos y desgloses: una sola pasada sobre self.df (ver agregado_categorias)
+        return self.metricas_categorias(self.agregados)
+
+    def _metricas_top_prestadores(self) -> Dict:
+        return {'top_prestadores': self._top_prestadores(10)}
+
+    def _metricas_flujo_diario(self) -> Dict:
+        return {'flujo_diario': self._flujo_diario()}
+
+    def _metricas_validacion(self) -> Dict:
+        # Validación de coherencia (global y encadenamiento de saldos por cuenta)
+        validacion_ok, diferencia = self._validar_coherencia_saldos(
+            self.metrica('saldo_inicial'), self.metrica('saldo_final'),
+            self.metrica('total_ingresos'), self.metrica('total_egresos')
+        )
+        return {
+            'validacion_saldos_ok': validacion_ok and self.conciliar_saldos()['ok'],
+            'diferencia_validacion': diferencia,
         }
 
-        # Mostrar resumen
-        self._mostrar_resumen()
+    def _metricas_conciliacion(self) -> Dict:
+        conciliacion = self.conciliar_saldos()
+        return {'saldos_por_cuenta': conciliacion['cuentas'], 'quiebres_saldo': conciliacion['quiebres']}
 
-        return self.metricas
+    def conciliar_saldos(self) -> Dict:
+        """
+        Concilia el saldo corrido de cada cuenta (ver ConciliadorSaldos).
+
+        Returns:
+            Dict con 'ok', 'cuentas' (saldo inicial/final por cuenta) y
+            'quiebres' (movimientos donde no encadena el saldo). Sin columna
+            Saldo devuelve tablas vacías.
+        """
+        if self._conciliacion is None:
+            if 'Saldo' in self.df.columns:
+                self._conciliacion = ConciliadorSaldos(self.df).conciliar()
+            else:
+                self._conciliacion = {'ok': True, 'cuentas': pd.DataFrame(), 'quiebres': pd.DataFrame()}
+        return self._conciliacion
 
     def _calcular_saldos(self) -> Tuple[float, float]:
         """
         Calcula el saldo inicial y final del período.
 
-        Saldo Inicial = saldo ANTES del primer movimiento
-        Saldo Final = saldo del movimiento más reciente (última fecha)
+        Con varias cuentas consolidadas (ej: Supervielle y Galicia) los saldos
+        son la suma de los saldos inicial y final de cada cuenta.
+
+        Saldo Inicial = saldo ANTES del primer movimiento de cada cuenta
+        Saldo Final = saldo DESPUÉS del último movimiento de cada cuenta
 
         Returns:
             Tupla (saldo_inicial, saldo_final)
@@ -129,28 +265,15 @@ class Analyzer:
             print("  ADVERTENCIA: El archivo no tiene columna 'Saldo'. No se puede calcular saldo inicial/final.")
             return float('nan'), float('nan')
 
-        # Ordenar por fecha
-        df_ordenado = self.df.sort_values('Fecha')
-
-        # Saldo final: último movimiento (DESPUÉS del último movimiento)
-        saldo_final = df_ordenado.iloc[-1]['Saldo']
-
-        # Saldo inicial: ANTES del primer movimiento
-        # El saldo que aparece en el Excel es DESPUÉS del movimiento
-        # Entonces: Saldo_Antes = Saldo_Después - Crédito + Débito
-        primer_movimiento = df_ordenado.iloc[0]
-        saldo_despues_primer_mov = primer_movimiento['Saldo']
-        credito_primer_mov = primer_movimiento['Crédito'] if pd.notna(primer_movimiento['Crédito']) else 0
-        debito_primer_mov = primer_movimiento['Débito'] if pd.notna(primer_movimiento['Débito']) else 0
+        cuentas = self.conciliar_saldos()['cuentas']
 
-        saldo_inicial = saldo_despues_primer_mov - credito_primer_mov + debito_primer_mov
-
-        # Verificar si son NaN
-        if pd.isna(saldo_inicial) or pd.isna(saldo_final):
+        # Verificar si hay saldos
+        if len(cuentas) == 0:
             print("  ADVERTENCIA: La columna 'Saldo' existe pero no tiene valores. No se puede calcular saldo inicial/final.")
             return float('nan'), float('nan')
 
-        return saldo_inicial, saldo_final
+        # Sin omitir NaN: una cuenta sin saldo no puede sumar como 0
+        return cuentas['Saldo_Inicial'].sum(skipna=False), cuentas['Saldo_Final'].sum(skipna=False)
 
     def _validar_coherencia_saldos(self, saldo_inicial: float, saldo_final: float,
                                    ingresos: float, egresos: float) -> Tuple[bool, float]:
@@ -176,109 +299,245 @@ class Analyzer:
 
         return validacion_ok, diferencia
 
-    def _calcular_ingresos(self) -> float:
+    def agregado_categorias(self) -> pd.DataFrame:
         """
-        Calcula el total de ingresos (TODOS los créditos).
+        Agregación única por (Tipo_Movimiento, Categoria_Principal, Categoria_Final, Clasificado).
+
+        Totales, desgloses y conteos de calcular_metricas() salen de esta
+        tabla (ver AgregadosReporte.por_categoria).
 
         Returns:
-            Total de ingresos
+            DataFrame con columnas Tipo_Movimiento, Categoria_Principal,
+            Categoria_Final, Clasificado, Crédito, Débito, Movimientos
         """
-        # Sumar TODOS los créditos (clasificados y sin clasificar)
-        return self.df['Crédito'].sum()
+        return self.agregados.por_categoria()
 
-    def _calcular_egresos(self) -> float:
+    @staticmethod
+    def metricas_categorias(agregados: AgregadosReporte) -> Dict:
         """
-        Calcula el total de egresos (TODOS los débitos).
+        Métricas que dependen solo del agregado por categoría: totales,
+        clasificados / sin clasificar, conteos y desgloses por subcategoría.
+
+        Sirve tanto para los agregados de un DataFrame como para los leídos
+        del cubo (ver metricas_periodo).
+
+        Args:
+            agregados: AgregadosReporte (con por_categoria disponible)
 
         Returns:
-            Total de egresos
+            Diccionario con las métricas por categoría
         """
-        # Sumar TODOS los débitos (clasificados y sin clasificar)
-        return self.df['Débito'].sum()
+        agregado = agregados.por_categoria()
+        clasificado = agregado['Clasificado']
+        ingreso = agregado['Tipo_Movimiento'] == 'Ingreso'
+        egreso = agregado['Tipo_Movimiento'] == 'Egreso'
+
+        # Totales: TODOS los movimientos (clasificados y sin clasificar)
+        total_ingresos = agregado['Crédito'].sum()
+        total_egresos = agregado['Débito'].sum()
+
+        total_movimientos = int(agregado['Movimientos'].sum())
+        movimientos_clasificados = int(agregado.loc[clasificado, 'Movimientos'].sum())
 
-    def _desglose_ingresos(self) -> Dict[str, float]:
+        return {
+            'total_ingresos': total_ingresos,
+            'total_egresos': total_egresos,
+            'variacion': total_ingresos - total_egresos,
+            'balance': total_ingresos - total_egresos,  # Mantener por compatibilidad
+            'ingresos_clasificados': agregado.loc[clasificado & ingreso, 'Crédito'].sum(),
+            'egresos_clasificados': agregado.loc[clasificado & egreso, 'Débito'].sum(),
+            'ingresos_sin_clasificar': agregado.loc[~clasificado, 'Crédito'].sum(),
+            'egresos_sin_clasificar': agregado.loc[~clasificado, 'Débito'].sum(),
+            'total_movimientos': total_movimientos,
+            'movimientos_clasificados': movimientos_clasificados,
+            'movimientos_sin_clasificar': total_movimientos - movimientos_clasificados,
+            'porcentaje_clasificado': (movimientos_clasificados / total_movimientos * 100) if total_movimientos > 0 else 0,
+            'ingresos_por_subcategoria': agregados.ingresos_por_categoria().to_dict(),
+            'egresos_por_subcategoria': agregados.egresos_por_categoria().to_dict(),
+            'alerta_egresos_mayores': total_egresos > total_ingresos,
+        }
+
+    @classmethod
+    def metricas_periodo(cls, cubo, desde: str = None, hasta: str = None) -> Dict:
         """
-        Desglose de ingresos por categoría final.
+        Métricas por categoría de cualquier período, leídas del cubo
+        (sin cargar movimientos).
+
+        Args:
+            cubo: CuboMovimientos
+            desde: Primer día incluido (None = sin límite)
+            hasta: Último día incluido (None = sin límite)
 
         Returns:
-            Diccionario {categoria_final: monto}
+            Diccionario con las métricas por categoría del período
         """
-        df_ingresos = self.df[self.df['Tipo_Movimiento'] == 'Ingreso']
-        desglose = df_ingresos.groupby('Categoria_Final')['Crédito'].sum().to_dict()
-        return desglose
+        return cls.metricas_categorias(cubo.agregados(desde, hasta))
+
+    # Períodos que separan un período del mismo período del año anterior
+    PERIODOS_POR_ANIO = {'D': 364, 'W': 52, 'M': 12}
 
-    def _desglose_egresos(self) -> Dict[str, float]:
+    @classmethod
+    def comparar_periodos(cls, tabla: pd.DataFrame, granularidad: str = 'M',
+                          periodos: int = None) -> Dict:
         """
-        Desglose de egresos por categoría final.
+        Comparativo por Categoria_Final entre períodos, con un único pivot.
+
+        Cada categoría se compara contra el período anterior y contra el mismo
+        período del año anterior (12 meses, 52 semanas o 364 días). Los
+        períodos sin movimientos de una categoría cuentan como 0; los
+        anteriores al primer período con datos quedan en NaN.
+
+        Args:
+            tabla: Importes por período y categoría (formato de
+                AgregadosReporte.por_periodo_categoria o CuboMovimientos.por_periodo_categoria)
+            granularidad: 'D', 'W' o 'M'
+            periodos: Cantidad de períodos a devolver, contando desde el último (None = todos)
 
         Returns:
-            Diccionario {categoria_final: monto}
+            Dict con:
+            - periodos: inicios de los períodos devueltos
+            - importes, variacion, variacion_pct, variacion_interanual,
+              variacion_interanual_pct: DataFrames con índice
+              (Tipo_Movimiento, Categoria_Final) y una columna por período
+            - resumen: DataFrame del último período (actual, anterior, variacion,
+              variacion_pct, anio_anterior, variacion_interanual, variacion_interanual_pct)
         """
-        df_egresos = self.df[self.df['Tipo_Movimiento'] == 'Egreso']
-        desglose = df_egresos.groupby('Categoria_Final')['Débito'].sum().to_dict()
-        return desglose
+        if granularidad not in AgregadosReporte.GRANULARIDADES:
+            raise ValueError(f"Granularidad no soportada: {granularidad} (usar 'D', 'W' o 'M')")
+
+        # Un solo pivot: categorías x períodos, con el calendario completo
+        importes = tabla.pivot_table(index=['Tipo_Movimiento', 'Categoria_Final'], columns='periodo',
+                                     values='importe', aggfunc='sum', fill_value=0.0)
+        if importes.shape[1] > 0:
+            calendario = pd.date_range(importes.columns.min(), importes.columns.max(),
+                                       freq=AgregadosReporte.GRANULARIDADES[granularidad][1])
+            importes = importes.reindex(columns=calendario, fill_value=0.0)
+        importes.columns.name = 'periodo'
+
+        def variaciones(rezago: int):
+            base = importes.shift(rezago, axis=1)
+            delta = importes - base
+            return base, delta, delta / base.where(base != 0) * 100
+
+        anterior, variacion, variacion_pct = variaciones(1)
+        anio_anterior, interanual, interanual_pct = variaciones(cls.PERIODOS_POR_ANIO[granularidad])
+
+        # Recortar a los últimos N períodos recién al final (el interanual usa los previos)
+        columnas = importes.columns if periodos is None else importes.columns[-periodos:]
+        tablas = {
+            'importes': importes,
+            'variacion': variacion,
+            'variacion_pct': variacion_pct,
+            'variacion_interanual': interanual,
+            'variacion_interanual_pct': interanual_pct,
+        }
+        resultado = {'granularidad': granularidad, 'periodos': list(columnas)}
+        resultado.update({clave: valor[columnas] for clave, valor in tablas.items()})
+
+        if len(columnas) == 0:
+            resultado['resumen'] = pd.DataFrame()
+            return resultado
+
+        ultimo = columnas[-1]
+        resumen = pd.DataFrame({
+            'actual': importes[ultimo],
+            'anterior': anterior[ultimo],
+            'variacion': variacion[ultimo],
+            'variacion_pct': variacion_pct[ultimo],
+            'anio_anterior': anio_anterior[ultimo],
+            'variacion_interanual': interanual[ultimo],
+            'variacion_interanual_pct': interanual_pct[ultimo],
+        }).reset_index()
+        # Ingresos primero, cada tipo de mayor a menor importe actual
+        resultado['resumen'] = resumen.sort_values(['Tipo_Movimiento', 'actual'], ascending=[False, False],
+                                                   kind='stable').reset_index(drop=True)
+        return resultado
+
+    def comparativo(self, granularidad: str = 'M', periodos: int = None, cubo=None) -> Dict:
+        """
+        Comparativo por categoría de este Analyzer (ver comparar_periodos).
+
+        Con cubo, la historia sale del cubo (meses anteriores ya procesados)
+        hasta el último movimiento de este Analyzer.
+
+        Args:
+            granularidad: 'D', 'W' o 'M'
+            periodos: Cantidad de períodos a devolver (None = todos)
+            cubo: CuboMovimientos con la historia (opcional)
+
+        Returns:
+            Dict de comparar_periodos
+        """
+        if cubo is not None:
+            tabla = cubo.por_periodo_categoria(granularidad, hasta=self.rango_fechas()[1])
+        else:
+            tabla = self.agregados.por_periodo_categoria(granularidad)
+        return self.comparar_periodos(tabla, granularidad, periodos)
 
     def _top_prestadores(self, n: int = 10) -> List[Dict]:
         """
         Top N prestadores por monto.
 
+        Los movimientos se agrupan por entidad (documento o nombre normalizado,
+        ver AgregadosReporte.entidades_prestadores), no por la grafía del
+        nombre. Los que no identifican prestador (sin nombre ni documento, ej:
+        cheques) quedan fuera antes de ordenar.
+
         Args:
             n: Número de prestadores a retornar
 
         Returns:
-            Lista de diccionarios con nombre y monto
+            Lista de diccionarios con nombre, documento y monto
         """
-        df_prestadores = self.df[self.df['Categoria_Principal'] == 'Prestadores']
+        df_prestadores = self.agregados.prestadores()
 
         if len(df_prestadores) == 0:
             return []
 
-        # Agrupar por nombre de persona
-        top = df_prestadores.groupby('Persona_Nombre')['Débito'].sum().sort_values(ascending=False).head(n)
+        entidad = self.agregados.entidades_prestadores()
+        top = df_prestadores['Débito'].groupby(entidad).sum().nlargest(n)
+
+        # Nombre a mostrar: la grafía más frecuente de cada entidad del top
+        en_top = entidad.isin(top.index)
+        if 'Persona_Nombre' in df_prestadores.columns:
+            nombres = df_prestadores.loc[en_top, 'Persona_Nombre']
+            nombres = nombres[nombres.notna() & (nombres.astype(str) != 'None')].astype(str)
+            nombres = nombres.groupby(entidad[en_top]).agg(lambda grafias: grafias.value_counts().index[0])
+        else:
+            nombres = pd.Series(dtype=object)
 
         resultado = []
-        for nombre, monto in top.items():
-            if pd.notna(nombre) and nombre != 'None':
-                resultado.append({
-                    'nombre': nombre,
-                    'monto': monto
-                })
+        for id_entidad, monto in top.items():
+            documento = id_entidad[4:] if id_entidad.startswith('DOC:') else None
+            resultado.append({
+                'nombre': nombres.get(id_entidad, f"Documento {documento}"),
+                'documento': documento,
+                'monto': monto
+            })
 
         return resultado
 
     def _flujo_diario(self) -> pd.DataFrame:
         """
-        Calcula el flujo de caja diario.
+        Calcula el flujo de caja diario (solo movimientos clasificados).
 
         Returns:
             DataFrame con columnas: fecha, ingresos, egresos
         """
-        # Extraer solo la fecha (sin hora)
-        self.df['Fecha_Solo'] = pd.to_datetime(self.df['Fecha']).dt.date
-
-        # Filtrar solo clasificados
-        df_clasificados = self.df[self.df['Categoria_Principal'] != 'Sin Clasificar'].copy()
-
-        # Calcular ingresos por fecha
-        ingresos_diarios = df_clasificados[df_clasificados['Tipo_Movimiento'] == 'Ingreso'].groupby('Fecha_Solo')['Crédito'].sum()
-
-        # Calcular egresos por fecha
-        egresos_diarios = df_clasificados[df_clasificados['Tipo_Movimiento'] == 'Egreso'].groupby('Fecha_Solo')['Débito'].sum()
+        return self.agregados.flujo_caja('D')
 
-        # Obtener todas las fechas únicas
-        todas_fechas = sorted(df_clasificados['Fecha_Solo'].unique())
-
-        # Crear DataFrame con todas las fechas
-        flujo = pd.DataFrame({'fecha': todas_fechas})
-
-        # Mapear ingresos y egresos
-        flujo['ingresos'] = flujo['fecha'].map(ingresos_diarios).fillna(0)
-        flujo['egresos'] = flujo['fecha'].map(egresos_diarios).fillna(0)
+    def flujo_caja(self, granularidad: str = 'D', rellenar_calendario: bool = False) -> pd.DataFrame:
+        """
+        Calcula el flujo de caja diario, semanal o mensual.
 
-        # Ordenar por fecha
-        flujo = flujo.sort_values('fecha')
+        Args:
+            granularidad: 'D' (diario), 'W' (semanal) o 'M' (mensual)
+            rellenar_calendario: Si True, incluye los períodos sin movimientos con 0
 
-        return flujo
+        Returns:
+            DataFrame con columnas: fecha, ingresos, egresos
+        """
+        return self.agregados.flujo_caja(granularidad, rellenar_calendario)
 
     def _mostrar_resumen(self):
         """
@@ -311,8 +570,22 @@ class Analyzer:
 
         print(f"Variación:       ${self.metricas['variacion']:,.2f}")
 
+        # Saldos por cuenta (solo si hay más de una)
+        cuentas = self.metricas['saldos_por_cuenta']
+        if len(cuentas) > 1:
+            print(f"\nSaldos por cuenta:")
+            for _, cuenta in cuentas.iterrows():
+                nombre = ' '.join(str(cuenta[c]) for c in ['Banco', 'Cuenta'] if c in cuenta.index)
+                print(f"  {nombre}: ${cuenta['Saldo_Inicial']:,.2f} -> ${cuenta['Saldo_Final']:,.2f}")
+
         # Validación de coherencia
-        if not self.metricas['validacion_saldos_ok']:
+        quiebres = self.metricas['quiebres_saldo']
+        if len(quiebres) > 0:
+            print(f"\nADVERTENCIA: {len(quiebres)} quiebre(s) en el saldo corrido (ver hoja Conciliación):")
+            for _, fila in quiebres.head(5).iterrows():
+                print(f"  {fila['Fecha']} {fila.get('Banco', '')}: {fila['Tipo_Quiebre']} "
+                      f"(diferencia ${fila['Diferencia']:,.2f})")
+        if not self.metricas['validacion_saldos_ok'] and self.metricas['diferencia_validacion'] >= 1.0:
             print(f"\nADVERTENCIA: Diferencia en validación de saldos: ${self.metricas['diferencia_validacion']:,.2f}")
             print("El saldo final no coincide con: Saldo Inicial + Ingresos - Egresos")
 
@@ -336,16 +609,13 @@ class Analyzer:
             for i, prestador in enumerate(self.metricas['top_prestadores'], 1):
                 print(f"  {i}. {prestador['nombre']}: ${prestador['monto']:,.2f}")
 
-    def obtener_metricas(self) -> Dict:
+    def obtener_metricas(self) -> MetricasFinancieras:
         """
-        Retorna las métricas calculadas.
+        Retorna las métricas (se calculan al leerlas, sin imprimir el resumen).
 
         Returns:
-            Diccionario con métricas
+            MetricasFinancieras con todas las métricas
         """
-        if not self.metricas:
-            self.calcular_metricas()
-
         return self.metricas
 
     def obtener_sin_clasificar(self) -> pd.DataFrame:
@@ -355,4 +625,4 @@ class Analyzer:
         Returns:
             DataFrame con movimientos sin clasificar
         """
-        return self.df[self.df['Categoria_Principal'] == 'Sin Clasificar'].copy()
+        return self.agregados.sin_clasificar().copy()
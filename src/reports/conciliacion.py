@@ -0,0 +1,154 @@
+"""
+Conciliación de saldos por cuenta - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+En una tabla consolidada conviven varias cuentas (ej: Supervielle y
+Galicia), así que el primer y último Saldo de toda la tabla no significan
+nada. ConciliadorSaldos verifica, por cuenta, que cada movimiento encadene
+con el anterior:
+
+    Saldo[i] = Saldo[i-1] + Crédito[i] - Débito[i]
+
+El encadenamiento se verifica por posición, en el orden cronológico de cada
+cuenta: el saldo previo de cada movimiento (Saldo - Crédito + Débito) tiene
+que ser el Saldo de la fila anterior de la misma cuenta. Los movimientos con
+la misma fecha y hora respetan el orden del extracto, que es el orden en que
+el banco los aplicó. El saldo inicial es el previo de la primera fila y el
+final el Saldo de la última. Todo se resuelve con operaciones vectorizadas
+sobre arrays (un orden y un corrimiento de una fila), sin recorrer filas en
+Python.
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class ConciliadorSaldos:
+    """
+    Concilia el saldo corrido de cada cuenta y marca los quiebres.
+
+    Un quiebre es un movimiento cuyo saldo previo no es el Saldo del
+    movimiento anterior de la cuenta (faltan movimientos o un extracto
+    intermedio) o una fila repetida (movimiento duplicado).
+
+    Uso:
+        resultado = ConciliadorSaldos(df).conciliar()
+        resultado['cuentas']   # saldo inicial/final por cuenta
+        resultado['quiebres']  # movimientos donde se corta la cadena
+    """
+
+    TIPO_DUPLICADO = 'Movimiento duplicado'
+    TIPO_SALTO = 'Salto de saldo (faltan movimientos)'
+
+    COLUMNAS_QUIEBRE = ['Fecha', 'Concepto', 'Detalle', 'Débito', 'Crédito', 'Saldo']
+
+    def __init__(self, df: pd.DataFrame, tolerancia: float = 0.01):
+        """
+        Args:
+            df: Movimientos con Fecha, Débito, Crédito, Saldo, Banco
+                (y opcionalmente Cuenta)
+            tolerancia: Diferencia máxima (en pesos) para considerar dos saldos iguales
+        """
+        self.df = df
+        self.tolerancia = tolerancia
+        self.claves_cuenta: List[str] = [c for c in ['Banco', 'Cuenta'] if c in df.columns]
+
+    def _ordenar(self) -> pd.DataFrame:
+        """
+        Movimientos con Saldo en orden cronológico dentro de cada cuenta.
+
+        Para movimientos con la misma fecha y hora se respeta el orden del
+        archivo (invertido si el extracto viene del más reciente al más antiguo).
+        """
+        df = self.df[self.df['Saldo'].notna().to_numpy() & self.df['Fecha'].notna().to_numpy()]
+        df = df.assign(_cuenta=self._codigo_cuenta(df))
+
+        posicion = np.arange(len(df))
+        fechas = df.groupby('_cuenta')['Fecha']
+        descendente = (fechas.transform('first') > fechas.transform('last')).to_numpy()
+        orden_archivo = np.where(descendente, -posicion, posicion)
+
+        orden = np.lexsort((orden_archivo, df['Fecha'].to_numpy(), df['_cuenta'].to_numpy()))
+        return df.iloc[orden]
+
+    def _codigo_cuenta(self, df: pd.DataFrame) -> np.ndarray:
+        if not self.claves_cuenta:
+            return np.zeros(len(df), dtype=np.int64)
+        claves = df[self.claves_cuenta].astype(str)
+        return claves.groupby(self.claves_cuenta, sort=False).ngroup().to_numpy()
+
+    def conciliar(self) -> Dict:
+        """
+        Concilia todas las cuentas.
+
+        Returns:
+            Dict con:
+            - ok: True si ninguna cuenta tiene quiebres
+            - cuentas: DataFrame por cuenta (Movimientos, Desde, Hasta, Saldo_Inicial,
+              Saldo_Final, Ingresos, Egresos, Quiebres, Diferencia)
+            - quiebres: DataFrame con los movimientos donde se corta la cadena
+              (Saldo_Previo, Saldo_Esperado, Diferencia, Tipo_Quiebre)
+        """
+        df = self._ordenar()
+        if len(df) == 0:
+            return {'ok': True, 'cuentas': pd.DataFrame(), 'quiebres': pd.DataFrame()}
+
+        cuenta = df['_cuenta'].to_numpy()
+        credito = df['Crédito'].fillna(0.0).to_numpy(dtype=float)
+        debito = df['Débito'].fillna(0.0).to_numpy(dtype=float)
+        saldo = df['Saldo'].to_numpy(dtype=float)
+        saldo_previo = saldo - credito + debito
+
+        # Saldo[i-1] + Crédito[i] - Débito[i] == Saldo[i], fila a fila dentro de cada cuenta
+        primera = np.r_[True, cuenta[1:] != cuenta[:-1]]
+        saldo_esperado = np.where(primera, np.nan, np.r_[np.nan, saldo[:-1]])
+        # Comparar saldos en unidades de tolerancia (enteros, sin errores de redondeo)
+        escala = 1.0 / self.tolerancia
+        quiebre = ~primera & (np.rint(saldo_previo * escala) != np.rint(np.nan_to_num(saldo_esperado) * escala))
+
+        # Fila repetida: igual a la anterior de la misma cuenta (fecha, importes y saldo)
+        fecha = df['Fecha'].to_numpy()
+        igual_anterior = np.zeros(len(df), dtype=bool)
+        igual_anterior[1:] = ((fecha[1:] == fecha[:-1]) & (credito[1:] == credito[:-1])
+                              & (debito[1:] == debito[:-1]) & (saldo[1:] == saldo[:-1]))
+        duplicado = quiebre & igual_anterior
+
+        quiebres = df.loc[quiebre, self.claves_cuenta + [c for c in self.COLUMNAS_QUIEBRE if c in df.columns]].copy()
+        quiebres['Saldo_Previo'] = saldo_previo[quiebre]
+        quiebres['Saldo_Esperado'] = saldo_esperado[quiebre]
+        quiebres['Diferencia'] = (quiebres['Saldo_Previo'] - quiebres['Saldo_Esperado']).round(2)
+        quiebres['Tipo_Quiebre'] = np.where(duplicado[quiebre], self.TIPO_DUPLICADO, self.TIPO_SALTO)
+
+        cuentas = self._resumen_cuentas(df, credito, debito, saldo_previo, saldo, quiebre)
+
+        return {
+            'ok': len(quiebres) == 0,
+            'cuentas': cuentas,
+            'quiebres': quiebres.reset_index(drop=True),
+        }
+
+    def _resumen_cuentas(self, df: pd.DataFrame, credito: np.ndarray, debito: np.ndarray,
+                         saldo_previo: np.ndarray, saldo: np.ndarray, quiebre: np.ndarray) -> pd.DataFrame:
+        """Saldo inicial/final, totales y cantidad de quiebres por cuenta (df ordenado por cuenta)."""
+        fecha = df['Fecha'].to_numpy()
+        primera_fila = np.flatnonzero(np.r_[True, df['_cuenta'].to_numpy()[1:] != df['_cuenta'].to_numpy()[:-1]])
+        ultima_fila = np.r_[primera_fila[1:] - 1, len(df) - 1]
+        por_cuenta = pd.DataFrame({
+            'Movimientos': ultima_fila - primera_fila + 1,
+            'Desde': fecha[primera_fila],
+            'Hasta': fecha[ultima_fila],
+            'Saldo_Inicial': saldo_previo[primera_fila],
+            'Saldo_Final': saldo[ultima_fila],
+            'Ingresos': np.add.reduceat(credito, primera_fila),
+            'Egresos': np.add.reduceat(debito, primera_fila),
+            'Quiebres': np.add.reduceat(quiebre.astype(np.int64), primera_fila),
+        })
+        por_cuenta['Diferencia'] = (por_cuenta['Saldo_Final'] - (
+            por_cuenta['Saldo_Inicial'] + por_cuenta['Ingresos'] - por_cuenta['Egresos'])).round(2) + 0.0
+
+        if self.claves_cuenta:
+            nombres = df[self.claves_cuenta].iloc[primera_fila].reset_index(drop=True)
+            por_cuenta = pd.concat([nombres, por_cuenta], axis=1)
+
+        return por_cuenta
@@ -0,0 +1,303 @@
+"""
+Cubo de movimientos agregados - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+Agregado persistente (SQLite) a nivel día × banco × Categoria_Principal ×
+Categoria_Final × Tipo_Movimiento. Se actualiza de forma incremental cada
+vez que se categorizan movimientos y permite responder las métricas de
+cualquier período (mes a mes, acumulado del año) sin volver a leer los
+movimientos de meses anteriores.
+"""
+import hashlib
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from .agregados import AgregadosReporte
+
+
+class CuboMovimientos:
+    """
+    Cubo OLAP local sobre SQLite.
+
+    Cada actualización reemplaza los pares (día, banco) presentes en el lote,
+    por lo que volver a cargar un archivo ya cargado (por ejemplo tras
+    correcciones o reclasificación) no duplica importes.
+
+    Uso:
+        cubo = CuboMovimientos('output/cubo_movimientos.sqlite')
+        cubo.actualizar(df_categorizado)
+        mensual = cubo.mensual()
+        ytd = cubo.acumulado_anual()
+    """
+
+    DIMENSIONES = ['fecha', 'banco', 'categoria_principal', 'categoria_final', 'tipo_movimiento']
+
+    def __init__(self, ruta_db: str):
+        """
+        Args:
+            ruta_db: Ruta del archivo SQLite (se crea si no existe)
+        """
+        self.ruta_db = ruta_db
+        directorio = os.path.dirname(os.path.abspath(ruta_db))
+        os.makedirs(directorio, exist_ok=True)
+        self._crear_esquema()
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión con commit al salir sin error y cierre siempre."""
+        conexion = sqlite3.connect(self.ruta_db)
+        try:
+            with conexion:
+                yield conexion
+        finally:
+            conexion.close()
+
+    def _crear_esquema(self):
+        with self._conectar() as conexion:
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS cubo (
+                    fecha TEXT NOT NULL,
+                    banco TEXT NOT NULL,
+                    categoria_principal TEXT NOT NULL,
+                    categoria_final TEXT NOT NULL,
+                    tipo_movimiento TEXT NOT NULL,
+                    movimientos INTEGER NOT NULL,
+                    credito REAL NOT NULL,
+                    debito REAL NOT NULL,
+                    PRIMARY KEY (fecha, banco, categoria_principal, categoria_final, tipo_movimiento)
+                )
+            """)
+
+    def actualizar(self, df: pd.DataFrame) -> int:
+        """
+        Agrega los movimientos por día y dimensiones y los guarda en el cubo.
+
+        Los pares (día, banco) presentes en df se reemplazan por completo.
+
+        Args:
+            df: Movimientos categorizados (Fecha, Crédito, Débito, Tipo_Movimiento,
+                Categoria_Principal, Categoria_Final y opcionalmente Banco)
+
+        Returns:
+            Cantidad de celdas del cubo escritas
+        """
+        fecha = pd.to_datetime(df['Fecha'], errors='coerce')
+        validos = fecha.notna().to_numpy()
+        if not validos.any():
+            return 0
+
+        def texto(columna: str, defecto: str) -> pd.Series:
+            if columna not in df.columns:
+                return pd.Series(defecto, index=df.index[validos])
+            return df[columna][validos].fillna(defecto).astype(str)
+
+        lote = pd.DataFrame({
+            'fecha': fecha[validos].dt.strftime('%Y-%m-%d'),
+            'banco': texto('Banco', 'Sin Banco'),
+            'categoria_principal': texto('Categoria_Principal', 'Sin Clasificar'),
+            'categoria_final': texto('Categoria_Final', 'Sin Clasificar'),
+            'tipo_movimiento': texto('Tipo_Movimiento', ''),
+            'credito': df['Crédito'][validos].fillna(0.0).astype(float),
+            'debito': df['Débito'][validos].fillna(0.0).astype(float),
+        })
+        celdas = (lote.groupby(self.DIMENSIONES, sort=False)
+                  .agg(movimientos=('credito', 'size'), credito=('credito', 'sum'), debito=('debito', 'sum'))
+                  .reset_index())
+        pares = celdas[['fecha', 'banco']].drop_duplicates()
+
+        with self._conectar() as conexion:
+            conexion.execute("CREATE TEMP TABLE lote_pares (fecha TEXT, banco TEXT)")
+            conexion.executemany("INSERT INTO lote_pares VALUES (?, ?)", pares.itertuples(index=False))
+            conexion.execute("""
+                DELETE FROM cubo WHERE EXISTS (
+                    SELECT 1 FROM lote_pares p WHERE p.fecha = cubo.fecha AND p.banco = cubo.banco
+                )
+            """)
+            conexion.executemany(
+                "INSERT INTO cubo (fecha, banco, categoria_principal, categoria_final, tipo_movimiento, "
+                "movimientos, credito, debito) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                celdas[self.DIMENSIONES + ['movimientos', 'credito', 'debito']].itertuples(index=False)
+            )
+            conexion.execute("DROP TABLE lote_pares")
+
+        return len(celdas)
+
+    def huella(self) -> str:
+        """
+        Huella (sha256) del contenido del cubo, para saber si cambió entre corridas.
+
+        Returns:
+            Huella hexadecimal
+        """
+        h = hashlib.sha256()
+        with self._conectar() as conexion:
+            filas = conexion.execute(
+                f"SELECT * FROM cubo ORDER BY {', '.join(self.DIMENSIONES)}")
+            for fila in filas:
+                h.update(repr(fila).encode('utf-8'))
+        return h.hexdigest()
+
+    @staticmethod
+    def _filtro_fechas(desde: Optional[str], hasta: Optional[str]) -> Tuple[str, list]:
+        condiciones, parametros = [], []
+        if desde is not None:
+            condiciones.append("fecha >= ?")
+            parametros.append(pd.Timestamp(desde).strftime('%Y-%m-%d'))
+        if hasta is not None:
+            condiciones.append("fecha <= ?")
+            parametros.append(pd.Timestamp(hasta).strftime('%Y-%m-%d'))
+        return (" WHERE " + " AND ".join(condiciones)) if condiciones else "", parametros
+
+    def rango_fechas(self) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """
+        Returns:
+            Tupla (primer día, último día) con datos, o (None, None) si el cubo está vacío
+        """
+        with self._conectar() as conexion:
+            minimo, maximo = conexion.execute("SELECT MIN(fecha), MAX(fecha) FROM cubo").fetchone()
+        if minimo is None:
+            return None, None
+        return pd.Timestamp(minimo), pd.Timestamp(maximo)
+
+    def por_categoria(self, desde: str = None, hasta: str = None) -> pd.DataFrame:
+        """
+        Agregado por categoría del período, con el mismo formato que
+        AgregadosReporte.por_categoria().
+
+        Args:
+            desde: Primer día incluido (None = sin límite)
+            hasta: Último día incluido (None = sin límite)
+
+        Returns:
+            DataFrame con columnas Tipo_Movimiento, Categoria_Principal,
+            Categoria_Final, Clasificado, Crédito, Débito, Movimientos
+        """
+        where, parametros = self._filtro_fechas(desde, hasta)
+        with self._conectar() as conexion:
+            tabla = pd.read_sql_query(
+                "SELECT tipo_movimiento AS Tipo_Movimiento, categoria_principal AS Categoria_Principal, "
+                "categoria_final AS Categoria_Final, SUM(credito) AS \"Crédito\", SUM(debito) AS \"Débito\", "
+                "SUM(movimientos) AS Movimientos FROM cubo" + where +
+                " GROUP BY tipo_movimiento, categoria_principal, categoria_final",
+                conexion, params=parametros
+            )
+        tabla.insert(3, 'Clasificado', tabla['Categoria_Principal'] != 'Sin Clasificar')
+        return tabla
+
+    def agregados(self, desde: str = None, hasta: str = None) -> AgregadosReporte:
+        """
+        AgregadosReporte del período servido desde el cubo (sin movimientos).
+
+        Solo están disponibles los agregados por categoría (por_categoria,
+        ingresos_por_categoria, egresos_por_categoria, resumen_principal,
+        total_categoria_final).
+
+        Args:
+            desde: Primer día incluido
+            hasta: Último día incluido
+
+        Returns:
+            AgregadosReporte con la tabla por categoría precargada
+        """
+        return AgregadosReporte.desde_tabla(self.por_categoria(desde, hasta))
+
+    def por_periodo_categoria(self, granularidad: str = 'M', desde: str = None,
+                              hasta: str = None) -> pd.DataFrame:
+        """
+        Importe por (período, Tipo_Movimiento, Categoria_Final), con el mismo
+        formato que AgregadosReporte.por_periodo_categoria().
+
+        Args:
+            granularidad: 'D', 'W' o 'M'
+            desde: Primer día incluido
+            hasta: Último día incluido
+
+        Returns:
+            DataFrame con columnas periodo, Tipo_Movimiento, Categoria_Final,
+            importe, movimientos
+        """
+        where, parametros = self._filtro_fechas(desde, hasta)
+        where += (" AND " if where else " WHERE ") + "tipo_movimiento IN ('Ingreso', 'Egreso')"
+        with self._conectar() as conexion:
+            diario = pd.read_sql_query(
+                "SELECT fecha, tipo_movimiento AS Tipo_Movimiento, categoria_final AS Categoria_Final, "
+                "SUM(CASE WHEN tipo_movimiento = 'Ingreso' THEN credito ELSE debito END) AS importe, "
+                "SUM(movimientos) AS movimientos FROM cubo" + where +
+                " GROUP BY fecha, tipo_movimiento, categoria_final",
+                conexion, params=parametros
+            )
+        diario['periodo'] = AgregadosReporte.inicio_periodo(
+            pd.to_datetime(diario['fecha'], format='%Y-%m-%d'), granularidad)
+        return (diario.groupby(['periodo', 'Tipo_Movimiento', 'Categoria_Final'])[['importe', 'movimientos']]
+                .sum()
+                .reset_index())
+
+    def mensual(self, desde: str = None, hasta: str = None) -> pd.DataFrame:
+        """
+        Serie mes a mes con variación respecto del mes anterior.
+
+        Args:
+            desde: Primer día incluido
+            hasta: Último día incluido
+
+        Returns:
+            DataFrame con columnas mes, ingresos, egresos, variacion, movimientos,
+            ingresos_vs_mes_anterior, egresos_vs_mes_anterior (en %)
+        """
+        where, parametros = self._filtro_fechas(desde, hasta)
+        with self._conectar() as conexion:
+            mensual = pd.read_sql_query(
+                "SELECT substr(fecha, 1, 7) AS mes, SUM(credito) AS ingresos, SUM(debito) AS egresos, "
+                "SUM(movimientos) AS movimientos FROM cubo" + where + " GROUP BY mes ORDER BY mes",
+                conexion, params=parametros
+            )
+        mensual['mes'] = pd.to_datetime(mensual['mes'], format='%Y-%m')
+        mensual.insert(3, 'variacion', mensual['ingresos'] - mensual['egresos'])
+
+        # Variación % contra el mes calendario anterior (NaN si ese mes no tiene datos o es 0)
+        anterior = (mensual.set_index('mes')[['ingresos', 'egresos']].shift(1, freq='MS')
+                    .reindex(mensual['mes']).set_index(mensual.index))
+        for columna in ['ingresos', 'egresos']:
+            base = anterior[columna].where(anterior[columna] != 0)
+            mensual[f'{columna}_vs_mes_anterior'] = (mensual[columna] - base) / base * 100
+
+        return mensual
+
+    def acumulado_anual(self, hasta: str = None) -> Dict:
+        """
+        Acumulado del año (YTD) hasta una fecha.
+
+        Args:
+            hasta: Fecha de corte (default: último día con datos)
+
+        Returns:
+            Dict con anio, desde, hasta, ingresos, egresos, variacion, movimientos
+        """
+        if hasta is None:
+            hasta = self.rango_fechas()[1]
+            if hasta is None:
+                return {'anio': None, 'desde': None, 'hasta': None,
+                        'ingresos': 0.0, 'egresos': 0.0, 'variacion': 0.0, 'movimientos': 0}
+
+        hasta = pd.Timestamp(hasta)
+        desde = pd.Timestamp(year=hasta.year, month=1, day=1)
+        where, parametros = self._filtro_fechas(desde, hasta)
+        with self._conectar() as conexion:
+            ingresos, egresos, movimientos = conexion.execute(
+                "SELECT COALESCE(SUM(credito), 0), COALESCE(SUM(debito), 0), COALESCE(SUM(movimientos), 0) "
+                "FROM cubo" + where, parametros
+            ).fetchone()
+
+        return {
+            'anio': hasta.year,
+            'desde': desde,
+            'hasta': hasta,
+            'ingresos': ingresos,
+            'egresos': egresos,
+            'variacion': ingresos - egresos,
+            'movimientos': movimientos,
+        }
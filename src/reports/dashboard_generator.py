@@ -2,43 +2,104 @@
 Generador de dashboard HTML interactivo - TORO · Resumen de Cuentas
 Autor: Sistema TORO
 """
-import pandas as pd
+import base64
+import gzip
+import html
 import json
+import os
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .agregados import AgregadosReporte
+from .conciliacion import ConciliadorSaldos
+from .cubo import CuboMovimientos
+from .plantilla_dashboard import PLANTILLA_COMPARATIVA, PLANTILLA_DASHBOARD, PLANTILLA_DASHBOARD_MINIFICADA
+from .submuestreo import indices_series
+
 
 class DashboardGenerator:
     """
     Genera dashboard HTML interactivo con Chart.js.
+
+    En modo offline el HTML es un único archivo autocontenido: Chart.js
+    embebido desde la copia local (reports/vendor/chart.umd.min.js) y la
+    plantilla minificada, para equipos sin acceso a internet.
+
+    En modo servidor (ver reports.servidor) el HTML no trae datos: muestra
+    un panel de filtros y pide los datos a la API local con cada consulta.
     """
 
-    def __init__(self, df: pd.DataFrame, metricas: Dict):
+    # Filas por bloque al escribir tablas largas
+    FILAS_POR_BLOQUE = 5000
+
+    # Chart.js: CDN en modo normal, copia local embebida en modo offline
+    URL_CHARTJS = "https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"
+    RUTA_CHARTJS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vendor', 'chart.umd.min.js')
+
+    # Puntos máximos del gráfico de flujo: más días se reducen ('lttb' o 'minmax')
+    # y la serie diaria completa queda embebida para tooltips y zoom
+    PUNTOS_FLUJO = 500
+    METODO_FLUJO = 'lttb'
+
+    # Presupuestos de tamaño del HTML en KB (se informan al generar)
+    PRESUPUESTO_KB = {'chartjs': 256, 'datos': 512, 'total': 8192}
+
+    def __init__(self, df: pd.DataFrame, metricas: Dict, agregados: AgregadosReporte = None,
+                 cubo: CuboMovimientos = None, comparativo: Dict = None,
+                 offline: bool = False, comprimir_datos: bool = False, ruta_chartjs: str = None,
+                 servidor: bool = False):
         """
         Args:
             df: DataFrame con movimientos categorizados (con columnas Tipo_Movimiento, Categoria_Final)
             metricas: Diccionario con métricas calculadas
+            agregados: Agregados ya calculados sobre df (ej: Analyzer.agregados).
+                Si es None se crean aquí.
+            cubo: Cubo histórico para la sección mes a mes / acumulado del año (opcional)
+            comparativo: Comparativo por categoría (ver Analyzer.comparativo). Opcional.
+            offline: Embeber Chart.js y minificar la plantilla (sin dependencias de red)
+            comprimir_datos: Embeber los datos de los gráficos como gzip+base64
+                (se comprimen igual si superan el presupuesto de datos)
+            ruta_chartjs: Copia local de Chart.js (default: RUTA_CHARTJS)
+            servidor: HTML para el servidor local: panel de filtros y datos
+                pedidos a /api/datos en lugar de embebidos
         """
         self.df = df
         self.metricas = metricas
+        self.agregados = agregados if agregados is not None else AgregadosReporte(df)
+        self.cubo = cubo
+        self.comparativo = comparativo
+        self.offline = offline
+        self.comprimir_datos = comprimir_datos
+        self.ruta_chartjs = ruta_chartjs or self.RUTA_CHARTJS
+        self.servidor = servidor
 
         # Filtrar sin clasificar
-        self.df_sin_clasificar = df[df['Categoria_Principal'] == 'Sin Clasificar'].copy()
+        self.df_sin_clasificar = self.agregados.sin_clasificar()
 
     def generar_html(self, ruta_salida: str):
         """
         Genera el archivo HTML del dashboard.
 
+        El HTML se escribe por fragmentos (ver Plantilla): las tablas largas
+        no se arman completas en memoria.
+
         Args:
             ruta_salida: Ruta donde guardar el HTML
-        """
-        print(f"\nGenerando dashboard HTML...")
 
-        html = self._crear_html()
+        Returns:
+            Dict con el tamaño en bytes de chartjs, datos, tablas y total
+        """
+        print(f"\nGenerando dashboard HTML{' (offline)' if self.offline else ''}...")
 
-        with open(ruta_salida, 'w', encoding='utf-8') as f:
-            f.write(html)
+        # newline='': sin traducir saltos de línea, el tamaño informado es el del archivo
+        with open(ruta_salida, 'w', encoding='utf-8', newline='') as f:
+            tamanios = self._plantilla().escribir(f, self._valores_plantilla())
 
         print(f"OK Dashboard generado: {ruta_salida}")
+        return self._informar_tamanios(tamanios)
 
     def _crear_html(self) -> str:
         """
@@ -47,655 +108,270 @@ class DashboardGenerator:
         Returns:
             String con el HTML
         """
-        # Calcular datos REALES desde el DataFrame categorizado
-        ingresos_por_categoria = self._calcular_ingresos_por_categoria()
-        egresos_por_categoria = self._calcular_egresos_por_categoria()
-        kpis = self._calcular_kpis_adicionales()
-        resumen_categorias = self._calcular_resumen_categorias()
-        alertas = self._generar_alertas()
-
-        # Preparar datos para gráficos
-        datos_ingresos = self._preparar_datos_torta(ingresos_por_categoria)
-        datos_egresos = self._preparar_datos_torta(egresos_por_categoria)
-        datos_flujo = self._preparar_datos_flujo(self.metricas['flujo_diario'])
-
-        # Color del balance
-        balance_color = '#28a745' if self.metricas['balance'] >= 0 else '#dc3545'
-
-        # Fecha de generación
-        fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M")
-
-        html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>TORO · Resumen de Cuentas – Dashboard Financiero</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-    <style>
-        /*
-        TORO Color Palette:
-        --toro-verde: #059669 (verde petróleo - color principal)
-        --toro-verde-oscuro: #047857 (verde oscuro)
-        --toro-acento: #0ea5e9 (azul acento)
-        --toro-verde-claro: #10b981 (verde claro para destacados)
-        */
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #059669 0%, #047857 100%);
-            padding: 20px;
-            min-height: 100vh;
-        }}
-
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
-            overflow: hidden;
-        }}
-
-        .header {{
-            background: linear-gradient(135deg, #059669 0%, #0ea5e9 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }}
-
-        .header p {{
-            font-size: 1.1em;
-            opacity: 0.9;
-        }}
-
-        .content {{
-            padding: 30px;
-        }}
-
-        .cards {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-
-        .card {{
-            background: white;
-            border-radius: 10px;
-            padding: 25px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            border-left: 4px solid;
-        }}
-
-        .card.ingresos {{
-            border-color: #28a745;
-        }}
-
-        .card.egresos {{
-            border-color: #dc3545;
-        }}
-
-        .card.variacion {{
-            border-color: {balance_color};
-        }}
-
-        .card.clasificados {{
-            border-color: #0ea5e9;
-        }}
-
-        .card.saldo-inicial {{
-            border-color: #059669;
-        }}
-
-        .card.saldo-final {{
-            border-color: #0ea5e9;
-        }}
-
-        .card.debin {{
-            border-color: #10b981;
-        }}
-
-        .card.prestadores {{
-            border-color: #059669;
-        }}
-
-        .card.mayor-egreso {{
-            border-color: #dc3545;
-        }}
-
-        .card.mayor-ingreso {{
-            border-color: #10b981;
-        }}
-
-        .card-title {{
-            font-size: 0.9em;
-            color: #666;
-            text-transform: uppercase;
-            margin-bottom: 10px;
-            font-weight: 600;
-        }}
-
-        .card-value {{
-            font-size: 2em;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-
-        .card.ingresos .card-value {{
-            color: #28a745;
-        }}
-
-        .card.egresos .card-value {{
-            color: #dc3545;
-        }}
-
-        .card.variacion .card-value {{
-            color: {balance_color};
-        }}
-
-        .card.clasificados .card-value {{
-            color: #0ea5e9;
-        }}
-
-        .card.saldo-inicial .card-value {{
-            color: #059669;
-        }}
-
-        .card.saldo-final .card-value {{
-            color: #0ea5e9;
-        }}
-
-        .card.debin .card-value {{
-            color: #10b981;
-        }}
-
-        .card.prestadores .card-value {{
-            color: #059669;
-        }}
-
-        .card.mayor-egreso .card-value {{
-            color: #dc3545;
-        }}
-
-        .card.mayor-ingreso .card-value {{
-            color: #10b981;
-        }}
-
-        .card-subtitle {{
-            font-size: 0.85em;
-            color: #999;
-        }}
-
-        .charts {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 30px;
-            margin-bottom: 30px;
-        }}
-
-        .chart-container {{
-            background: white;
-            border-radius: 10px;
-            padding: 25px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-
-        .chart-title {{
-            font-size: 1.3em;
-            font-weight: 600;
-            margin-bottom: 20px;
-            color: #333;
-        }}
-
-        .chart-full {{
-            grid-column: 1 / -1;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 10px;
-        }}
-
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-
-        th {{
-            background-color: #f8f9fa;
-            font-weight: 600;
-            color: #333;
-        }}
-
-        tr:hover {{
-            background-color: #f8f9fa;
-        }}
-
-        .alert {{
-            background-color: #fff3cd;
-            border: 1px solid #ffc107;
-            border-radius: 5px;
-            padding: 15px;
-            margin-bottom: 20px;
-            color: #856404;
-        }}
-
-        .alert-danger {{
-            background-color: #f8d7da;
-            border-color: #dc3545;
-            color: #721c24;
-        }}
-
-        .alert-info {{
-            background-color: #d1ecf1;
-            border-color: #17a2b8;
-            color: #0c5460;
-        }}
-
-        .alert-success {{
-            background-color: #d4edda;
-            border-color: #28a745;
-            color: #155724;
-        }}
-
-        .summary-table {{
-            width: 100%;
-            margin-top: 15px;
-        }}
-
-        .summary-table th {{
-            background: #059669;
-            color: white;
-            padding: 12px;
-            text-align: right;
-        }}
-
-        .summary-table th:first-child {{
-            text-align: left;
-        }}
-
-        .summary-table td {{
-            padding: 10px;
-            text-align: right;
-            border-bottom: 1px solid #e0e0e0;
-        }}
-
-        .summary-table td:first-child {{
-            text-align: left;
-            font-weight: 600;
-        }}
-
-        .summary-table .neto-positivo {{
-            color: #28a745;
-            font-weight: 600;
-        }}
-
-        .summary-table .neto-negativo {{
-            color: #dc3545;
-            font-weight: 600;
-        }}
-
-        .footer {{
-            background: #f8f9fa;
-            padding: 20px;
-            text-align: center;
-            color: #666;
-            font-size: 0.9em;
-        }}
-
-        @media (max-width: 768px) {{
-            .charts {{
-                grid-template-columns: 1fr;
-            }}
-
-            .cards {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>TORO · Resumen de Cuentas</h1>
-            <p>Generado el {fecha_generacion}</p>
-        </div>
+        return self._plantilla().renderizar(self._valores_plantilla())
 
-        <div class="content">
-            <!-- Alertas Inteligentes -->
-            {alertas}
-
-            <!-- Cards de métricas principales -->
-            <div class="cards">
-                <div class="card saldo-inicial">
-                    <div class="card-title">Saldo Inicial</div>
-                    <div class="card-value">{'No disponible' if pd.isna(self.metricas['saldo_inicial']) else f"${self.metricas['saldo_inicial']:,.2f}"}</div>
-                </div>
-
-                <div class="card ingresos">
-                    <div class="card-title">Total Ingresos</div>
-                    <div class="card-value">${self.metricas['total_ingresos']:,.2f}</div>
-                </div>
-
-                <div class="card egresos">
-                    <div class="card-title">Total Egresos</div>
-                    <div class="card-value">${self.metricas['total_egresos']:,.2f}</div>
-                </div>
-
-                <div class="card saldo-final">
-                    <div class="card-title">Saldo Final</div>
-                    <div class="card-value">{'No disponible' if pd.isna(self.metricas['saldo_final']) else f"${self.metricas['saldo_final']:,.2f}"}</div>
-                </div>
-
-                <div class="card variacion">
-                    <div class="card-title">Variación del Mes</div>
-                    <div class="card-value">${self.metricas['variacion']:,.2f}</div>
-                </div>
-
-                <div class="card clasificados">
-                    <div class="card-title">Movimientos Clasificados</div>
-                    <div class="card-value">{self.metricas['porcentaje_clasificado']:.1f}%</div>
-                    <div class="card-subtitle">{self.metricas['movimientos_clasificados']} de {self.metricas['total_movimientos']}</div>
-                </div>
-
-                <div class="card debin">
-                    <div class="card-title">💳 Ingresos DEBIN</div>
-                    <div class="card-value">${kpis['ingresos_debin_monto']:,.2f}</div>
-                    <div class="card-subtitle">{kpis['ingresos_debin_cant']} transacciones</div>
-                </div>
-
-                <div class="card prestadores">
-                    <div class="card-title">👥 Prestadores Activos</div>
-                    <div class="card-value">{kpis['prestadores_activos']}</div>
-                    <div class="card-subtitle">Total pagado: ${kpis['prestadores_total']:,.0f}</div>
-                </div>
-
-                <div class="card mayor-egreso">
-                    <div class="card-title">💰 Mayor Categoría Egreso</div>
-                    <div class="card-value">${kpis['mayor_cat_egreso_monto']:,.0f}</div>
-                    <div class="card-subtitle">{kpis['mayor_cat_egreso_nombre'][:30]} ({kpis['mayor_cat_egreso_pct']:.1f}%)</div>
-                </div>
-
-                <div class="card mayor-ingreso">
-                    <div class="card-title">📊 Mayor Categoría Ingreso</div>
-                    <div class="card-value">${kpis['mayor_cat_ingreso_monto']:,.0f}</div>
-                    <div class="card-subtitle">{kpis['mayor_cat_ingreso_nombre'][:30]} ({kpis['mayor_cat_ingreso_pct']:.1f}%)</div>
-                </div>
-            </div>
+    def _plantilla(self):
+        """Plantilla a usar: minificada en modo offline."""
+        return PLANTILLA_DASHBOARD_MINIFICADA if self.offline else PLANTILLA_DASHBOARD
 
-            <!-- Gráficos -->
-            <div class="charts">
-                <!-- Gráfico de Ingresos -->
-                <div class="chart-container">
-                    <div class="chart-title">Ingresos por Categoría</div>
-                    <canvas id="chartIngresos"></canvas>
-                </div>
-
-                <!-- Gráfico de Egresos -->
-                <div class="chart-container">
-                    <div class="chart-title">Top 10 Egresos por Categoría</div>
-                    <canvas id="chartEgresos"></canvas>
-                </div>
-
-                <!-- Gráfico de Flujo de Caja -->
-                <div class="chart-container chart-full">
-                    <div class="chart-title">Flujo de Caja Diario</div>
-                    <canvas id="chartFlujo"></canvas>
-                </div>
-            </div>
+    def _informar_tamanios(self, tamanios: Dict[str, int]) -> Dict[str, int]:
+        """
+        Resume los bytes escritos por marcador y los compara con PRESUPUESTO_KB.
 
-            <!-- Tabla Resumen por Categoría Principal -->
-            <div class="chart-container chart-full">
-                <div class="chart-title">📊 Resumen por Categoría Principal</div>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>Categoría</th>
-                            <th>Transacciones</th>
-                            <th>Ingresos</th>
-                            <th>Egresos</th>
-                            <th>Neto</th>
-                        </tr>
-                    </thead>
-                    <tbody id="summaryTableBody">
-                        <!-- Generado dinámicamente por JavaScript -->
-                    </tbody>
-                </table>
-            </div>
+        Args:
+            tamanios: Bytes por marcador (ver Plantilla.escribir)
 
-            <!-- Tabla de Top Prestadores -->
-            {self._generar_tabla_prestadores()}
+        Returns:
+            Dict con bytes de chartjs, datos, tablas y total
+        """
+        resumen = {
+            'chartjs': tamanios.get('chartjs', 0),
+            'datos': tamanios.get('carga_datos', 0),
+            'tablas': tamanios.get('tabla_prestadores', 0) + tamanios.get('tabla_sin_clasificar', 0),
+            'total': sum(tamanios.values()),
+        }
+
+        print(f"  Tamaño: {resumen['total'] / 1024:,.0f} KB "
+              f"(Chart.js {resumen['chartjs'] / 1024:,.0f} KB · datos {resumen['datos'] / 1024:,.0f} KB · "
+              f"tablas {resumen['tablas'] / 1024:,.0f} KB)")
+        for parte, limite_kb in self.PRESUPUESTO_KB.items():
+            if resumen[parte] > limite_kb * 1024:
+                print(f"  ADVERTENCIA: {parte} supera el presupuesto "
+                      f"({resumen[parte] / 1024:,.0f} KB > {limite_kb:,} KB)")
+
+        return resumen
+
+    def _script_chartjs(self) -> str:
+        """
+        Etiqueta <script> de Chart.js: embebida en modo offline, CDN si no.
 
-            <!-- Tabla de Movimientos Sin Clasificar -->
-            {self._generar_tabla_sin_clasificar()}
-        </div>
+        Returns:
+            String HTML
 
-        <div class="footer">
-            &copy; 2025 TORO · Resumen de Cuentas | Generado automáticamente
-        </div>
-    </div>
-
-    <script>
-        // Datos para gráficos
-        const datosIngresos = {datos_ingresos};
-        const datosEgresos = {datos_egresos};
-        const datosFlujo = {datos_flujo};
-        const resumenCategorias = {resumen_categorias};
-
-        // Llenar tabla de resumen por categoría principal
-        const summaryTableBody = document.getElementById('summaryTableBody');
-        resumenCategorias.forEach(cat => {{
-            const row = document.createElement('tr');
-            const netoClass = cat.neto >= 0 ? 'neto-positivo' : 'neto-negativo';
-            row.innerHTML = `
-                <td>${{cat.categoria}}</td>
-                <td>${{cat.transacciones.toLocaleString('es-AR')}}</td>
-                <td>$${{cat.ingresos.toLocaleString('es-AR', {{minimumFractionDigits: 0, maximumFractionDigits: 0}})}}</td>
-                <td>$${{cat.egresos.toLocaleString('es-AR', {{minimumFractionDigits: 0, maximumFractionDigits: 0}})}}</td>
-                <td class="${{netoClass}}">$${{cat.neto.toLocaleString('es-AR', {{minimumFractionDigits: 0, maximumFractionDigits: 0}})}}</td>
-            `;
-            summaryTableBody.appendChild(row);
-        }});
-
-        // Gráfico de Ingresos (Torta)
-        new Chart(document.getElementById('chartIngresos'), {{
-            type: 'pie',
-            data: {{
-                labels: datosIngresos.labels,
-                datasets: [{{
-                    data: datosIngresos.values,
-                    backgroundColor: [
-                        '#059669',  // TORO verde petróleo
-                        '#10b981',  // TORO verde claro
-                        '#0ea5e9',  // TORO azul acento
-                        '#047857',  // TORO verde oscuro
-                        '#06b6d4'   // Cyan complementario
-                    ],
-                    borderWidth: 2,
-                    borderColor: '#fff'
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                plugins: {{
-                    legend: {{
-                        position: 'bottom'
-                    }},
-                    tooltip: {{
-                        callbacks: {{
-                            label: function(context) {{
-                                let label = context.label || '';
-                                if (label) {{
-                                    label += ': ';
-                                }}
-                                label += '$' + context.parsed.toLocaleString('es-AR', {{minimumFractionDigits: 2}});
-                                return label;
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-
-        // Gráfico de Egresos (Torta - Top 10)
-        new Chart(document.getElementById('chartEgresos'), {{
-            type: 'pie',
-            data: {{
-                labels: datosEgresos.labels,
-                datasets: [{{
-                    data: datosEgresos.values,
-                    backgroundColor: [
-                        '#dc3545', // Rojo
-                        '#fd7e14', // Naranja
-                        '#ff6b6b', // Rojo claro
-                        '#e83e8c', // Rosa
-                        '#9b59b6', // Púrpura
-                        '#ffc107', // Amarillo
-                        '#f39c12', // Naranja oscuro
-                        '#17a2b8', // Azul
-                        '#3498db', // Azul claro
-                        '#6c757d'  // Gris
-                    ],
-                    borderWidth: 2,
-                    borderColor: '#fff'
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                plugins: {{
-                    legend: {{
-                        position: 'bottom'
-                    }},
-                    tooltip: {{
-                        callbacks: {{
-                            label: function(context) {{
-                                let label = context.label || '';
-                                if (label) {{
-                                    label += ': ';
-                                }}
-                                label += '$' + context.parsed.toLocaleString('es-AR', {{minimumFractionDigits: 2}});
-                                return label;
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-
-        // Gráfico de Flujo de Caja (Líneas)
-        new Chart(document.getElementById('chartFlujo'), {{
-            type: 'line',
-            data: {{
-                labels: datosFlujo.labels,
-                datasets: [
-                    {{
-                        label: 'Ingresos',
-                        data: datosFlujo.ingresos,
-                        borderColor: '#059669',
-                        backgroundColor: 'rgba(5, 150, 105, 0.1)',
-                        tension: 0.4,
-                        fill: true
-                    }},
-                    {{
-                        label: 'Egresos',
-                        data: datosFlujo.egresos,
-                        borderColor: '#dc3545',
-                        backgroundColor: 'rgba(220, 53, 69, 0.1)',
-                        tension: 0.4,
-                        fill: true
-                    }}
-                ]
-            }},
-            options: {{
-                responsive: true,
-                plugins: {{
-                    legend: {{
-                        position: 'top'
-                    }},
-                    tooltip: {{
-                        callbacks: {{
-                            label: function(context) {{
-                                let label = context.dataset.label || '';
-                                if (label) {{
-                                    label += ': ';
-                                }}
-                                label += '$' + context.parsed.y.toLocaleString('es-AR', {{minimumFractionDigits: 2}});
-                                return label;
-                            }}
-                        }}
-                    }}
-                }},
-                scales: {{
-                    y: {{
-                        beginAtZero: true,
-                        ticks: {{
-                            callback: function(value) {{
-                                return '$' + value.toLocaleString('es-AR');
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>"""
-
-        return html
+        Raises:
+            FileNotFoundError: En modo offline, si falta la copia local de Chart.js
+                (un dashboard con el CDN no funcionaría sin internet)
+        """
+        if self.offline:
+            if not os.path.exists(self.ruta_chartjs):
+                raise FileNotFoundError(
+                    f"No se encontró la copia local de Chart.js ({self.ruta_chartjs}), necesaria "
+                    f"para el dashboard offline (ver reports/vendor/README.md)")
+            with open(self.ruta_chartjs, 'r', encoding='utf-8') as f:
+                return f"<script>{f.read()}</script>"
+        return f'<script src="{self.URL_CHARTJS}"></script>'
+
+    def _carga_datos(self) -> str:
+        """
+        JavaScript que entrega los datos de los gráficos a iniciarDashboard():
+        JSON compacto, o gzip+base64 descomprimido en el navegador si se pidió
+        o si el JSON supera el presupuesto de datos.
 
-    def _calcular_ingresos_por_categoria(self) -> Dict[str, float]:
+        Returns:
+            String JavaScript
         """
-        Calcula ingresos REALES por Categoria_Final desde el DataFrame.
+        if self.servidor:
+            return "consultarServidor();"
+
+        datos = json.dumps(self._datos_graficos(), separators=(',', ':'), ensure_ascii=False)
+
+        comprimir = self.comprimir_datos
+        if not comprimir and len(datos.encode('utf-8')) > self.PRESUPUESTO_KB['datos'] * 1024:
+            print(f"  Datos de gráficos > {self.PRESUPUESTO_KB['datos']} KB: se embeben comprimidos")
+            comprimir = True
+
+        if comprimir:
+            comprimidos = base64.b64encode(gzip.compress(datos.encode('utf-8'), compresslevel=6, mtime=0)).decode('ascii')
+            return f'descomprimirDatos("{comprimidos}").then(iniciarDashboard);'
+
+        # "</" cerraría el <script> si aparece dentro de un texto
+        datos = datos.replace('</', '<\\/')
+        return f"iniciarDashboard({datos});"
+
+    def _datos_graficos(self) -> Dict:
+        """
+        Datos de todos los gráficos en formato columnar (una lista por campo).
 
         Returns:
-            Diccionario {categoria_final: monto}
+            Dict con ingresos, egresos, flujo, mensual y resumen
+        """
+        return {
+            'ingresos': self._preparar_datos_torta(self._calcular_ingresos_por_categoria()),
+            'egresos': self._preparar_datos_torta(self._calcular_egresos_por_categoria()),
+            'flujo': self._preparar_datos_flujo(self.metricas['flujo_diario']),
+            'mensual': self._preparar_datos_mensual(),
+            'resumen': self._calcular_resumen_categorias(),
+            'movimientos': self._datos_explorador(),
+        }
+
+    def datos_consulta(self) -> Dict:
         """
-        df_ingresos = self.df[self.df['Tipo_Movimiento'] == 'Ingreso'].copy()
+        Datos de gráficos, explorador y cards: la respuesta de /api/datos del
+        servidor local (el dashboard se actualiza sin regenerar el HTML).
 
-        if len(df_ingresos) == 0:
-            return {}
+        Returns:
+            Dict de _datos_graficos() más 'tarjetas' {marcador: texto}
+        """
+        datos = self._datos_graficos()
+        datos['tarjetas'] = self._valores_tarjetas()
+        return datos
 
-        # Agrupar por Categoria_Final y sumar Crédito
-        ingresos_por_cat = df_ingresos.groupby('Categoria_Final')['Crédito'].sum()
+    def _datos_explorador(self) -> Dict:
+        """
+        Movimientos para el explorador del dashboard, en columnas compactas.
 
-        # Ordenar de mayor a menor
-        ingresos_por_cat = ingresos_por_cat.sort_values(ascending=False)
+        Los textos repetidos (concepto, nombre, categoría, banco) se guardan
+        una sola vez por columna ('valores') y cada movimiento guarda su
+        índice ('codigos'). Las fechas van como días desde 'base' y los
+        importes (crédito - débito) en centavos.
 
-        return ingresos_por_cat.to_dict()
+        Returns:
+            Dict columnar con base, dias, centavos, concepto, persona, categoria y banco
+        """
+        df = self.df
+        if len(df) == 0:
+            vacia = {'valores': [], 'codigos': []}
+            return {'base': '1970-01-01', 'dias': [], 'centavos': [],
+                    'concepto': vacia, 'persona': vacia, 'categoria': vacia, 'banco': vacia}
+
+        fechas = pd.to_datetime(df['Fecha']).dt.normalize()
+        base = fechas.min()
+        importes = (df['Crédito'].fillna(0).astype(float) - df['Débito'].fillna(0).astype(float)).to_numpy()
+
+        def diccionario(columna: str) -> Dict:
+            textos = (df[columna].astype(object).where(df[columna].notna(), '').astype(str)
+                      if columna in df.columns else pd.Series('', index=df.index))
+            codigos, valores = pd.factorize(textos, sort=True)
+            return {'valores': list(valores), 'codigos': codigos.tolist()}
+
+        return {
+            'base': base.strftime('%Y-%m-%d'),
+            'dias': ((fechas - base) // pd.Timedelta(days=1)).astype(int).tolist(),
+            'centavos': np.round(importes * 100).astype(np.int64).tolist(),
+            'concepto': diccionario('Concepto'),
+            'persona': diccionario('Persona_Nombre'),
+            'categoria': diccionario('Categoria_Final'),
+            'banco': diccionario('Banco'),
+        }
+
+    @staticmethod
+    def _importes(valores) -> list:
+        """Importes redondeados a centavos, como lista para JSON."""
+        return np.round(np.asarray(valores, dtype=float), 2).tolist()
+
+    def _valores_plantilla(self) -> Dict:
+        """
+        Valores de los marcadores de la plantilla del dashboard.
 
-    def _calcular_egresos_por_categoria(self) -> Dict[str, float]:
+        Returns:
+            Dict {marcador: texto o iterable de fragmentos HTML}
         """
-        Calcula Top 10 egresos por Categoria_Final desde el DataFrame.
+        return {
+            # Color del balance
+            'balance_color': '#28a745' if self.metricas['balance'] >= 0 else '#dc3545',
+            'fecha_generacion': datetime.now().strftime("%d/%m/%Y %H:%M"),
+            'panel_servidor': self._generar_panel_servidor(),
+            'alertas': self._generar_alertas(),
+
+            # Cards de métricas principales
+            **self._valores_tarjetas(),
+
+            # Secciones y tablas (las tablas se generan por bloques al escribir)
+            'seccion_historica': self._generar_seccion_historica(),
+            'seccion_comparativa': self._generar_seccion_comparativa(),
+            'tabla_prestadores': self._generar_tabla_prestadores(),
+            'tabla_sin_clasificar': self._generar_tabla_sin_clasificar(),
+
+            # Chart.js y datos para gráficos
+            'chartjs': self._script_chartjs(),
+            'carga_datos': self._carga_datos(),
+        }
+
+    def _valores_tarjetas(self) -> Dict[str, str]:
+        """
+        Textos de las cards de métricas principales.
 
         Returns:
-            Diccionario {categoria_final: monto} - Solo Top 10
+            Dict {marcador: texto}
+        """
+        kpis = self._calcular_kpis_adicionales()
+
+        def moneda(valor: float, decimales: int = 2) -> str:
+            return f"${valor:,.{decimales}f}"
+
+        def saldo(valor: float) -> str:
+            return 'No disponible' if pd.isna(valor) else moneda(valor)
+
+        return {
+            'saldo_inicial': saldo(self.metricas['saldo_inicial']),
+            'total_ingresos': moneda(self.metricas['total_ingresos']),
+            'total_egresos': moneda(self.metricas['total_egresos']),
+            'saldo_final': saldo(self.metricas['saldo_final']),
+            'variacion': moneda(self.metricas['variacion']),
+            'porcentaje_clasificado': f"{self.metricas['porcentaje_clasificado']:.1f}%",
+            'movimientos_clasificados': (f"{self.metricas['movimientos_clasificados']} de "
+                                         f"{self.metricas['total_movimientos']}"),
+            'debin_monto': moneda(kpis['ingresos_debin_monto']),
+            'debin_cantidad': f"{kpis['ingresos_debin_cant']} transacciones",
+            'prestadores_activos': str(kpis['prestadores_activos']),
+            'prestadores_total': f"Total pagado: {moneda(kpis['prestadores_total'], 0)}",
+            'mayor_egreso_monto': moneda(kpis['mayor_cat_egreso_monto'], 0),
+            'mayor_egreso_detalle': (f"{kpis['mayor_cat_egreso_nombre'][:30]} "
+                                     f"({kpis['mayor_cat_egreso_pct']:.1f}%)"),
+            'mayor_ingreso_monto': moneda(kpis['mayor_cat_ingreso_monto'], 0),
+            'mayor_ingreso_detalle': (f"{kpis['mayor_cat_ingreso_nombre'][:30]} "
+                                      f"({kpis['mayor_cat_ingreso_pct']:.1f}%)"),
+        }
+
+    def _generar_panel_servidor(self) -> str:
+        """
+        Panel de filtros (período, categoría principal, banco) del modo servidor.
+
+        Returns:
+            String HTML (vacío si no es modo servidor)
         """
-        df_egresos = self.df[self.df['Tipo_Movimiento'] == 'Egreso'].copy()
+        if not self.servidor:
+            return ""
 
-        if len(df_egresos) == 0:
-            return {}
+        def opciones(columna: str, todas: str) -> str:
+            valores = (sorted(self.df[columna].dropna().astype(str).unique())
+                       if columna in self.df.columns else [])
+            return f'<option value="">{todas}</option>' + ''.join(
+                f'<option>{valor}</option>' for valor in self._escapar(pd.Series(valores, dtype=object)))
+
+        desde, hasta = ((self.df['Fecha'].min(), self.df['Fecha'].max()) if len(self.df) > 0
+                        else (None, None))
+        rango = (f' min="{desde:%Y-%m-%d}" max="{hasta:%Y-%m-%d}"' if desde is not None else '')
+
+        return f"""
+            <div class="panel-servidor">
+                <strong>🔌 Consulta en vivo</strong>
+                <input type="date" id="srv_desde" title="Desde"{rango}>
+                <input type="date" id="srv_hasta" title="Hasta"{rango}>
+                <select id="srv_categoria">{opciones('Categoria_Principal', 'Todas las categorías')}</select>
+                <select id="srv_banco">{opciones('Banco', 'Todos los bancos')}</select>
+                <button onclick="consultarServidor()">Aplicar</button>
+                <span id="srv_estado" class="flujo-ayuda"></span>
+            </div>
+"""
 
-        # Agrupar por Categoria_Final y sumar Débito
-        egresos_por_cat = df_egresos.groupby('Categoria_Final')['Débito'].sum()
+    def _calcular_ingresos_por_categoria(self) -> Dict[str, float]:
+        """
+        Calcula ingresos REALES por Categoria_Final desde el DataFrame.
 
-        # Ordenar de mayor a menor y tomar Top 10
-        egresos_por_cat = egresos_por_cat.sort_values(ascending=False).head(10)
+        Returns:
+            Diccionario {categoria_final: monto} (de mayor a menor)
+        """
+        return self.agregados.ingresos_por_categoria().to_dict()
 
-        return egresos_por_cat.to_dict()
+    def _calcular_egresos_por_categoria(self) -> Dict[str, float]:
+        """
+        Calcula Top 10 egresos por Categoria_Final desde el DataFrame.
+
+        Returns:
+            Diccionario {categoria_final: monto} - Solo Top 10
+        """
+        return self.agregados.egresos_por_categoria().head(10).to_dict()
 
     def _generar_alertas(self) -> str:
         """
@@ -722,9 +398,9 @@ class DashboardGenerator:
             )
 
         # Alerta 2: Sueldos altos
-        df_sueldos = self.df[self.df['Categoria_Final'].str.contains('Sueldos', case=False, na=False)]
-        if len(df_sueldos) > 0:
-            total_sueldos = df_sueldos['Débito'].sum()
+        sueldos = self.agregados.total_categoria_final('Sueldos')
+        if sueldos['movimientos'] > 0:
+            total_sueldos = sueldos['debito']
             pct_sueldos = (total_sueldos / self.metricas['total_egresos'] * 100) if self.metricas['total_egresos'] > 0 else 0
             if pct_sueldos > 20:
                 alertas_html.append(
@@ -734,10 +410,10 @@ class DashboardGenerator:
                 )
 
         # Alerta 3: Red prestacional
-        df_prestadores = self.df[self.df['Categoria_Principal'] == 'Prestadores']
-        if len(df_prestadores) > 0:
-            n_prestadores = df_prestadores['Persona_Nombre'].nunique()
-            total_prestadores = df_prestadores['Débito'].sum()
+        prestadores = self.agregados.resumen_prestadores()
+        if prestadores['movimientos'] > 0:
+            n_prestadores = prestadores['activos']
+            total_prestadores = prestadores['total']
             alertas_html.append(
                 '<div class="alert alert-info">'
                 f'<strong>📊 Red prestacional:</strong> {n_prestadores} prestadores activos este mes (${total_prestadores:,.0f} total)'
@@ -745,16 +421,13 @@ class DashboardGenerator:
             )
 
         # Alerta 4: Ingresos DEBIN
-        if 'Es_DEBIN' in self.df.columns:
-            df_debin = self.df[(self.df['Tipo_Movimiento'] == 'Ingreso') & (self.df['Es_DEBIN'] == True)]
-            if len(df_debin) > 0:
-                total_debin = df_debin['Crédito'].sum()
-                promedio_debin = df_debin['Crédito'].mean()
-                alertas_html.append(
-                    '<div class="alert alert-info">'
-                    f'<strong>💳 Ingresos por DEBIN:</strong> {len(df_debin)} transacciones por ${total_debin:,.0f} (promedio ${promedio_debin:,.0f})'
-                    '</div>'
-                )
+        debin = self.agregados.resumen_debin()
+        if debin['cantidad'] > 0:
+            alertas_html.append(
+                '<div class="alert alert-info">'
+                f'<strong>💳 Ingresos por DEBIN:</strong> {debin["cantidad"]} transacciones por ${debin["total"]:,.0f} (promedio ${debin["promedio"]:,.0f})'
+                '</div>'
+            )
 
         # Alerta 5: Egresos superan ingresos (ya existente)
         if self.metricas['alerta_egresos_mayores']:
@@ -773,6 +446,18 @@ class DashboardGenerator:
                 '</div>'
             )
 
+        # Alerta 7: Quiebres en el saldo corrido por cuenta
+        quiebres = self.metricas.get('quiebres_saldo')
+        if quiebres is not None and len(quiebres) > 0:
+            duplicados = int((quiebres['Tipo_Quiebre'] == ConciliadorSaldos.TIPO_DUPLICADO).sum())
+            alertas_html.append(
+                '<div class="alert alert-warning">'
+                f'<strong>⚠️ Conciliación:</strong> {len(quiebres)} quiebre(s) en el saldo corrido '
+                f'({duplicados} movimiento(s) duplicado(s), {len(quiebres) - duplicados} salto(s) de saldo). '
+                'Ver hoja Conciliacion del reporte Excel.'
+                '</div>'
+            )
+
         return '\n'.join(alertas_html)
 
     def _calcular_kpis_adicionales(self) -> Dict:
@@ -785,17 +470,17 @@ class DashboardGenerator:
         kpis = {}
 
         # Ingresos DEBIN
-        df_debin = self.df[(self.df['Tipo_Movimiento'] == 'Ingreso') & (self.df['Es_DEBIN'] == True)]
-        kpis['ingresos_debin_monto'] = df_debin['Crédito'].sum()
-        kpis['ingresos_debin_cant'] = len(df_debin)
+        debin = self.agregados.resumen_debin()
+        kpis['ingresos_debin_monto'] = debin['total']
+        kpis['ingresos_debin_cant'] = debin['cantidad']
 
         # Prestadores Activos
-        df_prestadores = self.df[self.df['Categoria_Principal'] == 'Prestadores']
-        kpis['prestadores_activos'] = df_prestadores['Persona_Nombre'].nunique()
-        kpis['prestadores_total'] = df_prestadores['Débito'].sum()
+        prestadores = self.agregados.resumen_prestadores()
+        kpis['prestadores_activos'] = prestadores['activos']
+        kpis['prestadores_total'] = prestadores['total']
 
         # Mayor categoría de egreso
-        egresos_por_cat = self.df[self.df['Tipo_Movimiento'] == 'Egreso'].groupby('Categoria_Final')['Débito'].sum()
+        egresos_por_cat = self.agregados.egresos_por_categoria()
         if len(egresos_por_cat) > 0:
             mayor_egreso = egresos_por_cat.idxmax()
             kpis['mayor_cat_egreso_nombre'] = mayor_egreso
@@ -807,7 +492,7 @@ class DashboardGenerator:
             kpis['mayor_cat_egreso_pct'] = 0
 
         # Mayor categoría de ingreso
-        ingresos_por_cat = self.df[self.df['Tipo_Movimiento'] == 'Ingreso'].groupby('Categoria_Final')['Crédito'].sum()
+        ingresos_por_cat = self.agregados.ingresos_por_categoria()
         if len(ingresos_por_cat) > 0:
             mayor_ingreso = ingresos_por_cat.idxmax()
             kpis['mayor_cat_ingreso_nombre'] = mayor_ingreso
@@ -820,95 +505,233 @@ class DashboardGenerator:
 
         return kpis
 
-    def _calcular_resumen_categorias(self) -> str:
+    def _calcular_resumen_categorias(self) -> Dict:
         """
         Calcula resumen por Categoria_Principal para tabla.
 
         Returns:
-            String JSON con datos de la tabla
+            Dict columnar con categoria, transacciones, ingresos, egresos y neto
         """
-        # Agrupar por Categoria_Principal
-        resumen = []
+        # Una fila por Categoria_Principal, ordenado por egresos descendente
+        resumen = self.agregados.resumen_principal()
+
+        return {
+            'categoria': resumen['categoria'].tolist(),
+            'transacciones': resumen['transacciones'].astype(int).tolist(),
+            'ingresos': self._importes(resumen['ingresos']),
+            'egresos': self._importes(resumen['egresos']),
+            'neto': self._importes(resumen['neto']),
+        }
+
+    def _preparar_datos_torta(self, datos: Dict) -> Dict:
+        """
+        Prepara datos para gráfico de torta.
 
-        for cat_principal in self.df['Categoria_Principal'].unique():
-            if cat_principal == 'Sin Clasificar':
-                continue
+        Args:
+            datos: Diccionario {categoria: monto}
 
-            df_cat = self.df[self.df['Categoria_Principal'] == cat_principal]
+        Returns:
+            Dict con labels y values
+        """
+        return {
+            'labels': list(datos.keys()),
+            'values': self._importes(list(datos.values()))
+        }
 
-            transacciones = len(df_cat)
-            ingresos = df_cat[df_cat['Tipo_Movimiento'] == 'Ingreso']['Crédito'].sum()
-            egresos = df_cat[df_cat['Tipo_Movimiento'] == 'Egreso']['Débito'].sum()
-            neto = ingresos - egresos
+    def _preparar_datos_flujo(self, df_flujo: pd.DataFrame) -> Dict:
+        """
+        Prepara datos para gráfico de flujo de caja.
 
-            resumen.append({
-                'categoria': cat_principal,
-                'transacciones': int(transacciones),
-                'ingresos': float(ingresos),
-                'egresos': float(egresos),
-                'neto': float(neto)
-            })
+        Si hay más de PUNTOS_FLUJO días, el gráfico recibe solo los puntos
+        elegidos por METODO_FLUJO (ver submuestreo) y además la serie diaria
+        completa ('diario') con la posición de cada punto en ella ('indices').
 
-        # Ordenar por egresos descendente
-        resumen.sort(key=lambda x: x['egresos'], reverse=True)
+        Args:
+            df_flujo: DataFrame con flujo diario
 
-        return json.dumps(resumen)
+        Returns:
+            Dict con labels, ingresos y egresos (y diario/indices si se redujo)
+        """
+        if len(df_flujo) == 0:
+            return {'labels': [], 'ingresos': [], 'egresos': []}
+
+        fechas = pd.to_datetime(df_flujo['fecha'])
+        diario = {
+            'labels': fechas.dt.strftime('%Y-%m-%d').tolist(),
+            'ingresos': self._importes(df_flujo['ingresos']),
+            'egresos': self._importes(df_flujo['egresos'])
+        }
+        if len(df_flujo) <= self.PUNTOS_FLUJO:
+            return diario
+
+        dias = (fechas - fechas.iloc[0]).dt.days.to_numpy()
+        indices = indices_series(dias, [diario['ingresos'], diario['egresos']],
+                                 self.PUNTOS_FLUJO, self.METODO_FLUJO)
+        reducido = {campo: [valores[i] for i in indices] for campo, valores in diario.items()}
+        return {**reducido, 'indices': indices.tolist(), 'diario': diario}
+
+    def _preparar_datos_mensual(self) -> Dict:
+        """
+        Prepara datos para el gráfico mes a mes desde el cubo.
 
-    def _preparar_datos_torta(self, datos: Dict) -> str:
+        Returns:
+            Dict con labels (YYYY-MM), ingresos y egresos
         """
-        Prepara datos para gráfico de torta.
+        if self.cubo is None:
+            return {'labels': [], 'ingresos': [], 'egresos': []}
 
-        Args:
-            datos: Diccionario {categoria: monto}
+        mensual = self.cubo.mensual()
+        return {
+            'labels': mensual['mes'].dt.strftime('%Y-%m').tolist(),
+            'ingresos': self._importes(mensual['ingresos']),
+            'egresos': self._importes(mensual['egresos'])
+        }
+
+    def _generar_seccion_historica(self) -> str:
+        """
+        Genera HTML de la sección mes a mes y acumulado del año (YTD).
 
         Returns:
-            String JSON con labels y values
+            String HTML (vacío si no hay cubo o está vacío)
         """
-        if not datos:
-            return json.dumps({'labels': [], 'values': []})
+        if self.cubo is None:
+            return ""
 
-        labels = list(datos.keys())
-        values = list(datos.values())
+        mensual = self.cubo.mensual()
+        if len(mensual) == 0:
+            return ""
 
-        return json.dumps({
-            'labels': labels,
-            'values': values
-        })
+        ytd = self.cubo.acumulado_anual()
+        ultimo = mensual.iloc[-1]
+
+        def variacion_pct(valor) -> str:
+            return "sin mes anterior" if pd.isna(valor) else f"{valor:+.1f}% vs mes anterior"
+
+        return f"""
+        <div class="cards">
+            <div class="card ingresos">
+                <div class="card-title">Ingresos {ultimo['mes'].strftime('%m/%Y')}</div>
+                <div class="card-value">${ultimo['ingresos']:,.0f}</div>
+                <div class="card-subtitle">{variacion_pct(ultimo['ingresos_vs_mes_anterior'])}</div>
+            </div>
+
+            <div class="card egresos">
+                <div class="card-title">Egresos {ultimo['mes'].strftime('%m/%Y')}</div>
+                <div class="card-value">${ultimo['egresos']:,.0f}</div>
+                <div class="card-subtitle">{variacion_pct(ultimo['egresos_vs_mes_anterior'])}</div>
+            </div>
+
+            <div class="card ingresos">
+                <div class="card-title">Ingresos Acumulados {ytd['anio']}</div>
+                <div class="card-value">${ytd['ingresos']:,.0f}</div>
+                <div class="card-subtitle">al {ytd['hasta'].strftime('%d/%m/%Y')}</div>
+            </div>
 
-    def _preparar_datos_flujo(self, df_flujo: pd.DataFrame) -> str:
+            <div class="card egresos">
+                <div class="card-title">Egresos Acumulados {ytd['anio']}</div>
+                <div class="card-value">${ytd['egresos']:,.0f}</div>
+                <div class="card-subtitle">Variación acumulada: ${ytd['variacion']:,.0f}</div>
+            </div>
+        </div>
+
+        <div class="chart-container chart-full" style="margin-bottom: 30px;">
+            <div class="chart-title">Evolución Mes a Mes</div>
+            <canvas id="chartMensual"></canvas>
+        </div>
         """
-        Prepara datos para gráfico de flujo de caja.
+
+    def _generar_seccion_comparativa(self, max_filas: int = 15) -> Iterator[str]:
+        """
+        Genera HTML de la tabla comparativa por categoría: último período contra
+        el anterior y contra el mismo período del año anterior.
 
         Args:
-            df_flujo: DataFrame con flujo diario
+            max_filas: Categorías a mostrar (las de mayor variación absoluta)
 
         Returns:
-            String JSON con labels, ingresos y egresos
+            Iterador de fragmentos HTML (vacío si no hay al menos dos períodos
+            para comparar)
         """
-        if len(df_flujo) == 0:
-            return json.dumps({'labels': [], 'ingresos': [], 'egresos': []})
+        if self.comparativo is None or len(self.comparativo['periodos']) < 2:
+            return
+
+        resumen = self.comparativo['resumen']
+        orden = resumen['variacion'].abs().sort_values(ascending=False, kind='stable').index
+        filas = resumen.loc[orden[:max_filas]]
+        formato = '%m/%Y' if self.comparativo['granularidad'] == 'M' else '%d/%m/%Y'
+        actual, anterior = self.comparativo['periodos'][-1], self.comparativo['periodos'][-2]
+        es_ingreso = (filas['Tipo_Movimiento'] == 'Ingreso').to_numpy()
+
+        def importe(serie: pd.Series) -> pd.Series:
+            return serie.map(lambda valor: '-' if pd.isna(valor) else f"${valor:,.0f}")
+
+        def celda_variacion(delta: pd.Series, pct: pd.Series) -> pd.Series:
+            texto = (delta.map(lambda valor: f"${valor:+,.0f}" if pd.notna(valor) else '-')
+                     + pct.map(lambda valor: f" ({valor:+.1f}%)" if pd.notna(valor) else ''))
+            favorable = np.where(es_ingreso, delta >= 0, delta <= 0)
+            clase = np.where(delta.isna(), '', np.where(favorable, ' class="neto-positivo"',
+                                                          ' class="neto-negativo"'))
+            return '<td' + pd.Series(clase, index=delta.index) + '>' + texto + '</td>'
+
+        categoria = filas['Categoria_Final'].astype(str) + ' (' + filas['Tipo_Movimiento'].astype(str) + ')'
+        celdas = ('                    <tr><td>' + categoria.map(html.escape) + '</td>'
+                  + '<td>' + importe(filas['actual']) + '</td>'
+                  + '<td>' + importe(filas['anterior']) + '</td>'
+                  + celda_variacion(filas['variacion'], filas['variacion_pct'])
+                  + '<td>' + importe(filas['anio_anterior']) + '</td>'
+                  + celda_variacion(filas['variacion_interanual'], filas['variacion_interanual_pct'])
+                  + '</tr>\n')
+
+        yield from PLANTILLA_COMPARATIVA.fragmentos({
+            'actual': actual.strftime(formato),
+            'anterior': anterior.strftime(formato),
+            'filas': celdas,
+        })
 
-        labels = [str(fecha) for fecha in df_flujo['fecha']]
-        ingresos = df_flujo['ingresos'].tolist()
-        egresos = df_flujo['egresos'].tolist()
+    @staticmethod
+    def _escapar(serie: pd.Series) -> pd.Series:
+        """Texto de una columna escapado para HTML (vectorizado)."""
+        return (serie.fillna('').astype(str)
+                .str.replace('&', '&amp;', regex=False)
+                .str.replace('<', '&lt;', regex=False)
+                .str.replace('>', '&gt;', regex=False))
+
+    @staticmethod
+    def _moneda(serie: pd.Series) -> pd.Series:
+        """Importes de una columna como texto '$1,234.56'."""
+        return '$' + serie.fillna(0).astype(float).map('{:,.2f}'.format)
+
+    @classmethod
+    def _filas_html(cls, celdas: pd.DataFrame) -> Iterator[str]:
+        """
+        Filas <tr> de una tabla, armadas por columnas y entregadas por bloques.
 
-        return json.dumps({
-            'labels': labels,
-            'ingresos': ingresos,
-            'egresos': egresos
-        })
+        Args:
+            celdas: Una columna por celda, con el texto HTML ya formateado
 
-    def _generar_tabla_prestadores(self) -> str:
+        Returns:
+            Iterador de bloques de filas (FILAS_POR_BLOQUE filas cada uno)
+        """
+        for inicio in range(0, len(celdas), cls.FILAS_POR_BLOQUE):
+            bloque = celdas.iloc[inicio:inicio + cls.FILAS_POR_BLOQUE]
+            filas = '<tr><td>' + bloque.iloc[:, 0]
+            for columna in bloque.columns[1:]:
+                filas = filas + '</td><td>' + bloque[columna]
+            yield '\n'.join(filas + '</td></tr>') + '\n'
+
+    def _generar_tabla_prestadores(self) -> Iterator[str]:
         """
         Genera HTML de la tabla de top prestadores.
 
         Returns:
-            String HTML con la tabla
+            Iterador de fragmentos HTML de la tabla
         """
         if len(self.metricas['top_prestadores']) == 0:
-            return ""
+            return
+
+        prestadores = pd.DataFrame(self.metricas['top_prestadores'])
 
-        html = """
+        yield """
         <div class="chart-container">
             <div class="chart-title">Top Prestadores</div>
             <table>
@@ -920,42 +743,37 @@ class DashboardGenerator:
                     </tr>
                 </thead>
                 <tbody>
-        """
-
-        for i, prestador in enumerate(self.metricas['top_prestadores'], 1):
-            html += f"""
-                    <tr>
-                        <td>{i}</td>
-                        <td>{prestador['nombre']}</td>
-                        <td>${prestador['monto']:,.2f}</td>
-                    </tr>
-            """
-
-        html += """
-                </tbody>
+"""
+        yield from self._filas_html(pd.DataFrame({
+            'posicion': pd.RangeIndex(1, len(prestadores) + 1).astype(str),
+            'nombre': self._escapar(prestadores['nombre']),
+            'monto': self._moneda(prestadores['monto']),
+        }))
+        yield """                </tbody>
             </table>
         </div>
         """
 
-        return html
-
-    def _generar_tabla_sin_clasificar(self) -> str:
+    def _generar_tabla_sin_clasificar(self) -> Iterator[str]:
         """
-        Genera HTML de la tabla de movimientos sin clasificar.
+        Genera HTML de la tabla de movimientos sin clasificar (todos, con
+        desplazamiento vertical).
 
         Returns:
-            String HTML con la tabla
+            Iterador de fragmentos HTML de la tabla
         """
         if len(self.df_sin_clasificar) == 0:
-            return """
+            yield """
         <div class="alert">
             <strong>Excelente!</strong> No hay movimientos sin clasificar.
         </div>
             """
+            return
 
-        html = f"""
+        yield f"""
         <div class="chart-container">
             <div class="chart-title">Movimientos Sin Clasificar ({len(self.df_sin_clasificar)})</div>
+            <div class="tabla-scroll">
             <table>
                 <thead>
                     <tr>
@@ -966,32 +784,16 @@ class DashboardGenerator:
                     </tr>
                 </thead>
                 <tbody>
-        """
-
-        # Mostrar máximo 20 movimientos
-        for _, row in self.df_sin_clasificar.head(20).iterrows():
-            html += f"""
-                    <tr>
-                        <td>{row['Fecha']}</td>
-                        <td>{row['Concepto']}</td>
-                        <td>${row['Débito']:,.2f}</td>
-                        <td>${row['Crédito']:,.2f}</td>
-                    </tr>
-            """
-
-        if len(self.df_sin_clasificar) > 20:
-            html += f"""
-                    <tr>
-                        <td colspan="4" style="text-align: center; color: #999;">
-                            ... y {len(self.df_sin_clasificar) - 20} más
-                        </td>
-                    </tr>
-            """
-
-        html += """
-                </tbody>
+"""
+        sin_clasificar = self.df_sin_clasificar
+        yield from self._filas_html(pd.DataFrame({
+            'fecha': self._escapar(sin_clasificar['Fecha']),
+            'concepto': self._escapar(sin_clasificar['Concepto']),
+            'debito': self._moneda(sin_clasificar['Débito']),
+            'credito': self._moneda(sin_clasificar['Crédito']),
+        }))
+        yield """                </tbody>
             </table>
+            </div>
         </div>
         """
-
-        return html
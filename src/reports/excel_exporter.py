@@ -5,21 +5,59 @@ Autor: Sistema TORO
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from typing import Dict
+from typing import Dict, Iterator, List, Tuple
+
+from .agregados import AgregadosReporte
+from .excel_streaming import EscritorExcelStreaming, Parte
+
 
 class ExcelExporter:
     """
     Genera reportes ejecutivos en Excel con múltiples hojas y formato profesional.
+
+    Cada hoja se describe como una lista de partes (tabla, fila inicial, con
+    encabezado). En modo normal se escriben con pandas y se formatean al
+    final; en modo streaming (ver EscritorExcelStreaming) se escriben por
+    bloques en memoria constante y las tablas que superan el límite de filas
+    de Excel siguen en hojas de continuación.
     """
 
-    def __init__(self, df: pd.DataFrame, metricas: Dict):
+    # Con más filas de detalle que esto se usa el modo streaming (si no se indicó)
+    FILAS_STREAMING = 50_000
+
+    # Hojas con título en A1 y secciones en negrita
+    HOJAS_CON_TITULO = ('Resumen', 'Ingresos', 'Egresos', 'Top Egresos')
+
+    # Columnas de la hoja Comparativo (resumen del último período)
+    COLUMNAS_COMPARATIVO = {
+        'Tipo_Movimiento': 'Tipo',
+        'Categoria_Final': 'Categoria',
+        'actual': 'Periodo Actual',
+        'anterior': 'Periodo Anterior',
+        'variacion': 'Variacion',
+        'variacion_pct': 'Variacion %',
+        'anio_anterior': 'Año Anterior',
+        'variacion_interanual': 'Variacion Interanual',
+        'variacion_interanual_pct': 'Variacion Interanual %',
+    }
+
+    def __init__(self, df: pd.DataFrame, metricas: Dict, agregados: AgregadosReporte = None,
+                 comparativo: Dict = None, streaming: bool = None):
         """
         Args:
             df: DataFrame con movimientos categorizados
             metricas: Diccionario con métricas calculadas
+            agregados: Agregados ya calculados sobre df (ej: Analyzer.agregados).
+                Si es None se crean aquí.
+            comparativo: Comparativo por categoría (ver Analyzer.comparativo). Opcional.
+            streaming: Escribir en memoria constante (None = automático si
+                Ingresos, Egresos o Sin Clasificar superan FILAS_STREAMING)
         """
         self.df = df
         self.metricas = metricas
+        self.agregados = agregados if agregados is not None else AgregadosReporte(df)
+        self.comparativo = comparativo
+        self.streaming = streaming
 
     def _formatear_monto(self, valor: float) -> str:
         """
@@ -35,38 +73,70 @@ class ExcelExporter:
             return "No disponible"
         return f"${valor:,.2f}"
 
-    def exportar(self, ruta_salida: str):
+    def exportar(self, ruta_salida: str) -> Dict[str, int]:
         """
         Exporta el reporte ejecutivo a Excel.
 
         Args:
             ruta_salida: Ruta del archivo de salida
-        """
-        print(f"\nGenerando reporte ejecutivo Excel...")
-
-        # Crear Excel writer
-        with pd.ExcelWriter(ruta_salida, engine='openpyxl') as writer:
-            # Hoja 1: Resumen
-            self._crear_hoja_resumen(writer)
-
-            # Hoja 2: Ingresos
-            self._crear_hoja_ingresos(writer)
-
-            # Hoja 3: Egresos
-            self._crear_hoja_egresos(writer)
-
-            # Hoja 4: Prestadores
-            self._crear_hoja_prestadores(writer)
-
-            # Hoja 5: Sin Clasificar
-            self._crear_hoja_sin_clasificar(writer)
 
-        # Aplicar formato
-        self._aplicar_formato(ruta_salida)
+        Returns:
+            Dict {hoja: filas escritas}
+        """
+        streaming = self.streaming
+        if streaming is None:
+            streaming = max(len(self.agregados.ingresos()), len(self.agregados.egresos()),
+                            len(self.agregados.sin_clasificar())) > self.FILAS_STREAMING
+
+        print(f"\nGenerando reporte ejecutivo Excel{' (streaming)' if streaming else ''}...")
+
+        if streaming:
+            escritor = EscritorExcelStreaming()
+            for nombre, partes in self._hojas():
+                escritor.escribir_hoja(nombre, partes, con_titulo=nombre in self.HOJAS_CON_TITULO)
+            filas = escritor.guardar(ruta_salida)
+        else:
+            with pd.ExcelWriter(ruta_salida, engine='openpyxl') as writer:
+                for nombre, partes in self._hojas():
+                    for tabla, fila, encabezado in partes:
+                        tabla.to_excel(writer, sheet_name=nombre, index=False, header=encabezado, startrow=fila)
+
+            # Aplicar formato
+            filas = self._aplicar_formato(ruta_salida)
 
         print(f"OK Reporte ejecutivo generado: {ruta_salida}")
+        print("  Filas por hoja: " + " · ".join(f"{hoja} {cantidad:,}" for hoja, cantidad in filas.items()))
+        return filas
+
+    def _hojas(self) -> Iterator[Tuple[str, List[Parte]]]:
+        """
+        Hojas del reporte, en orden: (nombre, partes). Se arman de a una.
+        """
+        yield 'Resumen', self._crear_hoja_resumen()
+        yield 'Ingresos', self._crear_hoja_ingresos()
+        yield 'Egresos', self._crear_hoja_egresos()
+        yield 'Top Egresos', self._crear_hoja_prestadores()
+        yield 'Sin Clasificar', self._crear_hoja_sin_clasificar()
+        yield 'Conciliacion', self._crear_hoja_conciliacion()
+        if self.comparativo is not None:
+            yield 'Comparativo', self._crear_hoja_comparativo()
+
+    @staticmethod
+    def _mensaje(texto: str, fila: int = 0) -> Parte:
+        """Parte de una sola celda de texto, sin encabezado."""
+        return pd.DataFrame([texto]), fila, False
+
+    @staticmethod
+    def _recientes_primero(tabla: pd.DataFrame) -> pd.DataFrame:
+        """
+        Movimientos del más reciente al más antiguo. Los subconjuntos del
+        Analyzer ya vienen en orden cronológico: se recorren al revés sin copiar.
+        """
+        if tabla['Fecha'].is_monotonic_increasing:
+            return tabla.iloc[::-1]
+        return tabla.sort_values('Fecha', ascending=False, kind='stable')
 
-    def _crear_hoja_resumen(self, writer):
+    def _crear_hoja_resumen(self) -> List[Parte]:
         """
         Crea la hoja de resumen ejecutivo.
         """
@@ -87,6 +157,9 @@ class ExcelExporter:
             datos.append(['ADVERTENCIA', ''])
             datos.append(['Diferencia en validacion', f"${self.metricas['diferencia_validacion']:,.2f}"])
             datos.append(['Detalle', 'El saldo final no coincide con Saldo Inicial + Ingresos - Egresos'])
+            quiebres = self.metricas.get('quiebres_saldo')
+            if quiebres is not None and len(quiebres) > 0:
+                datos.append(['Quiebres en saldo corrido', f"{len(quiebres)} (ver hoja Conciliacion)"])
             datos.append(['', ''])
 
         datos.extend([
@@ -114,20 +187,19 @@ class ExcelExporter:
         for sub, monto in egresos_ordenados:
             datos.append([sub, f"${monto:,.2f}"])
 
-        # Crear DataFrame y exportar
+        # Crear DataFrame
         df_resumen = pd.DataFrame(datos, columns=['Concepto', 'Valor'])
-        df_resumen.to_excel(writer, sheet_name='Resumen', index=False)
+        return [(df_resumen, 0, True)]
 
-    def _crear_hoja_ingresos(self, writer):
+    def _crear_hoja_ingresos(self) -> List[Parte]:
         """
         Crea la hoja de desglose de ingresos con resumen de saldos.
         """
-        df_ingresos = self.df[self.df['Tipo_Movimiento'] == 'Ingreso'].copy()
+        df_ingresos = self.agregados.ingresos()
 
         if len(df_ingresos) == 0:
             # Hoja vacía con mensaje
-            pd.DataFrame(['No hay ingresos registrados']).to_excel(writer, sheet_name='Ingresos', index=False, header=False)
-            return
+            return [self._mensaje('No hay ingresos registrados')]
 
         # Crear hoja con resumen y detalle
         # Primero agregamos el resumen de saldos
@@ -162,28 +234,21 @@ class ExcelExporter:
         columnas = ['Fecha', 'Concepto', 'Detalle', 'Crédito', 'Categoria_Final',
                    'Persona_Nombre', 'Es_DEBIN', 'Banco']
 
-        df_export = df_ingresos[columnas].copy()
-
         # Ordenar por fecha descendente
-        df_export = df_export.sort_values('Fecha', ascending=False)
+        df_export = self._recientes_primero(df_ingresos[columnas])
 
-        # Crear archivo temporal con ambas secciones
-        # Primero el resumen
-        df_resumen.to_excel(writer, sheet_name='Ingresos', index=False, startrow=0)
-
-        # Luego el detalle (después del resumen + una fila de separación)
+        # Primero el resumen, luego el detalle (después del resumen + una fila de separación)
         start_row = len(df_resumen) + 2
-        df_export.to_excel(writer, sheet_name='Ingresos', index=False, startrow=start_row)
+        return [(df_resumen, 0, True), (df_export, start_row, True)]
 
-    def _crear_hoja_egresos(self, writer):
+    def _crear_hoja_egresos(self) -> List[Parte]:
         """
         Crea la hoja de desglose de egresos con resumen de saldos.
         """
-        df_egresos = self.df[self.df['Tipo_Movimiento'] == 'Egreso'].copy()
+        df_egresos = self.agregados.egresos()
 
         if len(df_egresos) == 0:
-            pd.DataFrame(['No hay egresos registrados']).to_excel(writer, sheet_name='Egresos', index=False, header=False)
-            return
+            return [self._mensaje('No hay egresos registrados')]
 
         # Crear hoja con resumen y detalle
         # Primero agregamos el resumen de saldos
@@ -218,33 +283,28 @@ class ExcelExporter:
         columnas = ['Fecha', 'Concepto', 'Detalle', 'Débito', 'Categoria_Final',
                    'Persona_Nombre', 'Banco']
 
-        df_export = df_egresos[columnas].copy()
-
         # Ordenar por fecha descendente
-        df_export = df_export.sort_values('Fecha', ascending=False)
-
-        # Crear archivo temporal con ambas secciones
-        # Primero el resumen
-        df_resumen.to_excel(writer, sheet_name='Egresos', index=False, startrow=0)
+        df_export = self._recientes_primero(df_egresos[columnas])
 
-        # Luego el detalle (después del resumen + una fila de separación)
+        # Primero el resumen, luego el detalle (después del resumen + una fila de separación)
         start_row = len(df_resumen) + 2
-        df_export.to_excel(writer, sheet_name='Egresos', index=False, startrow=start_row)
+        return [(df_resumen, 0, True), (df_export, start_row, True)]
 
-    def _crear_hoja_prestadores(self, writer):
+    def _crear_hoja_prestadores(self) -> List[Parte]:
         """
         Crea la hoja de Top 15 Egresos (todos los egresos, no solo prestadores).
         """
         # Filtrar todos los egresos
-        df_egresos = self.df[self.df['Tipo_Movimiento'] == 'Egreso'].copy()
+        df_egresos = self.agregados.egresos()
 
         if len(df_egresos) == 0:
-            pd.DataFrame(['No hay egresos registrados']).to_excel(writer, sheet_name='Top Egresos', index=False, header=False)
-            return
+            return [self._mensaje('No hay egresos registrados')]
 
-        # Calcular resumen
-        total_egresos = df_egresos['Débito'].sum()
-        cantidad_egresos = len(df_egresos)
+        # Calcular resumen (desde la agregación por categoría)
+        agregado = self.agregados.por_categoria()
+        agregado = agregado[agregado['Tipo_Movimiento'] == 'Egreso']
+        total_egresos = agregado['Débito'].sum()
+        cantidad_egresos = int(agregado['Movimientos'].sum())
         promedio_egreso = total_egresos / cantidad_egresos if cantidad_egresos > 0 else 0
 
         # Crear resumen
@@ -275,40 +335,90 @@ class ExcelExporter:
         # Renombrar columna Débito a Monto para mayor claridad
         df_export = df_export.rename(columns={'Débito': 'Monto'})
 
-        # Exportar resumen primero
-        df_resumen.to_excel(writer, sheet_name='Top Egresos', index=False, startrow=0)
-
-        # Luego exportar el detalle
+        # Resumen primero, luego el detalle
         start_row = len(df_resumen) + 2
-        df_export.to_excel(writer, sheet_name='Top Egresos', index=False, startrow=start_row)
+        return [(df_resumen, 0, True), (df_export, start_row, True)]
 
-    def _crear_hoja_sin_clasificar(self, writer):
+    def _crear_hoja_sin_clasificar(self) -> List[Parte]:
         """
         Crea la hoja de movimientos sin clasificar.
         """
-        df_sin_clasificar = self.df[self.df['Categoria_Principal'] == 'Sin Clasificar'].copy()
+        df_sin_clasificar = self.agregados.sin_clasificar()
 
         if len(df_sin_clasificar) == 0:
-            pd.DataFrame(['Todos los movimientos estan clasificados']).to_excel(writer, sheet_name='Sin Clasificar', index=False, header=False)
-            return
+            return [self._mensaje('Todos los movimientos estan clasificados')]
 
         # Seleccionar columnas relevantes
         columnas = ['Fecha', 'Concepto', 'Detalle', 'Débito', 'Crédito', 'Banco']
 
-        df_export = df_sin_clasificar[columnas].copy()
+        # ID estable para completar correcciones masivas (--aplicar-correcciones)
+        if 'ID_Movimiento' in df_sin_clasificar.columns:
+            columnas.append('ID_Movimiento')
+
+        # Categorías sugeridas por similitud con el historial
+        if 'Sugerencias' in df_sin_clasificar.columns:
+            columnas.append('Sugerencias')
 
         # Ordenar por fecha descendente
-        df_export = df_export.sort_values('Fecha', ascending=False)
+        return [(self._recientes_primero(df_sin_clasificar[columnas]), 0, True)]
 
-        # Exportar
-        df_export.to_excel(writer, sheet_name='Sin Clasificar', index=False)
+    def _crear_hoja_conciliacion(self) -> List[Parte]:
+        """
+        Crea la hoja de conciliación: saldos por cuenta y quiebres del saldo corrido.
+        """
+        cuentas = self.metricas.get('saldos_por_cuenta')
+        if cuentas is None or len(cuentas) == 0:
+            return [self._mensaje('Sin saldos para conciliar (archivo sin columna Saldo)')]
+
+        quiebres = self.metricas['quiebres_saldo']
+        start_row = len(cuentas) + 3
+        if len(quiebres) == 0:
+            return [(cuentas, 0, True), self._mensaje('OK: el saldo encadena en todos los movimientos', start_row)]
+
+        return [
+            (cuentas, 0, True),
+            self._mensaje(f'QUIEBRES EN EL SALDO CORRIDO ({len(quiebres)})', start_row),
+            (quiebres, start_row + 1, True),
+        ]
 
-    def _aplicar_formato(self, ruta_archivo: str):
+    def _crear_hoja_comparativo(self, max_periodos: int = 12) -> List[Parte]:
+        """
+        Crea la hoja comparativa: último período contra el anterior y contra el
+        mismo período del año anterior, y la evolución por categoría.
+
+        Args:
+            max_periodos: Períodos a mostrar en la evolución por categoría
+        """
+        resumen = self.comparativo['resumen']
+        if len(resumen) == 0:
+            return [self._mensaje('Sin movimientos para comparar')]
+
+        formato = '%Y-%m' if self.comparativo['granularidad'] == 'M' else '%Y-%m-%d'
+        tabla = resumen.rename(columns=self.COLUMNAS_COMPARATIVO).round(2)
+        for columna in ['Variacion %', 'Variacion Interanual %']:
+            tabla[columna] = tabla[columna].round(1)
+
+        # Evolución: una columna por período (los últimos max_periodos)
+        importes = self.comparativo['importes'].iloc[:, -max_periodos:]
+        importes = importes.round(2).rename(columns=lambda periodo: periodo.strftime(formato)).reset_index()
+        importes = importes.rename(columns=self.COLUMNAS_COMPARATIVO)
+
+        start_row = len(tabla) + 3
+        return [
+            (tabla, 0, True),
+            self._mensaje('EVOLUCION POR CATEGORIA', start_row),
+            (importes, start_row + 1, True),
+        ]
+
+    def _aplicar_formato(self, ruta_archivo: str) -> Dict[str, int]:
         """
         Aplica formato profesional al Excel.
 
         Args:
             ruta_archivo: Ruta del archivo Excel
+
+        Returns:
+            Dict {hoja: filas}
         """
         # Cargar el workbook
         wb = load_workbook(ruta_archivo)
@@ -357,7 +467,7 @@ class ExcelExporter:
                         cell.border = border
 
             # Si es la hoja de Resumen, Ingresos, Egresos o Top Egresos, aplicar formato especial
-            if sheet_name in ['Resumen', 'Ingresos', 'Egresos', 'Top Egresos']:
+            if sheet_name in self.HOJAS_CON_TITULO:
                 ws['A1'].font = Font(bold=True, size=16, color='4472C4')
                 ws['A1'].alignment = title_alignment
 
@@ -369,3 +479,5 @@ class ExcelExporter:
 
         # Guardar cambios
         wb.save(ruta_archivo)
+
+        return {nombre: wb[nombre].max_row for nombre in wb.sheetnames}
@@ -0,0 +1,180 @@
+"""
+Escritura de Excel en memoria constante - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+Para meses con cientos de miles de movimientos (ej: un formato de banco
+nuevo que deja casi todo Sin Clasificar) el ExcelWriter normal arma cada
+hoja completa en memoria y después se vuelve a abrir el libro para darle
+formato. EscritorExcelStreaming usa el modo write_only de openpyxl: las
+filas se escriben por bloques y con el formato ya aplicado, sin releer el
+archivo.
+
+Si una tabla supera el límite de filas de Excel (1.048.576) sigue en hojas
+de continuación ('Sin Clasificar (2)', ...) que repiten el encabezado.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+# (tabla, fila inicial como en to_excel(startrow=...), con encabezado)
+Parte = Tuple[pd.DataFrame, int, bool]
+
+
+class EscritorExcelStreaming:
+    """
+    Escribe hojas (listas de Partes) en un libro write_only de openpyxl.
+
+    Uso:
+        escritor = EscritorExcelStreaming()
+        escritor.escribir_hoja('Sin Clasificar', [(df, 0, True)])
+        filas = escritor.guardar('reporte.xlsx')   # {'Sin Clasificar': n}
+    """
+
+    # Límite de filas por hoja de Excel
+    MAX_FILAS = 1_048_576
+
+    # Filas convertidas y escritas por vez
+    FILAS_POR_BLOQUE = 10_000
+
+    # Mismos estilos que ExcelExporter._aplicar_formato
+    FUENTE_ENCABEZADO = Font(bold=True, color='FFFFFF', size=11)
+    RELLENO_ENCABEZADO = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    ALINEACION_ENCABEZADO = Alignment(horizontal='center', vertical='center')
+    BORDE = Border(left=Side(style='thin'), right=Side(style='thin'),
+                   top=Side(style='thin'), bottom=Side(style='thin'))
+    FUENTE_TITULO = Font(bold=True, size=16, color='4472C4')
+    ALINEACION_TITULO = Alignment(horizontal='left', vertical='center')
+    FUENTE_SECCION = Font(bold=True, size=11)
+
+    def __init__(self, max_filas: int = None):
+        """
+        Args:
+            max_filas: Filas por hoja antes de continuar en otra (default: MAX_FILAS)
+        """
+        self.max_filas = max_filas or self.MAX_FILAS
+        self.libro = Workbook(write_only=True)
+        self.filas: Dict[str, int] = {}
+
+    def escribir_hoja(self, nombre: str, partes: List[Parte], con_titulo: bool = False):
+        """
+        Escribe una hoja con el mismo diseño que to_excel(startrow=...) para
+        cada parte, con encabezado de la fila 1 resaltado.
+
+        Args:
+            nombre: Nombre de la hoja
+            partes: Tablas de la hoja, en orden de fila inicial
+            con_titulo: Formato de título en A1 y de sección en los textos en
+                mayúsculas de la columna A (hojas Resumen, Ingresos, ...)
+        """
+        continuaciones = 1
+        hoja = self._nueva_hoja(nombre, continuaciones, partes)
+        fila = 0
+        encabezado_actual = None
+
+        for tabla, inicio, encabezado in partes:
+            while fila < inicio:
+                hoja.append([])
+                fila += 1
+
+            columnas = [str(columna) for columna in tabla.columns]
+            if encabezado:
+                hoja.append(self._celdas(hoja, columnas, fila, con_titulo))
+                fila += 1
+                encabezado_actual = columnas
+
+            for bloque in self._bloques(tabla):
+                for valores in bloque:
+                    if fila >= self.max_filas:
+                        # Hoja llena: continuar en otra con el mismo encabezado
+                        self.filas[hoja.title] = fila
+                        continuaciones += 1
+                        hoja = self._nueva_hoja(nombre, continuaciones, partes)
+                        fila = 0
+                        if encabezado_actual:
+                            hoja.append(self._celdas(hoja, encabezado_actual, fila, False))
+                            fila += 1
+                    if con_titulo and valores and isinstance(valores[0], str):
+                        hoja.append(self._celdas(hoja, valores, fila, con_titulo))
+                    else:
+                        # Fila de datos sin formato: valores directos (mucho más rápido que celdas)
+                        hoja.append(valores)
+                    fila += 1
+
+        self.filas[hoja.title] = fila
+
+    def guardar(self, ruta_salida: str) -> Dict[str, int]:
+        """
+        Guarda el libro.
+
+        Args:
+            ruta_salida: Ruta del archivo .xlsx
+
+        Returns:
+            Dict {hoja: filas escritas}
+        """
+        self.libro.save(ruta_salida)
+        return dict(self.filas)
+
+    def _nueva_hoja(self, nombre: str, numero: int, partes: List[Parte]):
+        """Crea la hoja (o su continuación número 'numero') con anchos de columna estimados."""
+        titulo = nombre if numero == 1 else f"{nombre[:25]} ({numero})"
+        hoja = self.libro.create_sheet(titulo)
+        for indice, ancho in enumerate(self._anchos(partes), start=1):
+            hoja.column_dimensions[get_column_letter(indice)].width = ancho
+        return hoja
+
+    def _celdas(self, hoja, valores: Iterable, fila: int, con_titulo: bool) -> list:
+        """
+        Celdas de una fila con el formato de _aplicar_formato: encabezado en
+        la fila 1, título en A1 y secciones en negrita.
+        """
+        celdas = []
+        for columna, valor in enumerate(valores):
+            celda = WriteOnlyCell(hoja, value=valor)
+            if fila == 0 and valor not in (None, ''):
+                celda.font = self.FUENTE_ENCABEZADO
+                celda.fill = self.RELLENO_ENCABEZADO
+                celda.alignment = self.ALINEACION_ENCABEZADO
+                celda.border = self.BORDE
+            if con_titulo and columna == 0:
+                if fila == 0:
+                    celda.font = self.FUENTE_TITULO
+                    celda.alignment = self.ALINEACION_TITULO
+                elif fila >= 2 and isinstance(valor, str) and valor and (
+                        valor.isupper() or 'TOTAL' in valor.upper()):
+                    celda.font = self.FUENTE_SECCION
+            celdas.append(celda)
+        return celdas
+
+    @classmethod
+    def _bloques(cls, tabla: pd.DataFrame):
+        """Filas de la tabla como listas de valores (NaN -> vacío), de a FILAS_POR_BLOQUE."""
+        for inicio in range(0, len(tabla), cls.FILAS_POR_BLOQUE):
+            bloque = tabla.iloc[inicio:inicio + cls.FILAS_POR_BLOQUE].astype(object)
+            yield bloque.where(bloque.notna(), None).itertuples(index=False, name=None)
+
+    @classmethod
+    def _anchos(cls, partes: List[Parte]) -> List[float]:
+        """
+        Ancho de cada columna (largo del texto + 2, máximo 50), estimado con
+        los encabezados y el primer bloque de cada tabla: en modo write_only
+        el ancho se fija antes de escribir las filas.
+        """
+        anchos: List[int] = []
+        for tabla, _, encabezado in partes:
+            muestra = tabla.iloc[:cls.FILAS_POR_BLOQUE]
+            # Las celdas vacías no cuentan (igual que en _aplicar_formato)
+            largos = [int(muestra[columna].dropna().astype(str).str.len().max() or 0)
+                      if muestra[columna].notna().any() else 0
+                      for columna in muestra.columns]
+            if encabezado:
+                largos = [max(largo, len(str(columna))) for largo, columna in zip(largos, tabla.columns)]
+            for indice, largo in enumerate(largos):
+                if indice >= len(anchos):
+                    anchos.append(0)
+                anchos[indice] = max(anchos[indice], largo)
+        return [min(largo + 2, 50) for largo in anchos]
@@ -0,0 +1,69 @@
+"""
+Métricas financieras perezosas - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+MetricasFinancieras se comporta como el diccionario que devolvía
+Analyzer.calcular_metricas(), pero cada métrica se calcula recién cuando se
+la pide por primera vez y queda memoizada en el Analyzer. Quien solo
+necesita los totales no paga la conciliación de saldos, el top de
+prestadores ni el flujo diario.
+"""
+from collections.abc import Mapping
+from typing import Iterable, Iterator
+
+
+class MetricasFinancieras(Mapping):
+    """
+    Vista perezosa (de solo lectura) sobre las métricas de un Analyzer.
+
+    Las métricas se calculan por grupo (ver Analyzer.GRUPOS_METRICAS): pedir
+    'total_ingresos' calcula todo el grupo de categorías de una vez, y
+    'saldo_final' reutiliza la conciliación si ya se había calculado.
+
+    Uso:
+        metricas = analyzer.calcular_metricas(['total_ingresos', 'total_egresos'])
+        metricas['total_ingresos']   # calcula solo el grupo de categorías
+        'flujo_diario' in metricas   # False: no fue solicitada
+    """
+
+    def __init__(self, analyzer, claves: Iterable[str]):
+        """
+        Args:
+            analyzer: Analyzer dueño de los cálculos y de la memoria de valores
+            claves: Métricas visibles en esta vista
+        """
+        self._analyzer = analyzer
+        self._claves = list(dict.fromkeys(claves))
+
+    def __getitem__(self, clave: str):
+        if clave not in self._claves:
+            raise KeyError(clave)
+        return self._analyzer.metrica(clave)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._claves)
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._claves
+
+    def calculadas(self) -> list:
+        """
+        Returns:
+            Métricas de la vista que ya fueron calculadas
+        """
+        return [clave for clave in self._claves if self._analyzer.metrica_calculada(clave)]
+
+    def a_dict(self) -> dict:
+        """
+        Calcula todas las métricas de la vista.
+
+        Returns:
+            Diccionario común con los valores
+        """
+        return {clave: self[clave] for clave in self._claves}
+
+    def __repr__(self) -> str:
+        return f"MetricasFinancieras({len(self.calculadas())}/{len(self)} calculadas)"
@@ -0,0 +1,104 @@
+"""
+Generación concurrente de salidas independientes - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+El dashboard HTML y el reporte Excel solo leen el mismo DataFrame, las
+mismas métricas y los mismos agregados: se generan a la vez, cada uno en
+su hilo. Un error en una salida no interrumpe a las demás.
+
+Se usan hilos y no procesos: los agregados y el cubo se comparten en
+memoria sin copiarlos (un proceso tendría que serializar el DataFrame y no
+puede recibir la conexión al cubo) y el ejecutable de Windows no necesita
+arranque especial. La escritura del Excel (openpyxl) y la del HTML (json,
+gzip, pandas) se superponen en lo que cada una libera el intérprete.
+
+Lo que cada salida imprime se guarda aparte y se muestra junto al terminar,
+en el orden de las tareas, para que la consola no quede intercalada.
+"""
+import io
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+
+class SalidaPorHilo(io.TextIOBase):
+    """
+    Reemplazo de sys.stdout que guarda lo que imprime cada hilo registrado
+    y deja pasar el resto a la salida original.
+    """
+
+    def __init__(self, original):
+        """
+        Args:
+            original: Salida a la que va lo que no es de un hilo registrado
+        """
+        self.original = original
+        self._buffers: Dict[int, io.StringIO] = {}
+
+    def registrar(self) -> io.StringIO:
+        """Empieza a guardar lo que imprime el hilo actual."""
+        buffer = io.StringIO()
+        self._buffers[threading.get_ident()] = buffer
+        return buffer
+
+    def liberar(self):
+        """Deja de guardar lo que imprime el hilo actual."""
+        self._buffers.pop(threading.get_ident(), None)
+
+    def write(self, texto: str) -> int:
+        buffer = self._buffers.get(threading.get_ident())
+        return (buffer or self.original).write(texto)
+
+    def flush(self):
+        self.original.flush()
+
+
+def generar_en_paralelo(tareas: Dict[str, Callable[[], object]], max_hilos: int = None) -> Dict[str, Dict]:
+    """
+    Ejecuta tareas independientes a la vez y devuelve el resultado de cada una.
+
+    Una tarea que falla no cancela a las otras: su error queda en el
+    resultado (y se imprime con su traza).
+
+    Args:
+        tareas: {nombre: función sin argumentos}, en el orden en que se
+            muestra lo que imprimen
+        max_hilos: Hilos máximos (default: uno por tarea)
+
+    Returns:
+        Dict {nombre: {'resultado', 'error' (excepción o None), 'segundos'}}
+    """
+    salida = SalidaPorHilo(sys.stdout)
+    textos: Dict[str, str] = {}
+
+    def ejecutar(nombre: str, tarea: Callable[[], object]) -> Dict:
+        buffer = salida.registrar()
+        inicio = time.perf_counter()
+        try:
+            estado = {'resultado': tarea(), 'error': None}
+        except Exception as e:
+            traceback.print_exc(file=buffer)
+            estado = {'resultado': None, 'error': e}
+        finally:
+            textos[nombre] = buffer.getvalue()
+            salida.liberar()
+        estado['segundos'] = time.perf_counter() - inicio
+        return estado
+
+    sys.stdout = salida
+    try:
+        with ThreadPoolExecutor(max_workers=max_hilos or max(len(tareas), 1)) as pool:
+            futuros = {nombre: pool.submit(ejecutar, nombre, tarea) for nombre, tarea in tareas.items()}
+            resultados = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    finally:
+        sys.stdout = salida.original
+
+    for nombre in tareas:
+        print(textos.get(nombre, ''), end='')
+        if resultados[nombre]['error'] is not None:
+            print(f"ERROR en {nombre}: {resultados[nombre]['error']}")
+
+    return resultados
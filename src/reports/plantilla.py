@@ -0,0 +1,109 @@
+"""
+Plantillas HTML precompiladas - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+Una Plantilla separa el texto en partes fijas y marcadores {{ nombre }} una
+sola vez, al crearla. Renderizar es recorrer esas partes: cada marcador
+recibe un texto o un iterable de fragmentos (ej: las filas de una tabla
+generadas por bloques), y los fragmentos se escriben directamente en el
+archivo de salida sin armar el HTML completo en memoria.
+
+minificada() da una copia sin sangrías ni líneas vacías en las partes fijas
+(HTML, CSS y JavaScript de la plantilla); los saltos de línea se conservan,
+así los comentarios // del JavaScript siguen terminando donde terminaban.
+"""
+import re
+from typing import Dict, Iterable, Iterator, TextIO, Tuple, Union
+
+Valor = Union[str, Iterable[str]]
+
+
+class Plantilla:
+    """
+    Plantilla de texto con marcadores {{ nombre }}.
+
+    Uso:
+        plantilla = Plantilla("<h1>{{ titulo }}</h1><table>{{ filas }}</table>")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            plantilla.escribir(f, {'titulo': 'Resumen', 'filas': generador_de_filas()})
+    """
+
+    MARCADOR = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+    def __init__(self, texto: str):
+        """
+        Args:
+            texto: Texto de la plantilla
+        """
+        partes = self.MARCADOR.split(texto)
+        self.literales = partes[0::2]
+        self.marcadores = partes[1::2]
+
+    def minificada(self) -> 'Plantilla':
+        """
+        Copia de la plantilla sin sangrías ni líneas vacías en las partes fijas.
+
+        Returns:
+            Nueva Plantilla con los mismos marcadores
+        """
+        copia = Plantilla('')
+        copia.literales = [re.sub(r'\n\s+', '\n', literal) for literal in self.literales]
+        copia.marcadores = list(self.marcadores)
+        return copia
+
+    def fragmentos(self, valores: Dict[str, Valor]) -> Iterator[str]:
+        """
+        Fragmentos del resultado, en orden.
+
+        Args:
+            valores: {marcador: texto o iterable de fragmentos}
+
+        Returns:
+            Iterador de textos
+
+        Raises:
+            KeyError: Si falta el valor de algún marcador
+        """
+        return (fragmento for _, fragmento in self._partes(valores))
+
+    def _partes(self, valores: Dict[str, Valor]) -> Iterator[Tuple[str, str]]:
+        """Pares (marcador, fragmento); las partes fijas van con marcador ''."""
+        faltantes = set(self.marcadores) - set(valores)
+        if faltantes:
+            raise KeyError(f"Faltan valores para la plantilla: {', '.join(sorted(faltantes))}")
+        return self._recorrer(valores)
+
+    def _recorrer(self, valores: Dict[str, Valor]) -> Iterator[Tuple[str, str]]:
+        for literal, marcador in zip(self.literales, self.marcadores):
+            yield '', literal
+            valor = valores[marcador]
+            if isinstance(valor, str):
+                yield marcador, valor
+            else:
+                for fragmento in valor:
+                    yield marcador, fragmento
+        yield '', self.literales[-1]
+
+    def renderizar(self, valores: Dict[str, Valor]) -> str:
+        """
+        Returns:
+            Resultado completo como texto
+        """
+        return ''.join(self.fragmentos(valores))
+
+    def escribir(self, archivo: TextIO, valores: Dict[str, Valor]) -> Dict[str, int]:
+        """
+        Escribe el resultado fragmento a fragmento.
+
+        Args:
+            archivo: Archivo de texto abierto para escritura
+            valores: {marcador: texto o iterable de fragmentos}
+
+        Returns:
+            Bytes (UTF-8) escritos por marcador; '' acumula las partes fijas
+        """
+        tamanios = dict.fromkeys([''] + self.marcadores, 0)
+        for marcador, fragmento in self._partes(valores):
+            archivo.write(fragmento)
+            tamanios[marcador] += len(fragmento.encode('utf-8'))
+        return tamanios
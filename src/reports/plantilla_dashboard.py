@@ -0,0 +1,965 @@
+"""
+Plantilla HTML del dashboard - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+HTML, estilos y JavaScript del dashboard que genera DashboardGenerator.
+Los marcadores {{ nombre }} se completan al renderizar (ver Plantilla);
+el resto del texto se escribe tal cual. PLANTILLA_DASHBOARD_MINIFICADA es
+la versión sin sangrías que usa el modo offline. PLANTILLA_COMPARATIVA es
+la tabla comparativa por categoría que va en {{ seccion_comparativa }}.
+"""
+from .plantilla import Plantilla
+
+
+PLANTILLA_DASHBOARD = Plantilla(r"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>TORO · Resumen de Cuentas – Dashboard Financiero</title>
+    {{ chartjs }}
+    <style>
+        /*
+        TORO Color Palette:
+        --toro-verde: #059669 (verde petróleo - color principal)
+        --toro-verde-oscuro: #047857 (verde oscuro)
+        --toro-acento: #0ea5e9 (azul acento)
+        --toro-verde-claro: #10b981 (verde claro para destacados)
+        */
+
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #059669 0%, #047857 100%);
+            padding: 20px;
+            min-height: 100vh;
+        }
+
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 15px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+            overflow: hidden;
+        }
+
+        .header {
+            background: linear-gradient(135deg, #059669 0%, #0ea5e9 100%);
+            color: white;
+            padding: 30px;
+            text-align: center;
+        }
+
+        .header h1 {
+            font-size: 2.5em;
+            margin-bottom: 10px;
+        }
+
+        .header p {
+            font-size: 1.1em;
+            opacity: 0.9;
+        }
+
+        .content {
+            padding: 30px;
+        }
+
+        .cards {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+
+        .card {
+            background: white;
+            border-radius: 10px;
+            padding: 25px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            border-left: 4px solid;
+        }
+
+        .card.ingresos {
+            border-color: #28a745;
+        }
+
+        .card.egresos {
+            border-color: #dc3545;
+        }
+
+        .card.variacion {
+            border-color: {{ balance_color }};
+        }
+
+        .card.clasificados {
+            border-color: #0ea5e9;
+        }
+
+        .card.saldo-inicial {
+            border-color: #059669;
+        }
+
+        .card.saldo-final {
+            border-color: #0ea5e9;
+        }
+
+        .card.debin {
+            border-color: #10b981;
+        }
+
+        .card.prestadores {
+            border-color: #059669;
+        }
+
+        .card.mayor-egreso {
+            border-color: #dc3545;
+        }
+
+        .card.mayor-ingreso {
+            border-color: #10b981;
+        }
+
+        .card-title {
+            font-size: 0.9em;
+            color: #666;
+            text-transform: uppercase;
+            margin-bottom: 10px;
+            font-weight: 600;
+        }
+
+        .card-value {
+            font-size: 2em;
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+
+        .card.ingresos .card-value {
+            color: #28a745;
+        }
+
+        .card.egresos .card-value {
+            color: #dc3545;
+        }
+
+        .card.variacion .card-value {
+            color: {{ balance_color }};
+        }
+
+        .card.clasificados .card-value {
+            color: #0ea5e9;
+        }
+
+        .card.saldo-inicial .card-value {
+            color: #059669;
+        }
+
+        .card.saldo-final .card-value {
+            color: #0ea5e9;
+        }
+
+        .card.debin .card-value {
+            color: #10b981;
+        }
+
+        .card.prestadores .card-value {
+            color: #059669;
+        }
+
+        .card.mayor-egreso .card-value {
+            color: #dc3545;
+        }
+
+        .card.mayor-ingreso .card-value {
+            color: #10b981;
+        }
+
+        .card-subtitle {
+            font-size: 0.85em;
+            color: #999;
+        }
+
+        .charts {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
+            gap: 30px;
+            margin-bottom: 30px;
+        }
+
+        .chart-container {
+            background: white;
+            border-radius: 10px;
+            padding: 25px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        }
+
+        .chart-title {
+            font-size: 1.3em;
+            font-weight: 600;
+            margin-bottom: 20px;
+            color: #333;
+        }
+
+        .chart-full {
+            grid-column: 1 / -1;
+        }
+
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 10px;
+        }
+
+        th, td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+
+        th {
+            background-color: #f8f9fa;
+            font-weight: 600;
+            color: #333;
+        }
+
+        tr:hover {
+            background-color: #f8f9fa;
+        }
+
+        .flujo-ayuda {
+            font-size: 0.7em;
+            font-weight: normal;
+            color: #999;
+        }
+
+        .flujo-boton {
+            display: none;
+            float: right;
+            padding: 4px 10px;
+            border: 1px solid #059669;
+            border-radius: 5px;
+            background: white;
+            color: #059669;
+            cursor: pointer;
+        }
+
+        .tabla-scroll {
+            max-height: 600px;
+            overflow-y: auto;
+        }
+
+        .tabla-scroll th {
+            position: sticky;
+            top: 0;
+        }
+
+        .panel-servidor {
+            display: flex;
+            flex-wrap: wrap;
+            align-items: center;
+            gap: 10px;
+            padding: 15px;
+            margin-bottom: 20px;
+            background: #f8f9fa;
+            border-radius: 10px;
+        }
+
+        .panel-servidor button {
+            padding: 6px 14px;
+            border: none;
+            border-radius: 5px;
+            background: #059669;
+            color: white;
+            cursor: pointer;
+        }
+
+        .explorador-filtros {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            margin: 10px 0;
+        }
+
+        .explorador-filtros select,
+        .explorador-filtros input {
+            padding: 6px;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+        }
+
+        .explorador-ventana {
+            position: relative;
+            height: 480px;
+            overflow-y: auto;
+            border: 1px solid #ddd;
+        }
+
+        .explorador-ventana table {
+            position: absolute;
+            top: 0;
+            margin-top: 0;
+            table-layout: fixed;
+        }
+
+        .explorador-ventana td,
+        .explorador-cabecera th {
+            height: 28px;
+            padding: 0 8px;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+
+        .explorador-cabecera {
+            table-layout: fixed;
+            margin-top: 0;
+        }
+
+        .importe {
+            text-align: right !important;
+        }
+
+        .alert {
+            background-color: #fff3cd;
+            border: 1px solid #ffc107;
+            border-radius: 5px;
+            padding: 15px;
+            margin-bottom: 20px;
+            color: #856404;
+        }
+
+        .alert-danger {
+            background-color: #f8d7da;
+            border-color: #dc3545;
+            color: #721c24;
+        }
+
+        .alert-info {
+            background-color: #d1ecf1;
+            border-color: #17a2b8;
+            color: #0c5460;
+        }
+
+        .alert-success {
+            background-color: #d4edda;
+            border-color: #28a745;
+            color: #155724;
+        }
+
+        .summary-table {
+            width: 100%;
+            margin-top: 15px;
+        }
+
+        .summary-table th {
+            background: #059669;
+            color: white;
+            padding: 12px;
+            text-align: right;
+        }
+
+        .summary-table th:first-child {
+            text-align: left;
+        }
+
+        .summary-table td {
+            padding: 10px;
+            text-align: right;
+            border-bottom: 1px solid #e0e0e0;
+        }
+
+        .summary-table td:first-child {
+            text-align: left;
+            font-weight: 600;
+        }
+
+        .summary-table .neto-positivo {
+            color: #28a745;
+            font-weight: 600;
+        }
+
+        .summary-table .neto-negativo {
+            color: #dc3545;
+            font-weight: 600;
+        }
+
+        .footer {
+            background: #f8f9fa;
+            padding: 20px;
+            text-align: center;
+            color: #666;
+            font-size: 0.9em;
+        }
+
+        @media (max-width: 768px) {
+            .charts {
+                grid-template-columns: 1fr;
+            }
+
+            .cards {
+                grid-template-columns: 1fr;
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>TORO · Resumen de Cuentas</h1>
+            <p>Generado el {{ fecha_generacion }}</p>
+        </div>
+
+        <div class="content">
+            <!-- Filtros del modo servidor (vacío en el HTML estático) -->
+            {{ panel_servidor }}
+
+            <!-- Alertas Inteligentes -->
+            {{ alertas }}
+
+            <!-- Cards de métricas principales -->
+            <div class="cards">
+                <div class="card saldo-inicial">
+                    <div class="card-title">Saldo Inicial</div>
+                    <div class="card-value" data-marcador="saldo_inicial">{{ saldo_inicial }}</div>
+                </div>
+
+                <div class="card ingresos">
+                    <div class="card-title">Total Ingresos</div>
+                    <div class="card-value" data-marcador="total_ingresos">{{ total_ingresos }}</div>
+                </div>
+
+                <div class="card egresos">
+                    <div class="card-title">Total Egresos</div>
+                    <div class="card-value" data-marcador="total_egresos">{{ total_egresos }}</div>
+                </div>
+
+                <div class="card saldo-final">
+                    <div class="card-title">Saldo Final</div>
+                    <div class="card-value" data-marcador="saldo_final">{{ saldo_final }}</div>
+                </div>
+
+                <div class="card variacion">
+                    <div class="card-title">Variación del Mes</div>
+                    <div class="card-value" data-marcador="variacion">{{ variacion }}</div>
+                </div>
+
+                <div class="card clasificados">
+                    <div class="card-title">Movimientos Clasificados</div>
+                    <div class="card-value" data-marcador="porcentaje_clasificado">{{ porcentaje_clasificado }}</div>
+                    <div class="card-subtitle" data-marcador="movimientos_clasificados">{{ movimientos_clasificados }}</div>
+                </div>
+
+                <div class="card debin">
+                    <div class="card-title">💳 Ingresos DEBIN</div>
+                    <div class="card-value" data-marcador="debin_monto">{{ debin_monto }}</div>
+                    <div class="card-subtitle" data-marcador="debin_cantidad">{{ debin_cantidad }}</div>
+                </div>
+
+                <div class="card prestadores">
+                    <div class="card-title">👥 Prestadores Activos</div>
+                    <div class="card-value" data-marcador="prestadores_activos">{{ prestadores_activos }}</div>
+                    <div class="card-subtitle" data-marcador="prestadores_total">{{ prestadores_total }}</div>
+                </div>
+
+                <div class="card mayor-egreso">
+                    <div class="card-title">💰 Mayor Categoría Egreso</div>
+                    <div class="card-value" data-marcador="mayor_egreso_monto">{{ mayor_egreso_monto }}</div>
+                    <div class="card-subtitle" data-marcador="mayor_egreso_detalle">{{ mayor_egreso_detalle }}</div>
+                </div>
+
+                <div class="card mayor-ingreso">
+                    <div class="card-title">📊 Mayor Categoría Ingreso</div>
+                    <div class="card-value" data-marcador="mayor_ingreso_monto">{{ mayor_ingreso_monto }}</div>
+                    <div class="card-subtitle" data-marcador="mayor_ingreso_detalle">{{ mayor_ingreso_detalle }}</div>
+                </div>
+            </div>
+
+            <!-- Gráficos -->
+            <div class="charts">
+                <!-- Gráfico de Ingresos -->
+                <div class="chart-container">
+                    <div class="chart-title">Ingresos por Categoría</div>
+                    <canvas id="chartIngresos"></canvas>
+                </div>
+
+                <!-- Gráfico de Egresos -->
+                <div class="chart-container">
+                    <div class="chart-title">Top 10 Egresos por Categoría</div>
+                    <canvas id="chartEgresos"></canvas>
+                </div>
+
+                <!-- Gráfico de Flujo de Caja -->
+                <div class="chart-container chart-full">
+                    <div class="chart-title">
+                        Flujo de Caja Diario
+                        <span id="flujoAyuda" class="flujo-ayuda"></span>
+                        <button id="flujoCompleto" class="flujo-boton">Ver período completo</button>
+                    </div>
+                    <canvas id="chartFlujo"></canvas>
+                </div>
+            </div>
+
+            <!-- Evolución mes a mes y acumulado del año (desde el cubo) -->
+            {{ seccion_historica }}
+
+            <!-- Comparativo por categoría contra el período anterior y el año anterior -->
+            {{ seccion_comparativa }}
+
+            <!-- Tabla Resumen por Categoría Principal -->
+            <div class="chart-container chart-full">
+                <div class="chart-title">📊 Resumen por Categoría Principal</div>
+                <table class="summary-table">
+                    <thead>
+                        <tr>
+                            <th>Categoría</th>
+                            <th>Transacciones</th>
+                            <th>Ingresos</th>
+                            <th>Egresos</th>
+                            <th>Neto</th>
+                        </tr>
+                    </thead>
+                    <tbody id="summaryTableBody">
+                        <!-- Generado dinámicamente por JavaScript -->
+                    </tbody>
+                </table>
+            </div>
+
+            <!-- Explorador de movimientos (tabla virtual con filtros, datos embebidos) -->
+            <div class="chart-container chart-full">
+                <div class="chart-title">
+                    🔎 Explorador de Movimientos
+                    <span id="explCuenta" class="flujo-ayuda"></span>
+                </div>
+                <div class="explorador-filtros">
+                    <select id="explCategoria"><option value="">Todas las categorías</option></select>
+                    <select id="explBanco"><option value="">Todos los bancos</option></select>
+                    <input type="date" id="explDesde" title="Desde">
+                    <input type="date" id="explHasta" title="Hasta">
+                    <input type="search" id="explTexto" placeholder="Buscar concepto o nombre">
+                </div>
+                <table class="explorador-cabecera">
+                    <colgroup><col style="width: 11%"><col style="width: 27%"><col style="width: 20%"><col style="width: 20%"><col style="width: 9%"><col style="width: 13%"></colgroup>
+                    <thead>
+                        <tr><th>Fecha</th><th>Concepto</th><th>Nombre</th><th>Categoría</th><th>Banco</th><th class="importe">Importe</th></tr>
+                    </thead>
+                </table>
+                <div id="explVentana" class="explorador-ventana">
+                    <div id="explAlto"></div>
+                    <table id="explTabla">
+                        <colgroup><col style="width: 11%"><col style="width: 27%"><col style="width: 20%"><col style="width: 20%"><col style="width: 9%"><col style="width: 13%"></colgroup>
+                        <tbody id="explFilas"></tbody>
+                    </table>
+                </div>
+            </div>
+
+            <!-- Tabla de Top Prestadores -->
+            {{ tabla_prestadores }}
+
+            <!-- Tabla de Movimientos Sin Clasificar -->
+            {{ tabla_sin_clasificar }}
+        </div>
+
+        <div class="footer">
+            &copy; 2025 TORO · Resumen de Cuentas | Generado automáticamente
+        </div>
+    </div>
+
+    <script>
+        // Datos embebidos: un objeto por gráfico, en columnas (una lista por campo)
+        async function descomprimirDatos(base64) {
+            const bytes = Uint8Array.from(atob(base64), c => c.charCodeAt(0));
+            const flujo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(flujo).text());
+        }
+
+        // Texto para insertar con innerHTML
+        const escapar = t => String(t).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+
+        // Explorador de movimientos: columnas con diccionario (textos una sola vez,
+        // cada fila guarda el índice) y tabla virtual (solo se dibujan las filas visibles)
+        function iniciarExplorador(mov) {
+            const ALTO_FILA = 28;
+            const columna = c => ({valores: c.valores, html: c.valores.map(escapar), codigos: Int32Array.from(c.codigos)});
+            const concepto = columna(mov.concepto), persona = columna(mov.persona);
+            const categoria = columna(mov.categoria), banco = columna(mov.banco);
+            const dias = Int32Array.from(mov.dias), centavos = Float64Array.from(mov.centavos);
+            const base = Date.parse(mov.base);
+            const total = dias.length;
+            const dia = ms => Math.round((ms - base) / 86400000);
+            const fecha = d => new Date(base + d * 86400000).toISOString().slice(0, 10);
+            const pesos = c => '$' + (c / 100).toLocaleString('es-AR', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+
+            const $ = id => document.getElementById(id);
+            const ventana = $('explVentana'), alto = $('explAlto'), tabla = $('explTabla'), filas = $('explFilas');
+            [[categoria, 'explCategoria'], [banco, 'explBanco']].forEach(([col, id]) => {
+                $(id).length = 1;
+                col.valores.forEach((valor, codigo) => {
+                    const opcion = document.createElement('option');
+                    opcion.value = codigo;
+                    opcion.textContent = valor || '(sin dato)';
+                    $(id).appendChild(opcion);
+                });
+            });
+
+            let visibles = new Int32Array(0);
+
+            function dibujar() {
+                const primera = Math.floor(ventana.scrollTop / ALTO_FILA);
+                const ultima = Math.min(visibles.length, primera + Math.ceil(ventana.clientHeight / ALTO_FILA) + 10);
+                let html = '';
+                for (let k = primera; k < ultima; k++) {
+                    const i = visibles[k];
+                    html += `<tr><td class="fecha">${fecha(dias[i])}</td><td>${concepto.html[concepto.codigos[i]]}</td>` +
+                            `<td>${persona.html[persona.codigos[i]]}</td><td>${categoria.html[categoria.codigos[i]]}</td>` +
+                            `<td>${banco.html[banco.codigos[i]]}</td>` +
+                            `<td class="importe ${centavos[i] >= 0 ? 'neto-positivo' : 'neto-negativo'}">${pesos(centavos[i])}</td></tr>`;
+                }
+                tabla.style.top = (primera * ALTO_FILA) + 'px';
+                filas.innerHTML = html;
+            }
+
+            function filtrar() {
+                const cat = $('explCategoria').value === '' ? -1 : +$('explCategoria').value;
+                const ban = $('explBanco').value === '' ? -1 : +$('explBanco').value;
+                const desde = $('explDesde').value ? dia(Date.parse($('explDesde').value)) : -Infinity;
+                const hasta = $('explHasta').value ? dia(Date.parse($('explHasta').value)) : Infinity;
+                const texto = $('explTexto').value.trim().toLowerCase();
+                // El texto se busca en los diccionarios, no fila por fila
+                const coincide = col => Uint8Array.from(col.valores, v => !texto || v.toLowerCase().includes(texto));
+                const enConcepto = coincide(concepto), enPersona = coincide(persona);
+
+                const resultado = new Int32Array(total);
+                let n = 0;
+                for (let i = 0; i < total; i++) {
+                    if ((cat < 0 || categoria.codigos[i] === cat) && (ban < 0 || banco.codigos[i] === ban) &&
+                        dias[i] >= desde && dias[i] <= hasta &&
+                        (enConcepto[concepto.codigos[i]] || enPersona[persona.codigos[i]])) {
+                        resultado[n++] = i;
+                    }
+                }
+                visibles = resultado.subarray(0, n);
+                alto.style.height = (n * ALTO_FILA) + 'px';
+                ventana.scrollTop = 0;
+                $('explCuenta').textContent = `(${n.toLocaleString('es-AR')} de ${total.toLocaleString('es-AR')} movimientos)`;
+                dibujar();
+            }
+
+            // Asignación (no addEventListener): en modo servidor se reinicia con cada consulta
+            ventana.onscroll = () => requestAnimationFrame(dibujar);
+            ['explCategoria', 'explBanco', 'explDesde', 'explHasta'].forEach(id => { $(id).onchange = filtrar; });
+            $('explTexto').oninput = filtrar;
+            filtrar();
+        }
+
+        function iniciarDashboard(datos) {
+            // En modo servidor se vuelve a llamar con cada consulta: se descartan
+            // los gráficos anteriores y se actualizan las cards
+            ['chartIngresos', 'chartEgresos', 'chartFlujo', 'chartMensual'].forEach(id => {
+                const anterior = Chart.getChart && Chart.getChart(id);
+                if (anterior) anterior.destroy();
+            });
+            Object.entries(datos.tarjetas || {}).forEach(([marcador, texto]) => {
+                document.querySelectorAll(`[data-marcador="${marcador}"]`).forEach(el => { el.textContent = texto; });
+            });
+
+            const datosIngresos = datos.ingresos;
+            const datosEgresos = datos.egresos;
+            const datosFlujo = datos.flujo;
+            const datosMensual = datos.mensual;
+            const resumenCategorias = datos.resumen;
+
+            // Llenar tabla de resumen por categoría principal
+            const summaryTableBody = document.getElementById('summaryTableBody');
+            summaryTableBody.innerHTML = '';
+            const formato = {minimumFractionDigits: 0, maximumFractionDigits: 0};
+            resumenCategorias.categoria.forEach((categoria, i) => {
+                const neto = resumenCategorias.neto[i];
+                const row = document.createElement('tr');
+                const netoClass = neto >= 0 ? 'neto-positivo' : 'neto-negativo';
+                row.innerHTML = `
+                    <td>${escapar(categoria)}</td>
+                    <td>${resumenCategorias.transacciones[i].toLocaleString('es-AR')}</td>
+                    <td>$${resumenCategorias.ingresos[i].toLocaleString('es-AR', formato)}</td>
+                    <td>$${resumenCategorias.egresos[i].toLocaleString('es-AR', formato)}</td>
+                    <td class="${netoClass}">$${neto.toLocaleString('es-AR', formato)}</td>
+                `;
+                summaryTableBody.appendChild(row);
+            });
+
+            iniciarExplorador(datos.movimientos);
+
+            // Gráfico de Ingresos (Torta)
+            new Chart(document.getElementById('chartIngresos'), {
+                type: 'pie',
+                data: {
+                    labels: datosIngresos.labels,
+                    datasets: [{
+                        data: datosIngresos.values,
+                        backgroundColor: [
+                            '#059669',  // TORO verde petróleo
+                            '#10b981',  // TORO verde claro
+                            '#0ea5e9',  // TORO azul acento
+                            '#047857',  // TORO verde oscuro
+                            '#06b6d4'   // Cyan complementario
+                        ],
+                        borderWidth: 2,
+                        borderColor: '#fff'
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    plugins: {
+                        legend: {
+                            position: 'bottom'
+                        },
+                        tooltip: {
+                            callbacks: {
+                                label: function(context) {
+                                    let label = context.label || '';
+                                    if (label) {
+                                        label += ': ';
+                                    }
+                                    label += '$' + context.parsed.toLocaleString('es-AR', {minimumFractionDigits: 2});
+                                    return label;
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+
+            // Gráfico de Egresos (Torta - Top 10)
+            new Chart(document.getElementById('chartEgresos'), {
+                type: 'pie',
+                data: {
+                    labels: datosEgresos.labels,
+                    datasets: [{
+                        data: datosEgresos.values,
+                        backgroundColor: [
+                            '#dc3545', // Rojo
+                            '#fd7e14', // Naranja
+                            '#ff6b6b', // Rojo claro
+                            '#e83e8c', // Rosa
+                            '#9b59b6', // Púrpura
+                            '#ffc107', // Amarillo
+                            '#f39c12', // Naranja oscuro
+                            '#17a2b8', // Azul
+                            '#3498db', // Azul claro
+                            '#6c757d'  // Gris
+                        ],
+                        borderWidth: 2,
+                        borderColor: '#fff'
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    plugins: {
+                        legend: {
+                            position: 'bottom'
+                        },
+                        tooltip: {
+                            callbacks: {
+                                label: function(context) {
+                                    let label = context.label || '';
+                                    if (label) {
+                                        label += ': ';
+                                    }
+                                    label += '$' + context.parsed.toLocaleString('es-AR', {minimumFractionDigits: 2});
+                                    return label;
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+
+            // Gráfico de Flujo de Caja (Líneas). En períodos largos se dibuja la
+            // serie reducida; la diaria (datosFlujo.diario) se usa en tooltips y zoom
+            const flujoDiario = datosFlujo.diario || null;
+            const botonFlujo = document.getElementById('flujoCompleto');
+            let indicesFlujo = datosFlujo.indices || null;
+            const pesos = v => '$' + v.toLocaleString('es-AR', {minimumFractionDigits: 2});
+            document.getElementById('flujoAyuda').textContent = flujoDiario ?
+                `(${datosFlujo.labels.length} de ${flujoDiario.labels.length} días; clic en un punto para ver el detalle diario)` : '';
+            botonFlujo.style.display = 'none';
+
+            const graficoFlujo = new Chart(document.getElementById('chartFlujo'), {
+                type: 'line',
+                data: {
+                    labels: datosFlujo.labels,
+                    datasets: [
+                        {
+                            label: 'Ingresos',
+                            data: datosFlujo.ingresos,
+                            borderColor: '#059669',
+                            backgroundColor: 'rgba(5, 150, 105, 0.1)',
+                            tension: 0.4,
+                            fill: true
+                        },
+                        {
+                            label: 'Egresos',
+                            data: datosFlujo.egresos,
+                            borderColor: '#dc3545',
+                            backgroundColor: 'rgba(220, 53, 69, 0.1)',
+                            tension: 0.4,
+                            fill: true
+                        }
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    onClick: function(evento, elementos) {
+                        // Zoom: días reales alrededor del punto elegido
+                        if (!indicesFlujo || elementos.length === 0) {
+                            return;
+                        }
+                        const i = elementos[0].index;
+                        const desde = indicesFlujo[Math.max(0, i - 5)];
+                        const hasta = i + 6 < indicesFlujo.length ? indicesFlujo[i + 6] : flujoDiario.labels.length;
+                        mostrarFlujo(flujoDiario.labels.slice(desde, hasta), flujoDiario.ingresos.slice(desde, hasta),
+                                     flujoDiario.egresos.slice(desde, hasta), null);
+                        botonFlujo.style.display = 'inline-block';
+                    },
+                    plugins: {
+                        legend: {
+                            position: 'top'
+                        },
+                        tooltip: {
+                            callbacks: {
+                                label: function(context) {
+                                    let label = context.dataset.label || '';
+                                    if (label) {
+                                        label += ': ';
+                                    }
+                                    label += '$' + context.parsed.y.toLocaleString('es-AR', {minimumFractionDigits: 2});
+                                    return label;
+                                },
+                                afterBody: function(items) {
+                                    // Totales diarios del tramo que representa el punto
+                                    if (!indicesFlujo || items.length === 0) {
+                                        return '';
+                                    }
+                                    const i = items[0].dataIndex;
+                                    const desde = indicesFlujo[i];
+                                    const hasta = i + 1 < indicesFlujo.length ? indicesFlujo[i + 1] : flujoDiario.labels.length;
+                                    if (hasta - desde <= 1) {
+                                        return '';
+                                    }
+                                    const suma = valores => valores.slice(desde, hasta).reduce((a, b) => a + b, 0);
+                                    return [
+                                        `Tramo ${flujoDiario.labels[desde]} a ${flujoDiario.labels[hasta - 1]} (${hasta - desde} días)`,
+                                        'Ingresos del tramo: ' + pesos(suma(flujoDiario.ingresos)),
+                                        'Egresos del tramo: ' + pesos(suma(flujoDiario.egresos))
+                                    ];
+                                }
+                            }
+                        }
+                    },
+                    scales: {
+                        y: {
+                            beginAtZero: true,
+                            ticks: {
+                                callback: function(value) {
+                                    return '$' + value.toLocaleString('es-AR');
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+
+            function mostrarFlujo(labels, ingresos, egresos, indices) {
+                indicesFlujo = indices;
+                graficoFlujo.data.labels = labels;
+                graficoFlujo.data.datasets[0].data = ingresos;
+                graficoFlujo.data.datasets[1].data = egresos;
+                graficoFlujo.update();
+            }
+
+            botonFlujo.onclick = function() {
+                mostrarFlujo(datosFlujo.labels, datosFlujo.ingresos, datosFlujo.egresos, datosFlujo.indices);
+                botonFlujo.style.display = 'none';
+            };
+
+            // Gráfico mes a mes (Barras) - solo si hay cubo histórico
+            if (document.getElementById('chartMensual')) {
+                new Chart(document.getElementById('chartMensual'), {
+                    type: 'bar',
+                    data: {
+                        labels: datosMensual.labels,
+                        datasets: [
+                            { label: 'Ingresos', data: datosMensual.ingresos, backgroundColor: '#059669' },
+                            { label: 'Egresos', data: datosMensual.egresos, backgroundColor: '#dc3545' }
+                        ]
+                    },
+                    options: {
+                        responsive: true,
+                        plugins: { legend: { position: 'top' } },
+                        scales: {
+                            y: {
+                                beginAtZero: true,
+                                ticks: {
+                                    callback: function(value) {
+                                        return '$' + value.toLocaleString('es-AR');
+                                    }
+                                }
+                            }
+                        }
+                    }
+                });
+            }
+        }
+
+        // Modo servidor (python main.py --servir): los datos se piden a la API
+        // local con los filtros del panel, sin volver a generar el HTML
+        async function consultarServidor() {
+            const parametros = new URLSearchParams();
+            ['desde', 'hasta', 'categoria', 'banco'].forEach(filtro => {
+                const valor = document.getElementById('srv_' + filtro).value;
+                if (valor) parametros.set(filtro, valor);
+            });
+            const estado = document.getElementById('srv_estado');
+            estado.textContent = 'Consultando...';
+            const respuesta = await fetch('/api/datos?' + parametros);
+            const datos = await respuesta.json();
+            if (!respuesta.ok) {
+                estado.textContent = datos.error;
+                return;
+            }
+            iniciarDashboard(datos);
+            estado.textContent = `${datos.movimientos.dias.length.toLocaleString('es-AR')} movimientos`;
+        }
+
+        {{ carga_datos }}
+    </script>
+</body>
+</html>
+""")
+
+PLANTILLA_DASHBOARD_MINIFICADA = PLANTILLA_DASHBOARD.minificada()
+
+# Tabla comparativa por categoría (marcador seccion_comparativa)
+PLANTILLA_COMPARATIVA = Plantilla("""
+        <div class="chart-container chart-full" style="margin-bottom: 30px;">
+            <div class="chart-title">Comparativo por Categoría: {{ actual }} vs {{ anterior }} y año anterior</div>
+            <table class="summary-table">
+                <thead>
+                    <tr>
+                        <th>Categoría</th>
+                        <th>Actual</th>
+                        <th>Anterior</th>
+                        <th>Variación</th>
+                        <th>Año Anterior</th>
+                        <th>Variación Interanual</th>
+                    </tr>
+                </thead>
+                <tbody>
+{{ filas }}                </tbody>
+            </table>
+        </div>
+        """)
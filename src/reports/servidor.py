@@ -0,0 +1,298 @@
+"""
+Servidor local del dashboard - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+Sirve el dashboard y una API JSON sobre los movimientos categorizados, para
+cambiar el período o los filtros sin volver a correr el proceso ni generar
+otro HTML. Solo usa la biblioteca estándar (http.server) y escucha en
+127.0.0.1: no expone datos fuera del equipo.
+
+Endpoints (GET):
+- /                 Dashboard HTML en modo servidor (panel de filtros)
+- /api/resumen      Rango de fechas, categorías principales y bancos disponibles
+- /api/datos        Datos del dashboard (gráficos, explorador y cards)
+- /api/agregados    Ingresos, egresos y cantidad agrupados (parámetro 'por':
+                    categoria, principal, banco, D, W o M)
+
+Filtros de /api/datos y /api/agregados: desde, hasta (AAAA-MM-DD),
+categoria (Categoria_Principal) y banco.
+
+Los movimientos se ordenan por fecha una sola vez (cortes por búsqueda
+binaria) y se indexan por categoría principal y banco; las respuestas se
+memorizan por filtros.
+"""
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .agregados import AgregadosReporte
+from .analyzer import Analyzer
+from .cubo import CuboMovimientos
+from .dashboard_generator import DashboardGenerator
+
+
+class ServidorDashboard:
+    """
+    Consultas del dashboard sobre un conjunto fijo de movimientos categorizados.
+
+    Uso:
+        servidor = ServidorDashboard(df, cubo).servir(puerto=8765)
+        servidor.serve_forever()
+    """
+
+    # Columnas indexadas (filtro -> columna)
+    FILTROS = {'categoria': 'Categoria_Principal', 'banco': 'Banco'}
+
+    # Agrupaciones de /api/agregados (las de período usan AgregadosReporte.GRANULARIDADES)
+    AGRUPACIONES = {'categoria': 'Categoria_Final', 'principal': 'Categoria_Principal', 'banco': 'Banco'}
+
+    # Respuestas memorizadas (las menos usadas se descartan)
+    MAX_CONSULTAS = 64
+
+    def __init__(self, df: pd.DataFrame, cubo: CuboMovimientos = None, comparativo: Dict = None):
+        """
+        Args:
+            df: DataFrame con movimientos categorizados
+            cubo: Cubo histórico para la sección mes a mes (opcional)
+            comparativo: Comparativo por categoría (ver Analyzer.comparativo). Opcional.
+        """
+        self.analyzer = Analyzer(df)
+        self.cubo = cubo
+        self.comparativo = comparativo
+
+        # Posiciones (en el orden cronológico de analyzer.df) de cada valor filtrable
+        self._indices: Dict[str, Dict[str, np.ndarray]] = {}
+        for filtro, columna in self.FILTROS.items():
+            if columna in self.analyzer.df.columns:
+                valores = self.analyzer.df[columna].astype(object).where(self.analyzer.df[columna].notna(), '')
+                self._indices[filtro] = {str(valor): np.asarray(posiciones)
+                                         for valor, posiciones in valores.groupby(valores).indices.items()}
+            else:
+                self._indices[filtro] = {}
+
+        self._consultas: 'OrderedDict[Tuple, object]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _memo(self, clave: Tuple, calcular: Callable):
+        """Devuelve la respuesta memorizada de 'clave' o la calcula (LRU de MAX_CONSULTAS)."""
+        with self._lock:
+            if clave in self._consultas:
+                self._consultas.move_to_end(clave)
+                return self._consultas[clave]
+
+        valor = calcular()
+
+        with self._lock:
+            self._consultas[clave] = valor
+            while len(self._consultas) > self.MAX_CONSULTAS:
+                self._consultas.popitem(last=False)
+        return valor
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def filtrar(self, desde: str = None, hasta: str = None, categoria: str = None,
+                banco: str = None) -> pd.DataFrame:
+        """
+        Movimientos que cumplen los filtros, en orden cronológico.
+
+        El período se corta por búsqueda binaria (Analyzer.limites) y cada
+        filtro por valor usa su índice de posiciones, recortado al período.
+
+        Args:
+            desde: Primer día incluido (None = sin límite)
+            hasta: Último día incluido (None = sin límite)
+            categoria: Categoria_Principal (None = todas)
+            banco: Banco (None = todos)
+
+        Returns:
+            DataFrame con los movimientos filtrados
+
+        Raises:
+            ValueError: Si una fecha no es válida
+        """
+        inicio, fin = self.analyzer.limites(desde, hasta)
+
+        seleccion = None
+        for filtro, valor in (('categoria', categoria), ('banco', banco)):
+            if not valor:
+                continue
+            posiciones = self._indices[filtro].get(valor, np.empty(0, dtype=np.intp))
+            posiciones = posiciones[np.searchsorted(posiciones, inicio):np.searchsorted(posiciones, fin)]
+            seleccion = posiciones if seleccion is None else np.intersect1d(seleccion, posiciones,
+                                                                            assume_unique=True)
+
+        if seleccion is None:
+            return self.analyzer.df.iloc[inicio:fin]
+        return self.analyzer.df.iloc[seleccion]
+
+    def resumen(self) -> Dict:
+        """
+        Returns:
+            Dict con desde, hasta, movimientos, categorias y bancos disponibles
+        """
+        primero, ultimo = self.analyzer.rango_fechas()
+        return {
+            'desde': None if primero is None else f"{primero:%Y-%m-%d}",
+            'hasta': None if ultimo is None else f"{ultimo:%Y-%m-%d}",
+            'movimientos': len(self.analyzer.df),
+            'categorias': sorted(valor for valor in self._indices['categoria'] if valor),
+            'bancos': sorted(valor for valor in self._indices['banco'] if valor),
+        }
+
+    def datos(self, desde: str = None, hasta: str = None, categoria: str = None,
+              banco: str = None) -> Dict:
+        """
+        Datos del dashboard para los filtros (ver DashboardGenerator.datos_consulta).
+
+        Returns:
+            Dict con gráficos, movimientos del explorador y textos de las cards
+
+        Raises:
+            ValueError: Si una fecha no es válida o no hay movimientos
+        """
+        def calcular():
+            df = self.filtrar(desde, hasta, categoria, banco)
+            if len(df) == 0:
+                raise ValueError("No hay movimientos con esos filtros")
+            analyzer = Analyzer(df)
+            return DashboardGenerator(analyzer.df, analyzer.metricas, analyzer.agregados,
+                                      self.cubo).datos_consulta()
+
+        return self._memo(('datos', desde, hasta, categoria, banco), calcular)
+
+    def agregados(self, por: str = 'categoria', desde: str = None, hasta: str = None,
+                  categoria: str = None, banco: str = None) -> Dict:
+        """
+        Ingresos (créditos), egresos (débitos) y cantidad de movimientos por grupo.
+
+        Args:
+            por: 'categoria' (Categoria_Final), 'principal', 'banco', o período 'D', 'W', 'M'
+            desde, hasta, categoria, banco: Filtros (ver filtrar)
+
+        Returns:
+            Dict columnar {por, clave, ingresos, egresos, cantidad}
+
+        Raises:
+            ValueError: Si la agrupación o una fecha no es válida
+        """
+        if por not in self.AGRUPACIONES and por not in AgregadosReporte.GRANULARIDADES:
+            raise ValueError(f"Agrupación desconocida: {por} "
+                             f"(usar {', '.join([*self.AGRUPACIONES, *AgregadosReporte.GRANULARIDADES])})")
+
+        def calcular():
+            df = self.filtrar(desde, hasta, categoria, banco)
+            if por in self.AGRUPACIONES:
+                columna = self.AGRUPACIONES[por]
+                clave = (df[columna].astype(object).where(df[columna].notna(), '') if columna in df.columns
+                         else pd.Series('', index=df.index))
+            else:
+                clave = AgregadosReporte.inicio_periodo(df['Fecha'], por).dt.strftime('%Y-%m-%d')
+
+            tabla = (df.assign(_clave=clave.astype(str))
+                     .groupby('_clave', sort=True)
+                     .agg(ingresos=('Crédito', 'sum'), egresos=('Débito', 'sum'), cantidad=('Fecha', 'size')))
+            return {
+                'por': por,
+                'clave': tabla.index.tolist(),
+                'ingresos': DashboardGenerator._importes(tabla['ingresos']),
+                'egresos': DashboardGenerator._importes(tabla['egresos']),
+                'cantidad': tabla['cantidad'].astype(int).tolist(),
+            }
+
+        return self._memo(('agregados', por, desde, hasta, categoria, banco), calcular)
+
+    def html(self) -> str:
+        """
+        Dashboard HTML en modo servidor: tablas del total y datos pedidos a /api/datos.
+
+        Returns:
+            String HTML
+        """
+        def calcular():
+            return DashboardGenerator(self.analyzer.df, self.analyzer.metricas, self.analyzer.agregados,
+                                      self.cubo, self.comparativo, servidor=True)._crear_html()
+
+        return self._memo(('html',), calcular)
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def responder(self, ruta: str) -> Tuple[int, str, bytes]:
+        """
+        Respuesta a un GET (independiente del socket, ver servir).
+
+        Args:
+            ruta: Ruta con query string (ej: '/api/datos?desde=2025-07-01')
+
+        Returns:
+            Tupla (código HTTP, Content-Type, cuerpo)
+        """
+        partes = urlsplit(ruta)
+        parametros = {clave: valores[0] for clave, valores in parse_qs(partes.query).items()}
+        filtros = {clave: parametros.get(clave) for clave in ('desde', 'hasta', 'categoria', 'banco')}
+
+        try:
+            if partes.path in ('/', '/index.html'):
+                return 200, 'text/html; charset=utf-8', self.html().encode('utf-8')
+            if partes.path == '/api/resumen':
+                respuesta = self.resumen()
+            elif partes.path == '/api/datos':
+                respuesta = self.datos(**filtros)
+            elif partes.path == '/api/agregados':
+                respuesta = self.agregados(parametros.get('por', 'categoria'), **filtros)
+            else:
+                return self._json(404, {'error': f"No existe: {partes.path}"})
+        except ValueError as e:
+            return self._json(400, {'error': str(e)})
+
+        return self._json(200, respuesta)
+
+    @staticmethod
+    def _json(codigo: int, datos: Dict) -> Tuple[int, str, bytes]:
+        """Respuesta JSON compacta."""
+        cuerpo = json.dumps(datos, separators=(',', ':'), ensure_ascii=False, default=str)
+        return codigo, 'application/json; charset=utf-8', cuerpo.encode('utf-8')
+
+    def servir(self, host: str = '127.0.0.1', puerto: int = 8765) -> ThreadingHTTPServer:
+        """
+        Crea el servidor HTTP (sin iniciarlo: llamar a serve_forever()).
+
+        Args:
+            host: Interfaz donde escuchar (default: solo este equipo)
+            puerto: Puerto TCP (0 = cualquiera libre)
+
+        Returns:
+            ThreadingHTTPServer listo para serve_forever()
+        """
+        dashboard = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                codigo, tipo, cuerpo = dashboard.responder(self.path)
+                comprimir = len(cuerpo) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', '')
+                if comprimir:
+                    cuerpo = gzip.compress(cuerpo, compresslevel=6)
+
+                self.send_response(codigo)
+                self.send_header('Content-Type', tipo)
+                self.send_header('Content-Length', str(len(cuerpo)))
+                if comprimir:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                # Sin una línea por pedido en la consola
+                pass
+
+        return ThreadingHTTPServer((host, puerto), Manejador)
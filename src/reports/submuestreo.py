@@ -0,0 +1,127 @@
+"""
+Reducción de series temporales para gráficos - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+Con períodos largos (años de datos diarios) el gráfico de flujo de caja
+recibe miles de puntos: el HTML crece y el navegador se vuelve lento. Estas
+funciones eligen qué puntos dibujar conservando la forma de la serie:
+
+- LTTB (Largest-Triangle-Three-Buckets): divide la serie en baldes y de cada
+  uno toma el punto que forma el triángulo más grande con el elegido antes y
+  el promedio del balde siguiente. Conserva picos y cambios de tendencia.
+- Mínimo/máximo por balde: toma el menor y el mayor de cada balde.
+
+Todas devuelven índices sobre la serie original, así el gráfico puede
+volver a los datos diarios (tooltips y zoom).
+"""
+from typing import Sequence
+
+import numpy as np
+
+
+def indices_lttb(x: Sequence[float], y: Sequence[float], puntos: int) -> np.ndarray:
+    """
+    Índices de los puntos elegidos por LTTB.
+
+    Args:
+        x: Posición de cada punto (ej: día como número), creciente
+        y: Valor de cada punto
+        puntos: Cantidad de puntos a conservar (incluye el primero y el último)
+
+    Returns:
+        Array ordenado de índices (todos si la serie ya entra en el presupuesto)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+
+    # Baldes interiores [bordes[i], bordes[i+1]); el último "balde" es el punto final
+    cada = (n - 2) / (puntos - 2)
+    bordes = (np.floor(np.arange(puntos - 1) * cada) + 1).astype(int)
+    bordes[-1] = n - 1
+
+    # Promedio de cada balde (y del punto final) de una sola vez
+    cantidades = np.diff(np.append(bordes, n))
+    promedio_x = np.add.reduceat(x, bordes) / cantidades
+    promedio_y = np.add.reduceat(y, bordes) / cantidades
+
+    elegidos = np.empty(puntos, dtype=int)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    a = 0
+    for i in range(puntos - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        # Doble del área del triángulo (a, candidato, promedio del balde siguiente)
+        areas = np.abs((x[a] - promedio_x[i + 1]) * (y[inicio:fin] - y[a])
+                       - (x[a] - x[inicio:fin]) * (promedio_y[i + 1] - y[a]))
+        a = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = a
+
+    return elegidos
+
+
+def indices_min_max(y: Sequence[float], puntos: int) -> np.ndarray:
+    """
+    Índices del mínimo y el máximo de cada balde (más el primero y el último).
+
+    Args:
+        y: Valor de cada punto (NaN = sin dato, se ignora)
+        puntos: Cantidad máxima de puntos a conservar
+
+    Returns:
+        Array ordenado de índices sin repetidos
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if puntos >= n or puntos < 4:
+        return np.arange(n)
+
+    # Baldes del mismo tamaño; el último se completa con NaN
+    tamanio = int(np.ceil(n / ((puntos - 2) // 2)))
+    baldes = np.full(int(np.ceil(n / tamanio)) * tamanio, np.nan)
+    baldes[:n] = y
+    baldes = baldes.reshape(-1, tamanio)
+    base = np.arange(len(baldes)) * tamanio
+
+    # Un balde sin ningún valor (todo NaN) no aporta puntos
+    con_datos = ~np.isnan(baldes).all(axis=1)
+    baldes, base = baldes[con_datos], base[con_datos]
+
+    return np.unique(np.concatenate([
+        [0, n - 1],
+        base + np.nanargmin(baldes, axis=1),
+        base + np.nanargmax(baldes, axis=1),
+    ]).astype(int))
+
+
+def indices_series(x: Sequence[float], series: Sequence[Sequence[float]], puntos: int,
+                   metodo: str = 'lttb') -> np.ndarray:
+    """
+    Índices comunes para varias series que comparten el eje x (ej: ingresos
+    y egresos del flujo de caja): cada serie recibe una parte del presupuesto
+    y se dibuja la unión de los puntos elegidos.
+
+    Args:
+        x: Posición de cada punto, creciente
+        series: Series con el mismo largo que x
+        puntos: Cantidad máxima de puntos del gráfico
+        metodo: 'lttb' o 'minmax'
+
+    Returns:
+        Array ordenado de índices sin repetidos
+
+    Raises:
+        ValueError: Si el método no existe
+    """
+    if metodo not in ('lttb', 'minmax'):
+        raise ValueError(f"Método de reducción desconocido: {metodo} (usar 'lttb' o 'minmax')")
+
+    n = len(x)
+    if puntos >= n or not series:
+        return np.arange(n)
+
+    por_serie = max(puntos // len(series), 4)
+    elegidos = [indices_lttb(x, y, por_serie) if metodo == 'lttb' else indices_min_max(y, por_serie)
+                for y in series]
+    return np.unique(np.concatenate(elegidos))
@@ -1,3 +1,5 @@
+from .cache_etapas import CacheEtapas
 from .cli_corrector import CLICorrector
+from .vigilante import VigilanteCarpeta
 
-__all__ = ['CLICorrector']
+__all__ = ['CacheEtapas', 'CLICorrector', 'VigilanteCarpeta']
@@ -0,0 +1,233 @@
+"""
+Cache de etapas del proceso completo - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+El proceso completo es un grafo de tres etapas (como un Makefile):
+
+    extracto ──> consolidado ──> categorizado ──> dashboard + reporte
+                                  ^
+                        reglas ───┘
+
+Cada etapa se identifica por la huella (sha256) de todo lo que la
+determina: sus archivos de entrada, las reglas, el mes y la versión del
+código. Si esa huella ya se calculó y sus archivos siguen en la cache, la
+etapa no se vuelve a ejecutar: se restauran sus archivos en la carpeta de
+salida. Volver a correr el proceso del mismo mes tras un cambio que no
+afecta una etapa solo recalcula desde la primera etapa afectada.
+
+La cache vive en output/.cache_etapas/ (índice JSON + archivos guardados
+por su contenido) y se puede borrar en cualquier momento.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+def huella_archivo(ruta: str) -> str:
+    """
+    sha256 de los bytes de un archivo ('' si no existe).
+
+    Args:
+        ruta: Ruta del archivo
+
+    Returns:
+        Huella hexadecimal
+    """
+    if not ruta or not os.path.exists(ruta):
+        return ''
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def huella_contenido(ruta: str) -> str:
+    """
+    Huella del contenido de un archivo, sin metadatos de guardado.
+
+    Un .xlsx es un zip cuyo docProps/ guarda la fecha de creación: dos
+    exportaciones de los mismos movimientos difieren en bytes. Para los .xlsx
+    se usan el nombre y el CRC de cada parte salvo docProps/ (sin
+    descomprimir); para el resto de archivos, sus bytes.
+
+    Args:
+        ruta: Ruta del archivo
+
+    Returns:
+        Huella hexadecimal ('' si no existe)
+    """
+    if not ruta or not os.path.exists(ruta):
+        return ''
+    if not zipfile.is_zipfile(ruta):
+        return huella_archivo(ruta)
+    h = hashlib.sha256()
+    with zipfile.ZipFile(ruta) as libro:
+        for parte in sorted(libro.infolist(), key=lambda p: p.filename):
+            if not parte.filename.startswith('docProps/'):
+                h.update(f"{parte.filename}:{parte.CRC}:{parte.file_size}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
+def version_codigo(version: str = '') -> str:
+    """
+    Huella del código fuente (todos los .py de src/) más la versión del sistema.
+
+    Cualquier cambio de código invalida la cache. En el ejecutable empaquetado,
+    sin los .py, queda solo la versión.
+
+    Args:
+        version: Versión del sistema (config.system.version)
+
+    Returns:
+        Huella hexadecimal
+    """
+    h = hashlib.sha256(version.encode('utf-8'))
+    raiz = Path(__file__).resolve().parents[1]
+    for ruta in sorted(raiz.rglob('*.py')):
+        h.update(ruta.relative_to(raiz).as_posix().encode('utf-8'))
+        h.update(ruta.read_bytes())
+    return h.hexdigest()
+
+
+class CacheEtapas:
+    """
+    Cache direccionada por contenido de las etapas del proceso completo.
+
+    Uso:
+        cache = CacheEtapas('output/.cache_etapas')
+        archivos = cache.ejecutar('Consolidar', {'extracto': huella_archivo(ruta)},
+                                  lambda: [consolidar(ruta)])
+        cache.resumen   # [{'etapa': 'Consolidar', 'hit': True, 'segundos': 0.01}]
+    """
+
+    # Claves guardadas por etapa (las más viejas y sus archivos se descartan)
+    MAX_ENTRADAS_POR_ETAPA = 12
+
+    def __init__(self, directorio: str, reutilizar: bool = True):
+        """
+        Args:
+            directorio: Carpeta de la cache (se crea si no existe)
+            reutilizar: Si False, ejecuta todas las etapas y solo actualiza la cache
+        """
+        self.directorio = directorio
+        self.reutilizar = reutilizar
+        self.ruta_indice = os.path.join(directorio, 'indice.json')
+        self.directorio_objetos = os.path.join(directorio, 'objetos')
+        os.makedirs(self.directorio_objetos, exist_ok=True)
+        self.indice = self._leer_indice()
+        self.resumen: List[Dict] = []
+
+    @staticmethod
+    def clave(etapa: str, entradas: Dict[str, str]) -> str:
+        """
+        Huella de una etapa: su nombre y todas sus entradas.
+
+        Args:
+            etapa: Nombre de la etapa
+            entradas: {nombre: huella o valor} de lo que determina la etapa
+
+        Returns:
+            Huella hexadecimal
+        """
+        texto = json.dumps({'etapa': etapa, 'entradas': entradas}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def ejecutar(self, etapa: str, entradas: Dict[str, str],
+                 calcular: Callable[[], Optional[List[str]]]) -> Optional[List[str]]:
+        """
+        Restaura los archivos de la etapa si sus entradas no cambiaron; si no,
+        la ejecuta y guarda sus archivos.
+
+        Args:
+            etapa: Nombre de la etapa (para el resumen)
+            entradas: {nombre: huella o valor} de lo que determina la etapa
+            calcular: Ejecuta la etapa y devuelve las rutas de los archivos que
+                genera (None si falló; una ruta None si falló una salida, y
+                en ese caso no se guarda en la cache)
+
+        Returns:
+            Rutas de los archivos de la etapa (None si falló)
+        """
+        inicio = time.perf_counter()
+        clave = self.clave(etapa, entradas)
+        registro = self.indice.get(clave)
+
+        if self.reutilizar and registro and self._completo(registro):
+            destino = os.path.dirname(registro['origen'])
+            archivos = [self._restaurar(nombre, objeto, destino) for nombre, objeto in registro['archivos'].items()]
+            registro['usado'] = datetime.now().isoformat(timespec='seconds')
+            self._escribir_indice()
+            self.resumen.append({'etapa': etapa, 'hit': True, 'segundos': time.perf_counter() - inicio})
+            return archivos
+
+        archivos = calcular()
+        self.resumen.append({'etapa': etapa, 'hit': False, 'segundos': time.perf_counter() - inicio})
+        if not archivos or any(ruta is None for ruta in archivos):
+            return archivos
+
+        self.indice[clave] = {
+            'etapa': etapa,
+            'origen': os.path.abspath(archivos[0]),
+            'archivos': {os.path.basename(ruta): self._guardar(ruta) for ruta in archivos},
+            'usado': datetime.now().isoformat(timespec='seconds'),
+        }
+        self._podar(etapa)
+        self._escribir_indice()
+        return archivos
+
+    def _completo(self, registro: Dict) -> bool:
+        """True si todos los archivos de la entrada siguen guardados."""
+        return all(os.path.exists(os.path.join(self.directorio_objetos, objeto))
+                   for objeto in registro['archivos'].values())
+
+    def _guardar(self, ruta: str) -> str:
+        """Copia el archivo a la cache con su huella como nombre (una sola copia por contenido)."""
+        objeto = huella_archivo(ruta)
+        ruta_objeto = os.path.join(self.directorio_objetos, objeto)
+        if not os.path.exists(ruta_objeto):
+            temporal = ruta_objeto + '.tmp'
+            shutil.copyfile(ruta, temporal)
+            os.replace(temporal, ruta_objeto)
+        return objeto
+
+    def _restaurar(self, nombre: str, objeto: str, destino: str) -> str:
+        """Deja en destino el archivo guardado, salvo que ya esté igual."""
+        ruta = os.path.join(destino, nombre)
+        if huella_archivo(ruta) != objeto:
+            os.makedirs(destino, exist_ok=True)
+            shutil.copyfile(os.path.join(self.directorio_objetos, objeto), ruta)
+        return ruta
+
+    def _podar(self, etapa: str):
+        """Descarta las entradas más viejas de la etapa y los archivos que ya nadie usa."""
+        claves = sorted((clave for clave, registro in self.indice.items() if registro['etapa'] == etapa),
+                        key=lambda clave: self.indice[clave]['usado'], reverse=True)
+        for clave in claves[self.MAX_ENTRADAS_POR_ETAPA:]:
+            del self.indice[clave]
+
+        en_uso = {objeto for registro in self.indice.values() for objeto in registro['archivos'].values()}
+        for objeto in os.listdir(self.directorio_objetos):
+            if objeto not in en_uso:
+                os.remove(os.path.join(self.directorio_objetos, objeto))
+
+    def _leer_indice(self) -> Dict:
+        """Índice guardado ({} si no existe o está dañado)."""
+        try:
+            with open(self.ruta_indice, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _escribir_indice(self):
+        """Guarda el índice de forma atómica (un corte a mitad no lo deja dañado)."""
+        temporal = self.ruta_indice + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.indice, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, self.ruta_indice)
@@ -73,6 +73,31 @@ class CLICorrector:
             if pd.notna(movimiento.get('DEBIN_ID')):
                 print(f"ID DEBIN: {movimiento['DEBIN_ID']}")
 
+        # Sugerencias por similitud con el historial (ver SugeridorCategorias)
+        sugerencias = movimiento.get('Sugerencias')
+        if pd.notna(sugerencias) and sugerencias:
+            print(f"\nSugerencias: {sugerencias}")
+            for categoria in str(sugerencias).split(' | '):
+                nombre = categoria.rsplit(' (', 1)[0]
+                numero = self.numero_opcion(nombre)
+                if numero is not None:
+                    print(f"  -> opcion [{numero}] {nombre}")
+
+    def numero_opcion(self, subcategoria: str):
+        """
+        Busca el número de opción del menú para una subcategoría.
+
+        Args:
+            subcategoria: Nombre de la subcategoría (ej: "Servicios - Agua")
+
+        Returns:
+            Número de opción o None si no está en el menú
+        """
+        for opcion in self.opciones:
+            if opcion['subcategoria'] == subcategoria:
+                return opcion['numero']
+        return None
+
     def mostrar_opciones(self):
         """
         Muestra el menú de categorías disponibles.
@@ -202,8 +227,7 @@ class CLICorrector:
                         df_resultado = categorizer.aplicar_correccion(
                             df=df_resultado,
                             idx=idx,
-                            categoria=opcion_elegida['categoria'],
-                            subcategoria=opcion_elegida['subcategoria'],
+                            categoria_final=opcion_elegida['subcategoria'],
                             aprender=aprender
                         )
 
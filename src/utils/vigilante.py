@@ -0,0 +1,183 @@
+"""
+Vigilancia de la carpeta de extractos - TORO · Resumen de Cuentas
+Autor: Sistema TORO
+
+Revisa la carpeta input/ cada pocos segundos (sondeo: funciona igual en
+Windows, en carpetas de red y en el ejecutable, sin dependencias) y pasa
+cada extracto nuevo o modificado a una función de procesamiento.
+
+Un archivo que se está copiando o descargando todavía no está completo:
+solo se toma cuando su tamaño y fecha de modificación no cambiaron durante
+'espera' segundos y el .xlsx ya es un zip válido (el índice del zip se
+escribe al final).
+
+Los extractos listos pasan por una cola acotada a un único hilo de trabajo,
+que procesa de a uno (el categorizador y los archivos de salida no se
+comparten entre hilos). Si la cola está llena, el archivo espera a la
+próxima revisión en lugar de descartarse.
+"""
+import os
+import queue
+import threading
+import time
+import traceback
+import zipfile
+from glob import glob
+from typing import Callable, Dict, List, Tuple
+
+# (tamaño, fecha de modificación en ns)
+Firma = Tuple[int, int]
+
+
+class VigilanteCarpeta:
+    """
+    Vigila una carpeta y procesa cada .xlsx nuevo o modificado.
+
+    Uso:
+        vigilante = VigilanteCarpeta('input', procesar_extracto)
+        vigilante.ejecutar()            # hasta Ctrl+C
+    """
+
+    # Máximo de extractos listos esperando ser procesados
+    MAX_PENDIENTES = 8
+
+    def __init__(self, carpeta: str, procesar: Callable[[str], object],
+                 intervalo: float = 2.0, espera: float = 3.0, max_pendientes: int = None):
+        """
+        Args:
+            carpeta: Carpeta a vigilar
+            procesar: Función que recibe la ruta de cada extracto listo
+            intervalo: Segundos entre revisiones de la carpeta
+            espera: Segundos sin cambios para considerar completo un archivo
+            max_pendientes: Tamaño de la cola de trabajo (default: MAX_PENDIENTES)
+        """
+        self.carpeta = carpeta
+        self.procesar = procesar
+        self.intervalo = intervalo
+        self.espera = espera
+        self.cola: queue.Queue = queue.Queue(maxsize=max_pendientes or self.MAX_PENDIENTES)
+        self.procesados = 0
+        self.errores = 0
+        self._vistos: Dict[str, Firma] = {}
+        self._candidatos: Dict[str, Tuple[Firma, float]] = {}
+        self._hilo = None
+
+    def registrar_existentes(self) -> int:
+        """
+        Toma como ya vistos los extractos que están en la carpeta (solo se
+        procesa lo que llegue o cambie después).
+
+        Returns:
+            Cantidad de extractos existentes
+        """
+        for ruta in self._archivos():
+            firma = self._firma(ruta)
+            if firma:
+                self._vistos[ruta] = firma
+        return len(self._vistos)
+
+    def revisar(self, ahora: float = None) -> List[str]:
+        """
+        Una revisión de la carpeta: encola los archivos que terminaron de escribirse.
+
+        Args:
+            ahora: Momento de la revisión (default: time.monotonic())
+
+        Returns:
+            Rutas encoladas en esta revisión
+        """
+        ahora = time.monotonic() if ahora is None else ahora
+        archivos = self._archivos()
+        encolados = []
+
+        for ruta in archivos:
+            firma = self._firma(ruta)
+            if firma is None or self._vistos.get(ruta) == firma:
+                continue
+
+            candidato = self._candidatos.get(ruta)
+            if candidato is None or candidato[0] != firma:
+                # Nuevo o todavía cambiando: esperar a que se quede quieto
+                self._candidatos[ruta] = (firma, ahora)
+                continue
+            if ahora - candidato[1] < self.espera or not self._completo(ruta):
+                continue
+
+            try:
+                self.cola.put_nowait(ruta)
+            except queue.Full:
+                continue
+            self._vistos[ruta] = firma
+            del self._candidatos[ruta]
+            encolados.append(ruta)
+
+        for ruta in set(self._candidatos) - set(archivos):
+            del self._candidatos[ruta]
+        return encolados
+
+    def iniciar(self):
+        """Arranca el hilo de trabajo."""
+        self._hilo = threading.Thread(target=self._trabajar, name='toro-vigilante', daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Termina lo encolado y detiene el hilo de trabajo."""
+        if self._hilo is not None:
+            self.cola.put(None)
+            self._hilo.join()
+            self._hilo = None
+
+    def ejecutar(self):
+        """Vigila la carpeta hasta Ctrl+C (lo ya encolado se termina de procesar)."""
+        existentes = self.registrar_existentes()
+        print(f"Vigilando '{self.carpeta}' cada {self.intervalo:g} s "
+              f"({existentes} extracto(s) existente(s) no se reprocesan). Ctrl+C para detener.")
+        self.iniciar()
+        try:
+            while True:
+                for ruta in self.revisar():
+                    print(f"\nExtracto nuevo: {os.path.basename(ruta)} (pendientes: {self.cola.qsize()})")
+                time.sleep(self.intervalo)
+        except KeyboardInterrupt:
+            print("\nDeteniendo vigilancia (se termina lo pendiente)...")
+        finally:
+            self.detener()
+        print(f"Vigilancia detenida: {self.procesados} extracto(s) procesado(s), {self.errores} con error.")
+
+    def _trabajar(self):
+        """Hilo de trabajo: procesa de a un extracto; un error no detiene la vigilancia."""
+        while True:
+            ruta = self.cola.get()
+            try:
+                if ruta is None:
+                    return
+                self.procesar(ruta)
+                self.procesados += 1
+            except Exception as e:
+                self.errores += 1
+                traceback.print_exc()
+                print(f"ERROR procesando {os.path.basename(ruta)}: {e}")
+            finally:
+                self.cola.task_done()
+
+    def _archivos(self) -> List[str]:
+        """Extractos de la carpeta (sin los temporales '~$' de Excel abierto)."""
+        return sorted(ruta for ruta in glob(os.path.join(self.carpeta, '*.xlsx'))
+                      if not os.path.basename(ruta).startswith('~$'))
+
+    @staticmethod
+    def _firma(ruta: str):
+        """(tamaño, fecha de modificación) o None si el archivo ya no está."""
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            return None
+        return estado.st_size, estado.st_mtime_ns
+
+    @staticmethod
+    def _completo(ruta: str) -> bool:
+        """True si el .xlsx se puede abrir y es un zip completo."""
+        try:
+            return zipfile.is_zipfile(ruta)
+        except OSError:
+            return False
@@ -7,6 +7,12 @@ Verifica cálculos de análisis financiero:
 - Saldo/Balance
 - Estadísticas por categoría
 """
+import base64
+import gzip
+import json
+import re
+
+import numpy as np
 import pytest
 import pandas as pd
 import sys
@@ -16,6 +22,9 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from reports.analyzer import Analyzer
+from reports.dashboard_generator import DashboardGenerator
+from reports.excel_exporter import ExcelExporter
+from reports.plantilla import Plantilla
 
 
 class TestAnalyzer:
@@ -248,6 +257,493 @@ class TestAnalyzer:
         assert metricas['total_egresos'] == 0.0
         assert metricas['total_movimientos'] == 0
 
+    def test_agregado_una_fila_por_combinacion(self):
+        """Test: La agregación única resume por categorías y conserva totales"""
+        # Arrange
+        df = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01', '2025-12-02', '2025-12-03', '2025-12-04']),
+            'Concepto': ['a', 'b', 'c', 'd'],
+            'Detalle': ['', '', '', ''],
+            'Débito': [100.0, 50.0, 0.0, 30.0],
+            'Crédito': [0.0, 0.0, 800.0, 0.0],
+            'Saldo': [900.0, 850.0, 1650.0, 1620.0],
+            'Banco': ['Supervielle'] * 4,
+            'Tipo_Movimiento': ['Egreso', 'Egreso', 'Ingreso', 'Egreso'],
+            'Categoria_Principal': ['Servicios', 'Servicios', 'Ingresos', 'Sin Clasificar'],
+            'Categoria_Final': ['Servicios - Agua', 'Servicios - Agua', 'Ingresos - Transferencias',
+                                'Sin Clasificar - Requiere Revisión']
+        })
+        analyzer = Analyzer(df)
+
+        # Act
+        agregado = analyzer.agregado_categorias()
+        metricas = analyzer.calcular_metricas()
+
+        # Assert
+        assert len(agregado) == 3
+        assert agregado['Movimientos'].sum() == 4
+        assert agregado.loc[~agregado['Clasificado'], 'Débito'].sum() == 30.0
+        assert metricas['egresos_por_subcategoria'] == {'Servicios - Agua': 150.0,
+                                                        'Sin Clasificar - Requiere Revisión': 30.0}
+        assert metricas['egresos_clasificados'] == 150.0
+        assert analyzer.agregado_categorias() is agregado  # se calcula una sola vez
+
+
+class TestAgregadosCompartidos:
+    """Suite de tests para los agregados compartidos entre reportes"""
+
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01', '2025-12-02', '2025-12-03', '2025-12-04', '2025-12-05']),
+            'Concepto': ['a', 'b', 'c', 'd', 'e'],
+            'Detalle': ['', '', '', '', ''],
+            'Débito': [100.0, 50.0, 0.0, 30.0, 200.0],
+            'Crédito': [0.0, 0.0, 800.0, 0.0, 0.0],
+            'Saldo': [900.0, 850.0, 1650.0, 1620.0, 1420.0],
+            'Banco': ['Supervielle'] * 5,
+            'Tipo_Movimiento': ['Egreso', 'Egreso', 'Ingreso', 'Egreso', 'Egreso'],
+            'Categoria_Principal': ['Servicios', 'Servicios', 'Ingresos', 'Sin Clasificar', 'Prestadores'],
+            'Categoria_Final': ['Servicios - Agua', 'Servicios - Luz', 'Ingresos - Transferencias',
+                                'Sin Clasificar - Requiere Revisión', 'Prestadores - Profesionales'],
+            'Persona_Nombre': [None, None, None, None, 'PEREZ'],
+        })
+
+    def test_resumen_principal_desde_agregado(self, df):
+        """Test: El resumen por categoría principal coincide con filtrar categoría por categoría"""
+        # Arrange
+        analyzer = Analyzer(df)
+
+        # Act
+        resumen = analyzer.agregados.resumen_principal().set_index('categoria')
+
+        # Assert
+        assert 'Sin Clasificar' not in resumen.index
+        assert list(resumen.index) == ['Prestadores', 'Servicios', 'Ingresos']
+        assert resumen.loc['Servicios', 'transacciones'] == 2
+        assert resumen.loc['Servicios', 'egresos'] == 150.0
+        assert resumen.loc['Ingresos', 'neto'] == 800.0
+
+    def test_generadores_reutilizan_agregados(self, df):
+        """Test: Dashboard y Excel usan los mismos agregados memorizados del Analyzer"""
+        # Arrange
+        analyzer = Analyzer(df)
+        metricas = analyzer.calcular_metricas()
+
+        # Act
+        dashboard = DashboardGenerator(analyzer.df, metricas, analyzer.agregados)
+        exporter = ExcelExporter(analyzer.df, metricas, analyzer.agregados)
+
+        # Assert
+        assert dashboard.agregados is analyzer.agregados
+        assert exporter.agregados is analyzer.agregados
+        assert dashboard.df_sin_clasificar is analyzer.agregados.sin_clasificar()
+        assert analyzer.agregados.resumen_prestadores() == {'movimientos': 1, 'activos': 1, 'total': 200.0}
+
+
+class TestFlujoCaja:
+    """Suite de tests para el flujo de caja por período"""
+
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01 09:30', '2025-12-01 18:00', '2025-12-03 00:00', '2025-12-09 00:00', '2025-12-10 00:00']),
+            'Débito': [0.0, 200.0, 50.0, 0.0, 70.0],
+            'Crédito': [1000.0, 0.0, 0.0, 300.0, 0.0],
+            'Tipo_Movimiento': ['Ingreso', 'Egreso', 'Egreso', 'Ingreso', 'Egreso'],
+            'Categoria_Principal': ['Ingresos', 'Servicios', 'Servicios', 'Ingresos', 'Sin Clasificar'],
+            'Categoria_Final': ['Ingresos', 'Servicios - Agua', 'Servicios - Agua', 'Ingresos', 'Sin Clasificar'],
+        })
+
+    def test_flujo_diario_no_modifica_df(self, df):
+        """Test: El flujo diario agrupa por día sin agregar columnas al DataFrame"""
+        # Arrange
+        analyzer = Analyzer(df)
+        columnas = list(analyzer.df.columns)
+
+        # Act
+        flujo = analyzer._flujo_diario()
+
+        # Assert
+        assert list(analyzer.df.columns) == columnas
+        assert flujo['fecha'].tolist() == list(pd.to_datetime(['2025-12-01', '2025-12-03', '2025-12-09']))
+        assert flujo['ingresos'].tolist() == [1000.0, 0.0, 300.0]
+        assert flujo['egresos'].tolist() == [200.0, 50.0, 0.0]  # sin clasificar no cuenta
+
+    def test_flujo_semanal_con_calendario(self, df):
+        """Test: Granularidad semanal (desde el lunes) y relleno de calendario diario"""
+        # Arrange
+        analyzer = Analyzer(df)
+
+        # Act
+        semanal = analyzer.flujo_caja('W')
+        diario = analyzer.flujo_caja('D', rellenar_calendario=True)
+
+        # Assert
+        assert semanal['fecha'].tolist() == list(pd.to_datetime(['2025-12-01', '2025-12-08']))
+        assert semanal['ingresos'].tolist() == [1000.0, 300.0]
+        assert semanal['egresos'].tolist() == [250.0, 0.0]
+        assert len(diario) == 9
+        assert diario['ingresos'].sum() == 1300.0
+
+    def test_granularidad_invalida(self, df):
+        """Test: Granularidad desconocida lanza ValueError"""
+        with pytest.raises(ValueError):
+            Analyzer(df).flujo_caja('Y')
+
+
+class TestMetricasPerezosas:
+    """Suite de tests para el cálculo de métricas a demanda"""
+
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01', '2025-12-02', '2025-12-03']),
+            'Débito': [100.0, 0.0, 30.0],
+            'Crédito': [0.0, 800.0, 0.0],
+            'Saldo': [900.0, 1700.0, 1670.0],
+            'Banco': ['Supervielle'] * 3,
+            'Tipo_Movimiento': ['Egreso', 'Ingreso', 'Egreso'],
+            'Categoria_Principal': ['Servicios', 'Ingresos', 'Prestadores'],
+            'Categoria_Final': ['Servicios - Agua', 'Ingresos - Transferencias', 'Prestadores - Profesionales'],
+            'Persona_Nombre': [None, None, 'PEREZ'],
+        })
+
+    def test_subconjunto_calcula_solo_lo_pedido(self, df, capsys):
+        """Test: Pedir totales no calcula conciliación, prestadores ni flujo diario ni imprime el resumen"""
+        # Arrange
+        analyzer = Analyzer(df)
+
+        # Act
+        metricas = analyzer.calcular_metricas(['total_ingresos', 'total_egresos'])
+        total = metricas['total_ingresos'] - metricas['total_egresos']
+
+        # Assert
+        assert total == 670.0
+        assert list(metricas) == ['total_ingresos', 'total_egresos']
+        assert 'flujo_diario' not in metricas
+        assert metricas.get('saldo_final') is None
+        assert not analyzer.metrica_calculada('flujo_diario')
+        assert not analyzer.metrica_calculada('top_prestadores')
+        assert analyzer._conciliacion is None
+        assert capsys.readouterr().out == ''
+
+    def test_todas_las_metricas_memoizadas(self, df):
+        """Test: Sin subconjunto se obtienen todas las métricas y cada grupo se calcula una vez"""
+        # Arrange
+        analyzer = Analyzer(df)
+
+        # Act
+        metricas = analyzer.calcular_metricas(mostrar_resumen=False)
+        flujo = metricas['flujo_diario']
+
+        # Assert
+        assert set(metricas) == set(Analyzer._GRUPO_DE_METRICA)
+        assert metricas['flujo_diario'] is flujo
+        assert metricas['saldo_inicial'] == 1000.0
+        assert metricas['validacion_saldos_ok']
+        assert metricas['top_prestadores'] == [{'nombre': 'PEREZ', 'documento': None, 'monto': 30.0}]
+        assert analyzer.obtener_metricas().a_dict()['saldo_final'] == 1670.0
+
+    def test_resumen_solo_sin_subconjunto(self, df, capsys):
+        """Test: Pedir todas las métricas imprime el resumen salvo que se pida lo contrario"""
+        # Act
+        Analyzer(df).calcular_metricas()
+        con_resumen = capsys.readouterr().out
+        Analyzer(df).calcular_metricas(['total_ingresos'], mostrar_resumen=True)
+        subconjunto_pedido = capsys.readouterr().out
+
+        # Assert
+        assert 'Calculando métricas financieras' in con_resumen
+        assert 'Calculando métricas financieras' in subconjunto_pedido
+
+    def test_metrica_desconocida(self, df):
+        """Test: Pedir una métrica inexistente lanza ValueError"""
+        with pytest.raises(ValueError):
+            Analyzer(df).calcular_metricas(['total_ingreso'], mostrar_resumen=False)
+
+
+class TestPeriodos:
+    """Suite de tests para el corte por período sobre fechas ordenadas"""
+
+    @pytest.fixture
+    def df(self):
+        # Extracto del más reciente al más antiguo, como lo entrega el banco
+        return pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-20 10:00', '2025-12-10 15:00', '2025-12-10 09:00',
+                                     '2025-12-05 12:00', '2025-12-01 08:00']),
+            'Débito': [0.0, 40.0, 0.0, 60.0, 100.0],
+            'Crédito': [500.0, 0.0, 300.0, 0.0, 0.0],
+            'Tipo_Movimiento': ['Ingreso', 'Egreso', 'Ingreso', 'Egreso', 'Egreso'],
+            'Categoria_Principal': ['Ingresos', 'Servicios', 'Ingresos', 'Servicios', 'Servicios'],
+            'Categoria_Final': ['Ingresos', 'Servicios - Agua', 'Ingresos', 'Servicios - Agua', 'Servicios - Agua'],
+        })
+
+    def test_movimientos_en_orden_cronologico(self, df):
+        """Test: El Analyzer ordena los movimientos por fecha"""
+        analyzer = Analyzer(df)
+
+        assert analyzer.df['Fecha'].is_monotonic_increasing
+        assert analyzer.rango_fechas() == (pd.Timestamp('2025-12-01 08:00'), pd.Timestamp('2025-12-20 10:00'))
+
+    def test_rebanada_incluye_dia_hasta(self, df):
+        """Test: --hasta incluye el día completo y --desde el primer instante"""
+        # Arrange
+        analyzer = Analyzer(df)
+
+        # Act
+        semana = analyzer.rebanada('2025-12-05', '2025-12-10')
+        hasta_hora = analyzer.rebanada(hasta='2025-12-10 09:00')
+        vacio = analyzer.rebanada('2025-12-21')
+
+        # Assert
+        assert semana['Débito'].sum() == 100.0
+        assert semana['Crédito'].sum() == 300.0
+        assert len(hasta_hora) == 3
+        assert len(vacio) == 0
+
+    def test_periodo_sin_copiar(self, df):
+        """Test: El Analyzer de un período comparte los datos del original"""
+        # Arrange
+        analyzer = Analyzer(df)
+
+        # Act
+        diciembre_10 = analyzer.periodo('2025-12-10', '2025-12-10')
+
+        # Assert
+        assert np.shares_memory(diciembre_10.df['Débito'].to_numpy(), analyzer.df['Débito'].to_numpy())
+        metricas = diciembre_10.calcular_metricas(['total_ingresos', 'total_egresos'], mostrar_resumen=False)
+        assert metricas['total_ingresos'] == 300.0
+        assert metricas['total_egresos'] == 40.0
+
+
+class TestComparativoPeriodos:
+    """Suite de tests para el comparativo entre períodos por categoría"""
+
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            'Fecha': pd.to_datetime(['2024-11-15', '2025-09-10', '2025-09-20', '2025-11-05', '2025-11-06']),
+            'Débito': [400.0, 100.0, 0.0, 150.0, 0.0],
+            'Crédito': [0.0, 0.0, 1000.0, 0.0, 500.0],
+            'Tipo_Movimiento': ['Egreso', 'Egreso', 'Ingreso', 'Egreso', 'Ingreso'],
+            'Categoria_Principal': ['Servicios', 'Servicios', 'Ingresos', 'Servicios', 'Ingresos'],
+            'Categoria_Final': ['Servicios - Agua', 'Servicios - Agua', 'Ingresos - Transferencias',
+                                'Servicios - Agua', 'Ingresos - Transferencias'],
+        })
+
+    def test_variacion_contra_anterior_y_anio_anterior(self, df):
+        """Test: Un mes sin movimientos cuenta como 0 y el interanual compara 12 meses atrás"""
+        # Act
+        comparativo = Analyzer(df).comparativo('M')
+
+        # Assert
+        resumen = comparativo['resumen'].set_index('Categoria_Final')
+        agua = resumen.loc['Servicios - Agua']
+        assert len(comparativo['periodos']) == 13
+        assert agua['actual'] == 150.0
+        assert agua['anterior'] == 0.0                  # octubre sin movimientos
+        assert np.isnan(agua['variacion_pct'])          # base 0
+        assert agua['anio_anterior'] == 400.0
+        assert agua['variacion_interanual_pct'] == -62.5
+        assert list(comparativo['resumen']['Tipo_Movimiento']) == ['Ingreso', 'Egreso']
+        assert comparativo['variacion'].loc[('Ingreso', 'Ingresos - Transferencias'),
+                                            pd.Timestamp('2025-10-01')] == -1000.0
+
+    def test_ultimos_periodos_conservan_interanual(self, df):
+        """Test: Recortar a los últimos N períodos no pierde la comparación interanual"""
+        # Act
+        comparativo = Analyzer(df).comparativo('M', periodos=3)
+
+        # Assert
+        assert comparativo['periodos'] == list(pd.to_datetime(['2025-09-01', '2025-10-01', '2025-11-01']))
+        assert comparativo['importes'].shape == (2, 3)
+        assert comparativo['resumen'].set_index('Categoria_Final').loc['Servicios - Agua', 'anio_anterior'] == 400.0
+
+
+class TestTopPrestadores:
+    """Suite de tests para el top de prestadores por entidad"""
+
+    def test_agrupa_grafias_y_completa_n(self):
+        """Test: Las grafías de un prestador se suman y los movimientos sin nombre no restan lugares"""
+        # Arrange
+        df = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01'] * 6),
+            'Débito': [900.0, 800.0, 100.0, 150.0, 120.0, 50.0],
+            'Crédito': [0.0] * 6,
+            'Tipo_Movimiento': ['Egreso'] * 6,
+            'Categoria_Principal': ['Prestadores'] * 6,
+            'Categoria_Final': ['Prestadores - Profesionales'] * 6,
+            'Persona_Nombre': [None, None, 'DECADE S.A.', 'DECADE S', 'PEREZ JUAN', 'LOPEZ ANA'],
+            'Documento': [np.nan, np.nan, 30708058188.0, 30708058188.0, np.nan, np.nan],
+        })
+
+        # Act
+        top = Analyzer(df).calcular_metricas(['top_prestadores'], mostrar_resumen=False)['top_prestadores']
+
+        # Assert
+        assert [p['monto'] for p in top[:2]] == [250.0, 120.0]
+        assert top[0]['documento'] == '30708058188'
+        assert top[0]['nombre'] in ('DECADE S.A.', 'DECADE S')
+        assert len(Analyzer(df)._top_prestadores(3)) == 3
+
+
+class TestDashboardHTML:
+    """Suite de tests para el renderizado del dashboard con plantilla"""
+
+    def test_plantilla_por_fragmentos(self):
+        """Test: Los marcadores aceptan texto o fragmentos y un valor faltante falla"""
+        # Arrange
+        plantilla = Plantilla("<h1>{{ titulo }}</h1><ul>{{filas}}</ul>")
+
+        # Act
+        html = plantilla.renderizar({'titulo': 'Resumen', 'filas': (f"<li>{i}</li>" for i in range(3))})
+
+        # Assert
+        assert html == "<h1>Resumen</h1><ul><li>0</li><li>1</li><li>2</li></ul>"
+        with pytest.raises(KeyError):
+            plantilla.renderizar({'titulo': 'Resumen'})
+
+    def test_sin_clasificar_completa_y_escapada(self, tmp_path):
+        """Test: La tabla de sin clasificar incluye todas las filas (sin tope) con el texto escapado"""
+        # Arrange
+        n = DashboardGenerator.FILAS_POR_BLOQUE + 7
+        df = pd.DataFrame({
+            'Fecha': pd.date_range('2025-12-01', periods=n, freq='h'),
+            'Concepto': ['Cargo <especial> & otros'] + ['Concepto raro'] * (n - 1),
+            'Débito': [1234.5] + [10.0] * (n - 1),
+            'Crédito': [0.0] * n,
+            'Tipo_Movimiento': ['Egreso'] * n,
+            'Categoria_Principal': ['Sin Clasificar'] * n,
+            'Categoria_Final': ['Sin Clasificar - Requiere Revisión'] * n,
+        })
+        analyzer = Analyzer(df)
+        ruta = tmp_path / 'dashboard.html'
+
+        # Act
+        DashboardGenerator(analyzer.df, analyzer.calcular_metricas(mostrar_resumen=False),
+                           analyzer.agregados).generar_html(str(ruta))
+
+        # Assert
+        html = ruta.read_text(encoding='utf-8')
+        assert html.count('<tr><td>') == n
+        assert '<td>Cargo &lt;especial&gt; &amp; otros</td><td>$1,234.50</td><td>$0.00</td>' in html
+        assert '{{' not in html and html.rstrip().endswith('</html>')
+
+    def test_comparativo_escapado(self):
+        """Test: La tabla comparativa escapa la categoría y marca las variaciones favorables"""
+        # Arrange
+        df = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-10-05', '2025-11-05', '2025-11-06']),
+            'Débito': [100.0, 150.0, 0.0],
+            'Crédito': [0.0, 0.0, 500.0],
+            'Tipo_Movimiento': ['Egreso', 'Egreso', 'Ingreso'],
+            'Categoria_Principal': ['Servicios', 'Servicios', 'Ingresos'],
+            'Categoria_Final': ['Agua <b>& luz</b>', 'Agua <b>& luz</b>', 'Ingresos - Transferencias'],
+        })
+        analyzer = Analyzer(df)
+        dashboard = DashboardGenerator(analyzer.df, analyzer.calcular_metricas(mostrar_resumen=False),
+                                       analyzer.agregados, comparativo=analyzer.comparativo('M'))
+
+        # Act
+        html = ''.join(dashboard._generar_seccion_comparativa())
+
+        # Assert
+        assert 'Comparativo por Categoría: 11/2025 vs 10/2025' in html
+        assert '<td>Agua &lt;b&gt;&amp; luz&lt;/b&gt; (Egreso)</td><td>$150</td><td>$100</td>' in html
+        assert '<td class="neto-negativo">$+50 (+50.0%)</td>' in html
+        assert '<td class="neto-positivo">$+500</td>' in html
+        assert '<b>' not in html and '{{' not in html
+
+    def test_offline_autocontenido(self, tmp_path):
+        """Test: En modo offline Chart.js va embebido y los datos comprimidos se recuperan intactos"""
+        # Arrange
+        df = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01', '2025-12-02', '2025-12-03']),
+            'Débito': [0.0, 150.25, 40.0],
+            'Crédito': [1000.0, 0.0, 0.0],
+            'Tipo_Movimiento': ['Ingreso', 'Egreso', 'Egreso'],
+            'Categoria_Principal': ['Ingresos', 'Servicios', 'Servicios'],
+            'Categoria_Final': ['Ingresos - Transferencias', 'Servicios - Agua', 'Servicios - Luz'],
+        })
+        analyzer = Analyzer(df)
+        chartjs = tmp_path / 'chart.umd.min.js'
+        chartjs.write_text('var Chart = function () {};', encoding='utf-8')
+        dashboard = DashboardGenerator(analyzer.df, analyzer.calcular_metricas(mostrar_resumen=False),
+                                       analyzer.agregados, offline=True, comprimir_datos=True,
+                                       ruta_chartjs=str(chartjs))
+        ruta = tmp_path / 'dashboard.html'
+
+        # Act
+        tamanios = dashboard.generar_html(str(ruta))
+
+        # Assert
+        html = ruta.read_text(encoding='utf-8')
+        assert 'cdn.jsdelivr.net' not in html
+        assert '<script>var Chart = function () {};</script>' in html
+        comprimidos = re.search(r'descomprimirDatos\("([^"]+)"\)', html).group(1)
+        datos = json.loads(gzip.decompress(base64.b64decode(comprimidos)))
+        assert datos['egresos'] == {'labels': ['Servicios - Agua', 'Servicios - Luz'], 'values': [150.25, 40.0]}
+        assert datos['resumen']['categoria'] == ['Servicios', 'Ingresos']
+        assert tamanios['total'] == ruta.stat().st_size
+
+    def test_offline_usa_chartjs_incluido(self, tmp_path):
+        """Test: La copia incluida de Chart.js es la versión del CDN; sin ella el modo offline falla"""
+        # Arrange
+        df = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01']),
+            'Débito': [0.0],
+            'Crédito': [1000.0],
+            'Tipo_Movimiento': ['Ingreso'],
+            'Categoria_Principal': ['Ingresos'],
+            'Categoria_Final': ['Ingresos - Transferencias'],
+        })
+        analyzer = Analyzer(df)
+        metricas = analyzer.calcular_metricas(mostrar_resumen=False)
+        version = re.search(r'chart\.js@([\d.]+)/', DashboardGenerator.URL_CHARTJS).group(1)
+
+        # Act
+        with open(DashboardGenerator.RUTA_CHARTJS, 'r', encoding='utf-8') as f:
+            chartjs = f.read()
+        sin_copia = DashboardGenerator(analyzer.df, metricas, analyzer.agregados, offline=True,
+                                       ruta_chartjs=str(tmp_path / 'no_existe.js'))
+
+        # Assert
+        assert f'static version="{version}"' in chartjs
+        with pytest.raises(FileNotFoundError):
+            sin_copia.generar_html(str(tmp_path / 'dashboard.html'))
+
+    def test_explorador_columnas_con_diccionario(self):
+        """Test: Los movimientos del explorador guardan cada texto una vez y se reconstruyen intactos"""
+        # Arrange
+        df = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01', '2025-12-03', '2025-12-03', '2025-12-10']),
+            'Concepto': ['Transferencia', 'Pago', 'Transferencia', 'Pago'],
+            'Débito': [0.0, 150.25, 0.0, 40.1],
+            'Crédito': [1000.0, 0.0, 20.0, 0.0],
+            'Tipo_Movimiento': ['Ingreso', 'Egreso', 'Ingreso', 'Egreso'],
+            'Categoria_Principal': ['Ingresos', 'Servicios', 'Ingresos', 'Servicios'],
+            'Categoria_Final': ['Ingresos - Transferencias', 'Servicios - Agua',
+                                'Ingresos - Transferencias', 'Servicios - Luz'],
+            'Banco': ['Supervielle', 'Galicia', 'Supervielle', None],
+        })
+        analyzer = Analyzer(df)
+        dashboard = DashboardGenerator(analyzer.df, analyzer.calcular_metricas(mostrar_resumen=False),
+                                       analyzer.agregados)
+
+        # Act
+        mov = dashboard._datos_explorador()
+
+        # Assert
+        assert mov['categoria']['valores'] == ['Ingresos - Transferencias', 'Servicios - Agua', 'Servicios - Luz']
+        assert mov['banco']['valores'] == ['', 'Galicia', 'Supervielle']
+        assert mov['persona'] == {'valores': [''], 'codigos': [0, 0, 0, 0]}
+        categorias = [mov['categoria']['valores'][c] for c in mov['categoria']['codigos']]
+        assert categorias == analyzer.df['Categoria_Final'].tolist()
+        assert mov['base'] == '2025-12-01'
+        assert sorted(mov['dias']) == [0, 2, 2, 9]
+        assert sorted(mov['centavos']) == [-15025, -4010, 2000, 100000]
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
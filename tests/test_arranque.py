@@ -0,0 +1,73 @@
+"""
+Tests de arranque - TORO · Resumen de Cuentas
+
+Verifica que la ayuda de la línea de comandos y el menú se muestran rápido:
+- No importan pandas, numpy ni openpyxl (se cargan al ejecutar un comando)
+- El tiempo de imports medido con python -X importtime entra en el presupuesto
+  (TORO_PRESUPUESTO_IMPORTS_MS lo cambia; 0 omite esa verificación)
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Presupuesto de tiempo de imports para --help y el menú. En una máquina de
+# CI lenta se puede ampliar con TORO_PRESUPUESTO_IMPORTS_MS (0 lo omite); que
+# no se carguen las dependencias pesadas se verifica siempre.
+PRESUPUESTO_MS = float(os.environ.get('TORO_PRESUPUESTO_IMPORTS_MS', 200))
+
+# Dependencias que solo deben cargarse al ejecutar un comando
+PESADAS = {'pandas', 'numpy', 'openpyxl'}
+
+
+def medir_imports(*argumentos):
+    """
+    Ejecuta python -X importtime con los argumentos dados.
+
+    Returns:
+        Tupla (salida estándar, {módulo: microsegundos propios})
+    """
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', *argumentos],
+                             cwd=RAIZ, capture_output=True, text=True, encoding='utf-8', timeout=60)
+    assert proceso.returncode == 0, proceso.stderr[-2000:]
+
+    modulos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or '[us]' in linea:
+            continue
+        propio, _, nombre = linea[len('import time:'):].split('|')
+        modulos[nombre.strip()] = int(propio)
+    return proceso.stdout, modulos
+
+
+class TestArranque:
+    """Suite de tests para el tiempo de arranque"""
+
+    def test_ayuda_sin_dependencias_pesadas(self):
+        """Test: python src/main.py --help no carga pandas/openpyxl y entra en el presupuesto"""
+        # Act
+        salida, modulos = medir_imports(os.path.join('src', 'main.py'), '--help')
+
+        # Assert
+        assert '--completo' in salida
+        assert not PESADAS & {nombre.split('.')[0] for nombre in modulos}
+        assert not PRESUPUESTO_MS or sum(modulos.values()) / 1000 < PRESUPUESTO_MS
+
+    def test_menu_sin_dependencias_pesadas(self):
+        """Test: Importar el menú y dibujar el banner y las opciones no carga pandas/openpyxl"""
+        # Act
+        salida, modulos = medir_imports(
+            '-c', 'import menu_principal; menu_principal.mostrar_banner(); menu_principal.mostrar_menu_principal()')
+
+        # Assert
+        assert 'MENÚ PRINCIPAL' in salida
+        assert 'main' in modulos
+        assert not PESADAS & {nombre.split('.')[0] for nombre in modulos}
+        assert not PRESUPUESTO_MS or sum(modulos.values()) / 1000 < PRESUPUESTO_MS
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
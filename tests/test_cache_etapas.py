@@ -0,0 +1,118 @@
+"""
+Tests para el módulo cache_etapas - TORO · Resumen de Cuentas
+
+Verifica la cache de etapas del proceso completo:
+- Una etapa con las mismas entradas no se vuelve a ejecutar y restaura sus archivos
+- Un cambio en las entradas o una etapa fallida no reutilizan la cache
+- La huella de un .xlsx no depende de la fecha de guardado
+"""
+import time
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.cache_etapas import CacheEtapas, huella_contenido
+
+
+@pytest.fixture
+def etapa(tmp_path):
+    """Etapa que escribe un archivo en output/ y cuenta sus ejecuciones"""
+    salida = tmp_path / 'output'
+    salida.mkdir()
+    ejecuciones = []
+
+    def calcular():
+        ejecuciones.append(1)
+        ruta = salida / 'movimientos_consolidados_2025_10.xlsx'
+        ruta.write_text(f"consolidado {len(ejecuciones)}")
+        return [str(ruta)]
+
+    return calcular, ejecuciones
+
+
+class TestCacheEtapas:
+    """Suite de tests para CacheEtapas"""
+
+    def test_reutiliza_y_restaura(self, etapa, tmp_path):
+        """Test: Con las mismas entradas la etapa no se ejecuta y su archivo borrado vuelve a aparecer"""
+        # Arrange
+        calcular, ejecuciones = etapa
+        directorio = str(tmp_path / 'output' / '.cache_etapas')
+        CacheEtapas(directorio).ejecutar('Consolidar', {'extracto': 'a1'}, calcular)
+        ruta = tmp_path / 'output' / 'movimientos_consolidados_2025_10.xlsx'
+        ruta.unlink()
+
+        # Act
+        cache = CacheEtapas(directorio)
+        archivos = cache.ejecutar('Consolidar', {'extracto': 'a1'}, calcular)
+
+        # Assert
+        assert len(ejecuciones) == 1
+        assert archivos == [str(ruta)]
+        assert ruta.read_text() == "consolidado 1"
+        assert cache.resumen[0]['etapa'] == 'Consolidar' and cache.resumen[0]['hit']
+
+    def test_cambio_de_entradas_o_error_ejecutan(self, etapa, tmp_path):
+        """Test: Otras entradas, reutilizar=False o una etapa fallida no usan la cache"""
+        # Arrange
+        calcular, ejecuciones = etapa
+        cache = CacheEtapas(str(tmp_path / 'cache'))
+        cache.ejecutar('Consolidar', {'extracto': 'a1'}, calcular)
+
+        # Act
+        cache.ejecutar('Consolidar', {'extracto': 'b2'}, calcular)
+        CacheEtapas(str(tmp_path / 'cache'), reutilizar=False).ejecutar('Consolidar', {'extracto': 'a1'}, calcular)
+        fallida = cache.ejecutar('Reportes', {'categorizado': 'c3'}, lambda: [None, 'reporte.xlsx'])
+        otra_vez = cache.ejecutar('Reportes', {'categorizado': 'c3'}, lambda: None)
+
+        # Assert
+        assert len(ejecuciones) == 3
+        assert fallida == [None, 'reporte.xlsx'] and otra_vez is None
+        assert [registro['hit'] for registro in cache.resumen] == [False, False, False, False]
+
+    def test_segunda_corrida_reutiliza_las_tres_etapas(self, tmp_path, capsys):
+        """Test: Repetir el proceso completo sin cambios reutiliza consolidar, categorizar y reportes"""
+        # Arrange
+        from main import ejecutar_pipeline
+        entrada = os.path.join(os.path.dirname(__file__), '..', 'input')
+        extracto = 'Movimientos_Supervielle_003095775-002_2025_11_14_182045.xlsx'
+
+        def correr():
+            return ejecutar_pipeline(extracto, ruta_input=entrada, ruta_output=str(tmp_path),
+                                     revisar_manual=False, abrir_dashboard=False)
+
+        # Act
+        primera = correr()
+        segunda = correr()
+
+        # Assert
+        assert primera['error'] is None
+        assert [registro['hit'] for registro in primera['etapas']] == [False, False, False]
+        assert [registro['hit'] for registro in segunda['etapas']] == [True, True, True]
+        assert segunda['dashboard'] == primera['dashboard'] and os.path.exists(segunda['reporte'])
+
+    def test_huella_xlsx_sin_fecha_de_guardado(self, tmp_path):
+        """Test: Dos exportaciones de los mismos datos tienen la misma huella; otros datos, otra"""
+        # Arrange
+        df = pd.DataFrame({'Concepto': ['Transferencia', 'Pago'], 'Crédito': [100.0, 0.0]})
+        df.to_excel(tmp_path / 'a.xlsx', index=False)
+        time.sleep(1.1)
+        df.to_excel(tmp_path / 'b.xlsx', index=False)
+        df.assign(**{'Crédito': [100.0, 1.0]}).to_excel(tmp_path / 'c.xlsx', index=False)
+
+        # Act
+        huellas = [huella_contenido(str(tmp_path / nombre)) for nombre in ('a.xlsx', 'b.xlsx', 'c.xlsx')]
+
+        # Assert
+        assert (tmp_path / 'a.xlsx').read_bytes() != (tmp_path / 'b.xlsx').read_bytes()
+        assert huellas[0] == huellas[1] != huellas[2]
+        assert huella_contenido(str(tmp_path / 'no_existe.xlsx')) == ''
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -3,6 +3,8 @@ Tests para el módulo Categorizer - TORO · Resumen de Cuentas
 
 Verifica clasificación automática de movimientos usando la función pura.
 """
+import json
+
 import pytest
 import pandas as pd
 import sys
@@ -11,7 +13,7 @@ import os
 # Agregar src/ al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from main import categorizar_movimientos_df
+from main import categorizar_movimientos_df, leer_correcciones
 from processors.categorizer import Categorizer
 
 
@@ -231,5 +233,149 @@ class TestCategorizerMetadata:
         assert len(df_categorizado) == 1
 
 
+class TestAplicarCorrecciones:
+    """Tests para correcciones masivas aplicadas con merge"""
+
+    def _df_categorizado(self):
+        df = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01', '2025-12-02', '2025-12-03']),
+            'Concepto': ['crédito por transferencia', 'movimiento raro', 'otro raro'],
+            'Detalle': ['pago cliente', None, 'sin pista'],
+            'Débito': [0.0, 300.0, 0.0],
+            'Crédito': [1000.0, 0.0, 50.0],
+            'Saldo': [5000.0, 4700.0, 4750.0],
+            'Banco': ['Supervielle'] * 3
+        })
+        df_categorizado, _ = categorizar_movimientos_df(df)
+        return df_categorizado
+
+    def test_id_movimiento_estable(self):
+        """Test: El ID no depende del índice y distingue duplicados"""
+        df = self._df_categorizado()
+        ids = Categorizer.calcular_id_movimiento(df)
+        ids_reindexado = Categorizer.calcular_id_movimiento(df.reset_index(drop=True).set_index(pd.Index([10, 20, 30])))
+        assert list(ids) == list(ids_reindexado)
+
+        duplicado = pd.concat([df.iloc[[1]], df.iloc[[1]]])
+        ids_dup = Categorizer.calcular_id_movimiento(duplicado)
+        assert ids_dup.iloc[0] != ids_dup.iloc[1]
+
+    def test_correcciones_por_id(self):
+        """Test: Corrige por ID_Movimiento e infiere el tipo"""
+        df = self._df_categorizado()
+        correcciones = pd.DataFrame({
+            'ID_Movimiento': [df['ID_Movimiento'].iloc[1]],
+            'Categoria_Final': ['Prestadores - Profesionales']
+        })
+
+        resultado = Categorizer().aplicar_correcciones(df, correcciones)
+
+        assert resultado['Categoria_Final'].iloc[1] == 'Prestadores - Profesionales'
+        assert resultado['Categoria_Principal'].iloc[1] == 'Prestadores'
+        assert resultado['Tipo_Movimiento'].iloc[1] == 'Egreso'
+        assert resultado['Categoria_Principal'].iloc[2] == 'Sin Clasificar'
+
+    def test_correcciones_por_fecha_concepto_detalle_importe(self):
+        """Test: Corrige por clave compuesta (Detalle vacío incluido)"""
+        df = self._df_categorizado()
+        correcciones = pd.DataFrame({
+            'Fecha': ['2025-12-02', '2025-12-03', '2025-12-09'],
+            'Concepto': ['movimiento raro', 'otro raro', 'no existe'],
+            'Detalle': [None, 'sin pista', ''],
+            'Importe': [300.0, 50.0, 1.0],
+            'Categoria_Final': ['Servicios - Agua', 'Ingresos - Devoluciones', 'Servicios - Gas']
+        })
+
+        resultado = Categorizer().aplicar_correcciones(df, correcciones)
+
+        assert resultado['Categoria_Final'].iloc[1] == 'Servicios - Agua'
+        assert resultado['Categoria_Final'].iloc[2] == 'Ingresos - Devoluciones'
+        assert resultado['Tipo_Movimiento'].iloc[2] == 'Ingreso'
+        assert (resultado['Categoria_Principal'] == 'Sin Clasificar').sum() == 0
+
+    def test_correcciones_csv_con_fecha_dia_mes(self, tmp_path):
+        """Test: Un CSV de Excel en español (dd/mm/aaaa, separador ';') corrige el día correcto"""
+        df = self._df_categorizado()
+        ruta = tmp_path / 'correcciones.csv'
+        ruta.write_text(
+            "Fecha;Concepto;Detalle;Importe;Categoria_Final\n"
+            "02/12/2025;movimiento raro;;300;Servicios - Agua\n"
+            "03/12/2025 00:00;otro raro;sin pista;50;Ingresos - Devoluciones\n",
+            encoding='utf-8'
+        )
+
+        resultado = Categorizer().aplicar_correcciones(df, leer_correcciones(str(ruta)))
+
+        assert resultado['Categoria_Final'].iloc[1] == 'Servicios - Agua'
+        assert resultado['Categoria_Final'].iloc[2] == 'Ingresos - Devoluciones'
+
+    def test_correcciones_sin_claves_falla(self):
+        """Test: Archivo sin columnas clave lanza ValueError"""
+        df = self._df_categorizado()
+        correcciones = pd.DataFrame({'Categoria_Final': ['Servicios - Agua']})
+
+        with pytest.raises(ValueError):
+            Categorizer().aplicar_correcciones(df, correcciones)
+
+
+class TestEstadisticasUso:
+    """Suite de tests para los contadores de uso de reglas del clasificador"""
+
+    def _df(self):
+        return pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-12-01'] * 4),
+            'Concepto': ['compra visa débito', 'compra visa débito', 'compra visa débito', 'xyz'],
+            'Detalle': ['EPEC CORDOBA', 'KIOSCO', 'EPEC', ''],
+            'Débito': [10.0, 20.0, 30.0, 40.0],
+            'Crédito': [0.0, 0.0, 0.0, 0.0],
+            'Saldo': [0.0, 0.0, 0.0, 0.0],
+            'Banco': ['Supervielle'] * 4
+        })
+
+    def test_hits_defaults_y_reglas_sin_uso(self):
+        """Test: Cuenta aplicaciones por regla, defaults y reglas nunca usadas"""
+        categorizer = Categorizer()
+
+        categorizer.categorizar_dataframe(self._df())
+        uso = categorizer.clasificador.estadisticas_uso()
+
+        assert uso['movimientos'] == 4
+        assert uso['sin_clasificar'] == 1
+        assert uso['cobertura_medida'] == 75.0
+        assert uso['hits_nivel1']['N1:compra visa débito'] == 3
+        assert uso['hits_nivel2']['REF-GAS-002'] == 2
+        assert uso['defaults_nivel2']['Gastos Operativos - Compras'] == 1
+        assert 'REF-GAS-001' in uso['reglas_sin_uso']
+        assert 'REF-GAS-002' not in uso['reglas_sin_uso']
+        assert uso['tiempo_nivel1_s'] >= 0
+
+    def test_lote_cuenta_igual_que_fila_a_fila(self):
+        """Test: clasificar_lote acumula los mismos contadores"""
+        df = self._df()
+        categorizer = Categorizer()
+        categorizer.categorizar_dataframe(df)
+        esperado = categorizer.clasificador.estadisticas_uso()
+
+        categorizer.clasificador.reiniciar_estadisticas()
+        categorizer.clasificador.clasificar_lote(df['Concepto'], df['Detalle'])
+        uso = categorizer.clasificador.estadisticas_uso()
+
+        for clave in ['movimientos', 'sin_clasificar', 'hits_nivel1', 'hits_nivel2', 'defaults_nivel2']:
+            assert uso[clave] == esperado[clave]
+
+    def test_exportar_json(self, tmp_path):
+        """Test: Las estadísticas se exportan como JSON"""
+        categorizer = Categorizer()
+        categorizer.categorizar_dataframe(self._df())
+
+        ruta = tmp_path / 'estadisticas.json'
+        categorizer.clasificador.exportar_estadisticas(str(ruta))
+
+        with open(ruta, encoding='utf-8') as f:
+            datos = json.load(f)
+        assert datos['hits_nivel1']['N1:compra visa débito'] == 3
+        assert 'generado' in datos
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,133 @@
+"""
+Tests para el módulo ConciliadorSaldos - TORO · Resumen de Cuentas
+
+Verifica la conciliación del saldo corrido por cuenta:
+- Saldo inicial y final por cuenta en una tabla consolidada
+- Detección de movimientos faltantes y duplicados
+- Extractos listados en cualquier sentido y cuentas que cierran con el saldo inicial
+"""
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from reports.analyzer import Analyzer
+from reports.conciliacion import ConciliadorSaldos
+
+
+def extracto(banco, saldo_inicial, importes, fechas):
+    """Extracto con saldo corrido, listado del más reciente al más antiguo (como el banco)"""
+    saldos = []
+    saldo = saldo_inicial
+    for importe in importes:
+        saldo += importe
+        saldos.append(round(saldo, 2))
+    df = pd.DataFrame({
+        'Fecha': pd.to_datetime(fechas),
+        'Concepto': [f'mov {i}' for i in range(len(importes))],
+        'Detalle': '',
+        'Débito': [-i if i < 0 else 0.0 for i in importes],
+        'Crédito': [i if i > 0 else 0.0 for i in importes],
+        'Saldo': saldos,
+        'Banco': banco,
+    })
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+@pytest.fixture
+def consolidado():
+    """Supervielle y Galicia consolidados en una sola tabla"""
+    supervielle = extracto('Supervielle', 1000.0, [500.0, -200.0, -50.0, 300.0],
+                           ['2025-11-01 10:00', '2025-11-02 10:00', '2025-11-02 10:00', '2025-11-05 09:00'])
+    galicia = extracto('Galicia', 20000.0, [-1000.0, 2500.0, -300.0],
+                       ['2025-11-01 08:00', '2025-11-03 12:00', '2025-11-04 12:00'])
+    return pd.concat([supervielle, galicia], ignore_index=True)
+
+
+class TestConciliadorSaldos:
+    """Suite de tests para ConciliadorSaldos"""
+
+    def test_saldos_por_cuenta(self, consolidado):
+        """Test: Saldo inicial y final de cada cuenta, sin quiebres"""
+        # Act
+        resultado = ConciliadorSaldos(consolidado).conciliar()
+
+        # Assert
+        cuentas = resultado['cuentas'].set_index('Banco')
+        assert resultado['ok']
+        assert cuentas.loc['Supervielle', 'Saldo_Inicial'] == 1000.0
+        assert cuentas.loc['Supervielle', 'Saldo_Final'] == 1550.0
+        assert cuentas.loc['Galicia', 'Saldo_Inicial'] == 20000.0
+        assert cuentas.loc['Galicia', 'Saldo_Final'] == 21200.0
+        assert (cuentas['Diferencia'] == 0).all()
+
+    def test_extracto_del_mas_antiguo_al_mas_reciente(self, consolidado):
+        """Test: Un extracto listado en orden cronológico (misma hora incluida) concilia igual"""
+        # Arrange: cada cuenta del más antiguo al más reciente
+        df = pd.concat([grupo.iloc[::-1] for _, grupo in consolidado.groupby('Banco', sort=False)])
+
+        # Act
+        resultado = ConciliadorSaldos(df).conciliar()
+
+        # Assert
+        assert resultado['ok']
+        assert resultado['cuentas'].set_index('Banco').loc['Supervielle', 'Saldo_Final'] == 1550.0
+
+    def test_cuenta_que_cierra_con_el_saldo_inicial(self):
+        """Test: 1000 -> 1100 -> 1000 informa saldo inicial y final 1000 (no NaN ni 0)"""
+        # Arrange
+        df = extracto('Galicia', 1000.0, [100.0, -100.0], ['2025-11-01 10:00', '2025-11-02 10:00'])
+        df['Tipo_Movimiento'] = ['Egreso', 'Ingreso']
+        df['Categoria_Principal'] = 'Varios'
+        df['Categoria_Final'] = 'Varios'
+
+        # Act
+        cuentas = ConciliadorSaldos(df).conciliar()['cuentas']
+        metricas = Analyzer(df).calcular_metricas(mostrar_resumen=False)
+
+        # Assert
+        assert cuentas.loc[0, 'Saldo_Inicial'] == 1000.0
+        assert cuentas.loc[0, 'Saldo_Final'] == 1000.0
+        assert metricas['saldo_inicial'] == 1000.0
+        assert metricas['saldo_final'] == 1000.0
+        assert metricas['validacion_saldos_ok']
+
+    def test_detecta_faltante_y_duplicado(self, consolidado):
+        """Test: Un movimiento faltante y uno duplicado se marcan en la fila exacta"""
+        # Arrange: falta el -200 de Supervielle y se repite el -1000 de Galicia
+        df = consolidado[consolidado['Débito'] != 200.0]
+        df = pd.concat([df, df[df['Débito'] == 1000.0]], ignore_index=True)
+
+        # Act
+        resultado = ConciliadorSaldos(df).conciliar()
+
+        # Assert
+        quiebres = resultado['quiebres'].set_index('Banco')
+        assert not resultado['ok']
+        assert len(quiebres) == 2
+        assert quiebres.loc['Supervielle', 'Tipo_Quiebre'] == ConciliadorSaldos.TIPO_SALTO
+        assert quiebres.loc['Supervielle', 'Diferencia'] == -200.0
+        assert quiebres.loc['Galicia', 'Tipo_Quiebre'] == ConciliadorSaldos.TIPO_DUPLICADO
+
+    def test_analyzer_suma_saldos_por_cuenta(self, consolidado):
+        """Test: El Analyzer informa saldos consolidados como suma de cada cuenta"""
+        # Arrange
+        consolidado['Tipo_Movimiento'] = ['Ingreso' if c > 0 else 'Egreso' for c in consolidado['Crédito']]
+        consolidado['Categoria_Principal'] = 'Varios'
+        consolidado['Categoria_Final'] = 'Varios'
+
+        # Act
+        metricas = Analyzer(consolidado).calcular_metricas()
+
+        # Assert
+        assert metricas['saldo_inicial'] == 21000.0
+        assert metricas['saldo_final'] == 22750.0
+        assert metricas['validacion_saldos_ok']
+        assert len(metricas['saldos_por_cuenta']) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
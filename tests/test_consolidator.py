@@ -0,0 +1,48 @@
+"""
+Tests para el módulo Consolidator - TORO · Resumen de Cuentas
+
+Verifica que agregar un extracto a los movimientos del mes:
+- Suma los movimientos de otro banco o de otros días
+- Reemplaza (no duplica) los días ya cargados del mismo banco
+"""
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processors.consolidator import Consolidator
+
+
+class TestAnexar:
+    """Suite de tests para Consolidator.anexar"""
+
+    def test_reemplaza_dias_del_mismo_banco(self):
+        """Test: Volver a cargar un extracto reemplaza sus días; los otros bancos y días quedan"""
+        # Arrange
+        existente = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-10-01 09:00', '2025-10-02 10:00', '2025-10-02 11:00']),
+            'Banco': ['Galicia', 'Galicia', 'Supervielle'],
+            'Crédito': [100.0, 200.0, 300.0],
+        })
+        nuevo = pd.DataFrame({
+            'Fecha': pd.to_datetime(['2025-10-02 15:00', '2025-10-03 08:00']),
+            'Banco': ['Galicia', 'Galicia'],
+            'Crédito': [250.0, 400.0],
+        })
+
+        # Act
+        anexado = Consolidator.anexar(existente, nuevo)
+        otra_vez = Consolidator.anexar(anexado, nuevo)
+
+        # Assert
+        assert anexado['Crédito'].tolist() == [400.0, 250.0, 300.0, 100.0]
+        assert anexado['Fecha'].is_monotonic_decreasing
+        assert otra_vez.equals(anexado)
+        assert Consolidator.anexar(None, nuevo)['Crédito'].tolist() == [400.0, 250.0]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,120 @@
+"""
+Tests para el módulo CuboMovimientos - TORO · Resumen de Cuentas
+
+Verifica el cubo histórico de agregados:
+- Actualización incremental sin duplicar importes
+- Métricas de un período iguales a las del Analyzer
+- Serie mes a mes y acumulado del año
+"""
+import math
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from reports.analyzer import Analyzer
+from reports.cubo import CuboMovimientos
+
+
+def movimientos(fechas, creditos, debitos, banco='Supervielle'):
+    """DataFrame categorizado mínimo"""
+    tipos = ['Ingreso' if c > 0 else 'Egreso' for c in creditos]
+    return pd.DataFrame({
+        'Fecha': pd.to_datetime(fechas),
+        'Débito': debitos,
+        'Crédito': creditos,
+        'Banco': banco,
+        'Tipo_Movimiento': tipos,
+        'Categoria_Principal': ['Ingresos' if t == 'Ingreso' else 'Servicios' for t in tipos],
+        'Categoria_Final': ['Ingresos - Transferencias' if t == 'Ingreso' else 'Servicios - Agua' for t in tipos],
+    })
+
+
+@pytest.fixture
+def cubo(tmp_path):
+    return CuboMovimientos(str(tmp_path / 'cubo.sqlite'))
+
+
+class TestCuboMovimientos:
+    """Suite de tests para CuboMovimientos"""
+
+    def test_actualizar_reemplaza_dias_cargados(self, cubo):
+        """Test: Volver a cargar los mismos días no duplica importes"""
+        # Arrange
+        df = movimientos(['2025-11-03', '2025-11-03', '2025-11-04'], [1000.0, 0.0, 0.0], [0.0, 200.0, 50.0])
+
+        # Act
+        cubo.actualizar(df)
+        cubo.actualizar(df)
+        cubo.actualizar(movimientos(['2025-11-04'], [0.0], [80.0]))  # corrección del día 4
+
+        # Assert
+        agregado = cubo.por_categoria()
+        assert agregado['Movimientos'].sum() == 3
+        assert agregado['Débito'].sum() == 280.0
+
+    def test_metricas_periodo_igual_al_analyzer(self, cubo):
+        """Test: Las métricas por categoría del cubo coinciden con las del Analyzer"""
+        # Arrange
+        df = movimientos(['2025-11-03', '2025-11-10', '2025-11-20', '2025-12-01'],
+                         [1000.0, 0.0, 300.0, 500.0], [0.0, 200.0, 0.0, 0.0])
+        df.loc[1, 'Categoria_Principal'] = 'Sin Clasificar'
+        cubo.actualizar(df)
+
+        # Act
+        desde_cubo = Analyzer.metricas_periodo(cubo, '2025-11-01', '2025-11-30')
+        esperado = Analyzer.metricas_categorias(Analyzer(df.iloc[:3]).agregados)
+
+        # Assert
+        assert desde_cubo == esperado
+        assert desde_cubo['total_movimientos'] == 3
+        assert desde_cubo['egresos_sin_clasificar'] == 200.0
+
+    def test_mensual_y_acumulado_anual(self, cubo):
+        """Test: Variación contra el mes anterior y acumulado del año"""
+        # Arrange
+        cubo.actualizar(movimientos(['2024-12-15', '2025-01-10', '2025-02-10', '2025-02-11'],
+                                    [100.0, 200.0, 300.0, 0.0], [0.0, 0.0, 0.0, 50.0]))
+
+        # Act
+        mensual = cubo.mensual()
+        ytd = cubo.acumulado_anual()
+
+        # Assert
+        assert mensual['mes'].dt.strftime('%Y-%m').tolist() == ['2024-12', '2025-01', '2025-02']
+        assert mensual['ingresos_vs_mes_anterior'].tolist()[1:] == [100.0, 50.0]
+        assert math.isnan(mensual['ingresos_vs_mes_anterior'].iloc[0])
+        assert ytd['anio'] == 2025
+        assert ytd['ingresos'] == 500.0
+        assert ytd['egresos'] == 50.0
+        assert ytd['movimientos'] == 3
+
+    def test_por_periodo_categoria_igual_a_agregados(self, cubo):
+        """Test: El comparativo servido desde el cubo coincide con el calculado sobre movimientos"""
+        # Arrange
+        df = movimientos(['2025-10-03', '2025-10-20', '2025-11-04', '2025-11-05'],
+                         [1000.0, 0.0, 300.0, 0.0], [0.0, 200.0, 0.0, 80.0])
+        cubo.actualizar(df)
+        analyzer = Analyzer(df)
+
+        # Act
+        desde_cubo = analyzer.comparativo('M', cubo=cubo)['resumen']
+        desde_df = analyzer.comparativo('M')['resumen']
+
+        # Assert
+        pd.testing.assert_frame_equal(desde_cubo, desde_df, check_dtype=False)
+        assert desde_df['variacion'].tolist() == [-700.0, -120.0]
+
+    def test_cubo_vacio(self, cubo):
+        """Test: Un cubo sin datos no rompe las consultas"""
+        assert len(cubo.mensual()) == 0
+        assert cubo.acumulado_anual()['movimientos'] == 0
+        assert cubo.rango_fechas() == (None, None)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
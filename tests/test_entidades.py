@@ -0,0 +1,151 @@
+"""
+Tests para el módulo IndicePrestadores - TORO · Resumen de Cuentas
+
+Verifica la resolución de entidades de prestadores:
+- CUIT y DNI de la misma persona
+- Grafías distintas del mismo nombre
+- Coincidencia aproximada sin documento
+- Registro de prestadores: búsqueda por documento y por palabras del nombre
+"""
+import numpy as np
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processors.clasificador_cascada import ClasificadorCascada
+from processors.entidades import (IndicePrestadores, RegistroPrestadores, normalizar_documentos,
+                                  normalizar_nombres)
+
+
+class TestNormalizacion:
+    """Suite de tests para la normalización de documentos y nombres"""
+
+    def test_cuit_de_persona_se_reduce_a_dni(self):
+        """Test: CUIT de persona, DNI y CUIT leído como float dan la misma clave"""
+        documentos = pd.Series(['20-23459418-5', '23459418', 20234594185.0, '30708058188', None], dtype=object)
+
+        claves = normalizar_documentos(documentos)
+
+        assert claves.tolist()[:4] == ['23459418', '23459418', '23459418', '30708058188']
+        assert pd.isna(claves.iloc[4])
+
+    def test_nombres_sin_formas_societarias(self):
+        """Test: Acentos, signos, forma societaria y orden de palabras no importan"""
+        nombres = pd.Series(['FARMACIAS LIDER S. A.', 'Farmacias Líder SA', 'LIDER FARMACIAS', 'None', None])
+
+        normalizados = normalizar_nombres(nombres)
+
+        assert normalizados.tolist()[:3] == ['FARMACIAS LIDER'] * 3
+        assert normalizados.iloc[3:].isna().all()
+
+
+class TestIndicePrestadores:
+    """Suite de tests para IndicePrestadores"""
+
+    def test_documento_primero(self):
+        """Test: Mismo documento con distinta grafía es una sola entidad; mismo nombre con
+        distinto documento son dos"""
+        # Arrange
+        df = pd.DataFrame({
+            'Persona_Nombre': ['DECADE S', 'DECADE S.A.', 'GOMEZ ANA', 'GOMEZ ANA'],
+            'Documento': [30708058188.0, 30708058188.0, 27111111112.0, 27222222223.0],
+        })
+
+        # Act
+        entidad = IndicePrestadores().resolver(df)
+
+        # Assert
+        assert entidad.iloc[0] == entidad.iloc[1] == 'DOC:30708058188'
+        assert entidad.iloc[2] != entidad.iloc[3]
+
+    def test_sin_documento_por_nombre(self):
+        """Test: Sin documento se une por nombre exacto o aproximado; sin datos queda NaN"""
+        # Arrange
+        df = pd.DataFrame({
+            'Persona_Nombre': ['PEREZ JUAN CARLOS', 'JUAN CARLOS PEREZ', 'PERES JUAN CARLOS',
+                               'MARTINEZ LUIS', 'MARTINES LUIS', 'ROMERO PABLO', None],
+            'Documento': [20234594185.0, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan],
+        })
+
+        # Act
+        entidad = IndicePrestadores().resolver(df)
+
+        # Assert
+        assert entidad.iloc[:3].tolist() == ['DOC:23459418'] * 3
+        assert entidad.iloc[3] == entidad.iloc[4]
+        assert entidad.iloc[3].startswith('NOM:')
+        assert entidad.iloc[5] == 'NOM:PABLO ROMERO'
+        assert pd.isna(entidad.iloc[6])
+
+
+@pytest.fixture
+def registro():
+    """Registro chico: una persona por CUIT, apellidos sueltos y un nombre compuesto"""
+    return RegistroPrestadores([
+        {'id': 'PRE-001', 'cuit': '27-11111111-2', 'nombre': 'Gómez Ana', 'categoria': 'Prestadores - Kinesiología'},
+        {'id': 'PRE-002', 'nombre': 'tura'},
+        {'id': 'PRE-003', 'nombre': 'diaz'},
+        {'id': 'PRE-004', 'nombre': 'diaz gustavo', 'categoria': 'Prestadores - Profesionales'},
+    ])
+
+
+class TestRegistroPrestadores:
+    """Suite de tests para RegistroPrestadores"""
+
+    def test_documento_antes_que_nombre(self, registro):
+        """Test: El documento del Detalle gana aunque el nombre coincida con otro prestador"""
+        # Act
+        por_cuit = registro.buscar('CBU: 0150 DOCUMENTO: 27111111112 NOMBRE: TURA JUAN')
+        por_dni = registro.buscar('DOCUMENTO: 11111111 NOMBRE: A. GOMEZ')
+
+        # Assert
+        assert por_cuit['id'] == 'PRE-001'
+        assert por_dni['id'] == 'PRE-001'
+
+    def test_palabras_completas_y_nombre_mas_completo(self, registro):
+        """Test: Se comparan palabras (no subcadenas) y gana el nombre con más palabras"""
+        # Act / Assert
+        assert registro.buscar('PAGO FACTURA 123 CAPTURA') is None
+        assert registro.buscar('NOMBRE: TURA JUAN')['id'] == 'PRE-002'
+        assert registro.buscar('NOMBRE: GUSTAVO DÍAZ')['id'] == 'PRE-004'
+        assert registro.buscar('NOMBRE: DIAZ MARIA')['id'] == 'PRE-003'
+        assert registro.buscar('') is None
+
+    def test_sin_cuit_ni_nombre_falla(self, registro):
+        """Test: Un prestador sin CUIT ni nombre válido no se registra"""
+        with pytest.raises(ValueError):
+            registro.agregar({'id': 'PRE-099', 'cuit': '12', 'nombre': 'S.A.'})
+
+    def test_clasificador_usa_registro(self, registro):
+        """Test: El Nivel 2 asigna la categoría e ID del prestador, o la de la regla si no tiene"""
+        # Arrange
+        base = ClasificadorCascada()
+        refinamiento = dict(base.reglas_refinamiento)
+        transferencias = dict(refinamiento['Egresos - Transferencias'])
+        transferencias['patrones'] = [(registro, 'Prestadores - Varios')]
+        transferencias['ids'] = ['REF-EGR-005']
+        refinamiento['Egresos - Transferencias'] = transferencias
+        clasificador = ClasificadorCascada(base.reglas_concepto, refinamiento)
+
+        # Act
+        kinesiologa = clasificador.clasificar_texto('Transferencia por CBU', 'DOCUMENTO: 27111111112')
+        tura = clasificador.clasificar_texto('Transferencia por CBU', 'NOMBRE: TURA JUAN')
+        indice = clasificador.indice_reglas().set_index('Regla_ID')
+
+        # Assert
+        assert kinesiologa[1] == 'Prestadores - Kinesiología'
+        assert kinesiologa[4] == 'PRE-001'
+        assert tura[1] == 'Prestadores - Varios'
+        assert indice.loc['PRE-001', 'Patrones'] == '27-11111111-2 | Gómez Ana'
+        assert indice.loc['PRE-002', 'Categoria'] == 'Prestadores - Varios'
+        assert 'Prestadores - Kinesiología' in clasificador.obtener_categorias()['Prestadores']
+        ids = clasificador.ids_refinamiento('Egresos - Transferencias')
+        assert ids == ['REF-EGR-005'] and clasificador.ids_refinamiento('Egresos - Transferencias') is ids
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,93 @@
+"""
+Tests para el módulo ExcelExporter - TORO · Resumen de Cuentas
+
+Verifica el reporte ejecutivo en modo streaming:
+- Mismas hojas y valores que el modo normal
+- Continuación en otra hoja al superar el límite de filas
+"""
+import numpy as np
+import pytest
+import pandas as pd
+from openpyxl import load_workbook
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from reports.analyzer import Analyzer
+from reports.excel_exporter import ExcelExporter
+from reports.excel_streaming import EscritorExcelStreaming
+
+
+@pytest.fixture
+def df():
+    """Movimientos de un mes con ingresos, egresos, sin clasificar y celdas vacías"""
+    rng = np.random.default_rng(5)
+    n = 120
+    credito = np.where(rng.random(n) < 0.5, rng.integers(1, 999, n) + 0.25, 0.0)
+    categoria = rng.choice(['Servicios', 'Sin Clasificar'], n)
+    return pd.DataFrame({
+        'Fecha': pd.Timestamp('2025-10-01') + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit='s'),
+        'Concepto': 'Transferencia',
+        'Detalle': rng.choice(['PAGO', 'CUOTA <3>', None], n),
+        'Débito': np.where(credito == 0, 50.5, 0.0),
+        'Crédito': credito,
+        'Banco': 'Galicia',
+        'Tipo_Movimiento': np.where(credito > 0, 'Ingreso', 'Egreso'),
+        'Categoria_Principal': categoria,
+        'Categoria_Final': np.where(categoria == 'Sin Clasificar', 'Sin Clasificar', 'Servicios - Luz'),
+        'Es_DEBIN': rng.random(n) < 0.1,
+        'Persona_Nombre': None,
+    })
+
+
+def valores(ruta):
+    """Valores de cada hoja del libro"""
+    libro = load_workbook(ruta)
+    return {nombre: list(libro[nombre].iter_rows(values_only=True)) for nombre in libro.sheetnames}
+
+
+class TestExcelStreaming:
+    """Suite de tests para el modo streaming del reporte ejecutivo"""
+
+    def test_streaming_igual_a_normal(self, df, tmp_path):
+        """Test: El modo streaming escribe las mismas hojas, valores y formato de títulos"""
+        # Arrange
+        analyzer = Analyzer(df)
+        metricas = analyzer.calcular_metricas(mostrar_resumen=False)
+
+        # Act
+        filas_normal = ExcelExporter(analyzer.df, metricas, analyzer.agregados,
+                                     streaming=False).exportar(str(tmp_path / 'normal.xlsx'))
+        filas_streaming = ExcelExporter(analyzer.df, metricas, analyzer.agregados,
+                                        streaming=True).exportar(str(tmp_path / 'streaming.xlsx'))
+
+        # Assert
+        assert filas_streaming == filas_normal
+        assert valores(tmp_path / 'streaming.xlsx') == valores(tmp_path / 'normal.xlsx')
+        titulo = load_workbook(tmp_path / 'streaming.xlsx')['Ingresos']['A1']
+        assert titulo.font.bold and titulo.font.size == 16
+
+    def test_continua_en_otra_hoja(self, df, tmp_path, monkeypatch):
+        """Test: Al superar el límite de filas la tabla sigue en otra hoja con el mismo encabezado"""
+        # Arrange
+        monkeypatch.setattr(EscritorExcelStreaming, 'MAX_FILAS', 40)
+        analyzer = Analyzer(df)
+        sin_clasificar = len(analyzer.agregados.sin_clasificar())
+
+        # Act
+        filas = ExcelExporter(analyzer.df, analyzer.calcular_metricas(mostrar_resumen=False), analyzer.agregados,
+                              streaming=True).exportar(str(tmp_path / 'reporte.xlsx'))
+
+        # Assert
+        hojas = [nombre for nombre in filas if nombre.startswith('Sin Clasificar')]
+        assert hojas[:2] == ['Sin Clasificar', 'Sin Clasificar (2)']
+        assert all(filas[nombre] <= 40 for nombre in filas)
+        assert sum(filas[nombre] - 1 for nombre in hojas) == sin_clasificar
+        libro = valores(tmp_path / 'reporte.xlsx')
+        assert libro['Sin Clasificar (2)'][0] == libro['Sin Clasificar'][0]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
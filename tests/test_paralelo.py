@@ -0,0 +1,64 @@
+"""
+Tests para el módulo paralelo - TORO · Resumen de Cuentas
+
+Verifica la generación concurrente de salidas:
+- Las tareas corren a la vez y se devuelve el resultado de cada una
+- Un error en una salida no impide las demás
+- Lo impreso por cada tarea se muestra junto y en orden
+"""
+import threading
+
+import pytest
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from reports.paralelo import generar_en_paralelo
+
+
+class TestGenerarEnParalelo:
+    """Suite de tests para generar_en_paralelo"""
+
+    def test_tareas_a_la_vez_y_salida_ordenada(self, capsys):
+        """Test: Ambas tareas corren a la vez (se esperan mutuamente) y su salida no se intercala"""
+        # Arrange
+        barrera = threading.Barrier(2, timeout=5)
+
+        def tarea(nombre):
+            def ejecutar():
+                print(f"{nombre} inicio")
+                barrera.wait()
+                print(f"{nombre} fin")
+                return nombre.lower()
+            return ejecutar
+
+        # Act
+        resultados = generar_en_paralelo({'Dashboard': tarea('Dashboard'), 'Excel': tarea('Excel')})
+
+        # Assert
+        assert resultados['Dashboard']['resultado'] == 'dashboard'
+        assert resultados['Excel']['error'] is None
+        assert capsys.readouterr().out == "Dashboard inicio\nDashboard fin\nExcel inicio\nExcel fin\n"
+
+    def test_error_no_pierde_la_otra_salida(self, capsys):
+        """Test: Si una salida falla, la otra se genera y el error queda informado"""
+        # Arrange
+        def falla():
+            raise PermissionError("reporte.xlsx abierto en Excel")
+
+        # Act
+        resultados = generar_en_paralelo({'Dashboard': lambda: 'ok', 'Excel': falla})
+
+        # Assert
+        assert resultados['Dashboard']['resultado'] == 'ok'
+        assert isinstance(resultados['Excel']['error'], PermissionError)
+        assert resultados['Excel']['segundos'] >= 0
+        salida = capsys.readouterr().out
+        assert 'ERROR en Excel: reporte.xlsx abierto en Excel' in salida
+        assert 'Traceback' in salida
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
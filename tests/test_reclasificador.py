@@ -0,0 +1,161 @@
+"""
+Tests para el módulo ReclasificadorSelectivo - TORO · Resumen de Cuentas
+
+Verifica la reclasificación selectiva por cambios de reglas:
+- Sin cambios de reglas no se reevalúa nada (salvo Sin Clasificar)
+- Reglas agregadas, eliminadas y modificadas dan el mismo resultado
+  que recategorizar todo desde cero
+- Las correcciones manuales se conservan
+"""
+import copy
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processors.clasificador_cascada import ClasificadorCascada
+from processors.reclasificador import ReclasificadorSelectivo
+
+
+@pytest.fixture
+def df_movimientos():
+    """Movimientos variados que ejercitan Nivel 1, Nivel 2 y defaults"""
+    return pd.DataFrame({
+        'Fecha': pd.date_range('2025-11-01', periods=8, freq='D'),
+        'Concepto': ['Compra Visa Débito', 'Compra Visa Débito', 'Transferencia por CBU',
+                     'Transferencia por CBU', 'Pago de servicios', 'Concepto raro',
+                     'Crédito por transferencia', 'Compra Visa Débito'],
+        'Detalle': ['AGUAS CORDOBESAS', 'KIOSCO PEPE', 'FARMACIA LIDER', 'JUAN PEREZ',
+                    'GAS DEL CENTRO', 'XYZ', 'OBRA SOCIAL', None],
+        'Débito': [100.0, 50.0, 200.0, 300.0, 80.0, 10.0, 0.0, 5.0],
+        'Crédito': [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 500.0, 0.0],
+    })
+
+
+def categorizar(df: pd.DataFrame, clasificador: ClasificadorCascada) -> pd.DataFrame:
+    """Categoriza df con el clasificador dado (equivalente al Categorizer)."""
+    df = df.copy()
+    resultados = [clasificador.clasificar_texto(c, d) for c, d in zip(df['Concepto'], df['Detalle'])]
+    columnas = ['Categoria_Principal', 'Categoria_Final', 'Confianza', 'Regla_Concepto', 'Regla_Detalle']
+    for i, col in enumerate(columnas):
+        df[col] = [r[i] for r in resultados]
+    return df.drop(columns=['Confianza'])
+
+
+def reglas_base():
+    """Copia editable de las reglas hardcodeadas"""
+    base = ClasificadorCascada()
+    return dict(base.reglas_concepto), copy.deepcopy(base.reglas_refinamiento)
+
+
+def verificar_igual_a_completo(df, clasificador_nuevo):
+    """La reclasificación selectiva debe coincidir con recategorizar todo."""
+    anterior = ClasificadorCascada()
+    df_categorizado = categorizar(df, anterior)
+
+    reclasificador = ReclasificadorSelectivo(clasificador_nuevo, anterior.indice_reglas())
+    df_selectivo, df_cambios = reclasificador.reclasificar(df_categorizado)
+    df_completo = categorizar(df, clasificador_nuevo)
+
+    columnas = ['Categoria_Principal', 'Categoria_Final', 'Regla_Concepto', 'Regla_Detalle']
+    pd.testing.assert_frame_equal(df_selectivo[columnas], df_completo[columnas])
+    return reclasificador, df_categorizado, df_cambios
+
+
+class TestReclasificadorSelectivo:
+    """Suite de tests para ReclasificadorSelectivo"""
+
+    def test_sin_cambios_solo_reevalua_sin_clasificar(self, df_movimientos):
+        """Test: Con las mismas reglas solo se reevalúan los Sin Clasificar"""
+        clasificador = ClasificadorCascada()
+        df = categorizar(df_movimientos, clasificador)
+
+        reclasificador = ReclasificadorSelectivo(clasificador, clasificador.indice_reglas())
+        mascara = reclasificador.filas_afectadas(df)
+
+        assert mascara.sum() == 1
+        assert df.loc[mascara, 'Concepto'].iloc[0] == 'Concepto raro'
+
+    def test_regla_modificada_igual_a_completo(self, df_movimientos):
+        """Test: Modificar la categoría de un patrón de Nivel 2"""
+        concepto, refinamiento = reglas_base()
+        refinamiento['Gastos Operativos - Compras']['patrones'][0] = (
+            ["aguas cordobesas"], "Servicios - Agua Potable")
+
+        reclasificador, df_categorizado, df_cambios = verificar_igual_a_completo(
+            df_movimientos, ClasificadorCascada(concepto, refinamiento))
+
+        assert reclasificador.comparar_reglas()['modificadas'] == ['REF-GAS-001']
+        assert list(df_cambios['Categoria_Nueva']) == ['Servicios - Agua Potable']
+        assert df_cambios['Regla_Anterior'].iloc[0] == 'REF-GAS-001'
+
+    def test_reglas_agregadas_y_eliminadas_igual_a_completo(self, df_movimientos):
+        """Test: Agregar reglas de Nivel 1/Nivel 2 y eliminar otras"""
+        concepto, refinamiento = reglas_base()
+        concepto['concepto raro'] = "Gastos Operativos - Compras"
+        del concepto['pago de servicios']
+        refinamiento['Egresos - Transferencias']['patrones'].append((["perez"], "Prestadores - Profesionales"))
+        refinamiento['Egresos - Transferencias']['ids'].append("REF-EGR-009")
+
+        reclasificador, df_categorizado, df_cambios = verificar_igual_a_completo(
+            df_movimientos, ClasificadorCascada(concepto, refinamiento))
+
+        cambios = reclasificador.comparar_reglas()
+        assert 'REF-EGR-009' in cambios['agregadas']
+        assert 'N1:pago de servicios' in cambios['eliminadas']
+        assert set(df_cambios['Concepto']) == {'Transferencia por CBU', 'Pago de servicios', 'Concepto raro'}
+
+    def test_prestador_registrado_igual_a_completo(self, df_movimientos):
+        """Test: Registrar un prestador reevalúa solo los movimientos con su nombre"""
+        concepto, refinamiento = reglas_base()
+        registro = refinamiento['Egresos - Transferencias']['patrones'][4][0]
+        registro.agregar({'id': 'PRE-900', 'nombre': 'juan perez', 'categoria': 'Prestadores - Profesionales'})
+
+        reclasificador, df_categorizado, df_cambios = verificar_igual_a_completo(
+            df_movimientos, ClasificadorCascada(concepto, refinamiento))
+
+        assert reclasificador.comparar_reglas()['agregadas'] == ['PRE-900']
+        assert list(df_cambios['Detalle']) == ['JUAN PEREZ']
+        assert df_cambios['Regla_Nueva'].iloc[0] == 'PRE-900'
+
+    def test_default_modificado_igual_a_completo(self, df_movimientos):
+        """Test: Cambiar el default de una categoría refinable"""
+        concepto, refinamiento = reglas_base()
+        refinamiento['Gastos Operativos - Compras']['default'] = "Gastos Operativos - Otros"
+
+        _, _, df_cambios = verificar_igual_a_completo(
+            df_movimientos, ClasificadorCascada(concepto, refinamiento))
+
+        assert list(df_cambios['Detalle']) == ['KIOSCO PEPE']
+
+    def test_respeta_correcciones_manuales(self, df_movimientos):
+        """Test: Las filas corregidas a mano no se reevalúan"""
+        anterior = ClasificadorCascada()
+        df = categorizar(df_movimientos, anterior)
+        df.loc[5, ['Categoria_Principal', 'Categoria_Final']] = ['Egresos', 'Egresos - Varios']
+        df.loc[5, 'Regla_Concepto'] = ReclasificadorSelectivo.REGLA_MANUAL
+
+        concepto, refinamiento = reglas_base()
+        concepto['concepto raro'] = "Gastos Operativos - Compras"
+        reclasificador = ReclasificadorSelectivo(ClasificadorCascada(concepto, refinamiento),
+                                                 anterior.indice_reglas())
+        df_nuevo, df_cambios = reclasificador.reclasificar(df)
+
+        assert df_nuevo.loc[5, 'Categoria_Final'] == 'Egresos - Varios'
+        assert len(df_cambios) == 0
+
+    def test_sin_foto_de_reglas_reevalua_todo(self, df_movimientos):
+        """Test: Sin reglas anteriores se reevalúan todos los movimientos"""
+        df = categorizar(df_movimientos, ClasificadorCascada())
+
+        reclasificador = ReclasificadorSelectivo(ClasificadorCascada(), None)
+
+        assert reclasificador.filas_afectadas(df).all()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
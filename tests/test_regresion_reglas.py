@@ -0,0 +1,102 @@
+"""
+Tests para el módulo RegresionReglas - TORO · Resumen de Cuentas
+
+Verifica la regresión de reglas candidatas sobre el corpus histórico:
+- clasificar_lote da el mismo resultado que clasificar_texto fila a fila
+- Conteos por cambio anterior -> nueva y nuevos sin clasificar
+- Las correcciones manuales no se comparan
+"""
+import copy
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processors.clasificador_cascada import ClasificadorCascada
+from processors.regresion_reglas import RegresionReglas
+
+
+@pytest.fixture
+def corpus():
+    """Corpus categorizado con las reglas actuales (con repetidos)"""
+    clasificador = ClasificadorCascada()
+    df = pd.DataFrame({
+        'Concepto': ['Compra Visa Débito', 'Compra Visa Débito', 'Compra Visa Débito',
+                     'Transferencia por CBU', 'IVA', 'Concepto raro', 'Pago de servicios'],
+        'Detalle': ['EPEC CORDOBA', 'EPEC CORDOBA', 'KIOSCO', 'FARMACIA LIDER', None, 'XYZ', ''],
+    })
+    df['Categoria_Final'] = [clasificador.clasificar_texto(c, d)[1]
+                             for c, d in zip(df['Concepto'], df['Detalle'])]
+    return df
+
+
+def clasificador_candidato():
+    """Reglas candidatas: EPEC pasa a 'Servicios - Luz' y se elimina la regla de IVA"""
+    base = ClasificadorCascada()
+    concepto = dict(base.reglas_concepto)
+    refinamiento = copy.deepcopy(base.reglas_refinamiento)
+    del concepto['iva']
+    refinamiento['Gastos Operativos - Compras']['patrones'][1] = (["epec"], "Servicios - Luz")
+    return ClasificadorCascada(concepto, refinamiento)
+
+
+class TestClasificarLote:
+    """Suite de tests para ClasificadorCascada.clasificar_lote"""
+
+    def test_igual_a_clasificar_texto(self, corpus):
+        """Test: El lote coincide con la clasificación fila a fila"""
+        clasificador = ClasificadorCascada()
+
+        lote = clasificador.clasificar_lote(corpus['Concepto'], corpus['Detalle'])
+        esperado = pd.DataFrame(
+            [clasificador.clasificar_texto(c, d) for c, d in zip(corpus['Concepto'], corpus['Detalle'])],
+            columns=lote.columns, index=corpus.index
+        )
+
+        pd.testing.assert_frame_equal(lote, esperado, check_dtype=False)
+
+
+class TestRegresionReglas:
+    """Suite de tests para RegresionReglas"""
+
+    def test_sin_cambios_de_reglas(self, corpus):
+        """Test: Con las mismas reglas no cambia nada"""
+        resultado = RegresionReglas(ClasificadorCascada()).ejecutar(corpus)
+
+        assert resultado['movimientos'] == 7
+        assert resultado['movimientos_cambiados'] == 0
+        assert len(resultado['cambios']) == 0
+
+    def test_reporta_cambios_y_nuevos_sin_clasificar(self, corpus):
+        """Test: Conteos por cambio, muestras agrupadas y nuevos sin clasificar"""
+        resultado = RegresionReglas(clasificador_candidato()).ejecutar(corpus)
+
+        cambios = resultado['cambios'].set_index(['Categoria_Anterior', 'Categoria_Nueva'])['Cantidad']
+        assert cambios[('Servicios - Electricidad', 'Servicios - Luz')] == 2
+        assert cambios[('Impuestos - IVA', 'Sin Clasificar - Requiere Revisión')] == 1
+        assert resultado['movimientos_cambiados'] == 3
+
+        # Los textos repetidos se muestran una vez con su cantidad
+        muestra = resultado['muestras']
+        assert muestra.loc[muestra['Detalle'] == 'EPEC CORDOBA', 'Cantidad'].tolist() == [2]
+        assert muestra.loc[muestra['Detalle'] == 'EPEC CORDOBA', 'Regla_Nueva'].tolist() == ['REF-GAS-002']
+
+        assert resultado['nuevos_sin_clasificar']['Concepto'].tolist() == ['IVA']
+
+    def test_excluye_correcciones_manuales(self, corpus):
+        """Test: Las filas con Regla_Concepto MANUAL no se comparan"""
+        corpus['Regla_Concepto'] = ''
+        corpus.loc[0, 'Regla_Concepto'] = RegresionReglas.REGLA_MANUAL
+
+        resultado = RegresionReglas(clasificador_candidato()).ejecutar(corpus)
+
+        assert resultado['manuales_excluidos'] == 1
+        assert resultado['movimientos_cambiados'] == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,112 @@
+"""
+Tests para el módulo servidor - TORO · Resumen de Cuentas
+
+Verifica las consultas del dashboard en vivo:
+- Filtros por período, categoría y banco (índices) iguales a una máscara
+- Agregados por grupo y por período
+- Respuestas HTTP: JSON, HTML en modo servidor y errores
+"""
+import json
+import urllib.request
+import threading
+
+import numpy as np
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from reports.servidor import ServidorDashboard
+
+
+@pytest.fixture
+def movimientos():
+    """Dos bancos, tres categorías y 200 días de movimientos (desordenados, como los extractos)"""
+    rng = np.random.default_rng(3)
+    n = 600
+    credito = np.where(rng.random(n) < 0.5, rng.integers(1, 1000, n), 0).astype(float)
+    df = pd.DataFrame({
+        'Fecha': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 200, n), unit='D'),
+        'Concepto': rng.choice(['Transferencia', 'Pago'], n),
+        'Débito': np.where(credito == 0, rng.integers(1, 1000, n), 0).astype(float),
+        'Crédito': credito,
+        'Tipo_Movimiento': np.where(credito > 0, 'Ingreso', 'Egreso'),
+        'Categoria_Principal': rng.choice(['Ingresos', 'Servicios', 'Prestadores'], n),
+        'Banco': rng.choice(['Galicia', 'Supervielle'], n),
+    })
+    df['Categoria_Final'] = df['Categoria_Principal'] + ' - Varios'
+    return df
+
+
+class TestServidorDashboard:
+    """Suite de tests para ServidorDashboard"""
+
+    def test_filtros_iguales_a_mascara(self, movimientos):
+        """Test: Período por búsqueda binaria e índices por valor dan las mismas filas que una máscara"""
+        # Arrange
+        servidor = ServidorDashboard(movimientos)
+        mascara = ((movimientos['Fecha'] >= '2025-02-01') & (movimientos['Fecha'] <= '2025-03-15')
+                   & (movimientos['Categoria_Principal'] == 'Servicios') & (movimientos['Banco'] == 'Galicia'))
+
+        # Act
+        filtrado = servidor.filtrar('2025-02-01', '2025-03-15', categoria='Servicios', banco='Galicia')
+
+        # Assert
+        assert filtrado['Fecha'].is_monotonic_increasing
+        assert sorted(filtrado.index) == sorted(movimientos.index[mascara])
+        assert len(servidor.filtrar(banco='Nación')) == 0
+        assert len(servidor.filtrar()) == len(movimientos)
+
+    def test_agregados_y_memoria(self, movimientos):
+        """Test: Agregados por banco y por mes suman lo mismo que el DataFrame; se memorizan"""
+        # Arrange
+        servidor = ServidorDashboard(movimientos)
+
+        # Act
+        por_banco = servidor.agregados('banco')
+        por_mes = servidor.agregados('M', categoria='Ingresos')
+
+        # Assert
+        esperado = movimientos.groupby('Banco')['Crédito'].sum()
+        assert por_banco['clave'] == ['Galicia', 'Supervielle']
+        assert por_banco['ingresos'] == esperado.round(2).tolist()
+        assert sum(por_banco['cantidad']) == len(movimientos)
+        assert por_mes['clave'][0] == '2025-01-01'
+        assert sum(por_mes['cantidad']) == (movimientos['Categoria_Principal'] == 'Ingresos').sum()
+        assert servidor.agregados('banco') is por_banco
+        with pytest.raises(ValueError):
+            servidor.agregados('cuenta')
+
+    def test_respuestas_http(self, movimientos):
+        """Test: El servidor responde el HTML en modo servidor, datos filtrados en JSON y errores 400/404"""
+        # Arrange
+        dashboard = ServidorDashboard(movimientos)
+        servidor = dashboard.servir(puerto=0)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+        try:
+            # Act
+            html = urllib.request.urlopen(url + '/').read().decode('utf-8')
+            datos = json.loads(urllib.request.urlopen(url + '/api/datos?banco=Supervielle&hasta=2025-03-31').read())
+            codigo_error, _, error = dashboard.responder('/api/datos?desde=2030-01-01')
+            codigo_ruta, _, _ = dashboard.responder('/api/otra')
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        # Assert
+        assert 'id="srv_banco"' in html
+        assert 'consultarServidor();' in html
+        assert datos['movimientos']['banco']['valores'] == ['Supervielle']
+        assert len(datos['movimientos']['dias']) == len(dashboard.filtrar(hasta='2025-03-31', banco='Supervielle'))
+        assert datos['tarjetas']['total_ingresos'].startswith('$')
+        assert codigo_error == 400 and 'No hay movimientos' in json.loads(error)['error']
+        assert codigo_ruta == 404
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,112 @@
+"""
+Tests para el módulo submuestreo - TORO · Resumen de Cuentas
+
+Verifica la reducción de series para el gráfico de flujo de caja:
+- LTTB respeta el presupuesto y conserva extremos y picos
+- Mínimo/máximo por balde conserva los valores extremos (e ignora tramos sin datos)
+- El dashboard reduce series largas y conserva la serie diaria
+"""
+import numpy as np
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from reports.analyzer import Analyzer
+from reports.dashboard_generator import DashboardGenerator
+from reports.submuestreo import indices_lttb, indices_min_max, indices_series
+
+
+@pytest.fixture
+def serie():
+    """Diez años de valores diarios con un pico aislado"""
+    rng = np.random.default_rng(7)
+    y = rng.random(3650) * 100
+    y[1234] = 10_000
+    return np.arange(3650), y
+
+
+class TestSubmuestreo:
+    """Suite de tests para las funciones de reducción"""
+
+    def test_lttb_presupuesto_y_pico(self, serie):
+        """Test: LTTB devuelve exactamente el presupuesto, ordenado, con primero, último y pico"""
+        # Arrange
+        x, y = serie
+
+        # Act
+        indices = indices_lttb(x, y, 200)
+
+        # Assert
+        assert len(indices) == 200
+        assert np.all(np.diff(indices) > 0)
+        assert indices[0] == 0 and indices[-1] == 3649
+        assert 1234 in indices
+        assert np.array_equal(indices_lttb(x[:50], y[:50], 200), np.arange(50))
+
+    def test_min_max_conserva_extremos(self, serie):
+        """Test: Mínimo/máximo por balde conserva el máximo y el mínimo globales"""
+        # Arrange
+        x, y = serie
+
+        # Act
+        indices = indices_min_max(y, 200)
+
+        # Assert
+        assert len(indices) <= 200
+        assert int(np.argmax(y)) in indices
+        assert int(np.argmin(y)) in indices
+        with pytest.raises(ValueError):
+            indices_series(x, [y], 200, metodo='promedio')
+
+    def test_min_max_baldes_sin_datos(self, serie):
+        """Test: Un tramo todo NaN no rompe el mínimo/máximo y no aporta puntos"""
+        # Arrange
+        _, y = serie
+        y = y.copy()
+        y[1000:2000] = np.nan
+
+        # Act
+        indices = indices_min_max(y, 200)
+        todo_nan = indices_min_max(np.full(500, np.nan), 20)
+
+        # Assert
+        assert len(indices) <= 200
+        assert not np.isnan(y[indices[1:-1]]).any()
+        assert int(np.nanargmax(y)) in indices
+        assert list(todo_nan) == [0, 499]
+
+    def test_dashboard_reduce_flujo_largo(self):
+        """Test: Con más días que PUNTOS_FLUJO el gráfico se reduce y la serie diaria se conserva"""
+        # Arrange
+        dias = DashboardGenerator.PUNTOS_FLUJO * 3
+        creditos = np.linspace(100.0, 200.0, dias).round(2)
+        creditos[777] = 0.0
+        df = pd.DataFrame({
+            'Fecha': pd.date_range('2020-01-01', periods=dias, freq='D'),
+            'Débito': np.where(creditos == 0, 50_000.0, 0.0),
+            'Crédito': creditos,
+            'Tipo_Movimiento': np.where(creditos == 0, 'Egreso', 'Ingreso'),
+            'Categoria_Principal': ['Ingresos'] * dias,
+            'Categoria_Final': ['Ingresos - Transferencias'] * dias,
+        })
+        analyzer = Analyzer(df)
+        metricas = analyzer.calcular_metricas(mostrar_resumen=False)
+
+        # Act
+        flujo = DashboardGenerator(analyzer.df, metricas, analyzer.agregados)._preparar_datos_flujo(
+            metricas['flujo_diario'])
+
+        # Assert
+        assert len(flujo['labels']) <= DashboardGenerator.PUNTOS_FLUJO
+        assert len(flujo['diario']['labels']) == dias
+        assert 777 in flujo['indices']
+        assert flujo['egresos'][flujo['indices'].index(777)] == 50_000.0
+        assert [flujo['diario']['labels'][i] for i in flujo['indices']] == flujo['labels']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
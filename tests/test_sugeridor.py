@@ -0,0 +1,82 @@
+"""
+Tests para el módulo SugeridorCategorias - TORO · Resumen de Cuentas
+
+Verifica las sugerencias por similitud de trigramas:
+- Categoría más parecida primero
+- Movimientos sin parecido no reciben sugerencias
+- Solo se anotan los movimientos sin clasificar
+"""
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from processors.sugeridor import SugeridorCategorias
+
+
+@pytest.fixture
+def historial():
+    """Historial categorizado mínimo"""
+    return pd.DataFrame({
+        'Concepto': ['compra visa débito', 'compra visa débito', 'transferencia por cbu', 'xxx'],
+        'Detalle': ['AGUAS CORDOBESAS SA', 'EPEC CORDOBA', 'FARMACIA LIDER SRL', 'algo'],
+        'Categoria_Principal': ['Servicios', 'Servicios', 'Prestadores', 'Sin Clasificar'],
+        'Categoria_Final': ['Servicios - Agua', 'Servicios - Electricidad',
+                            'Prestadores - Farmacias', 'Sin Clasificar - Requiere Revisión']
+    })
+
+
+class TestSugeridorCategorias:
+    """Suite de tests para SugeridorCategorias"""
+
+    def test_sugiere_categoria_mas_parecida(self, historial):
+        """Test: La categoría con texto más parecido va primero"""
+        sugeridor = SugeridorCategorias().entrenar(historial)
+        consulta = pd.DataFrame({
+            'Concepto': ['débito automático', 'pago'],
+            'Detalle': ['AGUAS CORDOBESAS 12345', 'FARMACIAS LIDER']
+        })
+
+        sugerencias = sugeridor.sugerir(consulta)
+
+        assert sugerencias[0][0][0] == 'Servicios - Agua'
+        assert sugerencias[1][0][0] == 'Prestadores - Farmacias'
+        assert sugerencias[0][0][1] >= sugerencias[0][-1][1]
+
+    def test_no_sugiere_sin_clasificar_ni_textos_ajenos(self, historial):
+        """Test: Historial sin clasificar no se usa y textos sin parecido quedan vacíos"""
+        sugeridor = SugeridorCategorias(score_minimo=0.2).entrenar(historial)
+        consulta = pd.DataFrame({'Concepto': ['zzzz qqqq'], 'Detalle': [None]})
+
+        sugerencias = sugeridor.sugerir(consulta)
+
+        assert sugerencias == [[]]
+        assert 'Sin Clasificar - Requiere Revisión' not in list(sugeridor.categorias)
+
+    def test_anotar_solo_sin_clasificar(self, historial):
+        """Test: La columna Sugerencias solo se completa en filas sin clasificar"""
+        sugeridor = SugeridorCategorias(k=2).entrenar(historial)
+        df = pd.DataFrame({
+            'Concepto': ['compra visa débito', 'movimiento raro'],
+            'Detalle': ['EPEC CORDOBA', 'EPEC CBA'],
+            'Categoria_Principal': ['Servicios', 'Sin Clasificar'],
+        })
+
+        resultado = sugeridor.anotar(df)
+
+        assert pd.isna(resultado['Sugerencias'].iloc[0])
+        assert resultado['Sugerencias'].iloc[1].startswith('Servicios - Electricidad (')
+
+    def test_historial_vacio(self):
+        """Test: Sin historial no hay sugerencias ni errores"""
+        vacio = pd.DataFrame(columns=['Concepto', 'Detalle', 'Categoria_Principal', 'Categoria_Final'])
+        sugeridor = SugeridorCategorias().entrenar(vacio)
+
+        assert sugeridor.sugerir(pd.DataFrame({'Concepto': ['a'], 'Detalle': ['b']})) == [[]]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,82 @@
+"""
+Tests para el módulo vigilante - TORO · Resumen de Cuentas
+
+Verifica la vigilancia de la carpeta de extractos:
+- Un archivo se toma recién cuando dejó de cambiar y es un .xlsx completo
+- La cola acotada deja esperando (sin perder) lo que no entra
+- Un error al procesar no detiene el hilo de trabajo
+"""
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Agregar src/ al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.vigilante import VigilanteCarpeta
+
+
+def extracto(ruta):
+    """Escribe un .xlsx mínimo"""
+    pd.DataFrame({'Fecha': ['2025-10-01'], 'Concepto': ['Pago']}).to_excel(ruta, index=False)
+
+
+class TestVigilanteCarpeta:
+    """Suite de tests para VigilanteCarpeta"""
+
+    def test_espera_a_que_el_archivo_este_completo(self, tmp_path):
+        """Test: Un archivo a medio copiar no se toma; completo y quieto durante la espera, sí"""
+        # Arrange
+        vigilante = VigilanteCarpeta(str(tmp_path), lambda ruta: None, espera=3)
+        parcial = tmp_path / 'Movimientos_Galicia.xlsx'
+        parcial.write_bytes(b'PK\x03\x04 copiando')
+        (tmp_path / '~$Movimientos_Galicia.xlsx').write_bytes(b'bloqueo de Excel')
+
+        # Act
+        primera = vigilante.revisar(ahora=0)
+        incompleto = vigilante.revisar(ahora=10)
+        extracto(parcial)
+        cambio = vigilante.revisar(ahora=11)
+        muy_pronto = vigilante.revisar(ahora=12)
+        listo = vigilante.revisar(ahora=14)
+        otra_vez = vigilante.revisar(ahora=20)
+
+        # Assert
+        assert primera == incompleto == cambio == muy_pronto == []
+        assert listo == [str(parcial)]
+        assert otra_vez == []
+        assert vigilante.cola.get_nowait() == str(parcial)
+
+    def test_cola_llena_espera_y_errores_no_detienen(self, tmp_path, capsys):
+        """Test: Con la cola llena el extracto queda para la próxima revisión; un error no frena el trabajo"""
+        # Arrange
+        procesados = []
+
+        def procesar(ruta):
+            if 'a_falla' in ruta:
+                raise ValueError("formato desconocido")
+            procesados.append(os.path.basename(ruta))
+
+        vigilante = VigilanteCarpeta(str(tmp_path), procesar, espera=0, max_pendientes=1)
+        for nombre in ('a_falla.xlsx', 'b.xlsx'):
+            extracto(tmp_path / nombre)
+        vigilante.revisar(ahora=0)
+
+        # Act
+        primera = vigilante.revisar(ahora=1)
+        vigilante.iniciar()
+        vigilante.cola.join()
+        segunda = vigilante.revisar(ahora=2)
+        vigilante.detener()
+
+        # Assert
+        assert [os.path.basename(ruta) for ruta in primera] == ['a_falla.xlsx']
+        assert [os.path.basename(ruta) for ruta in segunda] == ['b.xlsx']
+        assert procesados == ['b.xlsx']
+        assert vigilante.procesados == 1 and vigilante.errores == 1
+        assert 'ERROR procesando a_falla.xlsx: formato desconocido' in capsys.readouterr().out
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])